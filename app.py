@@ -3,15 +3,44 @@ ClimateGuardian - AI-powered climate risk analysis and policy recommendations
 Main Flask application for web deployment
 """
 
+import asyncio
 import os
 import json
 import logging
+import threading
+import time
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, Response, g, render_template, request, jsonify, session, stream_with_context
 from flask_cors import CORS
-import requests
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, Generator, Iterator, List, Optional, Tuple
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from climateguardian import answers, funding
+from climateguardian.answers import AnswerBook, AnswerBooks
+from climateguardian.cache import CacheKey, ResponseCache
+from climateguardian.history import DEFAULT_SESSION, ConversationHistoryStore, HistoryEntry
+from climateguardian.intent import ComparisonRequest, comparison_request, intent_classifier
+from climateguardian.knowledge import (ORGANIZATION_TYPES, REGIONS, ClimateKnowledgeStore, KnowledgeIndex,
+                                       ResolvedEntities)
+from climateguardian.llm import LLMError, WatsonxClient, build_prompt
+from climateguardian.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsRegistry
+from climateguardian.profiling import SamplingProfiler
+from climateguardian.registry import DATASETS, DatasetCatalog
+from climateguardian.singleflight import SingleFlight
+from climateguardian.startup import STARTUP_MODES, LazyComponent, StartupReport, warm_up
+from climateguardian.streaming import chunk_text, sse_event
+from climateguardian import tracing
+from climateguardian.tracing import Trace
+
+if TYPE_CHECKING:
+    # numpy-backed and SQLite modules are imported when first needed, not at startup
+    from climateguardian.analytics import ClimateAnalytics
+    from climateguardian.columnar import ColumnarCatalog
+    from climateguardian.ranking import RiskRanker
+    from climateguardian.storage import SQLiteBackend
+    from climateguardian.vectorstore import VectorStoreReader
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -30,275 +59,703 @@ class Config:
     IBM_CLOUD_API_KEY = os.environ.get('IBM_CLOUD_API_KEY')
     DEBUG = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
     PORT = int(os.environ.get('PORT', 12000))
-
-# Mock data for demonstration (in production, this would connect to real APIs)
-MOCK_CLIMATE_DATA = {
-    "flood_risks": {
-        "Bangladesh": {
-            "risk_level": "HIGH",
-            "confidence": 89,
-            "factors": [
-                "Increased monsoon intensity (+23% by 2030)",
-                "Sea level rise of 15-20cm expected",
-                "40% of population in flood-prone areas"
-            ],
-            "sources": ["ND-GAIN Country Index 2023", "NOAA Climate Projections"]
-        },
-        "Netherlands": {
-            "risk_level": "MEDIUM",
-            "confidence": 76,
-            "factors": [
-                "Advanced flood protection systems",
-                "Sea level rise of 10-15cm expected",
-                "25% of land below sea level"
-            ],
-            "sources": ["European Climate Assessment", "Dutch Delta Works Data"]
-        }
-    },
-    "policy_recommendations": {
-        "small_island_nations": {
-            "priorities": [
-                {
-                    "policy": "Coastal protection infrastructure",
-                    "funding": "$2.3B funding available",
-                    "impact": "High"
-                },
-                {
-                    "policy": "Renewable energy transition",
-                    "funding": "74% potential reduction in emissions",
-                    "impact": "Very High"
-                },
-                {
-                    "policy": "Climate-smart agriculture adaptation",
-                    "funding": "$500M available",
-                    "impact": "Medium"
-                }
-            ],
-            "funding_opportunities": [
-                {
-                    "name": "Green Climate Fund",
-                    "deadline": "June 2025",
-                    "amount": "$50M"
-                },
-                {
-                    "name": "Adaptation Fund",
-                    "deadline": "August 2025",
-                    "amount": "$25M"
-                }
-            ],
-            "sources": ["UN SDG13 Database", "Climate Watch Policy Tracker"]
-        }
-    },
-    "funding_opportunities": {
-        "africa_ngos": [
-            {
-                "name": "Adaptation Fund",
-                "amount": "$50M",
-                "deadline": "August 2025",
-                "eligibility": "Must demonstrate community impact and have local partnerships"
-            },
-            {
-                "name": "Climate Investment Funds",
-                "amount": "$25M",
-                "deadline": "September 2025",
-                "focus": "Community-based adaptation"
-            },
-            {
-                "name": "Global Environment Facility",
-                "amount": "$15M",
-                "deadline": "October 2025",
-                "focus": "Ecosystem-based solutions"
-            }
-        ]
-    }
-}
+    HISTORY_MAX_ENTRIES = int(os.environ.get('HISTORY_MAX_ENTRIES', 50))
+    HISTORY_MAX_SESSIONS = int(os.environ.get('HISTORY_MAX_SESSIONS', 10000))
+    HISTORY_SESSION_TTL = int(os.environ.get('HISTORY_SESSION_TTL', 86400))
+    RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', 1024))
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 3600))
+    DATA_DIR = os.environ.get('DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'))
+    WATSONX_URL = os.environ.get('WATSONX_URL', 'https://us-south.ml.cloud.ibm.com')
+    WATSONX_MODEL_ID = os.environ.get('WATSONX_MODEL_ID', 'ibm/granite-13b-chat-v2')
+    IBM_IAM_URL = os.environ.get('IBM_IAM_URL', 'https://iam.cloud.ibm.com/identity/token')
+    LLM_POOL_SIZE = int(os.environ.get('LLM_POOL_SIZE', 10))
+    LLM_MAX_CONCURRENCY = int(os.environ.get('LLM_MAX_CONCURRENCY', 8))
+    LLM_TIMEOUT = float(os.environ.get('LLM_TIMEOUT', 30))
+    LLM_MAX_RETRIES = int(os.environ.get('LLM_MAX_RETRIES', 3))
+    LLM_ASYNC_MAX_CONCURRENCY = int(os.environ.get('LLM_ASYNC_MAX_CONCURRENCY', 100))
+    RAG_TOP_K = int(os.environ.get('RAG_TOP_K', 3))
+    RANKING_TOP_K = int(os.environ.get('RANKING_TOP_K', 10))
+    BATCH_MAX_QUESTIONS = int(os.environ.get('BATCH_MAX_QUESTIONS', 200))
+    BATCH_MAX_WORKERS = int(os.environ.get('BATCH_MAX_WORKERS', 8))
+    DATASETS_CACHE_MAX_AGE = int(os.environ.get('DATASETS_CACHE_MAX_AGE', 60))
+    READINESS_CACHE_SECONDS = float(os.environ.get('READINESS_CACHE_SECONDS', 5))
+    READINESS_LLM_TIMEOUT = float(os.environ.get('READINESS_LLM_TIMEOUT', 2))
+    PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join(DATA_DIR, 'profiles'))
+    PROFILE_SAMPLE_EVERY = int(os.environ.get('PROFILE_SAMPLE_EVERY', 0))
+    STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'memory')
+    STORAGE_PATH = os.environ.get('STORAGE_PATH', os.path.join(DATA_DIR, 'shared', 'climateguardian.db'))
+    STORAGE_FLUSH_INTERVAL = float(os.environ.get('STORAGE_FLUSH_INTERVAL', 0.05))
+    ASGI_MAX_IN_FLIGHT = int(os.environ.get('ASGI_MAX_IN_FLIGHT', 256))
+    ASGI_WSGI_THREADS = int(os.environ.get('ASGI_WSGI_THREADS', 16))
+    ASGI_MAX_BODY_BYTES = int(os.environ.get('ASGI_MAX_BODY_BYTES', 1024 * 1024))
+    STARTUP_MODE = os.environ.get('STARTUP_MODE', 'eager')
 
 class ClimateGuardian:
     """Main ClimateGuardian AI assistant class"""
     
-    def __init__(self):
+    def __init__(self, llm: Optional[WatsonxClient] = None, startup_mode: Optional[str] = None,
+                 startup: Optional[StartupReport] = None):
+        self.startup_mode = startup_mode or Config.STARTUP_MODE
+        if self.startup_mode not in STARTUP_MODES:
+            raise ValueError(f"Unknown STARTUP_MODE {self.startup_mode!r}; use one of {', '.join(STARTUP_MODES)}")
+        self.startup = startup or StartupReport()
         self.api_key = Config.WATSONX_API_KEY
         self.project_id = Config.WATSONX_PROJECT_ID
-        self.conversation_history = []
+        self.storage: Optional["SQLiteBackend"] = None
+        self.history, self.response_cache = self._create_stores()
+        # Datasets and indexes are built on first use unless startup is eager
+        self._knowledge = LazyComponent("knowledge", lambda: ClimateKnowledgeStore(Config.DATA_DIR), self.startup)
+        self._tables = LazyComponent("tables", self._create_tables, self.startup)
+        self._analytics = LazyComponent("analytics", self._create_analytics, self.startup)
+        self._ranking = LazyComponent("ranking", self._create_ranking, self.startup)
+        self._retriever = LazyComponent("retriever", self._create_retriever, self.startup)
+        self._datasets = LazyComponent("datasets", lambda: DatasetCatalog(Config.DATA_DIR), self.startup)
+        # Answers fixed by the datasets, rendered once per knowledge index
+        self.answers = AnswerBooks()
+        if self.startup_mode == 'eager':
+            for component in (self._knowledge, self._tables, self._analytics, self._ranking, self._retriever,
+                              self._datasets):
+                component.get()
+            self.answers.book(self.knowledge.index)
+        self.llm = llm if llm is not None else self._create_llm_client()
+        self.batch_pool = ThreadPoolExecutor(max_workers=Config.BATCH_MAX_WORKERS,
+                                             thread_name_prefix="batch-query")
+        self.started_at = time.monotonic()
+        self._readiness: Optional[Tuple[float, Dict]] = None
+        self._readiness_lock = threading.Lock()
+        # Identical concurrent cache misses share one generation
+        self.inflight = SingleFlight()
+        self.metrics = MetricsRegistry()
+        self._register_metrics()
+        self.profiler = SamplingProfiler(Config.PROFILE_DIR, every=Config.PROFILE_SAMPLE_EVERY)
+        self.warm_up_thread = self._start_warm_up() if self.startup_mode == 'warm' else None
+    
+    @property
+    def knowledge(self) -> ClimateKnowledgeStore:
+        return self._knowledge.get()
+    
+    @property
+    def tables(self) -> "ColumnarCatalog":
+        return self._tables.get()
+    
+    @property
+    def analytics(self) -> "ClimateAnalytics":
+        return self._analytics.get()
+    
+    @property
+    def ranking(self) -> "RiskRanker":
+        return self._ranking.get()
+    
+    @property
+    def retriever(self) -> "VectorStoreReader":
+        return self._retriever.get()
+    
+    @property
+    def datasets(self) -> DatasetCatalog:
+        return self._datasets.get()
+    
+    def _create_tables(self) -> "ColumnarCatalog":
+        from climateguardian.columnar import ColumnarCatalog
+        return ColumnarCatalog(os.path.join(Config.DATA_DIR, 'columnar'))
+    
+    def _create_analytics(self) -> "ClimateAnalytics":
+        from climateguardian.analytics import ClimateAnalytics
+        return ClimateAnalytics(self.tables)
+    
+    def _create_ranking(self) -> "RiskRanker":
+        from climateguardian.ranking import RiskRanker
+        return RiskRanker()
+    
+    def _create_retriever(self) -> "VectorStoreReader":
+        from climateguardian.vectorstore import VectorStoreReader
+        return VectorStoreReader(os.path.join(Config.DATA_DIR, 'vectors'))
+    
+    def _start_warm_up(self) -> threading.Thread:
+        """Build datasets and indexes, open the column files and vector index and reach the LLM, off the request path"""
+        def open_tables():
+            tables = self.tables
+            for dataset, names in tables.tables().items():
+                for name in names:
+                    tables.table(dataset, name)
+        
+        steps = {
+            "knowledge": lambda: self.knowledge.index,
+            "answers": lambda: self.answers.book(self.knowledge.index),
+            "datasets": lambda: self.datasets.snapshot(),
+            "tables": open_tables,
+            "analytics": lambda: self.analytics,
+            "ranking": lambda: self.ranking.table(self.knowledge.index),
+            "retriever": lambda: self.retriever.store
+        }
+        if self.llm is not None:
+            steps["llm"] = lambda: self.llm.ping(Config.READINESS_LLM_TIMEOUT)
+        return warm_up(steps, self.startup)
+    
+    def _register_metrics(self):
+        """Hot-path counters plus scrape-time views of the cache, history and LLM client"""
+        metrics = self.metrics
+        self.http_requests = metrics.counter(
+            "http_requests_total", "HTTP requests by endpoint, method and status", ["endpoint", "method", "status"])
+        self.http_latency = metrics.histogram(
+            "http_request_duration_seconds", "HTTP request latency by endpoint", ["endpoint"])
+        self.query_latency = metrics.histogram(
+            "query_duration_seconds", "ClimateGuardian.query latency by intent", ["intent"])
+        self.stage_latency = metrics.histogram(
+            "query_stage_duration_seconds", "Latency of each query processing stage", ["stage"])
+        self.query_errors = metrics.counter(
+            "query_errors_total", "Queries that failed, by the stage that raised", ["stage"])
+        
+        cache = self.response_cache
+        metrics.callback("response_cache_hits_total", "Response cache hits", lambda: cache.hits, kind="counter")
+        metrics.callback("response_cache_misses_total", "Response cache misses", lambda: cache.misses, kind="counter")
+        metrics.callback("response_cache_evictions_total", "Response cache evictions",
+                         lambda: cache.evictions, kind="counter")
+        metrics.callback("response_cache_hit_ratio", "Response cache hits over lookups",
+                         lambda: cache.stats()["hit_rate"])
+        metrics.callback("response_cache_entries", "Cached responses", lambda: len(cache))
+        
+        inflight = self.inflight
+        metrics.callback("query_generations_total", "Responses generated for a cache miss",
+                         lambda: inflight.leaders, kind="counter")
+        metrics.callback("query_coalesced_total", "Queries answered by joining an identical in-flight generation",
+                         lambda: inflight.coalesced, kind="counter")
+        metrics.callback("query_generations_in_flight", "Response generations running", lambda: inflight.in_flight)
+        
+        history = self.history
+        metrics.callback("history_sessions", "Conversation sessions held",
+                         lambda: history.memory_budget()["sessions"])
+        metrics.callback("history_entries", "Conversation history entries held", lambda: len(history))
+        metrics.callback("history_estimated_bytes", "Estimated conversation history size",
+                         lambda: history.memory_budget()["estimated_bytes"])
+        
+        startup = self.startup
+        metrics.callback("startup_milestone_seconds", "Seconds from process start to each startup milestone",
+                         lambda: {(name,): seconds for name, seconds in startup.milestones.items()},
+                         labels=["milestone"])
+        
+        if self.llm is not None:
+            llm = self.llm
+            metrics.callback("llm_calls_total", "watsonx.ai generation calls", lambda: llm.calls, kind="counter")
+            metrics.callback("llm_failures_total", "watsonx.ai generation failures",
+                             lambda: llm.failures, kind="counter")
+            metrics.callback("llm_retries_total", "watsonx.ai request retries", lambda: llm.retries, kind="counter")
+    
+    def readiness(self) -> Dict:
+        """Whether this worker can answer: datasets loaded and the LLM backend reachable.
+
+        The result is reused for READINESS_CACHE_SECONDS so frequent load
+        balancer probes do not each reach the backend.
+        """
+        cached = self._readiness
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+        # One thread probes the backend; concurrent probes wait for its report
+        with self._readiness_lock:
+            cached = self._readiness
+            now = time.monotonic()
+            if cached is not None and now < cached[0]:
+                return cached[1]
+            report = self._check_readiness()
+            self._readiness = (now + Config.READINESS_CACHE_SECONDS, report)
+            return report
+    
+    def _check_readiness(self) -> Dict:
+        data = self.knowledge.index.data
+        loaded = [dataset_id for dataset_id in DATASETS if data.get(dataset_id)]
+        checks = {
+            "datasets": {
+                "ok": len(loaded) == len(DATASETS),
+                "loaded": len(loaded),
+                "expected": len(DATASETS),
+                "metadata_files": sum(1 for entry in self.datasets.entries() if "last_updated" in entry)
+            },
+            "llm": {"ok": True, "configured": False}
+        }
+        if self.llm is not None:
+            ping = self.llm.ping(Config.READINESS_LLM_TIMEOUT)
+            checks["llm"] = {"ok": ping["reachable"], "configured": True, **ping}
+        
+        return {"ready": all(check["ok"] for check in checks.values()), "checks": checks}
+    
+    def _create_stores(self):
+        """History and response cache: per process, or shared by all workers through SQLite"""
+        history_options = dict(max_entries_per_session=Config.HISTORY_MAX_ENTRIES,
+                               max_sessions=Config.HISTORY_MAX_SESSIONS,
+                               session_ttl=Config.HISTORY_SESSION_TTL)
+        cache_options = dict(max_size=Config.RESPONSE_CACHE_SIZE, ttl=Config.RESPONSE_CACHE_TTL,
+                             watch_paths=[Config.DATA_DIR])
+        if Config.STORAGE_BACKEND == 'sqlite':
+            from climateguardian.storage import SQLiteBackend, SQLiteHistoryStore, SQLiteResponseCache
+            self.storage = SQLiteBackend(Config.STORAGE_PATH, flush_interval=Config.STORAGE_FLUSH_INTERVAL)
+            logger.info(f"Sharing history and response cache through {Config.STORAGE_PATH}")
+            return (SQLiteHistoryStore(self.storage, **history_options),
+                    SQLiteResponseCache(self.storage, **cache_options))
+        if Config.STORAGE_BACKEND != 'memory':
+            raise ValueError(f"Unknown STORAGE_BACKEND {Config.STORAGE_BACKEND!r}; use 'memory' or 'sqlite'")
+        return ConversationHistoryStore(**history_options), ResponseCache(**cache_options)
+    
+    def _create_llm_client(self) -> Optional[WatsonxClient]:
+        """Create the shared watsonx.ai client when credentials are configured"""
+        if not (self.api_key and self.project_id):
+            logger.info("watsonx.ai credentials not configured; serving grounded answers directly")
+            return None
+        return WatsonxClient(
+            api_key=self.api_key,
+            project_id=self.project_id,
+            url=Config.WATSONX_URL,
+            model_id=Config.WATSONX_MODEL_ID,
+            iam_url=Config.IBM_IAM_URL,
+            pool_size=Config.LLM_POOL_SIZE,
+            max_concurrency=Config.LLM_MAX_CONCURRENCY,
+            read_timeout=Config.LLM_TIMEOUT,
+            max_retries=Config.LLM_MAX_RETRIES,
+            async_max_concurrency=Config.LLM_ASYNC_MAX_CONCURRENCY
+        )
     
     def query(self, question: str, context: Optional[Dict] = None) -> Dict:
         """Process a climate-related query and return AI-generated response"""
+        with tracing.activate(tracing.current_trace() or Trace()) as trace, self.profiler.sample():
+            try:
+                # Store query in conversation history
+                query_id = str(uuid.uuid4())
+                timestamp = datetime.now().isoformat()
+                
+                # Analyze query intent
+                with trace.span("intent"):
+                    intent = self._analyze_intent(question)
+                
+                # Generate response based on intent, reusing cached answers
+                with trace.span("cache"):
+                    cache_key = self.response_cache.make_key(question, intent)
+                    response = self.response_cache.get(cache_key)
+                if response is None:
+                    with trace.span("generate"):
+                        response, _ = self.inflight.do(
+                            cache_key, lambda: self._generate_cached(cache_key, question, intent, context))
+                
+                # Store in the session's conversation history
+                with trace.span("history"):
+                    self._record_history(query_id, timestamp, question, intent, response, context)
+                
+                self._observe_query(trace, intent)
+                return self._format_result(query_id, timestamp, intent, response)
+                
+            except Exception as e:
+                return self._query_failed(trace, e)
+    
+    async def aquery(self, question: str, context: Optional[Dict] = None) -> Dict:
+        """query() for the ASGI server: awaits the LLM instead of holding a thread.
+
+        Only intent classification runs on the event loop. Steps that can
+        block run on the default thread pool: the cache and history lookups,
+        which are SQLite calls with STORAGE_BACKEND=sqlite and rescan the
+        dataset directory every few seconds; drafting and retrieval, which
+        wait for components still loading under lazy or warm startup and
+        rebuild the knowledge index when a dataset file changes. The
+        watsonx.ai call itself is awaited. Queries are not sampled by the
+        profiler, which cannot follow a coroutine across awaits.
+        """
+        with tracing.activate(tracing.current_trace() or Trace()) as trace:
+            try:
+                query_id = str(uuid.uuid4())
+                timestamp = datetime.now().isoformat()
+                
+                with trace.span("intent"):
+                    intent = self._analyze_intent(question)
+                
+                with trace.span("cache"):
+                    cache_key = self.response_cache.make_key(question, intent)
+                    response = await asyncio.to_thread(self.response_cache.get, cache_key)
+                if response is None:
+                    with trace.span("generate"):
+                        response, _ = await self.inflight.ado(
+                            cache_key, lambda: self._agenerate_cached(cache_key, question, intent, context))
+                
+                with trace.span("history"):
+                    await asyncio.to_thread(
+                        self._record_history, query_id, timestamp, question, intent, response, context)
+                
+                self._observe_query(trace, intent)
+                return self._format_result(query_id, timestamp, intent, response)
+                
+            except Exception as e:
+                return self._query_failed(trace, e)
+    
+    def _query_failed(self, trace: Trace, error: Exception) -> Dict:
+        """Log and count a failed query and build the apology returned in its place"""
+        stage = trace.failed_stage or "query"
+        logger.exception(f"Error processing query in stage {stage}: {str(error)}")
+        self.query_errors.inc(stage=stage)
+        self._observe_query(trace, "error")
+        return {
+            "id": str(uuid.uuid4()),
+            "answer": "I apologize, but I encountered an error processing your query. Please try again.",
+            "sources": [],
+            "confidence": 0,
+            "intent": "error",
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    def _observe_query(self, trace: Trace, intent: str):
+        """Record a query's total latency by intent and each stage's latency"""
+        self.query_latency.observe(trace.elapsed(), intent=intent)
+        for stage, seconds in trace.spans:
+            self.stage_latency.observe(seconds, stage=stage)
+    
+    def query_batch(self, questions: List[str], context: Optional[Dict] = None) -> List[Dict]:
+        """Process a list of queries, generating each distinct question once.
+
+        Questions are classified up front, duplicates (same normalized text and
+        intent) share one response, and cache misses are generated in parallel
+        on the batch worker pool. Results come back in input order, each as
+        ``{"status": "success", "data": ...}`` with the same data as query(),
+        or ``{"status": "error", "error": ...}``.
+        """
+        timestamp = datetime.now().isoformat()
+        results: List[Optional[Dict]] = [None] * len(questions)
+        keys = {}
+        pending = {}
+        
+        for i, question in enumerate(questions):
+            if not isinstance(question, str) or not question.strip():
+                results[i] = {"status": "error", "error": "Question is required"}
+                continue
+            question = question.strip()
+            intent = self._analyze_intent(question)
+            key = self.response_cache.make_key(question, intent)
+            keys[i] = (question, intent, key)
+            if key not in pending:
+                response = self.response_cache.get(key)
+                pending[key] = response if response is not None else self.batch_pool.submit(
+                    self.inflight.do, key, partial(self._generate_cached, key, question, intent, context))
+        
+        responses = {}
+        for key, outcome in pending.items():
+            if isinstance(outcome, dict):
+                responses[key] = outcome
+                continue
+            try:
+                responses[key], _ = outcome.result()
+            except Exception as e:
+                logger.error(f"Error processing batch query: {str(e)}")
+        
+        for i, (question, intent, key) in keys.items():
+            response = responses.get(key)
+            if response is None:
+                results[i] = {"status": "error", "error": "Failed to process question"}
+                continue
+            query_id = str(uuid.uuid4())
+            self._record_history(query_id, timestamp, question, intent, response, context)
+            results[i] = {"status": "success", "data": self._format_result(query_id, timestamp, intent, response)}
+        
+        return results
+    
+    def stream_query(self, question: str, context: Optional[Dict] = None) -> Iterator[Tuple[str, Dict]]:
+        """Process a query and yield (event, data) pairs as the answer is produced.
+
+        Emits one ``meta`` event, a series of ``chunk`` events carrying answer
+        text, then a final ``done`` event with sources and confidence.
+        """
         try:
-            # Store query in conversation history
             query_id = str(uuid.uuid4())
             timestamp = datetime.now().isoformat()
-            
-            # Analyze query intent
             intent = self._analyze_intent(question)
+            yield "meta", {"id": query_id, "intent": intent, "timestamp": timestamp}
             
-            # Generate response based on intent
-            response = self._generate_response(question, intent, context)
+            cache_key = self.response_cache.make_key(question, intent)
+            response = self.response_cache.get(cache_key)
+            if response is None:
+                stream = self._stream_response(question, intent, context)
+                try:
+                    while True:
+                        yield "chunk", {"text": next(stream)}
+                except StopIteration as done:
+                    response = done.value
+                self.response_cache.put(cache_key, response)
+            else:
+                for text in chunk_text(response["answer"]):
+                    yield "chunk", {"text": text}
             
-            # Store in conversation history
-            self.conversation_history.append({
-                "id": query_id,
-                "timestamp": timestamp,
-                "question": question,
-                "intent": intent,
-                "response": response
-            })
-            
-            return {
-                "id": query_id,
-                "answer": response["answer"],
-                "sources": response["sources"],
-                "confidence": response["confidence"],
-                "intent": intent,
-                "timestamp": timestamp
-            }
+            self._record_history(query_id, timestamp, question, intent, response, context)
+            yield "done", {"sources": response["sources"], "confidence": response["confidence"]}
             
         except Exception as e:
-            logger.error(f"Error processing query: {str(e)}")
-            return {
-                "id": str(uuid.uuid4()),
-                "answer": "I apologize, but I encountered an error processing your query. Please try again.",
-                "sources": [],
-                "confidence": 0,
-                "intent": "error",
-                "timestamp": datetime.now().isoformat()
+            logger.error(f"Error streaming query: {str(e)}")
+            yield "error", {
+                "message": "I apologize, but I encountered an error processing your query. Please try again."
             }
     
+    @staticmethod
+    def _format_result(query_id: str, timestamp: str, intent: str, response: Dict) -> Dict:
+        """Shape a generated response as returned by the query API"""
+        return {
+            "id": query_id,
+            "answer": response["answer"],
+            "sources": response["sources"],
+            "confidence": response["confidence"],
+            "intent": intent,
+            "timestamp": timestamp
+        }
+    
+    def _record_history(self, query_id: str, timestamp: str, question: str, intent: str,
+                        response: Dict, context: Optional[Dict] = None):
+        """Append a processed query to its session's history"""
+        session_id = (context or {}).get("session_id", DEFAULT_SESSION)
+        self.history.append(session_id, HistoryEntry(query_id, timestamp, question, intent, response))
+    
     def _analyze_intent(self, question: str) -> str:
         """Analyze the intent of the user's question"""
-        question_lower = question.lower()
-        
-        if any(word in question_lower for word in ["flood", "risk", "vulnerability", "disaster"]):
-            return "risk_assessment"
-        elif any(word in question_lower for word in ["policy", "recommend", "should", "strategy"]):
-            return "policy_recommendation"
-        elif any(word in question_lower for word in ["funding", "grant", "money", "finance"]):
-            return "funding_intelligence"
-        elif any(word in question_lower for word in ["data", "statistics", "numbers", "trend"]):
-            return "data_analysis"
-        else:
-            return "general_climate"
+        return intent_classifier.classify(question)
+    
+    def _generate_cached(self, cache_key: CacheKey, question: str, intent: str,
+                         context: Optional[Dict] = None) -> Dict:
+        """Generate a response and cache it before callers sharing this generation are released"""
+        response = self._generate_response(question, intent, context)
+        self.response_cache.put(cache_key, response)
+        return response
+    
+    async def _agenerate_cached(self, cache_key: CacheKey, question: str, intent: str,
+                                context: Optional[Dict] = None) -> Dict:
+        """_generate_cached() awaiting the LLM call"""
+        response = await self._agenerate_response(question, intent, context)
+        await asyncio.to_thread(self.response_cache.put, cache_key, response)
+        return response
     
     def _generate_response(self, question: str, intent: str, context: Optional[Dict] = None) -> Dict:
         """Generate AI response based on intent and available data"""
+        with tracing.span("draft"):
+            response = self._draft_response(question, intent)
+        if self.llm is None:
+            return response
+        
+        try:
+            with tracing.span("retrieve"):
+                passages = self._retrieve(question)
+            with tracing.span("llm"):
+                result = self.llm.generate(build_prompt(question, response["answer"], passages))
+        except LLMError as e:
+            logger.warning(f"LLM generation failed, using grounded answer: {str(e)}")
+            return response
+        
+        answer = result.text.strip()
+        return {**response, "answer": answer} if answer else response
+    
+    async def _agenerate_response(self, question: str, intent: str, context: Optional[Dict] = None) -> Dict:
+        """_generate_response() awaiting the LLM call, with drafting and retrieval on the thread pool"""
+        with tracing.span("draft"):
+            response = await asyncio.to_thread(self._draft_response, question, intent)
+        if self.llm is None:
+            return response
+        
+        try:
+            with tracing.span("retrieve"):
+                passages = await asyncio.to_thread(self._retrieve, question)
+            with tracing.span("llm"):
+                result = await self.llm.agenerate(build_prompt(question, response["answer"], passages))
+        except LLMError as e:
+            logger.warning(f"LLM generation failed, using grounded answer: {str(e)}")
+            return response
+        
+        answer = result.text.strip()
+        return {**response, "answer": answer} if answer else response
+    
+    def _retrieve(self, question: str) -> List[str]:
+        """Texts of the indexed records most similar to the question"""
+        store = self.retriever.store
+        if store is None or Config.RAG_TOP_K <= 0:
+            return []
+        return [hit["text"] for hit in store.query([question], Config.RAG_TOP_K, min_score=0.1)[0]]
+    
+    def _draft_response(self, question: str, intent: str) -> Dict:
+        """Build the grounded answer for an intent from the knowledge store.
+
+        Entities are resolved once, against one snapshot of the index, and
+        handed to the handler for the intent with the answers pre-rendered
+        for that snapshot. Risk questions about several places, and general
+        questions asking to compare or rank places, get a comparative risk
+        ranking.
+        """
+        knowledge = self.knowledge.index
+        entities = knowledge.resolve(question)
+        if entities.corrections:
+            logger.debug(f"Read question words as {entities.corrections}")
         
+        if intent in ("risk_assessment", "general_climate"):
+            comparison = comparison_request(question)
+            if self._is_comparative(intent, entities, comparison):
+                response = self._handle_risk_comparison(knowledge, entities, comparison or ComparisonRequest())
+                if response:
+                    return response
+        
+        book = self.answers.book(knowledge)
         if intent == "risk_assessment":
-            return self._handle_risk_assessment(question)
+            return self._handle_risk_assessment(book, entities)
         elif intent == "policy_recommendation":
-            return self._handle_policy_recommendation(question)
+            return self._handle_policy_recommendation(knowledge, book, entities)
         elif intent == "funding_intelligence":
-            return self._handle_funding_intelligence(question)
+            return self._handle_funding_intelligence(question, knowledge, book, entities)
         elif intent == "data_analysis":
-            return self._handle_data_analysis(question)
+            return self._handle_data_analysis(question, knowledge, entities)
         else:
             return self._handle_general_climate(question)
     
-    def _handle_risk_assessment(self, question: str) -> Dict:
+    def _stream_response(self, question: str, intent: str,
+                         context: Optional[Dict] = None) -> Generator[str, None, Dict]:
+        """Yield answer text chunks as they are generated and return the full response"""
+        if self.llm is None:
+            response = self._generate_response(question, intent, context)
+            yield from chunk_text(response["answer"])
+            return response
+        
+        response = self._draft_response(question, intent)
+        chunks = []
+        try:
+            prompt = build_prompt(question, response["answer"], self._retrieve(question))
+            for text in self.llm.generate_stream(prompt):
+                chunks.append(text)
+                yield text
+        except LLMError as e:
+            if chunks:
+                raise
+            logger.warning(f"LLM stream failed, using grounded answer: {str(e)}")
+        
+        if not "".join(chunks).strip():
+            yield from chunk_text(response["answer"])
+            return response
+        return {**response, "answer": "".join(chunks)}
+    
+    def _handle_risk_assessment(self, book: AnswerBook, entities: ResolvedEntities) -> Dict:
         """Handle risk assessment queries"""
-        # Extract location/region from question
-        if "bangladesh" in question.lower():
-            data = MOCK_CLIMATE_DATA["flood_risks"]["Bangladesh"]
-            answer = f"""Based on ND-GAIN vulnerability data and NOAA precipitation forecasts, 
-Bangladesh faces {data['risk_level']} flood risk (confidence: {data['confidence']}%) due to:
-
-{chr(10).join(f"• {factor}" for factor in data['factors'])}
-
-This assessment is based on current climate models and historical data patterns."""
-            
-            return {
-                "answer": answer,
-                "sources": data["sources"],
-                "confidence": data["confidence"]
-            }
+        response = book.risk(entities.countries)
+        if response:
+            return response
         
         # Default risk assessment response
         return {
-            "answer": """Climate risk assessment requires specific location data. Please specify a country, 
-region, or city for detailed risk analysis. I can provide information on flood risks, drought 
-vulnerability, extreme weather patterns, and sea level rise impacts.""",
+            "answer": answers.RISK_DEFAULT.text,
             "sources": ["ND-GAIN Country Index", "NOAA Climate Data"],
             "confidence": 85
         }
     
-    def _handle_policy_recommendation(self, question: str) -> Dict:
+    @staticmethod
+    def _is_comparative(intent: str, entities: ResolvedEntities, comparison: Optional[ComparisonRequest]) -> bool:
+        """Whether a question asks for places to be ranked against each other"""
+        if len(entities.countries) >= 2:
+            return True
+        if entities.countries:
+            return False
+        if intent == "risk_assessment":
+            return bool(entities.regions or comparison)
+        return bool(entities.regions and comparison)
+    
+    def _handle_risk_comparison(self, knowledge: KnowledgeIndex, entities: ResolvedEntities,
+                                comparison: ComparisonRequest) -> Optional[Dict]:
+        """Rank the countries named, the members of the regions named or all countries by composite risk"""
+        comparing = len(entities.countries) >= 2
+        top_k = None if comparing else (comparison.top_k or Config.RANKING_TOP_K)
+        ranked = self.ranking.rank(knowledge, regions=entities.regions,
+                                   countries=entities.countries if comparing else (),
+                                   top_k=top_k, ascending=comparison.ascending)
+        if not ranked:
+            return None
+        
+        if comparing:
+            scope = "the countries compared"
+        elif entities.regions:
+            scope = " and ".join(REGIONS[region_id]["name"] for region_id in entities.regions)
+        else:
+            scope = "all countries with ND-GAIN scores"
+        order = "lowest risk first" if comparison.ascending else "highest risk first"
+        rows = []
+        sources = ["ND-GAIN Country Index"]
+        for rank, row in enumerate(ranked, 1):
+            # A country scored without one of its ND-GAIN indicators shows it as n/a
+            rows.append(answers.RANKING_ROW.render(
+                rank=rank, country=knowledge.countries[row["iso3"]]["name"], score=row["score"],
+                vulnerability="n/a" if row["vulnerability"] is None else f"{row['vulnerability']:.2f}",
+                readiness="n/a" if row["readiness"] is None else f"{row['readiness']:.2f}",
+                flood=f", {row['flood_risk']} flood risk" if row["flood_risk"] else ""))
+            for source in knowledge.flood_risks.get(row["iso3"], {}).get("sources", []):
+                if source not in sources:
+                    sources.append(source)
+        
+        ranked_codes = {row["iso3"] for row in ranked}
+        missing = [knowledge.countries[iso3]["name"] for iso3 in entities.countries if iso3 not in ranked_codes]
+        
+        return {
+            "answer": answers.RANKING.render(
+                scope=scope, order=order, rows="\n".join(rows), methodology=self.ranking.methodology(),
+                missing=answers.RANKING_MISSING.render(countries=", ".join(missing)) if comparing and missing else ""),
+            "sources": sources,
+            "confidence": 85
+        }
+    
+    def _handle_policy_recommendation(self, knowledge: KnowledgeIndex, book: AnswerBook,
+                                      entities: ResolvedEntities) -> Dict:
         """Handle policy recommendation queries"""
-        if "small island" in question.lower() or "island nation" in question.lower():
-            data = MOCK_CLIMATE_DATA["policy_recommendations"]["small_island_nations"]
-            
-            policies_text = "\n".join([
-                f"{i+1}. {policy['policy']} ({policy['funding']})"
-                for i, policy in enumerate(data["priorities"])
-            ])
-            
-            funding_text = "\n".join([
-                f"• {fund['name']}: {fund['amount']} (deadline: {fund['deadline']})"
-                for fund in data["funding_opportunities"]
-            ])
-            
-            answer = f"""For small island developing states, priority policies include:
-
-{policies_text}
-
-Funding Opportunities:
-{funding_text}
-
-These recommendations are based on IPCC guidelines and successful adaptation strategies from similar regions."""
-            
-            return {
-                "answer": answer,
-                "sources": data["sources"],
-                "confidence": 92
-            }
+        data = knowledge.policy_for(entities)
+        if data:
+            return book.policy(data["region"], funding.current_date())
         
         return {
-            "answer": """Policy recommendations depend on specific regional context, governance structure, 
-and climate vulnerabilities. Please specify a region, country, or sector for targeted policy guidance. 
-I can provide recommendations for adaptation, mitigation, financing, and implementation strategies.""",
+            "answer": answers.POLICY_DEFAULT.text,
             "sources": ["IPCC Policy Guidelines", "UN Climate Policy Database"],
             "confidence": 80
         }
     
-    def _handle_funding_intelligence(self, question: str) -> Dict:
-        """Handle funding and grant opportunity queries"""
-        if "africa" in question.lower() and "ngo" in question.lower():
-            opportunities = MOCK_CLIMATE_DATA["funding_opportunities"]["africa_ngos"]
-            
-            funding_text = "\n".join([
-                f"• {opp['name']}: {opp['amount']} (deadline: {opp['deadline']})\n  Focus: {opp.get('focus', opp.get('eligibility', 'General climate action'))}"
-                for opp in opportunities
-            ])
-            
-            answer = f"""Current climate funding opportunities for African NGOs:
+    def _handle_funding_intelligence(self, question: str, knowledge: KnowledgeIndex, book: AnswerBook,
+                                     entities: ResolvedEntities) -> Dict:
+        """Handle funding and grant opportunity queries.
 
-{funding_text}
-
-Application tips:
-• Demonstrate clear community impact and local partnerships
-• Include measurable climate adaptation or mitigation outcomes
-• Provide detailed budget breakdown and sustainability plan"""
-            
+        Only opportunities still open today are listed, soonest deadline
+        first, within any amount range and deadline window in the question
+        ("over $10M closing in the next 90 days").
+        """
+        today = funding.current_date()
+        limits = funding.funding_request(question, today)
+        regions = knowledge.regions_for(entities)
+        positions = knowledge.funding_positions(regions, entities.organization_types, min_amount=limits.min_amount,
+                                                max_amount=limits.max_amount, closes_by=limits.closes_by, today=today)
+        
+        organizations = (ORGANIZATION_TYPES[entities.organization_types[0]]["label"]
+                         if entities.organization_types else "organizations")
+        if entities.countries:
+            audience = f"{organizations} in {knowledge.countries[entities.countries[0]]['name']}"
+        elif entities.regions:
+            audience = f"{REGIONS[entities.regions[0]]['adjective']} {organizations}"
+        else:
+            audience = organizations
+        
+        if positions:
             return {
-                "answer": answer,
+                "answer": book.funding(audience, positions, limits.describe()),
                 "sources": ["Climate Finance Database", "Adaptation Fund Project Database"],
                 "confidence": 88
             }
         
+        if limits:
+            return {
+                "answer": answers.FUNDING_NONE.render(
+                    audience=audience, criteria=answers.FUNDING_CRITERIA.render(criteria=limits.describe())),
+                "sources": ["Climate Finance Database", "Adaptation Fund Project Database"],
+                "confidence": 80
+            }
+        
         return {
-            "answer": """Climate funding opportunities vary by region, organization type, and project focus. 
-Please specify your location, organization type (NGO, government, private sector), and project area 
-for targeted funding recommendations. I can help identify grants, loans, and investment opportunities.""",
+            "answer": answers.FUNDING_DEFAULT.text,
             "sources": ["Global Climate Finance Database", "Green Climate Fund"],
             "confidence": 85
         }
     
-    def _handle_data_analysis(self, question: str) -> Dict:
+    def _handle_data_analysis(self, question: str, knowledge: KnowledgeIndex,
+                              entities: ResolvedEntities) -> Dict:
         """Handle data analysis and statistics queries"""
+        analysis = self.analytics.answer(question, knowledge, entities)
+        if analysis:
+            return analysis
+        
         return {
-            "answer": """I can provide analysis of climate data including temperature trends, precipitation 
-patterns, emissions data, and vulnerability indices. Please specify:
-• Geographic region of interest
-• Type of climate data (temperature, precipitation, emissions, etc.)
-• Time period for analysis
-• Specific metrics or indicators needed""",
+            "answer": answers.DATA_ANALYSIS_DEFAULT.text,
             "sources": ["NOAA Climate Data", "Climate TRACE", "OpenAQ"],
             "confidence": 90
         }
@@ -306,28 +763,65 @@ patterns, emissions data, and vulnerability indices. Please specify:
     def _handle_general_climate(self, question: str) -> Dict:
         """Handle general climate queries"""
         return {
-            "answer": """I'm ClimateGuardian, your AI assistant for climate risk analysis and policy recommendations. 
-I can help with:
-
-• Climate risk assessments for specific regions
-• Evidence-based policy recommendations
-• Climate funding and grant opportunities
-• Data analysis and trend interpretation
-• Adaptation and mitigation strategies
-
-Please ask me about specific climate challenges, locations, or policy areas for detailed assistance.""",
+            "answer": answers.GENERAL.text,
             "sources": ["IPCC Reports", "UN Climate Database"],
             "confidence": 95
         }
 
 # Initialize ClimateGuardian instance
-guardian = ClimateGuardian()
+startup_report = StartupReport()
+startup_report.mark("imported")
+with startup_report.phase("guardian_init"):
+    guardian = ClimateGuardian(startup=startup_report)
+startup_report.mark("guardian_ready")
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Count every request and time it by route (path parameters collapsed)"""
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    guardian.http_requests.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+    if guardian.startup.mark("first_request"):
+        logger.info(f"First request served {guardian.startup.milestones['first_request']:.3f}s after process start "
+                    f"({guardian.startup_mode} startup)")
+    started = g.get('request_started')
+    if started is not None:
+        guardian.http_latency.observe(time.perf_counter() - started, endpoint=endpoint)
+    return response
 
 @app.route('/')
 def index():
     """Main application page"""
     return render_template('index.html')
 
+def get_session_context() -> Dict:
+    """Get the user context from the session, creating ids on first use"""
+    context = {
+        "user_id": session.get('user_id', str(uuid.uuid4())),
+        "session_id": session.get('session_id', str(uuid.uuid4()))
+    }
+    
+    # Store user context in session
+    session['user_id'] = context['user_id']
+    session['session_id'] = context['session_id']
+    return context
+
+def query_result(trace: Trace, response: Dict) -> Response:
+    """Serialize a query result, adding Server-Timing when the client asked for it"""
+    with trace.span("serialize"):
+        result = jsonify({
+            "status": "success",
+            "data": response
+        })
+    guardian.stage_latency.observe(trace.spans[-1][1], stage="serialize")
+    
+    if request.headers.get('X-Debug-Timing'):
+        result.headers['Server-Timing'] = trace.server_timing()
+    return result
+
 @app.route('/api/query', methods=['POST'])
 def api_query():
     """API endpoint for processing climate queries"""
@@ -342,25 +836,106 @@ def api_query():
             }), 400
         
         # Get user context from session
-        context = {
-            "user_id": session.get('user_id', str(uuid.uuid4())),
-            "session_id": session.get('session_id', str(uuid.uuid4()))
-        }
+        context = get_session_context()
         
-        # Store user context in session
-        session['user_id'] = context['user_id']
-        session['session_id'] = context['session_id']
+        # Process query, timing each stage and the serialization of the result
+        with tracing.activate(Trace()) as trace:
+            response = guardian.query(question, context)
+            return query_result(trace, response)
         
-        # Process query
-        response = guardian.query(question, context)
+    except Exception as e:
+        logger.exception(f"API query error: {str(e)}")
+        return jsonify({
+            "error": "Internal server error",
+            "status": "error"
+        }), 500
+
+async def api_query_async():
+    """api_query() for the ASGI server (asgi.py), which dispatches POST /api/query here"""
+    try:
+        data = request.get_json()
+        question = data.get('question', '').strip()
+        
+        if not question:
+            return jsonify({
+                "error": "Question is required",
+                "status": "error"
+            }), 400
+        
+        context = get_session_context()
+        
+        with tracing.activate(Trace()) as trace:
+            response = await guardian.aquery(question, context)
+            return query_result(trace, response)
+        
+    except Exception as e:
+        logger.exception(f"API query error: {str(e)}")
+        return jsonify({
+            "error": "Internal server error",
+            "status": "error"
+        }), 500
+
+@app.route('/api/query/batch', methods=['POST'])
+def api_query_batch():
+    """API endpoint for processing a list of climate queries in one request"""
+    try:
+        data = request.get_json()
+        questions = data.get('questions')
+        
+        if not isinstance(questions, list) or not questions:
+            return jsonify({
+                "error": "A non-empty list of questions is required",
+                "status": "error"
+            }), 400
+        
+        if len(questions) > Config.BATCH_MAX_QUESTIONS:
+            return jsonify({
+                "error": f"At most {Config.BATCH_MAX_QUESTIONS} questions per batch",
+                "status": "error"
+            }), 400
+        
+        context = get_session_context()
+        results = guardian.query_batch(questions, context)
         
         return jsonify({
             "status": "success",
-            "data": response
+            "data": results
         })
         
     except Exception as e:
-        logger.error(f"API query error: {str(e)}")
+        logger.error(f"API batch query error: {str(e)}")
+        return jsonify({
+            "error": "Internal server error",
+            "status": "error"
+        }), 500
+
+@app.route('/api/query/stream', methods=['POST'])
+def api_query_stream():
+    """API endpoint streaming the answer to a climate query as Server-Sent Events"""
+    try:
+        data = request.get_json()
+        question = data.get('question', '').strip()
+        
+        if not question:
+            return jsonify({
+                "error": "Question is required",
+                "status": "error"
+            }), 400
+        
+        context = get_session_context()
+        events = guardian.stream_query(question, context)
+        
+        return Response(
+            stream_with_context(sse_event(event, payload) for event, payload in events),
+            mimetype='text/event-stream',
+            headers={
+                "Cache-Control": "no-cache",
+                "X-Accel-Buffering": "no"
+            }
+        )
+        
+    except Exception as e:
+        logger.error(f"API stream error: {str(e)}")
         return jsonify({
             "error": "Internal server error",
             "status": "error"
@@ -368,10 +943,11 @@ def api_query():
 
 @app.route('/api/history', methods=['GET'])
 def api_history():
-    """Get conversation history"""
+    """Get conversation history for the current session"""
     try:
-        # Return last 10 conversations
-        history = guardian.conversation_history[-10:]
+        # Return last 10 conversations of this session only
+        session_id = session.get('session_id')
+        history = guardian.history.recent(session_id, 10) if session_id else []
         return jsonify({
             "status": "success",
             "data": history
@@ -390,61 +966,51 @@ def health_check():
         "status": "healthy",
         "service": "ClimateGuardian",
         "version": "1.0.0",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now().isoformat(),
+        "startup": {"mode": guardian.startup_mode, **guardian.startup.as_dict()}
+    })
+
+@app.route('/api/health/live', methods=['GET'])
+def health_live():
+    """Liveness probe: the process is up and serving requests"""
+    return jsonify({
+        "status": "alive",
+        "service": "ClimateGuardian",
+        "uptime_seconds": round(time.monotonic() - guardian.started_at, 3)
     })
 
+@app.route('/api/health/ready', methods=['GET'])
+def health_ready():
+    """Readiness probe: datasets are loaded and the LLM backend is reachable"""
+    try:
+        report = guardian.readiness()
+        return jsonify({
+            "status": "ready" if report["ready"] else "not_ready",
+            "checks": report["checks"],
+            "timestamp": datetime.now().isoformat()
+        }), 200 if report["ready"] else 503
+    except Exception as e:
+        logger.error(f"Readiness check error: {str(e)}")
+        return jsonify({
+            "status": "not_ready",
+            "error": "Readiness check failed"
+        }), 503
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics for this worker"""
+    return Response(guardian.metrics.render(), content_type=METRICS_CONTENT_TYPE)
+
 @app.route('/api/datasets', methods=['GET'])
 def api_datasets():
     """Get information about available datasets"""
-    datasets = [
-        {
-            "name": "ND-GAIN",
-            "description": "Climate vulnerability and readiness index",
-            "license": "CC BY 4.0",
-            "update_frequency": "Annual",
-            "url": "https://gain.nd.edu/our-work/country-index/"
-        },
-        {
-            "name": "NOAA Climate Data",
-            "description": "Historical weather and climate records",
-            "license": "Public Domain",
-            "update_frequency": "Daily/Monthly",
-            "url": "https://www.ncei.noaa.gov/products"
-        },
-        {
-            "name": "OpenAQ",
-            "description": "Global air quality measurements",
-            "license": "CC BY 4.0",
-            "update_frequency": "Real-time",
-            "url": "https://openaq.org/"
-        },
-        {
-            "name": "Climate TRACE",
-            "description": "Greenhouse gas emissions data",
-            "license": "CC BY 4.0",
-            "update_frequency": "Annual",
-            "url": "https://climatetrace.org/"
-        },
-        {
-            "name": "Climate Watch",
-            "description": "Climate policy and NDC tracking",
-            "license": "CC BY 4.0",
-            "update_frequency": "Quarterly",
-            "url": "https://www.climatewatchdata.org/"
-        },
-        {
-            "name": "UN SDG 13 Indicators",
-            "description": "Climate action progress metrics",
-            "license": "CC BY 3.0",
-            "update_frequency": "Annual",
-            "url": "https://unstats.un.org/sdgs/indicators/database/"
-        }
-    ]
-    
-    return jsonify({
-        "status": "success",
-        "data": datasets
-    })
+    body, etag = guardian.datasets.snapshot()
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = Config.DATASETS_CACHE_MAX_AGE
+    # Turns the response into a 304 when If-None-Match carries the current ETag
+    return response.make_conditional(request)
 
 if __name__ == '__main__':
     port = Config.PORT
@@ -0,0 +1,267 @@
+"""
+ClimateGuardian ASGI entry point
+Serves the Flask application from an event loop so queries waiting on
+watsonx.ai do not each hold a worker thread:
+
+    gunicorn -k uvicorn.workers.UvicornWorker --bind 0.0.0.0:$PORT asgi:app
+
+POST /api/query runs natively async (ClimateGuardian.aquery awaits the LLM
+over httpx and hands its blocking steps to the default thread pool), so one
+process holds hundreds of queries in flight. Every
+other route runs unchanged on a small thread pool through a WSGI bridge,
+which also streams /api/query/stream. Past ASGI_MAX_IN_FLIGHT concurrent
+requests new ones are turned away with 503 and Retry-After instead of
+queueing without bound; health probes and /metrics are always served.
+"""
+
+import asyncio
+import io
+import json
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from flask import Flask
+
+import app as application
+from climateguardian.metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+Scope = Dict
+Receive = Callable[[], Awaitable[Dict]]
+Send = Callable[[Dict], Awaitable[None]]
+
+# Routes served even when the in-flight limit is reached
+UNLIMITED_PATHS = frozenset({"/api/health", "/api/health/live", "/api/health/ready", "/metrics"})
+
+# Async views, by (method, path), dispatched on the event loop instead of the thread pool
+ASYNC_ROUTES = {("POST", "/api/query"): application.api_query_async}
+
+
+class RequestTooLarge(Exception):
+    pass
+
+
+def wsgi_environ(scope: Scope, body: bytes) -> Dict:
+    """PEP 3333 environ for an ASGI HTTP scope and its fully read body"""
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]) if server[1] is not None else "80",
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False
+    }
+    for raw_name, raw_value in scope.get("headers", []):
+        name = raw_name.decode("latin-1").upper().replace("-", "_")
+        value = raw_value.decode("latin-1")
+        if name == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value
+            continue
+        if name == "CONTENT_LENGTH":
+            continue
+        key = f"HTTP_{name}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def _encode_headers(headers: List[Tuple[str, str]]) -> List[Tuple[bytes, bytes]]:
+    return [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+
+
+class AsgiApp:
+    """ASGI application around the Flask app and its shared ClimateGuardian"""
+
+    def __init__(self, flask_app: Flask, guardian, max_in_flight: int = 256, wsgi_threads: int = 16,
+                 max_body_bytes: int = 1024 * 1024, metrics: Optional[MetricsRegistry] = None):
+        self.flask_app = flask_app
+        self.guardian = guardian
+        self.max_in_flight = max_in_flight
+        self.max_body_bytes = max_body_bytes
+        self.in_flight = 0
+        self.executor = ThreadPoolExecutor(max_workers=wsgi_threads, thread_name_prefix="asgi-wsgi")
+        metrics = metrics if metrics is not None else MetricsRegistry()
+        metrics.callback("asgi_in_flight", "HTTP requests in flight on the ASGI server", lambda: self.in_flight)
+        self.rejected = metrics.counter(
+            "asgi_rejected_total", "Requests turned away because the in-flight limit was reached")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            raise RuntimeError(f"Unsupported ASGI scope type {scope['type']}")
+
+        limited = scope["path"] not in UNLIMITED_PATHS
+        if limited and self.in_flight >= self.max_in_flight:
+            self.rejected.inc()
+            await self._send_json(send, 503, {"error": "Server is busy, please retry", "status": "error"},
+                                  [("Retry-After", "1")])
+            return
+
+        if limited:
+            self.in_flight += 1
+        try:
+            try:
+                body = await self._read_body(receive)
+            except RequestTooLarge:
+                await self._send_json(send, 413, {"error": "Request body too large", "status": "error"})
+                return
+            environ = wsgi_environ(scope, body)
+            view = ASYNC_ROUTES.get((scope["method"], scope["path"]))
+            if view is not None:
+                await self._call_async_view(view, environ, send)
+            else:
+                await self._call_wsgi(environ, send)
+        finally:
+            if limited:
+                self.in_flight -= 1
+
+    async def _lifespan(self, receive: Receive, send: Send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self.guardian.llm is not None:
+                    await self.guardian.llm.aclose()
+                self.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _read_body(self, receive: Receive) -> bytes:
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body_bytes:
+                raise RequestTooLarge()
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    async def _call_async_view(self, view, environ: Dict, send: Send):
+        """Run an async view inside a Flask request context, with the app's hooks and session handling"""
+        flask_app = self.flask_app
+        with flask_app.request_context(environ):
+            # Mirrors Flask.full_dispatch_request() and wsgi_app() error handling
+            try:
+                try:
+                    rv = flask_app.preprocess_request()
+                    if rv is None:
+                        rv = await view()
+                except Exception as e:
+                    rv = flask_app.handle_user_exception(e)
+                response = flask_app.finalize_request(rv)
+            except Exception as e:
+                response = flask_app.handle_exception(e)
+            body = response.get_data()
+            await send({"type": "http.response.start", "status": response.status_code,
+                        "headers": _encode_headers(response.headers.to_wsgi_list())})
+            await send({"type": "http.response.body", "body": body})
+
+    async def _call_wsgi(self, environ: Dict, send: Send):
+        """Run the WSGI app on the thread pool, streaming its output back as it is produced"""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def put(item):
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+
+        def run():
+            response_start = None
+            started = False
+
+            def start_response(status, headers, exc_info=None):
+                nonlocal response_start
+                if exc_info and started:
+                    raise exc_info[1].with_traceback(exc_info[2])
+                response_start = (int(status.split(" ", 1)[0]), headers)
+                return write
+
+            def write(data):
+                nonlocal started
+                if not started:
+                    put(("start", response_start))
+                    started = True
+                if data:
+                    put(("body", data))
+
+            try:
+                output = self.flask_app.wsgi_app(environ, start_response)
+                try:
+                    for chunk in output:
+                        write(chunk)
+                    write(b"")
+                finally:
+                    if hasattr(output, "close"):
+                        output.close()
+            except BaseException as e:
+                put(("error", e))
+            else:
+                put(("end", None))
+
+        future = loop.run_in_executor(self.executor, run)
+        response_started = False
+        try:
+            while True:
+                kind, value = await queue.get()
+                if kind == "start":
+                    status, headers = value
+                    await send({"type": "http.response.start", "status": status,
+                                "headers": _encode_headers(headers)})
+                    response_started = True
+                elif kind == "body":
+                    await send({"type": "http.response.body", "body": value, "more_body": True})
+                elif kind == "error":
+                    logger.error(f"WSGI bridge error: {str(value)}")
+                    if not response_started:
+                        await self._send_json(send, 500, {"error": "Internal server error", "status": "error"})
+                    return
+                else:
+                    await send({"type": "http.response.body", "body": b""})
+                    return
+        finally:
+            await future
+
+    @staticmethod
+    async def _send_json(send: Send, status: int, payload: Dict, headers: List[Tuple[str, str]] = ()):
+        body = json.dumps(payload).encode("utf-8")
+        await send({"type": "http.response.start", "status": status,
+                    "headers": _encode_headers([("Content-Type", "application/json"),
+                                                ("Content-Length", str(len(body))), *headers])})
+        await send({"type": "http.response.body", "body": body})
+
+
+def create_app(flask_app: Flask = application.app, guardian=application.guardian) -> AsgiApp:
+    """ASGI app serving ``flask_app`` with limits from Config and metrics on the guardian's registry"""
+    return AsgiApp(
+        flask_app,
+        guardian,
+        max_in_flight=application.Config.ASGI_MAX_IN_FLIGHT,
+        wsgi_threads=application.Config.ASGI_WSGI_THREADS,
+        max_body_bytes=application.Config.ASGI_MAX_BODY_BYTES,
+        metrics=guardian.metrics
+    )
+
+
+app = create_app()
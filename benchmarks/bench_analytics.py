@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Time-series analytics benchmark
+Builds a synthetic daily NOAA-style table in the columnar store and times
+data analysis answers over it, against a pure-Python loop over a subset.
+
+Usage: python benchmarks/bench_analytics.py [--rows 10000000] [--repeats 5]
+"""
+
+import os
+import sys
+import shutil
+import argparse
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from climateguardian.analytics import ClimateAnalytics  # noqa: E402
+from climateguardian.columnar import ColumnarCatalog, ColumnarWriter  # noqa: E402
+from climateguardian.knowledge import KnowledgeIndex  # noqa: E402
+from climateguardian.sample_data import SAMPLE_DATA  # noqa: E402
+
+COUNTRIES = ["Kenya", "Chile", "India", "Brazil", "Canada", "Fiji", "Peru", "Ghana", "Nepal", "Spain",
+             "Egypt", "Japan", "Mexico", "Norway", "Chad", "Bangladesh", "Vietnam", "Turkey", "Italy", "Haiti"]
+
+QUESTIONS = [
+    "What is the temperature trend data for Kenya?",
+    "Show global temperature trend statistics",
+    "Precipitation trend data for India"
+]
+
+
+def build_table(root: str, rows: int, chunk: int, seed: int):
+    """Write a synthetic daily table: date, country, tavg, prcp"""
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("1950-01-01T00:00:00")
+    span = (np.datetime64("2024-12-31T00:00:00") - start).astype(np.int64)
+    writer = ColumnarWriter(os.path.join(root, "noaa_climate", "daily"))
+    codes = np.array(COUNTRIES)
+    for offset in range(0, rows, chunk):
+        size = min(chunk, rows - offset)
+        seconds = rng.integers(0, span, size)
+        years = seconds / (365.25 * 86400)
+        writer.write_chunk({
+            "date": start + seconds.astype("timedelta64[s]"),
+            "country": codes[rng.integers(0, len(codes), size)],
+            "tavg": 14 + 0.015 * years + 8 * np.sin(2 * np.pi * years) + rng.normal(0, 3, size),
+            "prcp": rng.gamma(0.6, 4.0, size)
+        })
+    writer.close()
+
+
+def python_loop_summary(dates, countries, values, country):
+    """Per-year means and trend for one country with plain Python loops"""
+    sums, counts = {}, {}
+    for date, name, value in zip(dates, countries, values):
+        if name != country:
+            continue
+        year = int(str(date)[:4])
+        sums[year] = sums.get(year, 0.0) + value
+        counts[year] = counts.get(year, 0) + 1
+    years = sorted(sums)
+    means = [sums[year] / counts[year] for year in years]
+    x_mean = sum(years) / len(years)
+    y_mean = sum(means) / len(means)
+    sxy = sum((x - x_mean) * (y - y_mean) for x, y in zip(years, means))
+    sxx = sum((x - x_mean) ** 2 for x in years)
+    return sxy / sxx
+
+
+def time_answers(analytics, knowledge, question: str, repeats: int):
+    """Wall time of each answer in milliseconds"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        response = analytics.answer(question, knowledge)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings, response
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--chunk", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--loop-rows", type=int, default=1_000_000,
+                        help="Rows processed by the pure-Python comparison (extrapolated)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="climateguardian-bench-")
+    try:
+        start = time.perf_counter()
+        build_table(root, args.rows, args.chunk, args.seed)
+        print(f"Rows:               {args.rows:,} (built in {time.perf_counter() - start:.1f}s)")
+
+        knowledge = KnowledgeIndex(SAMPLE_DATA)
+        analytics = ClimateAnalytics(ColumnarCatalog(root))
+        for question in QUESTIONS:
+            timings, response = time_answers(analytics, knowledge, question, args.repeats)
+            print(f"\n{question}")
+            print(f"  first answer:     {timings[0]:.1f} ms")
+            print(f"  median answer:    {statistics.median(timings[1:] or timings):.1f} ms")
+            print("  " + response["answer"].splitlines()[0])
+
+        table = ColumnarCatalog(root).table("noaa_climate", "daily")
+        loop_rows = min(args.loop_rows, args.rows)
+        dates = table.column("date")[:loop_rows].tolist()
+        countries = table.dictionary("country")[table.column("country")[:loop_rows]].tolist()
+        values = table.column("tavg")[:loop_rows].tolist()
+        start = time.perf_counter()
+        python_loop_summary(dates, countries, values, "Kenya")
+        loop_ms = (time.perf_counter() - start) * 1000
+        print(f"\nPython loop, {loop_rows:,} rows: {loop_ms:.1f} ms "
+              f"(~{loop_ms * args.rows / loop_rows:.0f} ms extrapolated to {args.rows:,}, "
+              f"excluding conversion of columns to Python objects)")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
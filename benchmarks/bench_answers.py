@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Answer assembly benchmark
+Times the risk, policy, funding and ranking handlers against the f-string
+assembly they replaced, and measures with tracemalloc the memory each query
+allocates: the peak above the baseline during one call, and the memory
+still held per answer when many answers are kept (pre-rendered answers are
+shared, so keeping them costs nothing). Both sides do the same lookups, so
+the funding case runs the same deadline and amount query on each side.
+
+Risk and policy answers are pre-rendered and several times faster. Funding
+answers are memoized per audience and listing, which saves their assembly
+but not the query. Ranking answers depend on the question, so templates
+save nothing there: a ranking costs one template call per row, within a few
+percent of the f-string and a few hundred bytes more at peak.
+
+Usage: python benchmarks/bench_answers.py [--repeats 20000] [--keep 1000]
+"""
+
+import os
+import sys
+import argparse
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("STARTUP_MODE", "lazy")
+
+from app import Config, guardian  # noqa: E402
+from climateguardian import funding  # noqa: E402
+from climateguardian.intent import ComparisonRequest  # noqa: E402
+from climateguardian.knowledge import ORGANIZATION_TYPES, REGIONS  # noqa: E402
+
+FUNDING_QUESTION = "Climate funding opportunities for NGOs in Africa"
+
+
+def legacy_risk(knowledge, entities):
+    """Risk answer assembled per request"""
+    for iso3 in entities.countries:
+        data = knowledge.flood_risks.get(iso3)
+        if data:
+            country = knowledge.countries[iso3]["name"]
+            answer = f"""Based on ND-GAIN vulnerability data and NOAA precipitation forecasts, 
+{country} faces {data['risk_level']} flood risk (confidence: {data['confidence']}%) due to:
+
+{chr(10).join(f"• {factor}" for factor in data['factors'])}
+
+This assessment is based on current climate models and historical data patterns."""
+            return {"answer": answer, "sources": data["sources"], "confidence": data["confidence"]}
+    for iso3 in entities.countries:
+        scores = knowledge.nd_gain.get(iso3)
+        if scores:
+            country = knowledge.countries[iso3]["name"]
+            answer = f"""According to the ND-GAIN Country Index, {country} has a climate vulnerability 
+score of {scores['vulnerability_score']:.2f} and a readiness score of {scores['readiness_score']:.2f} 
+(scale 0-1; higher vulnerability and lower readiness mean greater exposure to climate risk).
+
+A detailed hazard profile for {country} is not available yet."""
+            return {"answer": answer, "sources": ["ND-GAIN Country Index"], "confidence": 80}
+    return None
+
+
+def legacy_policy(knowledge, entities):
+    """Policy answer assembled per request"""
+    data = knowledge.policy_for(entities)
+    region = REGIONS[data["region"]]["name"]
+    policies_text = "\n".join([
+        f"{i+1}. {policy['policy']} ({policy['funding']})"
+        for i, policy in enumerate(data["priorities"])
+    ])
+    funding_text = "\n".join([
+        f"• {fund['name']}: {fund['amount']} (deadline: {fund['deadline']})"
+        for fund in data["funding_opportunities"]
+    ])
+    answer = f"""For {region}, priority policies include:
+
+{policies_text}
+
+Funding Opportunities:
+{funding_text}
+
+These recommendations are based on IPCC guidelines and successful adaptation strategies from similar regions."""
+    return {"answer": answer, "sources": data["sources"], "confidence": 92}
+
+
+def legacy_funding(question, knowledge, entities):
+    """Funding answer assembled per request, from the same deadline and amount query as the handler"""
+    today = funding.current_date()
+    limits = funding.funding_request(question, today)
+    opportunities = knowledge.funding_for(knowledge.regions_for(entities), entities.organization_types,
+                                          min_amount=limits.min_amount, max_amount=limits.max_amount,
+                                          closes_by=limits.closes_by, today=today)
+    organizations = (ORGANIZATION_TYPES[entities.organization_types[0]]["label"]
+                     if entities.organization_types else "organizations")
+    if entities.countries:
+        audience = f"{organizations} in {knowledge.countries[entities.countries[0]]['name']}"
+    elif entities.regions:
+        audience = f"{REGIONS[entities.regions[0]]['adjective']} {organizations}"
+    else:
+        audience = organizations
+    funding_text = "\n".join([
+        f"• {opp['name']}: {opp['amount']} (deadline: {opp['deadline']})\n"
+        f"  Focus: {opp.get('focus', opp.get('eligibility', 'General climate action'))}"
+        for opp in opportunities
+    ])
+    answer = f"""Current climate funding opportunities for {audience}:
+
+{funding_text}
+
+Application tips:
+• Demonstrate clear community impact and local partnerships
+• Include measurable climate adaptation or mitigation outcomes
+• Provide detailed budget breakdown and sustainability plan"""
+    return {"answer": answer, "sources": ["Climate Finance Database", "Adaptation Fund Project Database"],
+            "confidence": 88}
+
+
+def legacy_ranking(knowledge, entities, comparison):
+    """Ranking answer assembled per request, making the same choices as the handler"""
+    comparing = len(entities.countries) >= 2
+    top_k = None if comparing else (comparison.top_k or Config.RANKING_TOP_K)
+    ranked = guardian.ranking.rank(knowledge, regions=entities.regions,
+                                   countries=entities.countries if comparing else (),
+                                   top_k=top_k, ascending=comparison.ascending)
+    if comparing:
+        scope = "the countries compared"
+    elif entities.regions:
+        scope = " and ".join(REGIONS[region_id]["name"] for region_id in entities.regions)
+    else:
+        scope = "all countries with ND-GAIN scores"
+    order = "lowest risk first" if comparison.ascending else "highest risk first"
+    lines = []
+    sources = ["ND-GAIN Country Index"]
+    for rank, row in enumerate(ranked, 1):
+        vulnerability = "n/a" if row["vulnerability"] is None else f"{row['vulnerability']:.2f}"
+        readiness = "n/a" if row["readiness"] is None else f"{row['readiness']:.2f}"
+        flood = f", {row['flood_risk']} flood risk" if row["flood_risk"] else ""
+        lines.append(f"{rank}. {knowledge.countries[row['iso3']]['name']}: {row['score']:.2f} "
+                     f"(vulnerability {vulnerability}, readiness {readiness}{flood})")
+        for source in knowledge.flood_risks.get(row["iso3"], {}).get("sources", []):
+            if source not in sources:
+                sources.append(source)
+    ranked_codes = {row["iso3"] for row in ranked}
+    missing = [knowledge.countries[iso3]["name"] for iso3 in entities.countries if iso3 not in ranked_codes]
+    methodology = guardian.ranking.methodology()
+    missing_text = (f"\n\nNo ND-GAIN scores are available yet for {', '.join(missing)}."
+                    if comparing and missing else "")
+    answer = f"""Climate risk ranking for {scope}, {order}:
+
+{chr(10).join(lines)}
+
+Scores combine {methodology} on a 0-1 scale; higher means greater exposure to climate risk.{missing_text}"""
+    return {"answer": answer, "sources": sources, "confidence": 85}
+
+
+def time_us(fn, repeats: int) -> float:
+    """Wall time of ``fn()`` in microseconds: the fastest of batches of 100 calls, the least disturbed by noise"""
+    timings = []
+    for _ in range(max(1, repeats // 100)):
+        start = time.perf_counter()
+        for _ in range(100):
+            fn()
+        timings.append((time.perf_counter() - start) * 1e4)
+    return min(timings)
+
+
+def allocations(fn, keep: int):
+    """(peak bytes allocated during one call, bytes still held per answer when ``keep`` answers are kept)"""
+    fn()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        fn()
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+        baseline = tracemalloc.get_traced_memory()[0]
+        kept = [fn() for _ in range(keep)]
+        held = (tracemalloc.get_traced_memory()[0] - baseline) / len(kept)
+    finally:
+        tracemalloc.stop()
+    return peak, held
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=20000)
+    parser.add_argument("--keep", type=int, default=1000)
+    args = parser.parse_args()
+
+    knowledge = guardian.knowledge.index
+    book = guardian.answers.book(knowledge)
+
+    def entities(question):
+        return knowledge.resolve(question)
+
+    risk = entities("What are the flood risks for Bangladesh?")
+    scores = entities("What is the climate risk for the Maldives?")
+    policy = entities("Policy recommendations for Pacific island nations")
+    funding_entities = entities(FUNDING_QUESTION)
+    ranking = entities("rank South Asian countries by flood risk")
+    cases = [
+        ("risk (hazard)", lambda: guardian._handle_risk_assessment(book, risk),
+         lambda: legacy_risk(knowledge, risk)),
+        ("risk (scores)", lambda: guardian._handle_risk_assessment(book, scores),
+         lambda: legacy_risk(knowledge, scores)),
+        ("policy", lambda: guardian._handle_policy_recommendation(knowledge, book, policy),
+         lambda: legacy_policy(knowledge, policy)),
+        ("funding", lambda: guardian._handle_funding_intelligence(FUNDING_QUESTION, knowledge, book, funding_entities),
+         lambda: legacy_funding(FUNDING_QUESTION, knowledge, funding_entities)),
+        ("ranking", lambda: guardian._handle_risk_comparison(knowledge, ranking, ComparisonRequest()),
+         lambda: legacy_ranking(knowledge, ranking, ComparisonRequest())),
+    ]
+
+    print(f"{'answer':<16}{'µs/query':>20}{'peak bytes/query':>22}{'held bytes/answer':>22}")
+    print(f"{'':<16}{'template  f-string':>20}{'template  f-string':>22}{'template  f-string':>22}")
+    for label, templated, legacy in cases:
+        assert templated()["answer"] == legacy()["answer"], label
+        template_peak, template_held = allocations(templated, args.keep)
+        legacy_peak, legacy_held = allocations(legacy, args.keep)
+        print(f"{label:<16}"
+              f"{time_us(templated, args.repeats):>10.2f}{time_us(legacy, args.repeats):>10.2f}"
+              f"{template_peak:>12,}{legacy_peak:>10,}"
+              f"{template_held:>12,.0f}{legacy_held:>10,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
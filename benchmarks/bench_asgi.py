@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark: sync gunicorn workers against the ASGI server
+Starts the local watsonx.ai stub, in its own process so it does not compete
+with the client threads for the GIL, with a slow generation latency and, in
+turn, gunicorn with sync workers (app:app) and gunicorn with a uvicorn
+worker (asgi:app). Each server is driven with unique questions, so every
+query waits on the LLM, at increasing client concurrency; throughput,
+latency and 503 rejections are reported per level.
+
+Usage: python benchmarks/bench_asgi.py [--concurrency 8 32 128 256] [--llm-latency 0.5]
+                                       [--sync-workers 2] [--sync-threads 4] [--duration 10]
+"""
+
+import os
+import sys
+import argparse
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+import requests
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, REPO_ROOT)
+
+from loadtest import free_port, percentile, wait_ready  # noqa: E402
+
+
+def start_stub(port: int, latency: float) -> subprocess.Popen:
+    stub = subprocess.Popen([sys.executable, "-m", "climateguardian.stub_llm", "--port", str(port),
+                             "--latency", str(latency)], cwd=REPO_ROOT, stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return stub
+        except OSError:
+            time.sleep(0.1)
+    stub.kill()
+    raise RuntimeError("LLM stub did not start")
+
+
+def start_server(kind: str, args, port: int, stub_url: str, data_dir: str) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "WATSONX_API_KEY": "bench-key",
+        "WATSONX_PROJECT_ID": "bench-project",
+        "WATSONX_URL": stub_url,
+        "IBM_IAM_URL": f"{stub_url}/identity/token",
+        "DATA_DIR": data_dir,
+        "FLASK_DEBUG": "false",
+        "SECRET_KEY": "bench",
+        "ASGI_MAX_IN_FLIGHT": str(args.max_in_flight),
+        # The sync client's semaphore would otherwise cap generations per worker
+        "LLM_MAX_CONCURRENCY": str(args.sync_threads),
+        "LLM_ASYNC_MAX_CONCURRENCY": str(args.max_in_flight)
+    })
+    command = [sys.executable, "-m", "gunicorn", "--bind", f"127.0.0.1:{port}", "--log-level", "warning",
+               "--timeout", "120"]
+    if kind == "sync":
+        command += ["--workers", str(args.sync_workers), "--threads", str(args.sync_threads), "app:app"]
+    else:
+        command += ["--workers", str(args.asgi_workers), "-k", "uvicorn.workers.UvicornWorker", "asgi:app"]
+    return subprocess.Popen(command, cwd=REPO_ROOT, env=env)
+
+
+def drive(base_url: str, concurrency: int, duration: float, prefix: str) -> Dict:
+    """``concurrency`` clients posting unique questions back to back for ``duration`` seconds"""
+    latencies: List[float] = []
+    counts = {"ok": 0, "rejected": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(index: int):
+        session = requests.Session()
+        serial = 0
+        local, local_counts = [], {"ok": 0, "rejected": 0, "errors": 0}
+        while time.perf_counter() < deadline:
+            serial += 1
+            question = f"How is climate change affecting coastal towns? ({prefix}-{index}-{serial})"
+            start = time.perf_counter()
+            try:
+                response = session.post(f"{base_url}/api/query", json={"question": question}, timeout=120)
+                status = response.status_code
+            except requests.RequestException:
+                status = None
+            if status == 200:
+                local.append((time.perf_counter() - start) * 1000)
+                local_counts["ok"] += 1
+            elif status == 503:
+                local_counts["rejected"] += 1
+            else:
+                local_counts["errors"] += 1
+        with lock:
+            latencies.extend(local)
+            for key, value in local_counts.items():
+                counts[key] += value
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return {
+        "concurrency": concurrency,
+        "rps": round(counts["ok"] / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50), 1),
+        "p95_ms": round(percentile(latencies, 0.95), 1),
+        **counts
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 32, 128, 256])
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Stub generation latency in seconds")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per concurrency level")
+    parser.add_argument("--sync-workers", type=int, default=2, help="Sync gunicorn worker processes")
+    parser.add_argument("--sync-threads", type=int, default=4, help="Threads per sync worker")
+    parser.add_argument("--asgi-workers", type=int, default=1, help="Uvicorn worker processes")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="ASGI_MAX_IN_FLIGHT for the ASGI server")
+    parser.add_argument("--servers", nargs="+", choices=["sync", "asgi"], default=["sync", "asgi"])
+    args = parser.parse_args()
+
+    stub_port = free_port()
+    stub = start_stub(stub_port, args.llm_latency)
+    results: Dict[str, List[Dict]] = {}
+    try:
+        for kind in args.servers:
+            data_dir = tempfile.mkdtemp(prefix=f"climateguardian-bench-{kind}-")
+            port = free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            server = start_server(kind, args, port, f"http://127.0.0.1:{stub_port}", data_dir)
+            try:
+                wait_ready(base_url, server)
+                results[kind] = []
+                for concurrency in args.concurrency:
+                    results[kind].append(drive(base_url, concurrency, args.duration, f"{kind}{concurrency}"))
+            finally:
+                server.terminate()
+                try:
+                    server.wait(timeout=30)
+                except subprocess.TimeoutExpired:
+                    server.kill()
+                shutil.rmtree(data_dir, ignore_errors=True)
+    finally:
+        stub.terminate()
+        stub.wait(timeout=30)
+
+    print(f"LLM latency {args.llm_latency}s, {args.duration}s per level; "
+          f"sync = {args.sync_workers} workers x {args.sync_threads} threads, "
+          f"asgi = {args.asgi_workers} uvicorn worker(s), max in flight {args.max_in_flight}")
+    print(f"\n{'server':<7}{'clients':>8}{'rps':>9}{'p50':>11}{'p95':>11}{'ok':>8}{'503':>7}{'errors':>8}")
+    for kind, levels in results.items():
+        for level in levels:
+            print(f"{kind:<7}{level['concurrency']:>8}{level['rps']:>9}{level['p50_ms']:>9.1f}ms"
+                  f"{level['p95_ms']:>9.1f}ms{level['ok']:>8}{level['rejected']:>7}{level['errors']:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Funding opportunity query benchmark
+Builds synthetic funding opportunities with text amounts and deadlines,
+some closed and some rolling, and times FundingIndex range queries (open
+opportunities for a region and organization type, an amount range, a
+deadline window, and all three) against filtering every opportunity in a
+loop, both parsing its amount and deadline text per query and reading
+them pre-parsed.
+
+Usage: python benchmarks/bench_funding.py [--opportunities 20000] [--repeats 200]
+"""
+
+import os
+import sys
+import argparse
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from functools import partial
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from climateguardian.funding import FundingIndex, parse_amount, parse_deadline  # noqa: E402
+from climateguardian.knowledge import ORGANIZATION_TYPES, REGIONS  # noqa: E402
+
+TODAY = date(2026, 10, 17)
+
+
+def synthetic_opportunities(count: int, seed: int):
+    """Opportunities with deadlines from a year ago to two years ahead, a quarter of them rolling"""
+    rng = random.Random(seed)
+    opportunities = []
+    for i in range(count):
+        deadline = TODAY + timedelta(days=rng.randint(-365, 730))
+        if rng.random() < 0.3:
+            amount = rng.choice(["$", "USD ", "US$ "]) + f"{rng.choice([250, 500, 750])}K"
+        else:
+            amount = f"${rng.randint(1, 200)}M"
+        opportunities.append({
+            "name": f"Opportunity {i}",
+            "amount": amount,
+            "deadline": rng.choice([f"{deadline.day} {deadline:%B %Y}", f"{deadline:%B %Y}", deadline.isoformat(),
+                                    "Rolling"]),
+            "regions": rng.sample(list(REGIONS), rng.randint(1, 3)),
+            "organization_types": rng.sample(list(ORGANIZATION_TYPES), rng.randint(1, 2)),
+        })
+    return opportunities
+
+
+def linear_filter(opportunities, amounts, deadlines, regions, organization_types, min_amount, max_amount, closes_by):
+    """Check every opportunity against every limit, soonest deadline first"""
+    matches = []
+    for position, opportunity in enumerate(opportunities):
+        deadline = deadlines[position] if deadlines else parse_deadline(opportunity["deadline"])
+        if deadline is not None and deadline < TODAY:
+            continue
+        if closes_by is not None and (deadline is None or deadline > closes_by):
+            continue
+        if min_amount is not None or max_amount is not None:
+            amount = amounts[position] if amounts else parse_amount(opportunity["amount"])
+            if (amount is None or min_amount is not None and amount < min_amount
+                    or max_amount is not None and amount > max_amount):
+                continue
+        if regions and not set(regions) & set(opportunity["regions"]):
+            continue
+        if organization_types and not set(organization_types) & set(opportunity["organization_types"]):
+            continue
+        matches.append((deadline is None, deadline, position))
+    return [position for _, _, position in sorted(matches)]
+
+
+def time_us(fn, repeats: int) -> float:
+    """Median wall time of ``fn()`` in microseconds"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--opportunities", type=int, default=20000)
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    opportunities = synthetic_opportunities(args.opportunities, args.seed)
+    start = time.perf_counter()
+    index = FundingIndex(opportunities)
+    print(f"Opportunities:      {len(index):,} (index built in {(time.perf_counter() - start) * 1000:.1f} ms)")
+
+    cases = [
+        ("region + org type", dict(regions=["pacific"], organization_types=["government"])),
+        ("amount range", dict(min_amount=10e6, max_amount=20e6)),
+        ("next 90 days", dict(closes_by=TODAY + timedelta(days=90))),
+        ("all three", dict(regions=["pacific"], organization_types=["government"], min_amount=10e6,
+                           closes_by=TODAY + timedelta(days=90))),
+    ]
+    print(f"\n{'query':<20}{'matches':>8}{'index µs':>12}{'pre-parsed µs':>15}{'parse per query µs':>20}")
+    for label, limits in cases:
+        full = {"regions": [], "organization_types": [], "min_amount": None, "max_amount": None, "closes_by": None,
+                **limits}
+        indexed = partial(index.query, today=TODAY, **full)
+        parsed = partial(linear_filter, opportunities, index.amounts, index.deadlines, **full)
+        text = partial(linear_filter, opportunities, None, None, **full)
+        result = indexed()
+        assert result == parsed() == text(), label
+        print(f"{label:<20}{len(result):>8,}{time_us(indexed, args.repeats):>12.1f}"
+              f"{time_us(parsed, args.repeats):>15.1f}{time_us(text, max(1, args.repeats // 20)):>20.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
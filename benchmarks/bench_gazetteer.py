@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Entity resolution benchmark
+Builds a corpus of questions naming countries in English, in Spanish,
+French, Portuguese and German, by demonym, by ISO code, with a random typo,
+or not at all, and times KnowledgeIndex.resolve over it with typo correction
+on and off, reporting throughput and the share of each kind resolved.
+
+Usage: python benchmarks/bench_gazetteer.py [--questions 100000] [--seed 7]
+"""
+
+import os
+import sys
+import argparse
+import random
+import string
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from climateguardian.countries import COUNTRIES, COUNTRY_DEMONYMS, COUNTRY_TRANSLATIONS  # noqa: E402
+from climateguardian.knowledge import AMBIGUOUS_ALPHA2, KnowledgeIndex  # noqa: E402
+from climateguardian.sample_data import SAMPLE_DATA  # noqa: E402
+
+TEMPLATES = [
+    "What are the flood risks for {place}?",
+    "Climate adaptation policies in {place}",
+    "Drought funding for NGOs in {place} next year",
+    "How is {place} preparing for sea level rise?",
+]
+DEMONYM_TEMPLATES = [
+    "How are {place} farmers coping with drought?",
+    "Funding for {place} NGOs working on flooding",
+]
+NO_PLACE = [
+    "How do I begin planning for extreme heat?",
+    "What is the global temperature trend?",
+    "Which grants support community resilience projects?",
+    "Explain the difference between adaptation and mitigation",
+]
+
+
+def misspell(name: str, rng: random.Random) -> str:
+    """``name`` with one random substitution, insertion, deletion or swap after the first letter of its longest word"""
+    words = name.split()
+    index = max(range(len(words)), key=lambda i: len(words[i]))
+    word = words[index]
+    position = rng.randrange(1, len(word) - 1)
+    letter = rng.choice(string.ascii_lowercase)
+    edit = rng.randrange(4)
+    if edit == 0:
+        word = word[:position] + letter + word[position + 1:]
+    elif edit == 1:
+        word = word[:position] + letter + word[position:]
+    elif edit == 2:
+        word = word[:position] + word[position + 1:]
+    else:
+        word = word[:position] + word[position + 1] + word[position] + word[position + 2:]
+    words[index] = word
+    return " ".join(words)
+
+
+def build_corpus(size: int, seed: int):
+    """(category, question, expected ISO alpha-3 or None) tuples"""
+    rng = random.Random(seed)
+    # Typos in short names are only corrected when capitalized mid-sentence, as here
+    typo_names = [(name, iso3) for name, _, iso3, _, _ in COUNTRIES if max(map(len, name.split())) >= 5]
+    translations = [(name, iso3) for iso3, names in COUNTRY_TRANSLATIONS.items() for name in names]
+    demonyms = [(name, iso3) for iso3, names in COUNTRY_DEMONYMS.items() for name in names]
+    codes = [(iso3, iso3) for _, _, iso3, _, _ in COUNTRIES]
+    codes += [(iso2, iso3) for _, iso2, iso3, _, _ in COUNTRIES if iso2 not in AMBIGUOUS_ALPHA2]
+
+    corpus = []
+    for _ in range(size):
+        category = rng.choice(["english", "translated", "demonym", "misspelt", "code", "none"])
+        if category == "none":
+            corpus.append((category, rng.choice(NO_PLACE), None))
+            continue
+        if category == "english":
+            name, _, iso3, _, _ = rng.choice(COUNTRIES)
+        elif category == "translated":
+            name, iso3 = rng.choice(translations)
+        elif category == "demonym":
+            name, iso3 = rng.choice(demonyms)
+            corpus.append((category, rng.choice(DEMONYM_TEMPLATES).format(place=name), iso3))
+            continue
+        elif category == "misspelt":
+            name, iso3 = rng.choice(typo_names)
+            name = misspell(name, rng)
+        else:
+            name, iso3 = rng.choice(codes)
+        corpus.append((category, rng.choice(TEMPLATES).format(place=name), iso3))
+    return corpus
+
+
+def run(index: KnowledgeIndex, corpus):
+    """Seconds to resolve the corpus and per-category (resolved, total) counts"""
+    resolved, totals = Counter(), Counter()
+    start = time.perf_counter()
+    results = [index.resolve(question).countries for _, question, _ in corpus]
+    elapsed = time.perf_counter() - start
+    for (category, _, expected), countries in zip(corpus, results):
+        totals[category] += 1
+        if (expected in countries) if expected else not countries:
+            resolved[category] += 1
+    return elapsed, resolved, totals
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--questions", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.questions, args.seed)
+    print(f"Questions:          {len(corpus):,}")
+    for label, fuzzy in (("exact only", False), ("with typo correction", True)):
+        start = time.perf_counter()
+        index = KnowledgeIndex(SAMPLE_DATA, fuzzy=fuzzy)
+        build_ms = (time.perf_counter() - start) * 1000
+        elapsed, resolved, totals = run(index, corpus)
+        print(f"\n{label} (index built in {build_ms:.1f} ms)")
+        print(f"  throughput:       {len(corpus) / elapsed:,.0f} questions/s "
+              f"({elapsed / len(corpus) * 1e6:.1f} µs/question)")
+        for category in sorted(totals):
+            share = resolved[category] / totals[category]
+            print(f"  {category:<18}{share:>7.1%} of {totals[category]:,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
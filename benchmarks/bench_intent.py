@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Intent classifier micro-benchmark
+Compares the legacy chained any() scans with IntentClassifier, which runs
+the same substring checks in plain loops, on a synthetic question corpus.
+
+Usage: python benchmarks/bench_intent.py [--questions 200000] [--seed 7]
+"""
+
+import os
+import sys
+import random
+import argparse
+import time
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from climateguardian.intent import INTENT_KEYWORDS, intent_classifier  # noqa: E402
+
+FILLER_WORDS = [
+    "climate", "adaptation", "coastal", "communities", "temperature", "rainfall", "emissions",
+    "heat", "drought", "sea", "level", "rise", "resilience", "agriculture", "water", "cities",
+    "region", "country", "next", "decade", "impact", "local", "government", "what", "are",
+    "the", "for", "how", "is", "changing", "in", "about", "Bangladesh", "Kenya", "Fiji", "Peru"
+]
+
+
+def legacy_analyze_intent(question: str) -> str:
+    """Original chained any() classifier, kept for comparison"""
+    question_lower = question.lower()
+
+    if any(word in question_lower for word in ["flood", "risk", "vulnerability", "disaster"]):
+        return "risk_assessment"
+    elif any(word in question_lower for word in ["policy", "recommend", "should", "strategy"]):
+        return "policy_recommendation"
+    elif any(word in question_lower for word in ["funding", "grant", "money", "finance"]):
+        return "funding_intelligence"
+    elif any(word in question_lower for word in ["data", "statistics", "numbers", "trend"]):
+        return "data_analysis"
+    else:
+        return "general_climate"
+
+
+def build_corpus(size: int, seed: int) -> List[str]:
+    """Build synthetic questions; roughly a third carry no intent keyword"""
+    rng = random.Random(seed)
+    keywords = [word for words in INTENT_KEYWORDS.values() for word in words]
+    corpus = []
+    for _ in range(size):
+        words = rng.choices(FILLER_WORDS, k=rng.randint(6, 24))
+        for _ in range(rng.choice([0, 0, 1, 1, 2, 3])):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords) + rng.choice(["", "s", "ing"]))
+        corpus.append(" ".join(words).capitalize() + "?")
+    return corpus
+
+
+def time_classifier(classify, corpus: List[str], repeats: int) -> float:
+    """Return the best wall time over several passes through the corpus"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for question in corpus:
+            classify(question)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--questions", type=int, default=200000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.questions, args.seed)
+
+    mismatches = sum(
+        1 for question in corpus
+        if legacy_analyze_intent(question) != intent_classifier.classify(question)
+    )
+
+    legacy = time_classifier(legacy_analyze_intent, corpus, args.repeats)
+    classifier = time_classifier(intent_classifier.classify, corpus, args.repeats)
+
+    print(f"Questions:          {len(corpus)}")
+    print(f"Mismatched intents: {mismatches}")
+    print(f"Legacy any() scans: {legacy:.3f}s ({legacy / len(corpus) * 1e6:.2f} µs/query)")
+    print(f"IntentClassifier:   {classifier:.3f}s ({classifier / len(corpus) * 1e6:.2f} µs/query)")
+    print(f"Speedup:            {legacy / classifier:.2f}x")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
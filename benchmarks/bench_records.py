@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+History entry and dataset row memory benchmark
+Fills a ConversationHistoryStore with entries as dicts holding a copy of
+their response (as a deserialized cache hit would), as dicts sharing the
+cached response, and as HistoryEntry records, then loads a synthetic
+dataset file with and without interning its strings, and reports the
+bytes each entry or row holds, measured with tracemalloc.
+
+Usage: python benchmarks/bench_records.py [--entries 100000] [--rows 100000]
+"""
+
+import os
+import sys
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from climateguardian.countries import COUNTRIES  # noqa: E402
+from climateguardian.history import ConversationHistoryStore, HistoryEntry  # noqa: E402
+from climateguardian.knowledge import intern_strings  # noqa: E402
+
+ENTRIES_PER_SESSION = 50
+INTENTS = ["risk_assessment", "policy_recommendation", "funding_intelligence", "data_analysis", "general_climate"]
+SOURCES = ["ND-GAIN Country Index 2023", "NOAA Climate Projections", "IPCC AR6 Working Group II",
+           "World Bank Climate Data", "Climate Finance Database", "Adaptation Fund Project Database"]
+
+
+def cached_responses(count: int, rng: random.Random):
+    """Responses as the response cache holds them, one per distinct question"""
+    return [{"answer": f"Answer {i}: " + "Grounded climate risk analysis. " * rng.randint(10, 40),
+             "sources": rng.sample(SOURCES, 2), "confidence": rng.randint(70, 95)}
+            for i in range(count)]
+
+
+def measure(build) -> float:
+    """Bytes still allocated after ``build()``, which returns what it built"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        built = build()
+        gc.collect()
+        held = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    del built
+    return held
+
+
+def fill_history(entries: int, responses, make_entry, seed: int) -> ConversationHistoryStore:
+    rng = random.Random(seed)
+    sessions = max(1, entries // ENTRIES_PER_SESSION)
+    # Sessions hash unevenly over shards; leave room so none is evicted
+    store = ConversationHistoryStore(max_entries_per_session=ENTRIES_PER_SESSION, max_sessions=sessions * 4)
+    for i in range(entries):
+        name = COUNTRIES[rng.randrange(len(COUNTRIES))][0]
+        question = f"What are the flood risks for {name} in {2025 + i % 30}?"
+        store.append(f"session-{i % sessions}", make_entry(str(uuid.uuid4()), datetime.now().isoformat(), question,
+                                                           INTENTS[i % len(INTENTS)], rng.choice(responses)))
+    assert len(store) == entries
+    return store
+
+
+def dict_with_copy(query_id, timestamp, question, intent, response):
+    return {"id": query_id, "timestamp": timestamp, "question": question, "intent": intent,
+            "response": json.loads(json.dumps(response))}
+
+
+def dict_sharing(query_id, timestamp, question, intent, response):
+    return {"id": query_id, "timestamp": timestamp, "question": question, "intent": intent, "response": response}
+
+
+def dataset_text(rows: int, seed: int) -> str:
+    """A flood risk dataset file of ``rows`` rows"""
+    rng = random.Random(seed)
+    return json.dumps({"flood_risks": [
+        {"country": rng.choice(COUNTRIES)[0], "risk_level": rng.choice(["LOW", "MEDIUM", "HIGH", "VERY HIGH"]),
+         "confidence": rng.randint(60, 95), "factors": [f"Observed change {rng.random():.4f}"],
+         "sources": rng.sample(SOURCES, 2), "topics": rng.sample(["flood", "sea_level", "precipitation"], 2)}
+        for _ in range(rows)
+    ]})
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--responses", type=int, default=500, help="Distinct cached responses")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    responses = cached_responses(args.responses, random.Random(args.seed))
+    print(f"History entries:    {args.entries:,} ({args.responses} distinct cached responses)")
+    for label, make_entry in (("dict + response copy", dict_with_copy), ("dict + shared response", dict_sharing),
+                              ("HistoryEntry", HistoryEntry)):
+        held = measure(lambda: fill_history(args.entries, responses, make_entry, args.seed))
+        print(f"  {label:<24}{held / args.entries:>8,.0f} bytes/entry")
+
+    text = dataset_text(args.rows, args.seed)
+    print(f"\nDataset rows:       {args.rows:,}")
+    for label, load in (("json.load", json.loads), ("interned", lambda data: intern_strings(json.loads(data)))):
+        held = measure(lambda: load(text))
+        print(f"  {label:<24}{held / args.rows:>8,.0f} bytes/row")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Storage backend micro-benchmark
+Replays the history and response cache traffic of /api/query (cache lookup,
+cache store on a miss, history append), with an /api/history read every
+``--history-every`` queries, against the in-process stores and the shared
+SQLite stores, with batched writes and with a commit per query.
+
+Usage: python benchmarks/bench_storage.py [--queries 20000] [--sessions 500] [--threads 4]
+"""
+
+import os
+import sys
+import argparse
+import shutil
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from climateguardian.cache import ResponseCache  # noqa: E402
+from climateguardian.history import ConversationHistoryStore  # noqa: E402
+from climateguardian.storage import SQLiteBackend, SQLiteHistoryStore, SQLiteResponseCache  # noqa: E402
+
+RESPONSE = {
+    "answer": "Bangladesh faces high flood exposure; adaptation readiness is improving. " * 4,
+    "sources": ["ND-GAIN Country Index", "World Bank Climate Data"],
+    "confidence": 85,
+    "intent": "risk_assessment"
+}
+
+
+def run(history, cache, queries: int, sessions: int, threads: int, history_every: int, commit=None) -> float:
+    """Wall time for ``queries`` queries spread over ``threads`` threads"""
+    per_thread = queries // threads
+
+    def worker(offset: int):
+        for i in range(offset, offset + per_thread):
+            session_id = f"session-{i % sessions}"
+            key = cache.make_key(f"What are the flood risks in country {i % 2000}?", "risk_assessment")
+            if cache.get(key) is None:
+                cache.put(key, RESPONSE)
+            history.append(session_id, {"question": key[0], "response": RESPONSE})
+            if commit is not None:
+                commit()
+            if i % history_every == 0:
+                history.recent(session_id, 10)
+
+    workers = [threading.Thread(target=worker, args=(n * per_thread,)) for n in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--history-every", type=int, default=10)
+    parser.add_argument("--flush-interval", type=float, default=0.05)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="bench-storage-")
+    try:
+        results = {"memory": run(ConversationHistoryStore(), ResponseCache(),
+                                 args.queries, args.sessions, args.threads, args.history_every)}
+
+        for name, batched in (("sqlite batched", True), ("sqlite commit/query", False)):
+            backend = SQLiteBackend(os.path.join(directory, f"{name.split()[1].replace('/', '-')}.db"),
+                                    flush_interval=args.flush_interval)
+            history, cache = SQLiteHistoryStore(backend), SQLiteResponseCache(backend)
+            elapsed = run(history, cache, args.queries, args.sessions, args.threads, args.history_every,
+                          commit=None if batched else backend.flush)
+            backend.close()
+            results[name] = elapsed
+            print(f"{name}: {backend.writes} writes in {backend.flushes} transactions")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    queries = args.queries // args.threads * args.threads
+    print(f"Queries: {queries} over {args.threads} threads, {args.sessions} sessions")
+    for name, elapsed in results.items():
+        print(f"{name:<20} {elapsed:.3f}s ({elapsed / queries * 1e6:.1f} µs/query)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
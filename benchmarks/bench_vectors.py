@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Vector index benchmark
+Builds an on-disk store of synthetic clustered embeddings, trains the IVF
+index and compares its recall and per-query latency against brute force.
+
+Usage: python benchmarks/bench_vectors.py [--rows 100000] [--dim 256] [--queries 200]
+"""
+
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from climateguardian.vectorstore import VectorStore, evaluate  # noqa: E402
+
+
+def clustered(rows: int, centers: np.ndarray, noise: float, rng: np.random.Generator) -> np.ndarray:
+    """Points scattered around shared cluster centres, like topic-grouped documents"""
+    points = centers[rng.integers(0, len(centers), rows)]
+    points += rng.normal(scale=noise, size=points.shape).astype(np.float32)
+    return points
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--clusters", type=int, default=2000)
+    parser.add_argument("--noise", type=float, default=1.0,
+                        help="Spread of points around their centre, relative to the centre spread")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--n-probe", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    centers = rng.normal(size=(args.clusters, args.dim)).astype(np.float32)
+    root = tempfile.mkdtemp(prefix="climateguardian-vectors-")
+    try:
+        store = VectorStore(root, dim=args.dim)
+        start = time.perf_counter()
+        batch = 50_000
+        for offset in range(0, args.rows, batch):
+            size = min(batch, args.rows - offset)
+            store.add_vectors([str(i) for i in range(offset, offset + size)],
+                              clustered(size, centers, args.noise, rng))
+        print(f"Vectors:  {args.rows:,} x {args.dim} (added in {time.perf_counter() - start:.1f}s)")
+
+        start = time.perf_counter()
+        store.train()
+        store.save()
+        print(f"Training: {len(store.centroids)} lists in {time.perf_counter() - start:.1f}s")
+
+        queries = clustered(args.queries, centers, args.noise, rng)
+        reopened = VectorStore(root, readonly=True)
+        print(f"\n{'n_probe':>8} {'recall@' + str(args.k):>10} {'IVF p50':>9} {'IVF p99':>9} "
+              f"{'exact p50':>10} {'exact p99':>10}")
+        for n_probe in args.n_probe:
+            report = evaluate(reopened, queries, args.k, n_probe)
+            print(f"{n_probe:>8} {report['recall']:>10.3f} {report['ann_p50_ms']:>7.2f}ms "
+                  f"{report['ann_p99_ms']:>7.2f}ms {report['exact_p50_ms']:>8.2f}ms {report['exact_p99_ms']:>8.2f}ms")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+HTTP load test for the Flask API under gunicorn
+Starts the local watsonx.ai stub and a gunicorn server pointed at it, drives
+/api/query, /api/history and /api/datasets with a weighted mix of questions
+for every intent, and reports throughput, latency percentiles and server
+memory over time. Results can be saved as a named baseline and later runs
+are compared against it.
+
+Usage: python benchmarks/loadtest.py [--workers 2] [--threads 4] [--clients 16] [--duration 30]
+                                     [--save-baseline] [--fail-on-regression]
+"""
+
+import os
+import sys
+import json
+import random
+import shutil
+import socket
+import argparse
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, REPO_ROOT)
+
+from climateguardian.stub_llm import StubWatsonxServer  # noqa: E402
+
+DEFAULT_BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "loadtest.json")
+
+COUNTRIES = ["Bangladesh", "Netherlands", "Maldives", "Kenya", "India", "China", "Brazil", "Fiji",
+             "Peru", "Vietnam", "Nigeria", "Mexico", "Chile", "Egypt", "Philippines", "Tuvalu"]
+
+# Question templates per intent, weighted roughly like production traffic
+QUESTIONS: Dict[str, List[str]] = {
+    "risk_assessment": [
+        "What are the flood risks for {country}?",
+        "How vulnerable is {country} to climate disasters?",
+        "Assess the climate risk for coastal cities in {country}"
+    ],
+    "policy_recommendation": [
+        "What climate policy should {country} adopt?",
+        "Recommend an adaptation strategy for small island nations",
+        "Which policies should developing countries prioritize?"
+    ],
+    "funding_intelligence": [
+        "Climate funding opportunities for NGOs in Africa",
+        "Which grants can a government in {country} apply for?",
+        "Where can local communities find adaptation finance?"
+    ],
+    "data_analysis": [
+        "What is the global temperature trend?",
+        "Show CO2 emissions trend data for {country}",
+        "Air quality statistics for major cities"
+    ],
+    "general_climate": [
+        "How is climate change affecting {country}?",
+        "Explain sea level rise impacts on agriculture",
+        "What can cities do to prepare for heatwaves?"
+    ]
+}
+INTENT_WEIGHTS = {"risk_assessment": 3, "policy_recommendation": 2, "funding_intelligence": 2,
+                  "data_analysis": 2, "general_climate": 1}
+ENDPOINT_WEIGHTS = {"query": 8, "history": 1, "datasets": 1}
+
+# Metrics compared against a baseline: name -> True when higher is better
+COMPARED = {"rps": True, "p50_ms": False, "p95_ms": False, "p99_ms": False, "error_rate": False}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+class QuestionMix:
+    """Weighted random questions; a fraction are made unique to force cache misses"""
+
+    def __init__(self, rng: random.Random, unique_fraction: float):
+        self.rng = rng
+        self.unique_fraction = unique_fraction
+        self.intents = list(INTENT_WEIGHTS)
+        self.weights = list(INTENT_WEIGHTS.values())
+        self.serial = 0
+
+    def next(self) -> str:
+        intent = self.rng.choices(self.intents, self.weights)[0]
+        question = self.rng.choice(QUESTIONS[intent]).format(country=self.rng.choice(COUNTRIES))
+        if self.rng.random() < self.unique_fraction:
+            self.serial += 1
+            question = f"{question} (case {self.rng.getrandbits(32)}-{self.serial})"
+        return question
+
+
+class MemorySampler(threading.Thread):
+    """Samples the summed RSS of a process and its children from /proc"""
+
+    def __init__(self, pid: int, interval: float):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.samples: List[Tuple[float, float]] = []
+        self._stop_event = threading.Event()
+
+    @staticmethod
+    def rss_mb(pids: List[int]) -> float:
+        total_kb = 0
+        for pid in pids:
+            try:
+                with open(f"/proc/{pid}/status") as f:
+                    for line in f:
+                        if line.startswith("VmRSS:"):
+                            total_kb += int(line.split()[1])
+                            break
+            except OSError:
+                continue
+        return total_kb / 1024
+
+    def process_tree(self) -> List[int]:
+        pids = [self.pid]
+        try:
+            for task in os.listdir(f"/proc/{self.pid}/task"):
+                with open(f"/proc/{self.pid}/task/{task}/children") as f:
+                    pids.extend(int(pid) for pid in f.read().split())
+        except OSError:
+            pass
+        return pids
+
+    def run(self):
+        started = time.perf_counter()
+        while not self._stop_event.is_set():
+            self.samples.append((time.perf_counter() - started, self.rss_mb(self.process_tree())))
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def start_gunicorn(args, port: int, stub: StubWatsonxServer, data_dir: str) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "WATSONX_API_KEY": "loadtest-key",
+        "WATSONX_PROJECT_ID": "loadtest-project",
+        "WATSONX_URL": stub.url,
+        "IBM_IAM_URL": stub.iam_url,
+        "DATA_DIR": data_dir,
+        "FLASK_DEBUG": "false",
+        "SECRET_KEY": "loadtest"
+    })
+    command = [sys.executable, "-m", "gunicorn", "--bind", f"127.0.0.1:{port}",
+               "--workers", str(args.workers), "--threads", str(args.threads),
+               "--log-level", "warning", "app:app"]
+    return subprocess.Popen(command, cwd=REPO_ROOT, env=env)
+
+
+def wait_ready(base_url: str, server: subprocess.Popen, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {server.returncode}")
+        try:
+            if requests.get(f"{base_url}/api/health/ready", timeout=2).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Server did not become ready in time")
+
+
+def client_loop(base_url: str, seed: int, unique_fraction: float, warmup_until: float,
+                deadline: float, results: Dict[str, List], lock: threading.Lock):
+    """One simulated user: a cookie session issuing weighted requests back to back"""
+    rng = random.Random(seed)
+    mix = QuestionMix(rng, unique_fraction)
+    endpoints, weights = list(ENDPOINT_WEIGHTS), list(ENDPOINT_WEIGHTS.values())
+    session = requests.Session()
+    etag = None
+    local: Dict[str, List] = {endpoint: [] for endpoint in endpoints}
+    while True:
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+        endpoint = rng.choices(endpoints, weights)[0]
+        ok = False
+        try:
+            if endpoint == "query":
+                response = session.post(f"{base_url}/api/query", json={"question": mix.next()}, timeout=60)
+            elif endpoint == "history":
+                response = session.get(f"{base_url}/api/history", timeout=60)
+            else:
+                # Browsers revalidate the catalog with the ETag they already hold
+                headers = {"If-None-Match": etag} if etag else {}
+                response = session.get(f"{base_url}/api/datasets", headers=headers, timeout=60)
+                etag = response.headers.get("ETag", etag)
+            ok = response.status_code in (200, 304)
+        except requests.RequestException:
+            pass
+        if now >= warmup_until:
+            local[endpoint].append(((time.perf_counter() - now) * 1000, ok))
+    with lock:
+        for endpoint, samples in local.items():
+            results[endpoint].extend(samples)
+
+
+def summarize(samples: List[Tuple[float, bool]], seconds: float) -> Dict:
+    latencies = [latency for latency, _ in samples]
+    errors = sum(1 for _, ok in samples if not ok)
+    return {
+        "requests": len(samples),
+        "rps": round(len(samples) / seconds, 1) if seconds else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0
+    }
+
+
+def memory_summary(samples: List[Tuple[float, float]]) -> Optional[Dict]:
+    """Start, peak and end RSS with the least-squares growth rate"""
+    if len(samples) < 2 or not any(rss for _, rss in samples):
+        return None
+    times = [t for t, _ in samples]
+    values = [rss for _, rss in samples]
+    t_mean, v_mean = statistics.fmean(times), statistics.fmean(values)
+    sxx = sum((t - t_mean) ** 2 for t in times)
+    slope = sum((t - t_mean) * (v - v_mean) for t, v in zip(times, values)) / sxx if sxx else 0.0
+    return {
+        "start_mb": round(values[0], 1),
+        "peak_mb": round(max(values), 1),
+        "end_mb": round(values[-1], 1),
+        "growth_mb": round(values[-1] - values[0], 1),
+        "growth_mb_per_min": round(slope * 60, 2),
+        "timeline": [(round(t, 1), round(v, 1)) for t, v in samples]
+    }
+
+
+def scenario_key(args) -> str:
+    return (f"workers={args.workers},threads={args.threads},clients={args.clients},"
+            f"llm_latency={args.llm_latency},unique={args.unique_fraction}")
+
+
+def load_baselines(path: str) -> Dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float, min_requests: int) -> List[str]:
+    """Print current against baseline per endpoint; returns regression descriptions.
+
+    Endpoints with fewer than ``min_requests`` samples are shown but never
+    flagged, since their percentiles are too noisy to compare.
+    """
+    regressions = []
+    print(f"\nAgainst baseline from {baseline.get('created', 'unknown')} ({baseline.get('commit', '?')}):")
+    for endpoint, stats in current["endpoints"].items():
+        before = baseline["endpoints"].get(endpoint)
+        if not before:
+            continue
+        cells = []
+        for metric, higher_is_better in COMPARED.items():
+            old, new = before.get(metric), stats.get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old if old else (0.0 if new == old else float("inf"))
+            worse = -change if higher_is_better else change
+            # Tiny error rate changes are noise; require an absolute difference as well
+            significant = stats["requests"] >= min_requests and (metric != "error_rate" or abs(new - old) >= 0.001)
+            flag = ""
+            if worse > tolerance and significant:
+                flag = " !"
+                regressions.append(f"{endpoint} {metric}: {old} -> {new} ({change:+.0%})")
+            cells.append(f"{metric} {new} ({change:+.0%}){flag}")
+        print(f"  {endpoint:<9} " + ", ".join(cells))
+    return regressions
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn worker processes")
+    parser.add_argument("--threads", type=int, default=4, help="Threads per gunicorn worker")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent simulated users")
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="Unmeasured seconds before measuring")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Stub generation latency in seconds")
+    parser.add_argument("--unique-fraction", type=float, default=0.1,
+                        help="Share of questions made unique so they miss the response cache")
+    parser.add_argument("--memory-interval", type=float, default=1.0, help="Seconds between RSS samples")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--baseline-file", default=DEFAULT_BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the scenario baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Relative change flagged as a regression")
+    parser.add_argument("--min-requests", type=int, default=200,
+                        help="Fewest requests an endpoint needs before it can be flagged")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--json", help="Also write the full report to this file")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="climateguardian-loadtest-")
+    stub = StubWatsonxServer(latency=args.llm_latency).start()
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = start_gunicorn(args, port, stub, data_dir)
+    try:
+        wait_ready(base_url, server)
+        sampler = MemorySampler(server.pid, args.memory_interval)
+        sampler.start()
+
+        results: Dict[str, List] = {endpoint: [] for endpoint in ENDPOINT_WEIGHTS}
+        lock = threading.Lock()
+        started = time.perf_counter()
+        warmup_until = started + args.warmup
+        deadline = warmup_until + args.duration
+        clients = [threading.Thread(target=client_loop, args=(base_url, args.seed + i, args.unique_fraction,
+                                                              warmup_until, deadline, results, lock))
+                   for i in range(args.clients)]
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+        measured = time.perf_counter() - warmup_until
+        sampler.stop()
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+        stub.stop()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    everything = [sample for samples in results.values() for sample in samples]
+    report = {
+        "scenario": scenario_key(args),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "duration_seconds": round(measured, 1),
+        "endpoints": {"all": summarize(everything, measured),
+                      **{endpoint: summarize(samples, measured) for endpoint, samples in results.items()}},
+        "memory": memory_summary(sampler.samples),
+        "llm_generation_requests": stub.counters["generation_requests"]
+    }
+
+    print(f"Scenario: {report['scenario']}  ({report['duration_seconds']}s measured after {args.warmup}s warm-up)")
+    print(f"\n{'endpoint':<10}{'requests':>10}{'rps':>9}{'p50':>10}{'p95':>10}{'p99':>10}{'errors':>9}")
+    for endpoint, stats in report["endpoints"].items():
+        print(f"{endpoint:<10}{stats['requests']:>10}{stats['rps']:>9}{stats['p50_ms']:>8.1f}ms"
+              f"{stats['p95_ms']:>8.1f}ms{stats['p99_ms']:>8.1f}ms{stats['error_rate']:>9.2%}")
+    memory = report["memory"]
+    if memory:
+        print(f"\nServer RSS: {memory['start_mb']} MB -> {memory['end_mb']} MB (peak {memory['peak_mb']} MB, "
+              f"{memory['growth_mb_per_min']:+} MB/min)")
+    print(f"LLM generations: {report['llm_generation_requests']}")
+
+    baselines = load_baselines(args.baseline_file)
+    regressions = []
+    baseline = baselines.get(report["scenario"])
+    if baseline:
+        regressions = compare(report, baseline, args.tolerance, args.min_requests)
+        for regression in regressions:
+            print(f"  REGRESSION {regression}")
+    else:
+        print("\nNo baseline for this scenario yet (run with --save-baseline to record one)")
+
+    if args.save_baseline:
+        stored = {key: value for key, value in report.items() if key != "memory"}
+        stored["memory"] = {key: value for key, value in (memory or {}).items() if key != "timeline"}
+        baselines[report["scenario"]] = stored
+        os.makedirs(os.path.dirname(args.baseline_file), exist_ok=True)
+        with open(args.baseline_file, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline_file}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
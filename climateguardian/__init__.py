@@ -0,0 +1,4 @@
+"""
+ClimateGuardian core package
+Supporting subsystems for the Flask application in app.py
+"""
@@ -0,0 +1,278 @@
+"""
+Time-series analytics over NOAA, Climate TRACE and OpenAQ series
+Series come from the columnar store when a large extract has been ingested,
+otherwise from the sample rows in the knowledge store. Trends, baseline
+anomalies, rolling means and year-over-year change are computed with
+vectorized NumPy operations over the whole series.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from climateguardian.columnar import ColumnarCatalog, ColumnarTable
+from climateguardian.knowledge import KnowledgeIndex, ResolvedEntities
+
+# Metric -> where its series lives and how to aggregate it per year.
+# ``columns`` are candidate value columns in an ingested table, ``sample``
+# names the fallback collection and value field in the sample data.
+METRICS: Dict[str, Dict] = {
+    "temperature": {
+        "label": "Temperature", "unit": "°C", "decimals": 2, "aggregate": "mean",
+        "dataset": "noaa_climate", "table": "daily", "columns": ["tavg", "temperature", "tmax", "anomaly"],
+        "sample": ("global_temperature_anomalies", "anomaly"), "source": "NOAA Climate Data"
+    },
+    "precipitation": {
+        "label": "Precipitation", "unit": "mm", "decimals": 1, "aggregate": "sum",
+        "dataset": "noaa_climate", "table": "daily", "columns": ["prcp", "precipitation"],
+        "sample": None, "source": "NOAA Climate Data"
+    },
+    "emissions": {
+        "label": "CO2 emissions", "unit": "Mt", "decimals": 0, "aggregate": "sum",
+        "dataset": "climate_trace", "table": "emissions", "columns": ["co2_emissions_mt", "emissions", "value"],
+        "sample": ("emissions_history", "co2_emissions_mt"), "source": "Climate TRACE"
+    },
+    "air_quality": {
+        "label": "PM2.5 concentration", "unit": "µg/m³", "decimals": 1, "aggregate": "mean",
+        "dataset": "openaq", "table": "measurements", "columns": ["pm25", "value"],
+        "sample": None, "source": "OpenAQ"
+    }
+}
+
+# String columns used to narrow a series to the places named in a question
+SCOPE_COLUMNS = ["country", "iso3", "region", "city", "location"]
+
+BASELINE_YEARS = 10
+ROLLING_WINDOW = 5
+
+
+def calendar_years(times: np.ndarray) -> np.ndarray:
+    """Calendar year of datetime64[s] values.
+
+    Uses integer day numbers and a per-day lookup table, which is several
+    times faster than casting to datetime64[Y] on large arrays.
+    """
+    if not len(times):
+        return np.empty(0, dtype=np.int64)
+    days = times.astype("datetime64[s]", copy=False).view(np.int64) // 86400
+    first, last = days.min(), days.max()
+    lookup = np.arange(first, last + 1).astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64) + 1970
+    return lookup[days - first]
+
+
+def annual_aggregate(years: np.ndarray, values: np.ndarray,
+                     how: str = "mean") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-year mean or sum of observations: (years, values, observation counts)"""
+    offset = years - years.min()
+    counts = np.bincount(offset)
+    totals = np.bincount(offset, weights=values)
+    present = counts > 0
+    annual = totals[present] if how == "sum" else totals[present] / counts[present]
+    return np.flatnonzero(present) + years.min(), annual, counts[present]
+
+
+def linear_trend(x: np.ndarray, y: np.ndarray) -> Tuple[float, float, float]:
+    """Least-squares slope, intercept and R² of y against x"""
+    x = x.astype(np.float64)
+    dx = x - x.mean()
+    dy = y - y.mean()
+    sxx = dx @ dx
+    if sxx == 0:
+        return 0.0, float(y.mean()), 0.0
+    slope = (dx @ dy) / sxx
+    syy = dy @ dy
+    r_squared = (dx @ dy) ** 2 / (sxx * syy) if syy else 1.0
+    return float(slope), float(y.mean() - slope * x.mean()), float(r_squared)
+
+
+def anomalies(years: np.ndarray, values: np.ndarray, baseline: Tuple[int, int]) -> Tuple[np.ndarray, float]:
+    """Departure of each value from the mean over the inclusive baseline years"""
+    in_baseline = (years >= baseline[0]) & (years <= baseline[1])
+    baseline_mean = float(values[in_baseline].mean())
+    return values - baseline_mean, baseline_mean
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over ``window`` consecutive values (length n - window + 1)"""
+    sums = np.cumsum(np.concatenate(([0.0], values)))
+    return (sums[window:] - sums[:-window]) / window
+
+
+def year_over_year(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Absolute and percentage change between consecutive values"""
+    change = np.diff(values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent = np.where(values[:-1] != 0, change / np.abs(values[:-1]) * 100, np.nan)
+    return change, percent
+
+
+def summarize(years: np.ndarray, values: np.ndarray, how: str = "mean") -> Optional[Dict]:
+    """Trend, baseline anomaly, rolling mean and year-over-year change of a series"""
+    annual_years, annual_values, counts = annual_aggregate(years, values, how)
+    if len(annual_years) < 2:
+        return None
+
+    slope, _, r_squared = linear_trend(annual_years, annual_values)
+    span = min(BASELINE_YEARS, max(1, len(annual_years) // 2))
+    baseline = (int(annual_years[0]), int(annual_years[span - 1]))
+    departures, baseline_mean = anomalies(annual_years, annual_values, baseline)
+    window = min(ROLLING_WINDOW, len(annual_values))
+    rolling = rolling_mean(annual_values, window)
+    change, percent = year_over_year(annual_values)
+
+    return {
+        "start_year": int(annual_years[0]),
+        "end_year": int(annual_years[-1]),
+        "years": len(annual_years),
+        "observations": int(counts.sum()),
+        "trend_per_decade": slope * 10,
+        "r_squared": r_squared,
+        "baseline": baseline,
+        "baseline_mean": baseline_mean,
+        "latest": float(annual_values[-1]),
+        "latest_anomaly": float(departures[-1]),
+        "rolling_window": window,
+        "rolling_mean": float(rolling[-1]),
+        "previous_year": int(annual_years[-2]),
+        "yoy_change": float(change[-1]),
+        "yoy_percent": float(percent[-1])
+    }
+
+
+class ClimateAnalytics:
+    """Answers data analysis questions from the columnar store or sample series"""
+
+    def __init__(self, tables: ColumnarCatalog):
+        self.tables = tables
+
+    def answer(self, question: str, knowledge: KnowledgeIndex,
+               entities: Optional[ResolvedEntities] = None) -> Optional[Dict]:
+        """Analysis response for the metric and places in a question (resolved if not given), or None"""
+        if entities is None:
+            entities = knowledge.resolve(question)
+        metric = next((topic for topic in entities.topics if topic in METRICS), None)
+        if metric is None:
+            return None
+
+        places = [knowledge.countries[iso3] for iso3 in entities.countries]
+        series = self.load_series(metric, places, knowledge)
+        if series is None:
+            return None
+        years, values, label, scope, observed_in = series
+
+        summary = summarize(years, values, METRICS[metric]["aggregate"])
+        if summary is None:
+            return None
+        return {
+            "answer": self.render(metric, label, scope, observed_in, summary),
+            "sources": [METRICS[metric]["source"]],
+            "confidence": 90
+        }
+
+    def load_series(self, metric: str, places: List[Dict],
+                    knowledge: KnowledgeIndex) -> Optional[Tuple[np.ndarray, np.ndarray, str, str, str]]:
+        """(years, values, label, scope, origin) for a metric, preferring ingested tables"""
+        spec = METRICS[metric]
+        table = self.tables.table(spec["dataset"], spec["table"])
+        if table is not None:
+            series = self._table_series(table, spec, places)
+            if series is not None:
+                return series
+        return self._sample_series(spec, places, knowledge)
+
+    def _table_series(self, table: ColumnarTable, spec: Dict, places: List[Dict]):
+        value_column = next((name for name in spec["columns"] if name in table.columns
+                             and table.column_type(name) in ("float64", "int64")), None)
+        time_column = next((name for name in table.columns if table.column_type(name) == "datetime"), None)
+        if value_column is None or (time_column is None and "year" not in table.columns):
+            return None
+
+        values = np.asarray(table.column(value_column), dtype=np.float64)
+        mask = ~np.isnan(values)
+        if time_column is not None:
+            times = table.column(time_column)
+            mask &= ~np.isnat(times)
+        else:
+            times = np.asarray(table.column("year"), dtype=np.int64)
+
+        scope = "all locations"
+        scope_column = next((name for name in SCOPE_COLUMNS if name in table.columns
+                             and table.column_type(name) == "string"), None)
+        if places and scope_column:
+            codes = {table.code(scope_column, label) for place in places
+                     for label in (place["name"], place["iso3"], place["iso2"])} - {None}
+            if not codes:
+                return None
+            column = table.column(scope_column)
+            # A few equality scans beat np.isin for a handful of codes
+            in_scope = np.zeros(len(column), dtype=bool)
+            for code in codes:
+                in_scope |= column == code
+            mask &= in_scope
+            scope = ", ".join(place["name"] for place in places)
+        elif places:
+            # Without a location column the table is one series for all of them
+            scope += self._unavailable_note(places)
+
+        if not mask.any():
+            return None
+        # Filter first so only the selected rows pay for date conversion
+        years = calendar_years(times[mask]) if time_column is not None else times[mask]
+        return years, values[mask], self._label(spec, value_column), scope, f"{int(mask.sum()):,} ingested records"
+
+    def _sample_series(self, spec: Dict, places: List[Dict], knowledge: KnowledgeIndex):
+        if not spec["sample"]:
+            return None
+        collection, field = spec["sample"]
+        rows = knowledge.data.get(spec["dataset"], {}).get(collection, [])
+        if places and rows and "country" in rows[0]:
+            codes = {place["iso3"] for place in places}
+            rows = [row for row in rows if knowledge.country_code(row["country"]) in codes]
+            scope = ", ".join(place["name"] for place in places)
+        else:
+            scopes = sorted({row.get("region") or row.get("country") for row in rows} - {None})
+            scope = scopes[0] if len(scopes) == 1 else "all reported countries"
+            if places:
+                # Sample rows without a country column are one global series
+                scope += self._unavailable_note(places)
+        if not rows:
+            return None
+        years = np.array([row["year"] for row in rows], dtype=np.int64)
+        values = np.array([row[field] for row in rows], dtype=np.float64)
+        return years, values, self._label(spec, field), scope, "sample records"
+
+    @staticmethod
+    def _unavailable_note(places: List[Dict]) -> str:
+        """Scope suffix for a series answered for every location instead of the places asked about"""
+        return f" (country-level data for {', '.join(place['name'] for place in places)} is not available)"
+
+    @staticmethod
+    def _label(spec: Dict, column: str) -> str:
+        return f"{spec['label']} anomaly" if column == "anomaly" else spec["label"]
+
+    @staticmethod
+    def render(metric: str, label: str, scope: str, observed_in: str, summary: Dict) -> str:
+        """Format a summary as an answer"""
+        spec = METRICS[metric]
+        unit, decimals = spec["unit"], spec["decimals"]
+
+        def number(value: float, signed: bool = False) -> str:
+            return f"{value:{'+' if signed else ''},.{decimals}f} {unit}"
+
+        # Short series read better as a yearly rate than extrapolated to a decade
+        per_decade = summary["years"] >= 10
+        trend = summary["trend_per_decade"] if per_decade else summary["trend_per_decade"] / 10
+
+        baseline = summary["baseline"]
+        baseline_label = str(baseline[0]) if baseline[0] == baseline[1] else f"{baseline[0]}-{baseline[1]}"
+        return f"""{label} analysis for {scope}, {summary['start_year']}-{summary['end_year']} \
+({summary['years']} years from {observed_in}):
+
+• Trend: {number(trend, True)} per {'decade' if per_decade else 'year'} (R² = {summary['r_squared']:.2f})
+• {summary['end_year']} value: {number(summary['latest'])}, {number(summary['latest_anomaly'], True)} against the \
+{baseline_label} baseline mean of {number(summary['baseline_mean'])}
+• {summary['rolling_window']}-year rolling mean: {number(summary['rolling_mean'])}""" + (
+            # No percentage change from a zero previous year
+            "" if np.isnan(summary["yoy_percent"]) else f"""
+• Year-over-year: {number(summary['yoy_change'], True)} ({summary['yoy_percent']:+.1f}%) from \
+{summary['previous_year']} to {summary['end_year']}""")
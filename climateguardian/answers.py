@@ -0,0 +1,267 @@
+"""
+Answer templates for ClimateGuardian's grounded answers
+Every answer is one of a few templates, and for a given dataset most of the
+text is fixed: a country's flood risk answer or a region's policy answer
+never changes until the data does. Templates are parsed once at import, an
+AnswerBook renders everything a knowledge index fixes ahead of time, and a
+request only formats the parts that depend on the question, such as the
+audience of a funding answer or the rows of a ranking.
+"""
+
+import keyword
+import string
+import threading
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple, cast
+
+from climateguardian.funding import parse_deadline
+from climateguardian.knowledge import REGIONS, KnowledgeIndex
+
+
+class Template:
+    """Answer text with ``{field}`` placeholders, compiled once to an f-string.
+
+    Fields are plain names with an optional conversion and format spec, as
+    in ``str.format``; rendering runs the compiled f-string, so it costs
+    what the inline f-string it replaces did.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        pieces = []
+        fields: Dict[str, None] = {}
+        for literal, field, spec, conversion in string.Formatter().parse(source):
+            pieces.append(literal.replace("{", "{{").replace("}", "}}"))
+            if field is None:
+                continue
+            if not field.isidentifier() or keyword.iskeyword(field) or "{" in spec:
+                raise ValueError(f"Template field {field!r} must be a plain name")
+            fields[field] = None
+            pieces.append("{" + field + (f"!{conversion}" if conversion else "") + (f":{spec}" if spec else "") + "}")
+        self.fields: Tuple[str, ...] = tuple(fields)
+        # Templates without fields are their own text
+        self.text: Optional[str] = None if self.fields else source.format()
+        parameters = ", ".join(["*", *self.fields, "**_"]) if self.fields else "**_"
+        code = f"def render({parameters}):\n    return f{''.join(pieces)!r}"
+        namespace: Dict = {}
+        exec(compile(code, "<answer template>", "exec"), namespace)
+        if self.fields:
+            # Call the compiled function directly, saving a call per render
+            self.render = namespace["render"]  # type: ignore[method-assign]
+
+    def render(self, **values) -> str:
+        """The text with ``values`` filled in; values for other names are ignored"""
+        # Only templates without fields get here; the others render with their compiled function
+        return cast(str, self.text)
+
+    def lines(self, rows: Iterable[Dict]) -> str:
+        """One rendering per row, a line each"""
+        return "\n".join([self.render(**row) for row in rows])
+
+
+RISK_FLOOD = Template("""Based on ND-GAIN vulnerability data and NOAA precipitation forecasts, 
+{country} faces {risk_level} flood risk (confidence: {confidence}%) due to:
+
+{factors}
+
+This assessment is based on current climate models and historical data patterns.""")
+RISK_FACTOR = Template("• {factor}")
+
+RISK_SCORES = Template("""According to the ND-GAIN Country Index, {country} has a climate vulnerability 
+score of {vulnerability_score:.2f} and a readiness score of {readiness_score:.2f} 
+(scale 0-1; higher vulnerability and lower readiness mean greater exposure to climate risk).
+
+A detailed hazard profile for {country} is not available yet.""")
+
+RISK_DEFAULT = Template("""Climate risk assessment requires specific location data. Please specify a country, 
+region, or city for detailed risk analysis. I can provide information on flood risks, drought 
+vulnerability, extreme weather patterns, and sea level rise impacts.""")
+
+RANKING = Template("""Climate risk ranking for {scope}, {order}:
+
+{rows}
+
+Scores combine {methodology} on a 0-1 scale; higher means greater exposure to climate risk.{missing}""")
+# Indicator values come formatted, as "0.62" or "n/a" for a country without one
+RANKING_ROW = Template("{rank}. {country}: {score:.2f} (vulnerability {vulnerability}, readiness {readiness}{flood})")
+RANKING_MISSING = Template("\n\nNo ND-GAIN scores are available yet for {countries}.")
+
+POLICY = Template("""For {region}, priority policies include:
+
+{policies}
+
+Funding Opportunities:
+{funding}
+
+These recommendations are based on IPCC guidelines and successful adaptation strategies from similar regions.""")
+POLICY_PRIORITY = Template("{number}. {policy} ({funding})")
+POLICY_FUNDING = Template("• {name}: {amount} (deadline: {deadline})")
+POLICY_FUNDING_NONE = Template("• None still open; ask about climate funding for this region for current calls")
+
+POLICY_DEFAULT = Template("""Policy recommendations depend on specific regional context, governance structure, 
+and climate vulnerabilities. Please specify a region, country, or sector for targeted policy guidance. 
+I can provide recommendations for adaptation, mitigation, financing, and implementation strategies.""")
+
+FUNDING = Template("""Current climate funding opportunities for {audience}{criteria}:
+
+{opportunities}
+
+Application tips:
+• Demonstrate clear community impact and local partnerships
+• Include measurable climate adaptation or mitigation outcomes
+• Provide detailed budget breakdown and sustainability plan""")
+FUNDING_OPPORTUNITY = Template("• {name}: {amount} (deadline: {deadline})\n  Focus: {focus}")
+FUNDING_CRITERIA = Template(" ({criteria})")
+FUNDING_NONE = Template("""No open climate funding opportunities for {audience}{criteria}
+were found in the current data. Try a wider amount range or a later deadline, or ask for all
+funding opportunities for your region and organization type.""")
+
+FUNDING_DEFAULT = Template("""Climate funding opportunities vary by region, organization type, and project focus. 
+Please specify your location, organization type (NGO, government, private sector), and project area 
+for targeted funding recommendations. I can help identify grants, loans, and investment opportunities.""")
+
+DATA_ANALYSIS_DEFAULT = Template("""I can provide analysis of climate data including temperature trends, precipitation 
+patterns, emissions data, and vulnerability indices. Please specify:
+• Geographic region of interest
+• Type of climate data (temperature, precipitation, emissions, etc.)
+• Time period for analysis
+• Specific metrics or indicators needed""")
+
+GENERAL = Template("""I'm ClimateGuardian, your AI assistant for climate risk analysis and policy recommendations. 
+I can help with:
+
+• Climate risk assessments for specific regions
+• Evidence-based policy recommendations
+• Climate funding and grant opportunities
+• Data analysis and trend interpretation
+• Adaptation and mitigation strategies
+
+Please ask me about specific climate challenges, locations, or policy areas for detailed assistance.""")
+
+
+class AnswerBook:
+    """Answers and answer fragments fixed by one knowledge index, rendered when it is built.
+
+    The response dicts are shared between requests and must not be modified.
+    """
+
+    def __init__(self, knowledge: KnowledgeIndex, max_memo: int = 1024):
+        self.max_memo = max_memo
+        self._funding_answers: Dict[Tuple[str, str, Tuple[int, ...]], str] = {}
+        self._policy_answers: Dict[Tuple[str, Tuple[int, ...]], Dict] = {}
+        self.flood_risk: Dict[str, Dict] = {}
+        for iso3, data in knowledge.flood_risks.items():
+            self.flood_risk[iso3] = {
+                "answer": RISK_FLOOD.render(country=knowledge.countries[iso3]["name"],
+                                            risk_level=data["risk_level"], confidence=data["confidence"],
+                                            factors=RISK_FACTOR.lines({"factor": factor}
+                                                                      for factor in data["factors"])),
+                "sources": data["sources"],
+                "confidence": data["confidence"]
+            }
+
+        self.scores: Dict[str, Dict] = {}
+        for iso3, scores in knowledge.nd_gain.items():
+            if scores.get("vulnerability_score") is None or scores.get("readiness_score") is None:
+                continue
+            self.scores[iso3] = {
+                "answer": RISK_SCORES.render(country=knowledge.countries[iso3]["name"],
+                                             vulnerability_score=scores["vulnerability_score"],
+                                             readiness_score=scores["readiness_score"]),
+                "sources": ["ND-GAIN Country Index"],
+                "confidence": 80
+            }
+
+        # Policy answers listing every funding opportunity, with the parts
+        # needed to re-render them once some have closed
+        self.policies: Dict[str, Dict] = {}
+        self._policy_parts: Dict[str, Tuple[str, str, List[Tuple[Optional[date], str]]]] = {}
+        self._policy_first_close: Dict[str, date] = {}
+        for region_id, data in knowledge.policies.items():
+            region = REGIONS[data["region"]]["name"]
+            priorities = POLICY_PRIORITY.lines(
+                {"number": number, "policy": policy["policy"], "funding": policy["funding"]}
+                for number, policy in enumerate(data["priorities"], 1))
+            opportunities = [(parse_deadline(str(opportunity.get("deadline", ""))), POLICY_FUNDING.render(
+                name=opportunity["name"], amount=opportunity["amount"], deadline=opportunity["deadline"]))
+                for opportunity in data["funding_opportunities"]]
+            self.policies[region_id] = {
+                "answer": POLICY.render(region=region, policies=priorities,
+                                        funding="\n".join(line for _, line in opportunities)),
+                "sources": data["sources"],
+                "confidence": 92
+            }
+            self._policy_parts[region_id] = (region, priorities, opportunities)
+            deadlines = [deadline for deadline, _ in opportunities if deadline is not None]
+            if deadlines:
+                self._policy_first_close[region_id] = min(deadlines)
+
+        # One rendered line per funding opportunity, by position in the index
+        self.funding_lines: List[str] = [
+            FUNDING_OPPORTUNITY.render(name=opportunity["name"], amount=opportunity["amount"],
+                                       deadline=opportunity["deadline"],
+                                       focus=opportunity.get("focus", opportunity.get("eligibility",
+                                                                                      "General climate action")))
+            for opportunity in knowledge.funding
+        ]
+
+    def risk(self, countries: Iterable[str]) -> Optional[Dict]:
+        """Flood risk answer for the first country with a hazard profile, else its ND-GAIN scores"""
+        for iso3 in countries:
+            if iso3 in self.flood_risk:
+                return self.flood_risk[iso3]
+        for iso3 in countries:
+            if iso3 in self.scores:
+                return self.scores[iso3]
+        return None
+
+    def policy(self, region_id: str, today: date) -> Dict:
+        """Policy answer for a region, listing only the funding opportunities still open ``today``"""
+        first_close = self._policy_first_close.get(region_id)
+        if first_close is None or today <= first_close:
+            return self.policies[region_id]
+        region, priorities, opportunities = self._policy_parts[region_id]
+        open_positions = tuple(position for position, (deadline, _) in enumerate(opportunities)
+                               if deadline is None or deadline >= today)
+        key = (region_id, open_positions)
+        response = self._policy_answers.get(key)
+        if response is None:
+            listed = "\n".join([opportunities[position][1] for position in open_positions])
+            response = {**self.policies[region_id],
+                        "answer": POLICY.render(region=region, policies=priorities,
+                                                funding=listed or POLICY_FUNDING_NONE.text)}
+            if len(self._policy_answers) >= self.max_memo:
+                self._policy_answers.clear()
+            self._policy_answers[key] = response
+        return response
+
+    def funding(self, audience: str, positions: Iterable[int], criteria: str = "") -> str:
+        """Funding answer listing the opportunities at ``positions`` in order, under the amount and
+        deadline ``criteria`` asked for; rendered once per audience, criteria and listing"""
+        key = (audience, criteria, tuple(positions))
+        answer = self._funding_answers.get(key)
+        if answer is None:
+            answer = FUNDING.render(audience=audience,
+                                    criteria=FUNDING_CRITERIA.render(criteria=criteria) if criteria else "",
+                                    opportunities="\n".join([self.funding_lines[position] for position in key[2]]))
+            if len(self._funding_answers) >= self.max_memo:
+                self._funding_answers.clear()
+            self._funding_answers[key] = answer
+        return answer
+
+
+class AnswerBooks:
+    """AnswerBook for the current knowledge index, rebuilt when the index is reloaded"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built: Optional[Tuple[KnowledgeIndex, AnswerBook]] = None
+
+    def book(self, knowledge: KnowledgeIndex) -> AnswerBook:
+        built = self._built
+        if built is not None and built[0] is knowledge:
+            return built[1]
+        with self._lock:
+            if self._built is None or self._built[0] is not knowledge:
+                self._built = (knowledge, AnswerBook(knowledge))
+            return self._built[1]
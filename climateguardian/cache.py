@@ -0,0 +1,197 @@
+"""
+Response caching for ClimateGuardian
+Generated responses are cached by normalized question text and intent, with
+LRU and TTL eviction, and the whole cache is invalidated when the watched
+dataset files change on disk. Entries are sharded over independently locked
+partitions so concurrent request threads rarely contend.
+"""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+CacheKey = Tuple[str, str]
+
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+
+# Caches with fewer entries per shard than this use fewer shards
+MIN_ENTRIES_PER_SHARD = 64
+
+
+def normalize_question(question: str) -> str:
+    """Fold case, punctuation and whitespace so equivalent questions share a key"""
+    return " ".join(_PUNCTUATION.sub(" ", question.casefold()).split())
+
+
+def source_fingerprint(paths: Iterable[str]) -> Tuple:
+    """Name, size and modification time of every file under ``paths``"""
+    stamps = []
+    for path in paths:
+        if os.path.isdir(path):
+            with os.scandir(path) as entries:
+                files = [entry for entry in entries if entry.is_file()]
+            for entry in sorted(files, key=lambda item: item.name):
+                stat = entry.stat()
+                stamps.append((entry.path, stat.st_size, stat.st_mtime_ns))
+        elif os.path.isfile(path):
+            stat = os.stat(path)
+            stamps.append((path, stat.st_size, stat.st_mtime_ns))
+    return tuple(stamps)
+
+
+class SourceWatcher:
+    """Reports when the files under ``paths`` change, checking at most every ``check_interval`` seconds"""
+
+    def __init__(self, paths: Iterable[str], check_interval: float = 5.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.paths = list(paths)
+        self.check_interval = check_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._fingerprint = source_fingerprint(self.paths)
+        self._next_check = clock() + check_interval
+
+    def changed(self) -> bool:
+        """True once per change; one thread checks while the others carry on"""
+        now = self._clock()
+        if not self.paths or now < self._next_check:
+            return False
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            if now < self._next_check:
+                return False
+            self._next_check = now + self.check_interval
+            fingerprint = source_fingerprint(self.paths)
+            if fingerprint == self._fingerprint:
+                return False
+            self._fingerprint = fingerprint
+            return True
+        finally:
+            self._lock.release()
+
+
+class _Shard:
+    """Keys hashing to one shard, in LRU order, with their counters, under their own lock"""
+
+    __slots__ = ("lock", "entries", "max_size", "hits", "misses", "evictions")
+
+    def __init__(self, max_size: int):
+        self.lock = threading.Lock()
+        # Least recently used entry first; values are (expires_at, response)
+        self.entries: "OrderedDict[CacheKey, Tuple[float, Dict]]" = OrderedDict()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+class ResponseCache:
+    """Size- and TTL-bounded LRU cache of generated responses, safe to share between threads.
+
+    Keys are spread over ``shards`` independently locked shards, each holding
+    an equal share of ``max_size`` in its own LRU order; small caches use a
+    single shard so the order is exact.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = 3600,
+                 watch_paths: Iterable[str] = (), check_interval: float = 5.0,
+                 clock: Callable[[], float] = time.monotonic, shards: int = 16):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        count = max(1, min(shards, max_size // MIN_ENTRIES_PER_SHARD))
+        self._shards = [_Shard(max_size // count + (1 if i < max_size % count else 0)) for i in range(count)]
+        self._sources = SourceWatcher(watch_paths, check_interval, clock)
+        self.invalidations = 0
+
+    @property
+    def hits(self) -> int:
+        return sum(shard.hits for shard in self._shards)
+
+    @property
+    def misses(self) -> int:
+        return sum(shard.misses for shard in self._shards)
+
+    @property
+    def evictions(self) -> int:
+        return sum(shard.evictions for shard in self._shards)
+
+    @staticmethod
+    def make_key(question: str, intent: str) -> CacheKey:
+        """Build the cache key for a question and its intent"""
+        return normalize_question(question), intent
+
+    def get(self, key: CacheKey) -> Optional[Dict]:
+        """Return the cached response or None on a miss"""
+        now = self._clock()
+        self._check_sources()
+
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is None:
+                shard.misses += 1
+                return None
+            expires_at, response = entry
+            if expires_at <= now:
+                del shard.entries[key]
+                shard.evictions += 1
+                shard.misses += 1
+                return None
+
+            shard.entries.move_to_end(key)
+            shard.hits += 1
+            return response
+
+    def put(self, key: CacheKey, response: Dict):
+        """Store a response, evicting the least recently used entry if full"""
+        if self.max_size <= 0:
+            return
+        expires_at = self._clock() + self.ttl if self.ttl is not None else float("inf")
+        shard = self._shard(key)
+        with shard.lock:
+            shard.entries[key] = (expires_at, response)
+            shard.entries.move_to_end(key)
+            while len(shard.entries) > shard.max_size:
+                shard.entries.popitem(last=False)
+                shard.evictions += 1
+
+    def clear(self) -> int:
+        """Drop every cached response; returns how many were dropped"""
+        dropped = 0
+        for shard in self._shards:
+            with shard.lock:
+                dropped += len(shard.entries)
+                shard.entries.clear()
+        return dropped
+
+    def stats(self) -> Dict:
+        """Cache counters and occupancy"""
+        hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "size": len(self),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": hits,
+            "misses": misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "shards": len(self._shards)
+        }
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self._shards)
+
+    def _shard(self, key: CacheKey) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _check_sources(self):
+        """Invalidate everything if a watched file changed since the last check"""
+        if self._sources.changed() and self.clear():
+            self.invalidations += 1
@@ -0,0 +1,409 @@
+"""
+Columnar on-disk storage for large upstream datasets
+CSV and NDJSON sources are parsed in fixed-size chunks and appended to one
+raw binary file per column, with a ``schema.json`` sidecar describing column
+types and row count. String columns are dictionary-encoded as int32 codes.
+Tables are read lazily through read-only memory maps, one column at a time.
+
+Layout of a table directory:
+
+    schema.json          {"rows": N, "columns": {"name": {"type": ...}}}
+    <column>.bin         little-endian values, N entries
+    <column>.dict.json   dictionary for string columns
+"""
+
+import csv
+import io
+import json
+import os
+import shutil
+import threading
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+SCHEMA_FILE = "schema.json"
+DEFAULT_CHUNK_ROWS = 100_000
+
+# Storage dtype for each logical column type
+COLUMN_TYPES = {
+    "int64": np.dtype("<i8"),
+    "float64": np.dtype("<f8"),
+    "datetime": np.dtype("<M8[s]"),
+    "string": np.dtype("<i4")
+}
+
+
+def _flatten(record: Dict, prefix: str = "") -> Dict:
+    """Flatten nested NDJSON objects into dotted column names"""
+    flat = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+
+def _infer_type(values: List) -> str:
+    """Pick the narrowest column type that fits every non-empty value.
+
+    Integers with blanks among them are stored as float64, with NaN for the
+    blanks, since int64 has no null value.
+    """
+    if isinstance(values, np.ndarray) and values.dtype.kind in "iufM":
+        return {"i": "int64", "u": "int64", "f": "float64", "M": "datetime"}[values.dtype.kind]
+    present = [value for value in values if value not in (None, "")]
+    if not present:
+        return "string"
+    for column_type in ("int64", "float64", "datetime"):
+        try:
+            _convert(present, column_type)
+        except (ValueError, TypeError, OverflowError):
+            continue
+        if column_type == "int64" and any(isinstance(value, float) for value in present):
+            continue
+        if column_type == "int64" and len(present) < len(values):
+            return "float64"
+        return column_type
+    return "string"
+
+
+def _integers_with_blanks(values: List) -> bool:
+    """True when some values are blank and the rest are whole numbers"""
+    present = [value for value in values if value not in (None, "")]
+    if len(present) == len(values) or any(isinstance(value, float) for value in present):
+        return False
+    try:
+        _convert(present, "int64")
+    except (ValueError, TypeError, OverflowError):
+        return False
+    return True
+
+
+def _nulls(column_type: str, count: int) -> np.ndarray:
+    """``count`` null values of a numeric or datetime column"""
+    if column_type == "datetime":
+        return np.full(count, np.datetime64("NaT"), dtype=COLUMN_TYPES["datetime"])
+    return np.full(count, np.nan, dtype=COLUMN_TYPES["float64"])
+
+
+def _convert(values: List, column_type: str) -> np.ndarray:
+    """Convert a chunk of raw values to the column's storage dtype"""
+    if isinstance(values, np.ndarray) and values.dtype.kind in "iufM":
+        return values.astype(COLUMN_TYPES[column_type])
+    if column_type == "datetime":
+        cleaned = ["NaT" if value in (None, "") else str(value).rstrip("Z") for value in values]
+        return np.array(cleaned, dtype="datetime64[s]")
+    dtype = COLUMN_TYPES[column_type]
+    try:
+        return np.asarray(values, dtype=dtype)
+    except (ValueError, TypeError):
+        if column_type != "float64":
+            raise
+        # Slow path for blanks and nulls in float columns
+        return np.array([np.nan if value in (None, "") else float(value) for value in values], dtype=dtype)
+
+
+class ColumnarWriter:
+    """Append row chunks to a columnar table, inferring the schema unless one is given.
+
+    An inferred schema grows as chunks arrive: a column first seen in a later
+    chunk is null for the rows before it, and an int64 column that later
+    meets blanks is rewritten as float64.
+    """
+
+    def __init__(self, path: str, schema: Optional[Dict[str, str]] = None):
+        self.path = path
+        self._tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        shutil.rmtree(self._tmp_path, ignore_errors=True)
+        os.makedirs(self._tmp_path)
+        self._inferred = not schema
+        self.schema = dict(schema) if schema else None
+        self.rows = 0
+        self._files = {}
+        self._dictionaries: Dict[str, Dict[str, int]] = {}
+
+    def write_chunk(self, columns: Dict[str, List]):
+        """Append one chunk given as column name -> list of raw values"""
+        if self.schema is None:
+            self.schema = {}
+        if self._inferred:
+            for name, values in columns.items():
+                if name not in self.schema:
+                    self._add_column(name, values)
+        length = len(next(iter(columns.values()), []))
+        for name, column_type in self.schema.items():
+            values = columns.get(name)
+            if values is None:
+                values = [None] * length
+            if column_type == "int64" and self._inferred and _integers_with_blanks(values):
+                column_type = self._widen(name)
+            if column_type == "string":
+                array = self._encode(name, values)
+            else:
+                try:
+                    array = _convert(values, column_type)
+                except (ValueError, TypeError, OverflowError) as e:
+                    raise ValueError(
+                        f"Column '{name}' does not fit inferred type {column_type} "
+                        f"near row {self.rows}; pass an explicit schema") from e
+            self._file(name).write(array.astype(COLUMN_TYPES[column_type], copy=False).tobytes())
+        self.rows += length
+
+    def close(self):
+        """Write the schema sidecar and move the finished table into place"""
+        for handle in self._files.values():
+            handle.close()
+        for name, codes in self._dictionaries.items():
+            with open(os.path.join(self._tmp_path, f"{name}.dict.json"), "w") as f:
+                json.dump(list(codes), f)
+        for name in self.schema or {}:
+            # Columns that never received a chunk still get an (empty) file
+            open(os.path.join(self._tmp_path, f"{name}.bin"), "ab").close()
+        with open(os.path.join(self._tmp_path, SCHEMA_FILE), "w") as f:
+            json.dump({
+                "rows": self.rows,
+                "columns": {name: {"type": column_type} for name, column_type in (self.schema or {}).items()}
+            }, f, indent=2)
+
+        # Swap directories so readers never see a half-written table;
+        # memory maps already open on the old files stay valid.
+        old_path = f"{self.path}.old-{os.getpid()}-{threading.get_ident()}"
+        if os.path.exists(self.path):
+            os.rename(self.path, old_path)
+        os.rename(self._tmp_path, self.path)
+        shutil.rmtree(old_path, ignore_errors=True)
+
+    def abort(self):
+        """Discard a partially written table"""
+        for handle in self._files.values():
+            handle.close()
+        shutil.rmtree(self._tmp_path, ignore_errors=True)
+
+    def _add_column(self, name: str, values: List):
+        """Add a column first seen in this chunk, null for every row written before it"""
+        column_type = _infer_type(values)
+        if self.rows and column_type == "int64":
+            column_type = "float64"
+        self.schema[name] = column_type
+        if not self.rows:
+            return
+        if column_type == "string":
+            codes = self._dictionaries.setdefault(name, {})
+            nulls = np.full(self.rows, codes.setdefault("", len(codes)), dtype=COLUMN_TYPES["string"])
+        else:
+            nulls = _nulls(column_type, self.rows)
+        self._file(name).write(nulls.tobytes())
+
+    def _widen(self, name: str) -> str:
+        """Rewrite an int64 column written so far as float64, so it can hold blanks"""
+        file_path = os.path.join(self._tmp_path, f"{name}.bin")
+        handle = self._files.pop(name, None)
+        if handle is not None:
+            handle.close()
+        written = np.fromfile(file_path, dtype=COLUMN_TYPES["int64"]) if os.path.exists(file_path) else []
+        self._file(name).write(np.asarray(written, dtype=COLUMN_TYPES["float64"]).tobytes())
+        self.schema[name] = "float64"
+        return "float64"
+
+    def _file(self, name: str):
+        if name not in self._files:
+            self._files[name] = open(os.path.join(self._tmp_path, f"{name}.bin"), "wb")
+        return self._files[name]
+
+    def _encode(self, name: str, values: List) -> np.ndarray:
+        codes = self._dictionaries.setdefault(name, {})
+        if not len(values):
+            return np.empty(0, dtype=np.int32)
+        # Encode distinct values only, then map the whole chunk at once
+        text = np.asarray(values, dtype=object)
+        text[np.equal(text, None)] = ""
+        distinct, inverse = np.unique(text.astype(str), return_inverse=True)
+        mapping = np.fromiter((codes.setdefault(str(value), len(codes)) for value in distinct),
+                              dtype=np.int32, count=len(distinct))
+        return mapping[inverse]
+
+
+def iter_csv_chunks(lines: Iterable[str], chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[Dict[str, List]]:
+    """Parse CSV text lines into column chunks of at most ``chunk_rows`` rows"""
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if not header:
+        return
+    while True:
+        rows = list(islice(reader, chunk_rows))
+        if not rows:
+            return
+        columns = zip(*(row + [""] * (len(header) - len(row)) for row in rows))
+        yield {name: list(values) for name, values in zip(header, columns)}
+
+
+def iter_ndjson_chunks(lines: Iterable[str], chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[Dict[str, List]]:
+    """Parse newline-delimited JSON into column chunks of at most ``chunk_rows`` rows"""
+    records = (_flatten(json.loads(line)) for line in lines if line.strip())
+    while True:
+        chunk = list(islice(records, chunk_rows))
+        if not chunk:
+            return
+        names = list(dict.fromkeys(name for record in chunk for name in record))
+        yield {name: [record.get(name) for record in chunk] for name in names}
+
+
+CHUNK_PARSERS: Dict[str, Callable[..., Iterator[Dict[str, List]]]] = {
+    "csv": iter_csv_chunks,
+    "ndjson": iter_ndjson_chunks,
+    "jsonl": iter_ndjson_chunks
+}
+
+
+def ingest_lines(lines: Iterable[str], path: str, fmt: str,
+                 schema: Optional[Dict[str, str]] = None, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Dict:
+    """Stream CSV/NDJSON lines into a columnar table at ``path`` and return its schema"""
+    if fmt not in CHUNK_PARSERS:
+        raise ValueError(f"Unsupported format '{fmt}'; expected one of {', '.join(CHUNK_PARSERS)}")
+    writer = ColumnarWriter(path, schema)
+    try:
+        for chunk in CHUNK_PARSERS[fmt](lines, chunk_rows):
+            writer.write_chunk(chunk)
+        writer.close()
+    except Exception:
+        writer.abort()
+        raise
+    return ColumnarTable(path).schema
+
+
+def ingest_file(source: str, path: str, fmt: Optional[str] = None,
+                schema: Optional[Dict[str, str]] = None, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Dict:
+    """Stream a local CSV/NDJSON file into a columnar table"""
+    fmt = fmt or os.path.splitext(source)[1].lstrip(".").lower()
+    with open(source, newline="", encoding="utf-8") as f:
+        return ingest_lines(f, path, fmt, schema, chunk_rows)
+
+
+class ColumnarTable:
+    """Read-only, lazily memory-mapped view of a columnar table"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, SCHEMA_FILE)) as f:
+            self.schema = json.load(f)
+        self.rows = self.schema["rows"]
+        self._columns: Dict[str, np.ndarray] = {}
+        self._dictionaries: Dict[str, np.ndarray] = {}
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.schema["columns"])
+
+    def column_type(self, name: str) -> str:
+        return self.schema["columns"][name]["type"]
+
+    def column(self, name: str) -> np.ndarray:
+        """Memory-mapped values of one column (dictionary codes for strings)"""
+        if name not in self._columns:
+            dtype = COLUMN_TYPES[self.column_type(name)]
+            if self.rows == 0:
+                self._columns[name] = np.empty(0, dtype=dtype)
+            else:
+                self._columns[name] = np.memmap(os.path.join(self.path, f"{name}.bin"),
+                                                dtype=dtype, mode="r", shape=(self.rows,))
+        return self._columns[name]
+
+    def dictionary(self, name: str) -> np.ndarray:
+        """Distinct values of a string column, indexed by code"""
+        if name not in self._dictionaries:
+            with open(os.path.join(self.path, f"{name}.dict.json")) as f:
+                self._dictionaries[name] = np.array(json.load(f), dtype=object)
+        return self._dictionaries[name]
+
+    def code(self, name: str, value: str) -> Optional[int]:
+        """Dictionary code of a string value, for vectorized filtering"""
+        matches = np.flatnonzero(self.dictionary(name) == value)
+        return int(matches[0]) if len(matches) else None
+
+    def read(self, columns: Optional[Iterable[str]] = None, decode: bool = True) -> Dict[str, np.ndarray]:
+        """Selected columns as arrays, decoding string columns if requested"""
+        result = {}
+        for name in columns or self.columns:
+            values = self.column(name)
+            if decode and self.column_type(name) == "string":
+                values = self.dictionary(name)[values]
+            result[name] = values
+        return result
+
+    def __len__(self) -> int:
+        return self.rows
+
+
+class ColumnarCatalog:
+    """Opens tables under ``root/<dataset>/<table>`` on demand, reopening after re-ingest"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._tables: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def table_path(self, dataset: str, table: str) -> str:
+        return os.path.join(self.root, dataset, table)
+
+    def table(self, dataset: str, table: str) -> Optional[ColumnarTable]:
+        """The table if it has been ingested, else None"""
+        path = self.table_path(dataset, table)
+        try:
+            stamp = os.stat(os.path.join(path, SCHEMA_FILE)).st_mtime_ns
+        except OSError:
+            return None
+        cached = self._tables.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        with self._lock:
+            cached = self._tables.get(path)
+            if cached is None or cached[0] != stamp:
+                cached = (stamp, ColumnarTable(path))
+                self._tables[path] = cached
+            return cached[1]
+
+    def tables(self) -> Dict[str, List[str]]:
+        """Ingested table names grouped by dataset"""
+        found = {}
+        if not os.path.isdir(self.root):
+            return found
+        for dataset in sorted(os.listdir(self.root)):
+            dataset_dir = os.path.join(self.root, dataset)
+            if os.path.isdir(dataset_dir):
+                names = [name for name in sorted(os.listdir(dataset_dir))
+                         if os.path.isfile(os.path.join(dataset_dir, name, SCHEMA_FILE))]
+                if names:
+                    found[dataset] = names
+        return found
+
+
+def text_lines(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[str]:
+    """Decode a byte stream (e.g. an HTTP response body) into text lines"""
+    wrapper = io.TextIOWrapper(_ChunkReader(chunks), encoding=encoding, newline="")
+    yield from wrapper
+
+
+class _ChunkReader(io.RawIOBase):
+    """Minimal file-like adaptor over an iterator of byte chunks"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        while not self._buffer:
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(target), len(self._buffer))
+        target[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
@@ -0,0 +1,472 @@
+"""
+Country reference table for ClimateGuardian
+UN member states (plus Palestine) with ISO 3166 codes and UN M49 regions,
+used to build the entity indexes of the knowledge store.
+"""
+
+from typing import Dict, List, Tuple
+
+# name, ISO alpha-2, ISO alpha-3, region, subregion
+COUNTRIES: Tuple[Tuple[str, str, str, str, str], ...] = (
+    ("Afghanistan", "AF", "AFG", "Asia", "Southern Asia"),
+    ("Albania", "AL", "ALB", "Europe", "Southern Europe"),
+    ("Algeria", "DZ", "DZA", "Africa", "Northern Africa"),
+    ("Andorra", "AD", "AND", "Europe", "Southern Europe"),
+    ("Angola", "AO", "AGO", "Africa", "Middle Africa"),
+    ("Antigua and Barbuda", "AG", "ATG", "Americas", "Caribbean"),
+    ("Argentina", "AR", "ARG", "Americas", "South America"),
+    ("Armenia", "AM", "ARM", "Asia", "Western Asia"),
+    ("Australia", "AU", "AUS", "Oceania", "Australia and New Zealand"),
+    ("Austria", "AT", "AUT", "Europe", "Western Europe"),
+    ("Azerbaijan", "AZ", "AZE", "Asia", "Western Asia"),
+    ("Bahamas", "BS", "BHS", "Americas", "Caribbean"),
+    ("Bahrain", "BH", "BHR", "Asia", "Western Asia"),
+    ("Bangladesh", "BD", "BGD", "Asia", "Southern Asia"),
+    ("Barbados", "BB", "BRB", "Americas", "Caribbean"),
+    ("Belarus", "BY", "BLR", "Europe", "Eastern Europe"),
+    ("Belgium", "BE", "BEL", "Europe", "Western Europe"),
+    ("Belize", "BZ", "BLZ", "Americas", "Central America"),
+    ("Benin", "BJ", "BEN", "Africa", "Western Africa"),
+    ("Bhutan", "BT", "BTN", "Asia", "Southern Asia"),
+    ("Bolivia", "BO", "BOL", "Americas", "South America"),
+    ("Bosnia and Herzegovina", "BA", "BIH", "Europe", "Southern Europe"),
+    ("Botswana", "BW", "BWA", "Africa", "Southern Africa"),
+    ("Brazil", "BR", "BRA", "Americas", "South America"),
+    ("Brunei", "BN", "BRN", "Asia", "South-eastern Asia"),
+    ("Bulgaria", "BG", "BGR", "Europe", "Eastern Europe"),
+    ("Burkina Faso", "BF", "BFA", "Africa", "Western Africa"),
+    ("Burundi", "BI", "BDI", "Africa", "Eastern Africa"),
+    ("Cabo Verde", "CV", "CPV", "Africa", "Western Africa"),
+    ("Cambodia", "KH", "KHM", "Asia", "South-eastern Asia"),
+    ("Cameroon", "CM", "CMR", "Africa", "Middle Africa"),
+    ("Canada", "CA", "CAN", "Americas", "Northern America"),
+    ("Central African Republic", "CF", "CAF", "Africa", "Middle Africa"),
+    ("Chad", "TD", "TCD", "Africa", "Middle Africa"),
+    ("Chile", "CL", "CHL", "Americas", "South America"),
+    ("China", "CN", "CHN", "Asia", "Eastern Asia"),
+    ("Colombia", "CO", "COL", "Americas", "South America"),
+    ("Comoros", "KM", "COM", "Africa", "Eastern Africa"),
+    ("Congo", "CG", "COG", "Africa", "Middle Africa"),
+    ("Costa Rica", "CR", "CRI", "Americas", "Central America"),
+    ("Cote d'Ivoire", "CI", "CIV", "Africa", "Western Africa"),
+    ("Croatia", "HR", "HRV", "Europe", "Southern Europe"),
+    ("Cuba", "CU", "CUB", "Americas", "Caribbean"),
+    ("Cyprus", "CY", "CYP", "Asia", "Western Asia"),
+    ("Czechia", "CZ", "CZE", "Europe", "Eastern Europe"),
+    ("Democratic Republic of the Congo", "CD", "COD", "Africa", "Middle Africa"),
+    ("Denmark", "DK", "DNK", "Europe", "Northern Europe"),
+    ("Djibouti", "DJ", "DJI", "Africa", "Eastern Africa"),
+    ("Dominica", "DM", "DMA", "Americas", "Caribbean"),
+    ("Dominican Republic", "DO", "DOM", "Americas", "Caribbean"),
+    ("Ecuador", "EC", "ECU", "Americas", "South America"),
+    ("Egypt", "EG", "EGY", "Africa", "Northern Africa"),
+    ("El Salvador", "SV", "SLV", "Americas", "Central America"),
+    ("Equatorial Guinea", "GQ", "GNQ", "Africa", "Middle Africa"),
+    ("Eritrea", "ER", "ERI", "Africa", "Eastern Africa"),
+    ("Estonia", "EE", "EST", "Europe", "Northern Europe"),
+    ("Eswatini", "SZ", "SWZ", "Africa", "Southern Africa"),
+    ("Ethiopia", "ET", "ETH", "Africa", "Eastern Africa"),
+    ("Fiji", "FJ", "FJI", "Oceania", "Melanesia"),
+    ("Finland", "FI", "FIN", "Europe", "Northern Europe"),
+    ("France", "FR", "FRA", "Europe", "Western Europe"),
+    ("Gabon", "GA", "GAB", "Africa", "Middle Africa"),
+    ("Gambia", "GM", "GMB", "Africa", "Western Africa"),
+    ("Georgia", "GE", "GEO", "Asia", "Western Asia"),
+    ("Germany", "DE", "DEU", "Europe", "Western Europe"),
+    ("Ghana", "GH", "GHA", "Africa", "Western Africa"),
+    ("Greece", "GR", "GRC", "Europe", "Southern Europe"),
+    ("Grenada", "GD", "GRD", "Americas", "Caribbean"),
+    ("Guatemala", "GT", "GTM", "Americas", "Central America"),
+    ("Guinea", "GN", "GIN", "Africa", "Western Africa"),
+    ("Guinea-Bissau", "GW", "GNB", "Africa", "Western Africa"),
+    ("Guyana", "GY", "GUY", "Americas", "South America"),
+    ("Haiti", "HT", "HTI", "Americas", "Caribbean"),
+    ("Honduras", "HN", "HND", "Americas", "Central America"),
+    ("Hungary", "HU", "HUN", "Europe", "Eastern Europe"),
+    ("Iceland", "IS", "ISL", "Europe", "Northern Europe"),
+    ("India", "IN", "IND", "Asia", "Southern Asia"),
+    ("Indonesia", "ID", "IDN", "Asia", "South-eastern Asia"),
+    ("Iran", "IR", "IRN", "Asia", "Southern Asia"),
+    ("Iraq", "IQ", "IRQ", "Asia", "Western Asia"),
+    ("Ireland", "IE", "IRL", "Europe", "Northern Europe"),
+    ("Israel", "IL", "ISR", "Asia", "Western Asia"),
+    ("Italy", "IT", "ITA", "Europe", "Southern Europe"),
+    ("Jamaica", "JM", "JAM", "Americas", "Caribbean"),
+    ("Japan", "JP", "JPN", "Asia", "Eastern Asia"),
+    ("Jordan", "JO", "JOR", "Asia", "Western Asia"),
+    ("Kazakhstan", "KZ", "KAZ", "Asia", "Central Asia"),
+    ("Kenya", "KE", "KEN", "Africa", "Eastern Africa"),
+    ("Kiribati", "KI", "KIR", "Oceania", "Micronesia"),
+    ("Kuwait", "KW", "KWT", "Asia", "Western Asia"),
+    ("Kyrgyzstan", "KG", "KGZ", "Asia", "Central Asia"),
+    ("Laos", "LA", "LAO", "Asia", "South-eastern Asia"),
+    ("Latvia", "LV", "LVA", "Europe", "Northern Europe"),
+    ("Lebanon", "LB", "LBN", "Asia", "Western Asia"),
+    ("Lesotho", "LS", "LSO", "Africa", "Southern Africa"),
+    ("Liberia", "LR", "LBR", "Africa", "Western Africa"),
+    ("Libya", "LY", "LBY", "Africa", "Northern Africa"),
+    ("Liechtenstein", "LI", "LIE", "Europe", "Western Europe"),
+    ("Lithuania", "LT", "LTU", "Europe", "Northern Europe"),
+    ("Luxembourg", "LU", "LUX", "Europe", "Western Europe"),
+    ("Madagascar", "MG", "MDG", "Africa", "Eastern Africa"),
+    ("Malawi", "MW", "MWI", "Africa", "Eastern Africa"),
+    ("Malaysia", "MY", "MYS", "Asia", "South-eastern Asia"),
+    ("Maldives", "MV", "MDV", "Asia", "Southern Asia"),
+    ("Mali", "ML", "MLI", "Africa", "Western Africa"),
+    ("Malta", "MT", "MLT", "Europe", "Southern Europe"),
+    ("Marshall Islands", "MH", "MHL", "Oceania", "Micronesia"),
+    ("Mauritania", "MR", "MRT", "Africa", "Western Africa"),
+    ("Mauritius", "MU", "MUS", "Africa", "Eastern Africa"),
+    ("Mexico", "MX", "MEX", "Americas", "Central America"),
+    ("Micronesia", "FM", "FSM", "Oceania", "Micronesia"),
+    ("Moldova", "MD", "MDA", "Europe", "Eastern Europe"),
+    ("Monaco", "MC", "MCO", "Europe", "Western Europe"),
+    ("Mongolia", "MN", "MNG", "Asia", "Eastern Asia"),
+    ("Montenegro", "ME", "MNE", "Europe", "Southern Europe"),
+    ("Morocco", "MA", "MAR", "Africa", "Northern Africa"),
+    ("Mozambique", "MZ", "MOZ", "Africa", "Eastern Africa"),
+    ("Myanmar", "MM", "MMR", "Asia", "South-eastern Asia"),
+    ("Namibia", "NA", "NAM", "Africa", "Southern Africa"),
+    ("Nauru", "NR", "NRU", "Oceania", "Micronesia"),
+    ("Nepal", "NP", "NPL", "Asia", "Southern Asia"),
+    ("Netherlands", "NL", "NLD", "Europe", "Western Europe"),
+    ("New Zealand", "NZ", "NZL", "Oceania", "Australia and New Zealand"),
+    ("Nicaragua", "NI", "NIC", "Americas", "Central America"),
+    ("Niger", "NE", "NER", "Africa", "Western Africa"),
+    ("Nigeria", "NG", "NGA", "Africa", "Western Africa"),
+    ("North Korea", "KP", "PRK", "Asia", "Eastern Asia"),
+    ("North Macedonia", "MK", "MKD", "Europe", "Southern Europe"),
+    ("Norway", "NO", "NOR", "Europe", "Northern Europe"),
+    ("Oman", "OM", "OMN", "Asia", "Western Asia"),
+    ("Pakistan", "PK", "PAK", "Asia", "Southern Asia"),
+    ("Palau", "PW", "PLW", "Oceania", "Micronesia"),
+    ("Palestine", "PS", "PSE", "Asia", "Western Asia"),
+    ("Panama", "PA", "PAN", "Americas", "Central America"),
+    ("Papua New Guinea", "PG", "PNG", "Oceania", "Melanesia"),
+    ("Paraguay", "PY", "PRY", "Americas", "South America"),
+    ("Peru", "PE", "PER", "Americas", "South America"),
+    ("Philippines", "PH", "PHL", "Asia", "South-eastern Asia"),
+    ("Poland", "PL", "POL", "Europe", "Eastern Europe"),
+    ("Portugal", "PT", "PRT", "Europe", "Southern Europe"),
+    ("Qatar", "QA", "QAT", "Asia", "Western Asia"),
+    ("Romania", "RO", "ROU", "Europe", "Eastern Europe"),
+    ("Russia", "RU", "RUS", "Europe", "Eastern Europe"),
+    ("Rwanda", "RW", "RWA", "Africa", "Eastern Africa"),
+    ("Saint Kitts and Nevis", "KN", "KNA", "Americas", "Caribbean"),
+    ("Saint Lucia", "LC", "LCA", "Americas", "Caribbean"),
+    ("Saint Vincent and the Grenadines", "VC", "VCT", "Americas", "Caribbean"),
+    ("Samoa", "WS", "WSM", "Oceania", "Polynesia"),
+    ("San Marino", "SM", "SMR", "Europe", "Southern Europe"),
+    ("Sao Tome and Principe", "ST", "STP", "Africa", "Middle Africa"),
+    ("Saudi Arabia", "SA", "SAU", "Asia", "Western Asia"),
+    ("Senegal", "SN", "SEN", "Africa", "Western Africa"),
+    ("Serbia", "RS", "SRB", "Europe", "Southern Europe"),
+    ("Seychelles", "SC", "SYC", "Africa", "Eastern Africa"),
+    ("Sierra Leone", "SL", "SLE", "Africa", "Western Africa"),
+    ("Singapore", "SG", "SGP", "Asia", "South-eastern Asia"),
+    ("Slovakia", "SK", "SVK", "Europe", "Eastern Europe"),
+    ("Slovenia", "SI", "SVN", "Europe", "Southern Europe"),
+    ("Solomon Islands", "SB", "SLB", "Oceania", "Melanesia"),
+    ("Somalia", "SO", "SOM", "Africa", "Eastern Africa"),
+    ("South Africa", "ZA", "ZAF", "Africa", "Southern Africa"),
+    ("South Korea", "KR", "KOR", "Asia", "Eastern Asia"),
+    ("South Sudan", "SS", "SSD", "Africa", "Eastern Africa"),
+    ("Spain", "ES", "ESP", "Europe", "Southern Europe"),
+    ("Sri Lanka", "LK", "LKA", "Asia", "Southern Asia"),
+    ("Sudan", "SD", "SDN", "Africa", "Northern Africa"),
+    ("Suriname", "SR", "SUR", "Americas", "South America"),
+    ("Sweden", "SE", "SWE", "Europe", "Northern Europe"),
+    ("Switzerland", "CH", "CHE", "Europe", "Western Europe"),
+    ("Syria", "SY", "SYR", "Asia", "Western Asia"),
+    ("Tajikistan", "TJ", "TJK", "Asia", "Central Asia"),
+    ("Tanzania", "TZ", "TZA", "Africa", "Eastern Africa"),
+    ("Thailand", "TH", "THA", "Asia", "South-eastern Asia"),
+    ("Timor-Leste", "TL", "TLS", "Asia", "South-eastern Asia"),
+    ("Togo", "TG", "TGO", "Africa", "Western Africa"),
+    ("Tonga", "TO", "TON", "Oceania", "Polynesia"),
+    ("Trinidad and Tobago", "TT", "TTO", "Americas", "Caribbean"),
+    ("Tunisia", "TN", "TUN", "Africa", "Northern Africa"),
+    ("Turkey", "TR", "TUR", "Asia", "Western Asia"),
+    ("Turkmenistan", "TM", "TKM", "Asia", "Central Asia"),
+    ("Tuvalu", "TV", "TUV", "Oceania", "Polynesia"),
+    ("Uganda", "UG", "UGA", "Africa", "Eastern Africa"),
+    ("Ukraine", "UA", "UKR", "Europe", "Eastern Europe"),
+    ("United Arab Emirates", "AE", "ARE", "Asia", "Western Asia"),
+    ("United Kingdom", "GB", "GBR", "Europe", "Northern Europe"),
+    ("United States", "US", "USA", "Americas", "Northern America"),
+    ("Uruguay", "UY", "URY", "Americas", "South America"),
+    ("Uzbekistan", "UZ", "UZB", "Asia", "Central Asia"),
+    ("Vanuatu", "VU", "VUT", "Oceania", "Melanesia"),
+    ("Venezuela", "VE", "VEN", "Americas", "South America"),
+    ("Vietnam", "VN", "VNM", "Asia", "South-eastern Asia"),
+    ("Yemen", "YE", "YEM", "Asia", "Western Asia"),
+    ("Zambia", "ZM", "ZMB", "Africa", "Eastern Africa"),
+    ("Zimbabwe", "ZW", "ZWE", "Africa", "Eastern Africa"),
+)
+
+# Alternative English names, keyed by ISO alpha-3
+COUNTRY_ALIASES: Dict[str, List[str]] = {
+    "BHS": ["The Bahamas"],
+    "BRN": ["Brunei Darussalam"],
+    "BOL": ["Plurinational State of Bolivia"],
+    "CPV": ["Cape Verde"],
+    "CIV": ["Ivory Coast", "Côte d'Ivoire"],
+    "COD": ["DR Congo", "DRC", "Congo-Kinshasa"],
+    "COG": ["Republic of the Congo", "Congo-Brazzaville"],
+    "CZE": ["Czech Republic"],
+    "FSM": ["Federated States of Micronesia"],
+    "GMB": ["The Gambia"],
+    "IRN": ["Islamic Republic of Iran"],
+    "LAO": ["Lao PDR", "Lao People's Democratic Republic"],
+    "MMR": ["Burma"],
+    "MKD": ["Macedonia"],
+    "NLD": ["The Netherlands", "Holland"],
+    "PRK": ["Democratic People's Republic of Korea", "DPRK"],
+    "KOR": ["Republic of Korea", "Korea"],
+    "MDA": ["Republic of Moldova"],
+    "PSE": ["State of Palestine"],
+    "RUS": ["Russian Federation"],
+    "SWZ": ["Swaziland"],
+    "SYR": ["Syrian Arab Republic"],
+    "TLS": ["East Timor"],
+    "TUR": ["Türkiye", "Turkiye"],
+    "TZA": ["United Republic of Tanzania"],
+    "ARE": ["UAE", "Emirates"],
+    "GBR": ["UK", "Britain", "Great Britain"],
+    "USA": ["United States of America", "USA", "US"],
+    "VEN": ["Bolivarian Republic of Venezuela"],
+    "VNM": ["Viet Nam"],
+}
+
+# Small Island Developing States among the countries above (UN-OHRLLS list)
+SMALL_ISLAND_STATES = frozenset({
+    "ATG", "BHS", "BRB", "BLZ", "CPV", "COM", "CUB", "DMA", "DOM", "FJI", "FSM", "GRD",
+    "GNB", "GUY", "HTI", "JAM", "KIR", "MDV", "MHL", "MUS", "NRU", "PLW", "PNG", "KNA",
+    "LCA", "VCT", "WSM", "STP", "SYC", "SGP", "SLB", "SUR", "TLS", "TON", "TTO", "TUV",
+    "VUT", "BHR",
+})
+
+# Country names in Spanish, French, Portuguese and German, plus common
+# endonyms, where they differ from the English name. Names that are also
+# common given names or English words (Maurice, Mauricio, German "Island")
+# are left out.
+COUNTRY_TRANSLATIONS: Dict[str, List[str]] = {
+    "AFG": ["Afganistán", "Afeganistão"],
+    "ALB": ["Albanie", "Albânia", "Albanien"],
+    "DZA": ["Argelia", "Algérie", "Argélia", "Algerien"],
+    "ATG": ["Antigua y Barbuda", "Antigua-et-Barbuda", "Antígua e Barbuda", "Antigua und Barbuda"],
+    "ARG": ["Argentine", "Argentinien"],
+    "ARM": ["Arménie", "Armênia", "Arménia", "Armenien"],
+    "AUS": ["Australie", "Austrália", "Australien"],
+    "AUT": ["Autriche", "Áustria", "Österreich"],
+    "AZE": ["Azerbaiyán", "Azerbaïdjan", "Azerbaijão", "Aserbaidschan"],
+    "BHR": ["Baréin", "Bahreïn", "Barém"],
+    "BGD": ["Bangladés", "Bangladeche", "Bangladesch"],
+    "BRB": ["Barbade"],
+    "BLR": ["Bielorrusia", "Biélorussie", "Bielorrússia", "Weißrussland"],
+    "BEL": ["Bélgica", "Belgique", "Belgien"],
+    "BLZ": ["Belice"],
+    "BEN": ["Benín", "Bénin", "Benim"],
+    "BTN": ["Bután", "Bhoutan", "Butão"],
+    "BOL": ["Bolivie", "Bolívia", "Bolivien"],
+    "BIH": ["Bosnia y Herzegovina", "Bosnie-Herzégovine", "Bósnia e Herzegovina",
+            "Bosnien und Herzegowina"],
+    "BWA": ["Botsuana"],
+    "BRA": ["Brasil", "Brésil", "Brasilien"],
+    "BRN": ["Brunéi"],
+    "BGR": ["Bulgarie", "Bulgária", "Bulgarien"],
+    "CPV": ["Cap-Vert", "Kap Verde"],
+    "KHM": ["Camboya", "Cambodge", "Camboja", "Kambodscha"],
+    "CMR": ["Camerún", "Cameroun", "Camarões", "Kamerun"],
+    "CAN": ["Canadá", "Kanada"],
+    "CAF": ["República Centroafricana", "République centrafricaine", "República Centro-Africana",
+            "Zentralafrikanische Republik"],
+    "TCD": ["Tchad", "Chade", "Tschad"],
+    "CHN": ["Chine"],
+    "COL": ["Colombie", "Colômbia", "Kolumbien"],
+    "COM": ["Comoras", "Comores", "Komoren"],
+    "COD": ["República Democrática del Congo", "République démocratique du Congo",
+            "República Democrática do Congo", "Demokratische Republik Kongo"],
+    "CRI": ["Kostarika"],
+    "CIV": ["Costa de Marfil", "Costa do Marfim", "Elfenbeinküste"],
+    "HRV": ["Croacia", "Croatie", "Croácia", "Kroatien", "Hrvatska"],
+    "CUB": ["Kuba"],
+    "CYP": ["Chipre", "Chypre", "Zypern"],
+    "CZE": ["República Checa", "Chequia", "Tchéquie", "Chéquia", "Tschechien"],
+    "DNK": ["Dinamarca", "Danemark", "Dänemark", "Danmark"],
+    "DJI": ["Yibuti", "Dschibuti"],
+    "DOM": ["República Dominicana", "République dominicaine", "Dominikanische Republik"],
+    "ECU": ["Équateur", "Equador"],
+    "EGY": ["Egipto", "Égypte", "Egito", "Ägypten"],
+    "GNQ": ["Guinea Ecuatorial", "Guinée équatoriale", "Guiné Equatorial", "Äquatorialguinea"],
+    "ERI": ["Érythrée", "Eritreia"],
+    "EST": ["Estonie", "Estónia", "Estland", "Eesti"],
+    "SWZ": ["Esuatini"],
+    "ETH": ["Etiopía", "Éthiopie", "Etiópia", "Äthiopien"],
+    "FJI": ["Fiyi", "Fidji", "Fidschi"],
+    "FIN": ["Finlandia", "Finlande", "Finlândia", "Finnland", "Suomi"],
+    "FRA": ["Francia", "França", "Frankreich"],
+    "GAB": ["Gabón", "Gabão"],
+    "GEO": ["Géorgie", "Geórgia", "Georgien"],
+    "DEU": ["Alemania", "Allemagne", "Alemanha", "Deutschland"],
+    "GRC": ["Grecia", "Grèce", "Grécia", "Griechenland"],
+    "GIN": ["Guinée", "Guiné"],
+    "GNB": ["Guinea-Bisáu", "Guinée-Bissau", "Guiné-Bissau"],
+    "HTI": ["Haití", "Haïti"],
+    "HUN": ["Hungría", "Hongrie", "Hungria", "Ungarn"],
+    "ISL": ["Islandia", "Islande", "Islândia"],
+    "IND": ["Inde", "Índia", "Indien", "Bharat"],
+    "IDN": ["Indonésie", "Indonésia", "Indonesien"],
+    "IRN": ["Irán", "Irão"],
+    "IRQ": ["Irak", "Iraque"],
+    "IRL": ["Irlanda", "Irlande", "Irland"],
+    "ISR": ["Israël"],
+    "ITA": ["Italia", "Italie", "Itália", "Italien"],
+    "JAM": ["Jamaïque", "Jamaika"],
+    "JPN": ["Japón", "Japon", "Japão", "Nippon"],
+    "JOR": ["Jordania", "Jordanie", "Jordânia", "Jordanien"],
+    "KAZ": ["Kazajistán", "Cazaquistão", "Kasachstan"],
+    "KEN": ["Kenia", "Quénia", "Quênia"],
+    "KWT": ["Koweït"],
+    "KGZ": ["Kirguistán", "Kirghizistan", "Quirguistão", "Kirgisistan"],
+    "LVA": ["Letonia", "Lettonie", "Letônia", "Letónia", "Lettland"],
+    "LBN": ["Líbano", "Liban", "Libanon"],
+    "LSO": ["Lesoto"],
+    "LBR": ["Libéria"],
+    "LBY": ["Libia", "Libye", "Líbia", "Libyen"],
+    "LTU": ["Lituania", "Lituanie", "Lituânia", "Litauen"],
+    "LUX": ["Luxemburgo", "Luxemburg"],
+    "MDG": ["Madagáscar", "Madagaskar"],
+    "MWI": ["Malaui", "Malávi"],
+    "MYS": ["Malasia", "Malaisie", "Malásia"],
+    "MDV": ["Maldivas", "Malediven"],
+    "MLT": ["Malte"],
+    "MHL": ["Islas Marshall", "Îles Marshall", "Ilhas Marshall", "Marshallinseln"],
+    "MRT": ["Mauritanie", "Mauritânia", "Mauretanien"],
+    "MEX": ["México", "Mexique", "Mexiko"],
+    "FSM": ["Micronésie", "Micronésia", "Mikronesien"],
+    "MDA": ["Moldavia", "Moldavie", "Moldávia", "Moldau"],
+    "MNG": ["Mongolie", "Mongólia", "Mongolei"],
+    "MNE": ["Monténégro"],
+    "MAR": ["Marruecos", "Maroc", "Marrocos", "Marokko"],
+    "MOZ": ["Moçambique", "Mosambik"],
+    "MMR": ["Birmania", "Birmanie", "Birmânia"],
+    "NAM": ["Namibie", "Namíbia"],
+    "NPL": ["Népal"],
+    "NLD": ["Países Bajos", "Pays-Bas", "Países Baixos", "Niederlande", "Holanda", "Nederland"],
+    "NZL": ["Nueva Zelanda", "Nouvelle-Zélande", "Nova Zelândia", "Neuseeland"],
+    "NER": ["Níger"],
+    "NGA": ["Nigéria"],
+    "PRK": ["Corea del Norte", "Corée du Nord", "Coreia do Norte", "Nordkorea"],
+    "MKD": ["Macedonia del Norte", "Macédoine du Nord", "Macedônia do Norte", "Nordmazedonien"],
+    "NOR": ["Noruega", "Norvège", "Norwegen", "Norge"],
+    "OMN": ["Omán"],
+    "PAK": ["Pakistán", "Paquistão"],
+    "PLW": ["Palaos"],
+    "PSE": ["Palestina"],
+    "PAN": ["Panamá"],
+    "PNG": ["Papúa Nueva Guinea", "Papouasie-Nouvelle-Guinée", "Papua-Nova Guiné", "Papua-Neuguinea"],
+    "PRY": ["Paraguai"],
+    "PER": ["Perú", "Pérou"],
+    "PHL": ["Filipinas", "Philippinen"],
+    "POL": ["Polonia", "Pologne", "Polónia", "Polônia", "Polen", "Polska"],
+    "QAT": ["Catar", "Katar"],
+    "ROU": ["Rumania", "Roumanie", "Roménia", "Romênia", "Rumänien"],
+    "RUS": ["Rusia", "Russie", "Rússia", "Russland"],
+    "RWA": ["Ruanda"],
+    "WSM": ["Samoa Occidental"],
+    "STP": ["Santo Tomé y Príncipe", "São Tomé e Príncipe", "São Tomé-et-Principe"],
+    "SAU": ["Arabia Saudita", "Arabie saoudite", "Arábia Saudita", "Saudi-Arabien"],
+    "SEN": ["Sénégal"],
+    "SRB": ["Serbie", "Sérvia", "Serbien"],
+    "SYC": ["Seicheles", "Seychellen"],
+    "SLE": ["Sierra Leona", "Serra Leoa"],
+    "SGP": ["Singapur", "Singapour", "Singapura"],
+    "SVK": ["Eslovaquia", "Slovaquie", "Eslováquia", "Slowakei"],
+    "SVN": ["Eslovenia", "Slovénie", "Eslovénia", "Slowenien"],
+    "SLB": ["Islas Salomón", "Îles Salomon", "Ilhas Salomão", "Salomonen"],
+    "SOM": ["Somalie", "Somália"],
+    "ZAF": ["Sudáfrica", "Afrique du Sud", "África do Sul", "Südafrika"],
+    "KOR": ["Corea del Sur", "Corée du Sud", "Coreia do Sul", "Südkorea"],
+    "SSD": ["Sudán del Sur", "Soudan du Sud", "Sudão do Sul", "Südsudan"],
+    "ESP": ["España", "Espagne", "Espanha", "Spanien"],
+    "SDN": ["Sudán", "Soudan", "Sudão"],
+    "SUR": ["Surinam"],
+    "SWE": ["Suecia", "Suède", "Suécia", "Schweden", "Sverige"],
+    "CHE": ["Suiza", "Suisse", "Suíça", "Schweiz"],
+    "SYR": ["Siria", "Syrie", "Síria", "Syrien"],
+    "TJK": ["Tayikistán", "Tadjikistan", "Tajiquistão", "Tadschikistan"],
+    "TZA": ["Tanzanie", "Tanzânia", "Tansania"],
+    "THA": ["Tailandia", "Thaïlande", "Tailândia"],
+    "TLS": ["Timor Oriental", "Osttimor"],
+    "TTO": ["Trinidad y Tobago", "Trinité-et-Tobago", "Trindade e Tobago", "Trinidad und Tobago"],
+    "TUN": ["Túnez", "Tunisie", "Tunísia", "Tunesien"],
+    "TUR": ["Turquía", "Turquie", "Turquia", "Türkei"],
+    "TKM": ["Turkmenistán", "Turkménistan", "Turquemenistão"],
+    "UGA": ["Ouganda"],
+    "UKR": ["Ucrania", "Ucrânia"],
+    "ARE": ["Emiratos Árabes Unidos", "Émirats arabes unis", "Emirados Árabes Unidos",
+            "Vereinigte Arabische Emirate"],
+    "GBR": ["Reino Unido", "Royaume-Uni", "Vereinigtes Königreich"],
+    "USA": ["Estados Unidos", "États-Unis", "Vereinigte Staaten"],
+    "URY": ["Uruguai"],
+    "UZB": ["Uzbekistán", "Ouzbékistan", "Usbequistão", "Usbekistan"],
+    "VEN": ["Venezuela"],
+    "VNM": ["Viêt Nam", "Vietnã", "Vietname"],
+    "YEM": ["Yémen", "Iémen", "Iêmen", "Jemen"],
+    "ZMB": ["Zambie", "Zâmbia", "Sambia"],
+    "ZWE": ["Zimbabue", "Zimbábue", "Simbabwe"],
+}
+
+# English demonyms. Ambiguous ones (Congolese, Dominican, Guinean) and those
+# that double as the name of a language spoken across many countries
+# (English, French, Spanish, Portuguese) are left out.
+COUNTRY_DEMONYMS: Dict[str, List[str]] = {
+    "AFG": ["Afghan"], "ALB": ["Albanian"], "DZA": ["Algerian"], "AND": ["Andorran"],
+    "AGO": ["Angolan"], "ATG": ["Antiguan"], "ARG": ["Argentine", "Argentinian"],
+    "ARM": ["Armenian"], "AUS": ["Australian"], "AUT": ["Austrian"], "AZE": ["Azerbaijani"],
+    "BHS": ["Bahamian"], "BHR": ["Bahraini"], "BGD": ["Bangladeshi"], "BRB": ["Barbadian"],
+    "BLR": ["Belarusian"], "BEL": ["Belgian"], "BLZ": ["Belizean"], "BEN": ["Beninese"],
+    "BTN": ["Bhutanese"], "BOL": ["Bolivian"], "BIH": ["Bosnian"], "BWA": ["Motswana", "Batswana"],
+    "BRA": ["Brazilian"], "BRN": ["Bruneian"], "BGR": ["Bulgarian"], "BFA": ["Burkinabe"],
+    "BDI": ["Burundian"], "CPV": ["Cape Verdean", "Cabo Verdean"], "KHM": ["Cambodian"],
+    "CMR": ["Cameroonian"], "CAN": ["Canadian"], "TCD": ["Chadian"], "CHL": ["Chilean"],
+    "CHN": ["Chinese"], "COL": ["Colombian"], "COM": ["Comorian"], "CRI": ["Costa Rican"],
+    "CIV": ["Ivorian"], "HRV": ["Croatian"], "CUB": ["Cuban"], "CYP": ["Cypriot"], "CZE": ["Czech"],
+    "DNK": ["Danish"], "DJI": ["Djiboutian"], "ECU": ["Ecuadorian"], "EGY": ["Egyptian"],
+    "SLV": ["Salvadoran"], "GNQ": ["Equatorial Guinean"], "ERI": ["Eritrean"], "EST": ["Estonian"],
+    "SWZ": ["Swazi"], "ETH": ["Ethiopian"], "FJI": ["Fijian"], "FIN": ["Finnish"],
+    "GAB": ["Gabonese"], "GMB": ["Gambian"], "GEO": ["Georgian"], "DEU": ["German"],
+    "GHA": ["Ghanaian"], "GRC": ["Greek"], "GRD": ["Grenadian"], "GTM": ["Guatemalan"],
+    "GNB": ["Bissau-Guinean"], "GUY": ["Guyanese"], "HTI": ["Haitian"], "HND": ["Honduran"],
+    "HUN": ["Hungarian"], "ISL": ["Icelandic"], "IND": ["Indian"], "IDN": ["Indonesian"],
+    "IRN": ["Iranian"], "IRQ": ["Iraqi"], "IRL": ["Irish"], "ISR": ["Israeli"], "ITA": ["Italian"],
+    "JAM": ["Jamaican"], "JPN": ["Japanese"], "JOR": ["Jordanian"], "KAZ": ["Kazakh", "Kazakhstani"],
+    "KEN": ["Kenyan"], "KWT": ["Kuwaiti"], "KGZ": ["Kyrgyz"], "LAO": ["Lao", "Laotian"],
+    "LVA": ["Latvian"], "LBN": ["Lebanese"], "LSO": ["Basotho", "Mosotho"], "LBR": ["Liberian"],
+    "LBY": ["Libyan"], "LIE": ["Liechtensteiner"], "LTU": ["Lithuanian"], "LUX": ["Luxembourgish"],
+    "MDG": ["Malagasy"], "MWI": ["Malawian"], "MYS": ["Malaysian"], "MDV": ["Maldivian"],
+    "MLI": ["Malian"], "MLT": ["Maltese"], "MHL": ["Marshallese"], "MRT": ["Mauritanian"],
+    "MUS": ["Mauritian"], "MEX": ["Mexican"], "FSM": ["Micronesian"], "MDA": ["Moldovan"],
+    "MCO": ["Monegasque"], "MNG": ["Mongolian"], "MNE": ["Montenegrin"], "MAR": ["Moroccan"],
+    "MOZ": ["Mozambican"], "MMR": ["Burmese"], "NAM": ["Namibian"], "NRU": ["Nauruan"],
+    "NPL": ["Nepali", "Nepalese"], "NLD": ["Dutch"], "NZL": ["New Zealander"], "NIC": ["Nicaraguan"],
+    "NER": ["Nigerien"], "NGA": ["Nigerian"], "PRK": ["North Korean"], "MKD": ["Macedonian"],
+    "NOR": ["Norwegian"], "OMN": ["Omani"], "PAK": ["Pakistani"], "PLW": ["Palauan"],
+    "PSE": ["Palestinian"], "PAN": ["Panamanian"], "PNG": ["Papua New Guinean"],
+    "PRY": ["Paraguayan"], "PER": ["Peruvian"], "PHL": ["Filipino", "Philippine"], "POL": ["Polish"],
+    "QAT": ["Qatari"], "ROU": ["Romanian"], "RUS": ["Russian"], "RWA": ["Rwandan"],
+    "KNA": ["Kittitian"], "LCA": ["Saint Lucian"], "VCT": ["Vincentian"], "WSM": ["Samoan"],
+    "SMR": ["Sammarinese"], "STP": ["Santomean"], "SAU": ["Saudi"], "SEN": ["Senegalese"],
+    "SRB": ["Serbian"], "SYC": ["Seychellois"], "SLE": ["Sierra Leonean"], "SGP": ["Singaporean"],
+    "SVK": ["Slovak"], "SVN": ["Slovenian", "Slovene"], "SLB": ["Solomon Islander"],
+    "SOM": ["Somali"], "ZAF": ["South African"], "KOR": ["South Korean", "Korean"],
+    "SSD": ["South Sudanese"], "LKA": ["Sri Lankan"], "SDN": ["Sudanese"], "SUR": ["Surinamese"],
+    "SWE": ["Swedish"], "CHE": ["Swiss"], "SYR": ["Syrian"], "TJK": ["Tajik"], "TZA": ["Tanzanian"],
+    "THA": ["Thai"], "TLS": ["Timorese", "East Timorese"], "TGO": ["Togolese"], "TON": ["Tongan"],
+    "TTO": ["Trinidadian"], "TUN": ["Tunisian"], "TUR": ["Turkish"], "TKM": ["Turkmen"],
+    "TUV": ["Tuvaluan"], "UGA": ["Ugandan"], "UKR": ["Ukrainian"], "ARE": ["Emirati"],
+    "GBR": ["British"], "USA": ["American"], "URY": ["Uruguayan"], "UZB": ["Uzbek"],
+    "VEN": ["Venezuelan"], "VNM": ["Vietnamese"], "YEM": ["Yemeni"], "ZMB": ["Zambian"],
+    "ZWE": ["Zimbabwean"],
+}
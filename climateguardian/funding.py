@@ -0,0 +1,282 @@
+"""
+Funding opportunity index for ClimateGuardian
+Funding rows give amounts and deadlines as text ("$50M", "USD 2.5 million",
+"August 2027", "15 January 2027", "Rolling"). A FundingIndex parses them
+once into numbers and dates and keeps the opportunities sorted by deadline
+and by amount next to region and organization type postings, so "grants
+over $10M closing in the next 90 days for Pacific governments" is answered
+by bisecting the sorted lists and intersecting the narrowest matches
+instead of reading every opportunity. Every deadline range starts today,
+so opportunities whose deadline has passed are never returned.
+"""
+
+import calendar
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+_MULTIPLIERS = {"k": 1e3, "thousand": 1e3, "m": 1e6, "mn": 1e6, "million": 1e6,
+                "b": 1e9, "bn": 1e9, "billion": 1e9}
+_SCALE = r"(k|thousand|mn|m|million|bn|b|billion)?\b"
+# "$50M", "US$ 2.5 million", "USD 500,000"; a bare "10M" or "10 million" only
+# in questions, whose cache keys drop the "$"
+_AMOUNT = re.compile(r"(?:us\$|\$|usd\s?)\s*(\d[\d,]*(?:\.\d+)?)\s*" + _SCALE, re.IGNORECASE)
+_BARE_AMOUNT = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*(k|thousand|mn|m|million|bn|b|billion)\b", re.IGNORECASE)
+
+_MONTHS = {name.lower(): number for number, name in enumerate(calendar.month_name) if name}
+_MONTHS.update({name.lower(): number for number, name in enumerate(calendar.month_abbr) if name}, sept=9)
+_MONTH = "(" + "|".join(sorted(_MONTHS, key=len, reverse=True)) + r")\.?"
+_ISO_DATE = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
+_DAY_MONTH_YEAR = re.compile(r"\b(\d{1,2})(?:st|nd|rd|th)?\s+" + _MONTH + r",?\s+(\d{4})\b", re.IGNORECASE)
+_MONTH_DAY_YEAR = re.compile(r"\b" + _MONTH + r"\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})\b", re.IGNORECASE)
+_MONTH_YEAR = re.compile(r"\b" + _MONTH + r"\s+(\d{4})\b", re.IGNORECASE)
+_QUARTER = re.compile(r"\bQ([1-4])\s+(\d{4})\b", re.IGNORECASE)
+
+# An amount in a question: "$10M", "USD 500,000", "10 million"
+_AMOUNT_PHRASE = r"((?:us\$|usd)?\s*\S+(?:\s+(?:thousand|million|billion))?)"
+_BETWEEN = re.compile(r"\bbetween\s+(.+?)\s+and\s+" + _AMOUNT_PHRASE, re.IGNORECASE)
+_MINIMUM = re.compile(r"\b(?:over|above|more than|greater than|at least|exceeding|minimum of|no less than)\s+"
+                      + _AMOUNT_PHRASE, re.IGNORECASE)
+_MAXIMUM = re.compile(r"\b(?:under|below|less than|up to|at most|no more than|maximum of|smaller than)\s+"
+                      + _AMOUNT_PHRASE, re.IGNORECASE)
+_WINDOW = re.compile(r"\b(?:next|within|coming|in)\s+(?:the\s+)?(?:next\s+)?(\d+|a|one|two|three|six)\s+"
+                     r"(day|week|month)s?\b", re.IGNORECASE)
+_BEFORE = re.compile(r"\b(before|by|until|no later than)\s+(.+)", re.IGNORECASE)
+_WINDOW_NUMBERS = {"a": 1, "one": 1, "two": 2, "three": 3, "six": 6}
+# Every limit has a number or a "day", "week" or "month" window in it
+_LIMIT_HINT = re.compile(r"\d|\b(?:day|week|month)s?\b", re.IGNORECASE)
+
+
+def current_date() -> date:
+    """Today's date; deadline ranges start here"""
+    return date.today()
+
+
+def _number(text: str, scale: Optional[str]) -> float:
+    return float(text.replace(",", "")) * _MULTIPLIERS.get((scale or "").lower(), 1.0)
+
+
+def parse_amount(text: str, require_currency: bool = True) -> Optional[float]:
+    """Largest amount in ``text`` in US dollars ("$1M-$5M" is 5,000,000); None if there is none.
+
+    Without ``require_currency`` a bare "10M" or "10 million" counts too,
+    as it does in questions.
+    """
+    amounts = [_number(number, scale) for number, scale in _AMOUNT.findall(text)]
+    if not require_currency:
+        amounts += [_number(number, scale) for number, scale in _BARE_AMOUNT.findall(text)]
+    return max(amounts) if amounts else None
+
+
+def format_amount(amount: float) -> str:
+    """Short dollar figure as written in the datasets: $500K, $12M, $2.3B"""
+    for threshold, suffix in ((1e9, "B"), (1e6, "M"), (1e3, "K")):
+        if amount >= threshold:
+            return f"${amount / threshold:.1f}".rstrip("0").rstrip(".") + suffix
+    return f"${amount:,.0f}"
+
+
+def _add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    year, month = day.year + month // 12, month % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def _period(text: str) -> Optional[Tuple[date, date]]:
+    """First and last day of the date, month or quarter named in ``text``"""
+    try:
+        match = _ISO_DATE.search(text)
+        if match:
+            day = date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+            return day, day
+        match = _DAY_MONTH_YEAR.search(text)
+        if match:
+            day = date(int(match.group(3)), _MONTHS[match.group(2).lower()], int(match.group(1)))
+            return day, day
+        match = _MONTH_DAY_YEAR.search(text)
+        if match:
+            day = date(int(match.group(3)), _MONTHS[match.group(1).lower()], int(match.group(2)))
+            return day, day
+    except ValueError:
+        return None
+    match = _MONTH_YEAR.search(text)
+    if match:
+        year, month = int(match.group(2)), _MONTHS[match.group(1).lower()]
+        return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+    match = _QUARTER.search(text)
+    if match:
+        year, month = int(match.group(2)), int(match.group(1)) * 3
+        return date(year, month - 2, 1), date(year, month, calendar.monthrange(year, month)[1])
+    return None
+
+
+def parse_deadline(text: str) -> Optional[date]:
+    """Last day an application is accepted; None for rolling or unreadable deadlines.
+
+    A month without a day ("August 2027") closes on its last day and a
+    quarter ("Q3 2027") on the last day of its last month.
+    """
+    period = _period(text)
+    return period[1] if period else None
+
+
+@dataclass
+class FundingRequest:
+    """Amount and deadline limits asked for in a funding question"""
+    min_amount: Optional[float] = None
+    max_amount: Optional[float] = None
+    closes_by: Optional[date] = None
+
+    def __bool__(self) -> bool:
+        return self.min_amount is not None or self.max_amount is not None or self.closes_by is not None
+
+    def describe(self) -> str:
+        """The limits as a phrase ("over $10M, closing by 15 January 2027"), empty without any"""
+        parts = []
+        if self.min_amount is not None and self.max_amount is not None:
+            parts.append(f"between {format_amount(self.min_amount)} and {format_amount(self.max_amount)}")
+        elif self.min_amount is not None:
+            parts.append(f"over {format_amount(self.min_amount)}")
+        elif self.max_amount is not None:
+            parts.append(f"up to {format_amount(self.max_amount)}")
+        if self.closes_by is not None:
+            parts.append(f"closing by {self.closes_by.day} {calendar.month_name[self.closes_by.month]} "
+                         f"{self.closes_by.year}")
+        return ", ".join(parts)
+
+
+def funding_request(question: str, today: Optional[date] = None) -> FundingRequest:
+    """Amount limits ("over $10M", "between $5M and $20M") and a deadline window
+    ("in the next 90 days", "within 3 months", "before March 2027") in a question"""
+    request = FundingRequest()
+    if not _LIMIT_HINT.search(question):
+        return request
+    today = today or current_date()
+
+    between = _BETWEEN.search(question)
+    if between:
+        low, high = parse_amount(between.group(1), False), parse_amount(between.group(2), False)
+        if low is not None and high is not None:
+            request.min_amount, request.max_amount = min(low, high), max(low, high)
+    if request.min_amount is None:
+        for pattern, field in ((_MINIMUM, "min_amount"), (_MAXIMUM, "max_amount")):
+            match = pattern.search(question)
+            if match:
+                setattr(request, field, parse_amount(match.group(1), False))
+
+    window = _WINDOW.search(question)
+    if window:
+        count = window.group(1).lower()
+        count = int(count) if count.isdigit() else _WINDOW_NUMBERS[count]
+        unit = window.group(2).lower()
+        if unit == "month":
+            request.closes_by = _add_months(today, count)
+        else:
+            request.closes_by = today + timedelta(days=count * (7 if unit == "week" else 1))
+    else:
+        before = _BEFORE.search(question)
+        period = _period(before.group(2)) if before else None
+        if period:
+            # "before March 2027" ends with February; "by March 2027" includes March
+            if before.group(1).lower() == "before":
+                request.closes_by = period[0] - timedelta(days=1)
+            else:
+                request.closes_by = period[1]
+    return request
+
+
+class FundingIndex:
+    """Funding opportunities with parsed amounts and deadlines, sorted for range queries.
+
+    Positions are indexes into the opportunity list given. Opportunities
+    without a readable deadline (rolling calls) never expire and are
+    listed after dated ones; those without a readable amount match no
+    amount limit.
+    """
+
+    def __init__(self, opportunities: Sequence[Dict]):
+        self.amounts: List[Optional[float]] = [parse_amount(str(opportunity.get("amount", "")))
+                                               for opportunity in opportunities]
+        self.deadlines: List[Optional[date]] = [parse_deadline(str(opportunity.get("deadline", "")))
+                                                for opportunity in opportunities]
+
+        dated = sorted((deadline.toordinal(), position) for position, deadline in enumerate(self.deadlines)
+                       if deadline is not None)
+        self._deadline_keys = [key for key, _ in dated]
+        self._by_deadline = [position for _, position in dated]
+        self._open_ended = [position for position, deadline in enumerate(self.deadlines) if deadline is None]
+        # Result order: soonest deadline first, rolling calls last
+        self._order = {position: rank for rank, position in enumerate(self._by_deadline + self._open_ended)}
+
+        priced = sorted((amount, position) for position, amount in enumerate(self.amounts) if amount is not None)
+        self._amount_keys = [key for key, _ in priced]
+        self._by_amount = [position for _, position in priced]
+
+        self.by_region: Dict[str, Set[int]] = {}
+        self.by_organization: Dict[str, Set[int]] = {}
+        for position, opportunity in enumerate(opportunities):
+            for region_id in opportunity.get("regions", []):
+                self.by_region.setdefault(region_id, set()).add(position)
+            for org_type in opportunity.get("organization_types", []):
+                self.by_organization.setdefault(org_type, set()).add(position)
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    def open(self, today: Optional[date] = None, closes_by: Optional[date] = None) -> List[int]:
+        """Positions still accepting applications today, closing by ``closes_by`` if given, soonest first"""
+        today = today or current_date()
+        start = bisect_left(self._deadline_keys, today.toordinal())
+        if closes_by is None:
+            return self._by_deadline[start:] + self._open_ended
+        return self._by_deadline[start:bisect_right(self._deadline_keys, closes_by.toordinal())]
+
+    def query(self, regions: Iterable[str] = (), organization_types: Iterable[str] = (),
+              min_amount: Optional[float] = None, max_amount: Optional[float] = None,
+              closes_by: Optional[date] = None, today: Optional[date] = None) -> List[int]:
+        """Open opportunities for any of the regions and any of the organization types given,
+        within the amount range and closing by ``closes_by``, soonest deadline first"""
+        today = today or current_date()
+        low = min_amount if min_amount is not None else float("-inf")
+        high = max_amount if max_amount is not None else float("inf")
+        ranges: List[List[int]] = []
+        if min_amount is not None or max_amount is not None:
+            ranges.append(self._by_amount[bisect_left(self._amount_keys, low):bisect_right(self._amount_keys, high)])
+        elif not (regions or organization_types):
+            return self.open(today, closes_by)
+        if closes_by is not None:
+            ranges.append(self.open(today, closes_by))
+
+        postings: List[Set[int]] = []
+        for by_key, keys in ((self.by_region, regions), (self.by_organization, organization_types)):
+            keys = list(keys)
+            if keys:
+                postings.append(by_key.get(keys[0], set()) if len(keys) == 1
+                                else set().union(*[by_key.get(key, ()) for key in keys]))
+        # Postings are intersected as sets, joined by the narrower range only
+        # when it is smaller than all of them; the limits are then checked
+        # on each remaining candidate
+        if ranges:
+            smallest = min(ranges, key=len)
+            if not postings or len(smallest) < min(len(matched) for matched in postings):
+                postings.append(set(smallest))
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:])
+
+        amounts, deadlines = self.amounts, self.deadlines
+        matches = []
+        for position in candidates:
+            deadline = deadlines[position]
+            if deadline is None:
+                if closes_by is not None:
+                    continue
+            elif deadline < today or closes_by is not None and deadline > closes_by:
+                continue
+            if min_amount is not None or max_amount is not None:
+                amount = amounts[position]
+                if amount is None or not low <= amount <= high:
+                    continue
+            matches.append(position)
+        return sorted(matches, key=self._order.__getitem__)
@@ -0,0 +1,226 @@
+"""
+Gazetteer for resolving names in questions
+A question can name a place as "Bangladesh", "Bangladés", "Bangladeshi
+farmers", "BGD" or "Bangaldesh". A Gazetteer maps every folded alias (case,
+punctuation and accents removed) to an entity and finds them in one pass
+over the question's tokens. Tokens that match no alias are looked up in a
+symmetric-deletion index of the place-name vocabulary, so a misspelling is
+corrected with a few dictionary lookups rather than a scan of every name.
+"""
+
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from climateguardian.cache import normalize_question
+
+_CODE_TOKEN = re.compile(r"\b[A-Z]{2,4}\b")
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+
+# Memo miss marker; None is a cached "no correction"
+_MISSING = object()
+
+# Shorter tokens are too often ordinary words one typo away from a name
+MIN_FUZZY_LENGTH = 5
+# Tokens this long are corrected even in lower case; shorter ones only
+# when capitalized mid-sentence, as names are
+MIN_LOWERCASE_FUZZY_LENGTH = 7
+
+
+def fold(text: str) -> str:
+    """normalize_question() with accents stripped, so "Perú" and "Peru" share an alias"""
+    text = normalize_question(text)
+    if text.isascii():
+        return text
+    return "".join(char for char in unicodedata.normalize("NFKD", text) if not unicodedata.combining(char))
+
+
+def max_edits(token: str) -> int:
+    """Typos tolerated in a token of this length"""
+    return 1 if len(token) <= 8 else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance (edits and adjacent swaps), capped at ``limit + 1``"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def deletions(word: str, depth: int) -> Set[str]:
+    """``word`` and every string made by deleting up to ``depth`` of its characters"""
+    variants = {word}
+    frontier = {word}
+    for _ in range(depth):
+        frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+        variants |= frontier
+    return variants
+
+
+class Gazetteer:
+    """Aliases and codes of named entities, resolved exactly or through typo correction.
+
+    Aliases are added with ``add`` (the first entity registered for an alias
+    keeps it) and codes with ``add_code``. Only the words of aliases whose
+    kind is in ``fuzzy_kinds`` are candidates for correction, so a typo can
+    become "Kenya" but an unknown word never becomes a topic.
+    """
+
+    def __init__(self, fuzzy_kinds: Iterable[str] = ("country", "region"), fuzzy: bool = True,
+                 max_memo: int = 4096):
+        self.fuzzy_kinds = frozenset(fuzzy_kinds)
+        self.fuzzy = fuzzy
+        self.max_memo = max_memo
+        self._phrases: Dict[str, Tuple[str, str]] = {}
+        self._codes: Dict[str, Tuple[str, str]] = {}
+        # Longest phrase lengths to try, keyed by first token
+        self._phrase_lengths: Dict[str, List[int]] = {}
+        self._words: Set[str] = set()
+        # Correction candidates, ranked by first registration to break ties
+        self._fuzzy_words: Dict[str, int] = {}
+        # Built on the first correction: deletion variant -> vocabulary words
+        self._deletions: Optional[Dict[str, List[str]]] = None
+        self._corrections: Dict[str, Optional[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._phrases)
+
+    def add(self, alias: str, kind: str, entity_id: str) -> bool:
+        """Register an alias; False if it was empty or already taken"""
+        phrase = fold(alias)
+        if not phrase or phrase in self._phrases:
+            return False
+        self._phrases[phrase] = (kind, entity_id)
+        tokens = phrase.split()
+        lengths = self._phrase_lengths.setdefault(tokens[0], [])
+        if len(tokens) not in lengths:
+            lengths.append(len(tokens))
+            lengths.sort(reverse=True)
+        self._words.update(tokens)
+        if kind in self.fuzzy_kinds:
+            for token in tokens:
+                if len(token) >= MIN_FUZZY_LENGTH - 1:
+                    self._fuzzy_words.setdefault(token, len(self._fuzzy_words))
+            self._deletions = None
+        return True
+
+    def add_code(self, code: str, kind: str, entity_id: str):
+        """Register an upper-case code (BGD, BD, DRC); the first registration wins"""
+        self._codes.setdefault(code, (kind, entity_id))
+
+    def lookup(self, name: str) -> Optional[Tuple[str, str]]:
+        """(kind, id) of an exact alias"""
+        return self._phrases.get(fold(name))
+
+    def code(self, code: str) -> Optional[Tuple[str, str]]:
+        """(kind, id) of a code, matched case-sensitively"""
+        return self._codes.get(code.strip())
+
+    def correct(self, token: str) -> Optional[str]:
+        """The vocabulary word closest to a folded token, within ``max_edits``.
+
+        Ties go to the word registered first, so English names win over
+        translations ("guinae" is read as "guinea", not French "guinee").
+        """
+        # Single lookups only: another request thread may clear the memo or
+        # drop the deletion index between a check and a read
+        cached = self._corrections.get(token, _MISSING)
+        if cached is not _MISSING:
+            return cached
+        deletion_index = self._deletions
+        if deletion_index is None:
+            deletion_index = self._deletions = self._build_deletions()
+
+        limit = max_edits(token)
+        correction, best = None, (limit + 1, 0)
+        seen = set()
+        for variant in deletions(token, limit):
+            for word in deletion_index.get(variant, ()):
+                if word in seen:
+                    continue
+                seen.add(word)
+                score = (edit_distance(token, word, limit), self._fuzzy_words[word])
+                if score < best:
+                    correction, best = word, score
+
+        if len(self._corrections) >= self.max_memo:
+            self._corrections.clear()
+        self._corrections[token] = correction
+        return correction
+
+    def scan(self, question: str) -> Tuple[List[Tuple[str, str]], Dict[str, str]]:
+        """Entities in order of first mention, and the corrections made to find them"""
+        tokens = fold(question).split()
+        corrected = self._correct_tokens(question, tokens) if self.fuzzy else {}
+        corrections: Dict[str, str] = {}
+
+        found: List[Tuple[str, str]] = []
+        phrases = self._phrases
+        position = 0
+        while position < len(tokens):
+            matched = 1
+            for length in self._phrase_lengths.get(tokens[position], ()):
+                if position + length > len(tokens):
+                    continue
+                entry = phrases.get(" ".join(tokens[position:position + length]))
+                if entry:
+                    if entry not in found:
+                        found.append(entry)
+                    # A correction counts only if it completed a name
+                    for corrected_position in range(position, position + length):
+                        if corrected_position in corrected:
+                            corrections[corrected[corrected_position]] = tokens[corrected_position]
+                    matched = length
+                    break
+            position += matched
+
+        # Codes only count when written in capitals inside mixed-case text
+        if not question.isupper():
+            for code in _CODE_TOKEN.findall(question):
+                entry = self._codes.get(code)
+                if entry and entry not in found:
+                    found.append(entry)
+
+        return found, corrections
+
+    def _correct_tokens(self, question: str, tokens: List[str]) -> Dict[int, str]:
+        """Replace misspelt tokens in place with the words they were meant to be; returns the originals.
+
+        Only tokens outside the vocabulary are replaced, so a correction
+        that completes no name cannot hide one either.
+        """
+        corrected: Dict[int, str] = {}
+        # Capitalization is only a signal in mixed-case text whose tokens line up with the folded ones
+        original = _PUNCTUATION.sub(" ", question).split()
+        capitals = len(original) == len(tokens) and not question.isupper() and not question.islower()
+        for position, token in enumerate(tokens):
+            if len(token) < MIN_FUZZY_LENGTH or token in self._words or not token.isalpha():
+                continue
+            if len(token) < MIN_LOWERCASE_FUZZY_LENGTH and not (
+                    capitals and position > 0 and original[position][0].isupper()):
+                continue
+            correction = self.correct(token)
+            if correction:
+                corrected[position] = token
+                tokens[position] = correction
+        return corrected
+
+    def _build_deletions(self) -> Dict[str, List[str]]:
+        index: Dict[str, List[str]] = {}
+        for word in sorted(self._fuzzy_words):
+            # Long words are reachable from tokens allowed two edits
+            for variant in deletions(word, 2 if len(word) >= 7 else 1):
+                index.setdefault(variant, []).append(word)
+        return index
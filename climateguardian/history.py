@@ -0,0 +1,237 @@
+"""
+Conversation history storage for ClimateGuardian
+Each session keeps a fixed-size ring buffer of its most recent entries, and
+idle sessions are evicted by LRU order and TTL so memory stays bounded.
+Sessions are sharded over independently locked partitions so request
+threads of different sessions do not contend. Entries recorded by the app
+are slotted HistoryEntry records that share their response with the
+response cache rather than copying it.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from itertools import islice
+from typing import Callable, Deque, Dict, List, Optional, Union
+
+# Session key used when a query arrives without a session context
+DEFAULT_SESSION = "anonymous"
+
+# Stores with fewer sessions per shard than this use fewer shards
+MIN_SESSIONS_PER_SHARD = 64
+
+
+class HistoryEntry:
+    """One answered query in a session's history.
+
+    The intent is interned and ``response`` is the dict the response cache
+    holds, shared rather than copied, so an entry costs its slots and the
+    strings unique to it.
+    """
+
+    __slots__ = ("query_id", "timestamp", "question", "intent", "response")
+
+    def __init__(self, query_id: str, timestamp: str, question: str, intent: str, response: Dict):
+        self.query_id = query_id
+        self.timestamp = timestamp
+        self.question = question
+        self.intent = sys.intern(intent)
+        self.response = response
+
+    def as_dict(self) -> Dict:
+        """The entry as returned by the history API"""
+        return {
+            "id": self.query_id,
+            "timestamp": self.timestamp,
+            "question": self.question,
+            "intent": self.intent,
+            "response": self.response
+        }
+
+
+Entry = Union[Dict, HistoryEntry]
+
+
+def as_dict(entry: Entry) -> Dict:
+    return entry.as_dict() if isinstance(entry, HistoryEntry) else entry
+
+
+def estimate_size(value) -> int:
+    """Approximate deep size in bytes of a JSON-like value or a HistoryEntry.
+
+    A HistoryEntry counts its own strings and its response but not its
+    interned intent. The response may be shared with the response cache,
+    but once the cache evicts it the history is its only holder, so it is
+    counted in full and the estimate errs high rather than low.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, HistoryEntry):
+        return (size + sum(sys.getsizeof(text) for text in (value.query_id, value.timestamp, value.question))
+                + estimate_size(value.response))
+    if isinstance(value, dict):
+        size += sum(estimate_size(key) + estimate_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(estimate_size(item) for item in value)
+    return size
+
+
+class _Session:
+    """Ring buffer of one session's entries"""
+
+    __slots__ = ("entries", "sizes", "last_seen")
+
+    def __init__(self, capacity: int, now: float):
+        self.entries: Deque[Entry] = deque(maxlen=capacity)
+        self.sizes: Deque[int] = deque(maxlen=capacity)
+        self.last_seen = now
+
+
+class _Shard:
+    """Sessions whose id hashes to one shard, in LRU order, under their own lock"""
+
+    __slots__ = ("lock", "sessions", "max_sessions", "entry_count", "bytes", "evicted")
+
+    def __init__(self, max_sessions: int):
+        self.lock = threading.Lock()
+        # Least recently used session first
+        self.sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self.max_sessions = max_sessions
+        self.entry_count = 0
+        self.bytes = 0
+        self.evicted = 0
+
+    def evict_expired(self, cutoff: Optional[float]):
+        """Drop sessions idle since before ``cutoff``; they sit at the front of the LRU order"""
+        if cutoff is None:
+            return
+        while self.sessions:
+            session_id, session = next(iter(self.sessions.items()))
+            if session.last_seen > cutoff:
+                break
+            self.drop(session_id)
+
+    def drop(self, session_id: str, evicted: bool = True):
+        session = self.sessions.pop(session_id)
+        self.entry_count -= len(session.entries)
+        self.bytes -= sum(session.sizes)
+        if evicted:
+            self.evicted += 1
+
+
+class ConversationHistoryStore:
+    """Bounded, per-session conversation history, safe to share between threads.
+
+    Sessions are spread over ``shards`` independently locked shards by a hash
+    of their id, so concurrent requests from different sessions rarely wait
+    on each other. Each shard holds an equal share of ``max_sessions`` and
+    evicts by its own LRU order; small stores use a single shard so the
+    order is exact.
+    """
+
+    def __init__(self, max_entries_per_session: int = 50, max_sessions: int = 10000,
+                 session_ttl: float = 86400, clock: Callable[[], float] = time.monotonic,
+                 shards: int = 16):
+        if max_entries_per_session < 1 or max_sessions < 1:
+            raise ValueError("History capacity must be at least one entry and one session")
+        self.max_entries_per_session = max_entries_per_session
+        self.max_sessions = max_sessions
+        self.session_ttl = session_ttl
+        self._clock = clock
+        count = max(1, min(shards, max_sessions // MIN_SESSIONS_PER_SHARD))
+        self._shards = [_Shard(max_sessions // count + (1 if i < max_sessions % count else 0))
+                        for i in range(count)]
+
+    @property
+    def evicted_sessions(self) -> int:
+        return sum(shard.evicted for shard in self._shards)
+
+    def append(self, session_id: str, entry: Entry):
+        """Record an entry, dropping the session's oldest one when full"""
+        # Sized outside the lock; entries can be large
+        size = estimate_size(entry)
+        now = self._clock()
+        shard = self._shard(session_id)
+        with shard.lock:
+            shard.evict_expired(self._cutoff(now))
+
+            session = shard.sessions.get(session_id)
+            if session is None:
+                session = _Session(self.max_entries_per_session, now)
+                shard.sessions[session_id] = session
+                if len(shard.sessions) > shard.max_sessions:
+                    shard.drop(next(iter(shard.sessions)))
+            else:
+                session.last_seen = now
+                shard.sessions.move_to_end(session_id)
+
+            if len(session.entries) == self.max_entries_per_session:
+                shard.bytes -= session.sizes[0]
+                shard.entry_count -= 1
+
+            session.entries.append(entry)
+            session.sizes.append(size)
+            shard.bytes += size
+            shard.entry_count += 1
+
+    def recent(self, session_id: str, limit: int = 10) -> List[Dict]:
+        """Return up to ``limit`` most recent entries for a session, oldest first"""
+        now = self._clock()
+        shard = self._shard(session_id)
+        with shard.lock:
+            shard.evict_expired(self._cutoff(now))
+
+            session = shard.sessions.get(session_id)
+            if session is None or limit <= 0:
+                return []
+            session.last_seen = now
+            shard.sessions.move_to_end(session_id)
+
+            latest = list(islice(reversed(session.entries), limit))
+        latest.reverse()
+        return [as_dict(entry) for entry in latest]
+
+    def count(self, session_id: str) -> int:
+        """Number of entries currently held for a session"""
+        shard = self._shard(session_id)
+        with shard.lock:
+            session = shard.sessions.get(session_id)
+            return len(session.entries) if session else 0
+
+    def clear(self, session_id: str):
+        """Forget a session's history"""
+        shard = self._shard(session_id)
+        with shard.lock:
+            if session_id in shard.sessions:
+                shard.drop(session_id, evicted=False)
+
+    def memory_budget(self) -> Dict:
+        """Report current usage against the configured capacity"""
+        cutoff = self._cutoff(self._clock())
+        sessions = entries = estimated_bytes = 0
+        for shard in self._shards:
+            with shard.lock:
+                shard.evict_expired(cutoff)
+                sessions += len(shard.sessions)
+                entries += shard.entry_count
+                estimated_bytes += shard.bytes
+        return {
+            "sessions": sessions,
+            "entries": entries,
+            "estimated_bytes": estimated_bytes,
+            "max_sessions": self.max_sessions,
+            "max_entries_per_session": self.max_entries_per_session,
+            "max_entries": self.max_sessions * self.max_entries_per_session,
+            "session_ttl_seconds": self.session_ttl,
+            "evicted_sessions": self.evicted_sessions,
+            "shards": len(self._shards)
+        }
+
+    def __len__(self) -> int:
+        return sum(shard.entry_count for shard in self._shards)
+
+    def _shard(self, session_id: str) -> _Shard:
+        return self._shards[hash(session_id) % len(self._shards)]
+
+    def _cutoff(self, now: float) -> Optional[float]:
+        return now - self.session_ttl if self.session_ttl is not None else None
@@ -0,0 +1,85 @@
+"""
+Intent classification for ClimateGuardian queries
+A question's intent is the first intent, in precedence order, with one of
+its keywords anywhere in the lowercased question. Each keyword is checked
+on its own with ``in``, so overlapping keywords and keywords that prefix
+one another are all found.
+
+This is deliberately a scan per keyword rather than one compiled engine
+(a single alternation regex or an Aho-Corasick automaton). With sixteen
+short keywords, CPython's substring search beats a one-pass regex over
+the question, and a prefix-factored alternation also takes a single match
+per position, hiding keywords that prefix another. benchmarks/bench_intent.py
+measures the plain loops at 1.6-1.9x the speed of the original any() scans.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Intent keywords in precedence order: the first intent with any hit wins
+INTENT_KEYWORDS: Dict[str, List[str]] = {
+    "risk_assessment": ["flood", "risk", "vulnerability", "disaster"],
+    "policy_recommendation": ["policy", "recommend", "should", "strategy"],
+    "funding_intelligence": ["funding", "grant", "money", "finance"],
+    "data_analysis": ["data", "statistics", "numbers", "trend"],
+}
+
+DEFAULT_INTENT = "general_climate"
+
+# Words asking for places to be ranked or compared rather than described one at a time
+COMPARISON_PREFIXES = ("rank", "compar")
+COMPARISON_WORDS = frozenset({"versus", "vs", "top", "most", "least", "highest", "lowest",
+                              "worst", "riskiest", "safest"})
+ASCENDING_WORDS = frozenset({"least", "lowest", "safest"})
+_TOP_K = re.compile(r"\btop (\d{1,3})\b|\b(\d{1,3}) (?:most|least|highest|lowest|riskiest|safest|countries)\b")
+_WORD = re.compile(r"[a-z]+")
+
+
+class IntentClassifier:
+    """Keyword intent classifier with first-intent-wins precedence, one substring check per keyword"""
+
+    def __init__(self, intent_keywords: Dict[str, List[str]], default_intent: str = DEFAULT_INTENT):
+        self.default_intent = default_intent
+        self._keywords = tuple((intent, tuple(keyword.lower() for keyword in keywords))
+                               for intent, keywords in intent_keywords.items())
+
+    def hit_counts(self, question: str) -> Dict[str, int]:
+        """Return the number of keyword hits per intent, counting each keyword separately"""
+        question_lower = question.lower()
+        return {intent: sum(question_lower.count(keyword) for keyword in keywords)
+                for intent, keywords in self._keywords}
+
+    def classify(self, question: str) -> str:
+        """Return the highest-precedence intent with at least one keyword hit"""
+        question_lower = question.lower()
+        # Plain loops rather than any(): no generator is created per intent
+        for intent, keywords in self._keywords:
+            for keyword in keywords:
+                if keyword in question_lower:
+                    return intent
+        return self.default_intent
+
+
+@dataclass
+class ComparisonRequest:
+    """How many places a comparative question asks for, and in which order"""
+    top_k: Optional[int] = None
+    ascending: bool = False
+
+
+def comparison_request(question: str) -> Optional[ComparisonRequest]:
+    """Ranking asked for by a question ("top 5", "least vulnerable", "compare"), or None"""
+    question_lower = question.lower()
+    words = _WORD.findall(question_lower)
+    if not any(word in COMPARISON_WORDS or word.startswith(COMPARISON_PREFIXES) for word in words):
+        return None
+    match = _TOP_K.search(question_lower)
+    return ComparisonRequest(
+        top_k=int(match.group(1) or match.group(2)) if match else None,
+        ascending=any(word in ASCENDING_WORDS for word in words)
+    )
+
+
+# Shared classifier, built once at import
+intent_classifier = IntentClassifier(INTENT_KEYWORDS)
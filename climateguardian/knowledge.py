@@ -0,0 +1,411 @@
+"""
+Indexed climate knowledge store for ClimateGuardian
+Loads the data/{dataset}_sample.json files written by
+scripts/initialize_datasets.py and builds inverted indexes by country name,
+ISO code, region alias, organization type and topic, so entities mentioned
+in a question are resolved in a single pass over its tokens. Country and
+region names are also indexed in Spanish, French, Portuguese and German,
+by demonym and with typo correction (see climateguardian.gazetteer).
+"""
+
+import glob
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional
+
+from climateguardian.cache import source_fingerprint
+from climateguardian.countries import (COUNTRIES, COUNTRY_ALIASES, COUNTRY_DEMONYMS, COUNTRY_TRANSLATIONS,
+                                       SMALL_ISLAND_STATES)
+from climateguardian.funding import FundingIndex
+from climateguardian.gazetteer import Gazetteer
+from climateguardian.sample_data import SAMPLE_DATA
+
+logger = logging.getLogger(__name__)
+
+# Dataset strings up to this long are interned: country names, risk
+# levels, region and topic ids and source names repeat across rows
+MAX_INTERNED_LENGTH = 64
+
+# Region groupings: display name, adjective, aliases (English, then Spanish,
+# French, Portuguese and German where they differ) and membership rule
+REGIONS: Dict[str, Dict] = {
+    "africa": {"name": "Africa", "adjective": "African",
+               "aliases": ["africa", "african", "afrique", "afrika", "africano", "africain"],
+               "regions": ["Africa"]},
+    "asia": {"name": "Asia", "adjective": "Asian",
+             "aliases": ["asia", "asian", "asie", "ásia", "asien", "asiático", "asiatique"],
+             "regions": ["Asia"]},
+    "europe": {"name": "Europe", "adjective": "European",
+               "aliases": ["europe", "european", "europa", "europeo", "européen", "europeu"],
+               "regions": ["Europe"]},
+    "americas": {"name": "the Americas", "adjective": "American",
+                 "aliases": ["americas", "the americas", "amériques"], "regions": ["Americas"]},
+    "oceania": {"name": "Oceania", "adjective": "Oceanian",
+                "aliases": ["oceania"], "regions": ["Oceania"]},
+    "latin_america": {"name": "Latin America and the Caribbean", "adjective": "Latin American",
+                      "aliases": ["latin america", "latin american", "latam", "américa latina",
+                                  "latinoamérica", "amérique latine", "lateinamerika"],
+                      "subregions": ["Caribbean", "Central America", "South America"]},
+    "pacific": {"name": "the Pacific Islands", "adjective": "Pacific",
+                "aliases": ["pacific", "pacific island", "pacific islands", "pacífico",
+                            "pacifique", "pazifik"],
+                "subregions": ["Melanesia", "Micronesia", "Polynesia"]},
+    "small_island_nations": {"name": "small island developing states", "adjective": "small island",
+                             "aliases": ["small island", "small islands", "small island nation",
+                                         "small island nations", "small island state",
+                                         "small island states", "small island developing state",
+                                         "small island developing states", "sids",
+                                         "island nation", "island nations", "island state",
+                                         "island states", "pequeños estados insulares",
+                                         "petits états insulaires", "pequenos estados insulares",
+                                         "kleine inselstaaten"],
+                             "small_island_states": True},
+    "northern_africa": {"name": "North Africa", "adjective": "North African",
+                        "aliases": ["north africa", "northern africa", "north african",
+                                    "norte de áfrica", "afrique du nord", "nordafrika"],
+                        "subregions": ["Northern Africa"]},
+    "eastern_africa": {"name": "East Africa", "adjective": "East African",
+                       "aliases": ["east africa", "eastern africa", "east african", "áfrica oriental",
+                                   "afrique de l'est", "ostafrika"],
+                       "subregions": ["Eastern Africa"]},
+    "middle_africa": {"name": "Central Africa", "adjective": "Central African",
+                      "aliases": ["central africa", "middle africa", "central african",
+                                  "áfrica central", "afrique centrale", "zentralafrika"],
+                      "subregions": ["Middle Africa"]},
+    "southern_africa": {"name": "Southern Africa", "adjective": "Southern African",
+                        "aliases": ["southern africa", "southern african", "áfrica austral",
+                                    "afrique australe", "südliches afrika"],
+                        "subregions": ["Southern Africa"]},
+    "western_africa": {"name": "West Africa", "adjective": "West African",
+                       "aliases": ["west africa", "western africa", "west african", "áfrica occidental",
+                                   "afrique de l'ouest", "westafrika"],
+                       "subregions": ["Western Africa"]},
+    "caribbean": {"name": "the Caribbean", "adjective": "Caribbean",
+                  "aliases": ["caribbean", "caribe", "caraïbes", "karibik"], "subregions": ["Caribbean"]},
+    "central_america": {"name": "Central America", "adjective": "Central American",
+                        "aliases": ["central america", "central american", "centroamérica",
+                                    "américa central", "amérique centrale", "mittelamerika"],
+                        "subregions": ["Central America"]},
+    "south_america": {"name": "South America", "adjective": "South American",
+                      "aliases": ["south america", "south american", "sudamérica", "suramérica",
+                                  "américa del sur", "amérique du sud", "américa do sul", "südamerika"],
+                      "subregions": ["South America"]},
+    "northern_america": {"name": "North America", "adjective": "North American",
+                         "aliases": ["north america", "northern america", "north american",
+                                     "norteamérica", "amérique du nord", "nordamerika"],
+                         "subregions": ["Northern America"]},
+    "central_asia": {"name": "Central Asia", "adjective": "Central Asian",
+                     "aliases": ["central asia", "central asian", "asia central",
+                                 "asie centrale", "zentralasien"], "subregions": ["Central Asia"]},
+    "eastern_asia": {"name": "East Asia", "adjective": "East Asian",
+                     "aliases": ["east asia", "eastern asia", "east asian", "asia oriental",
+                                 "asie de l'est", "ostasien"],
+                     "subregions": ["Eastern Asia"]},
+    "south_eastern_asia": {"name": "Southeast Asia", "adjective": "Southeast Asian",
+                           "aliases": ["southeast asia", "south east asia", "south eastern asia",
+                                       "southeast asian", "south east asian", "sudeste asiático",
+                                       "asie du sud est", "südostasien"],
+                           "subregions": ["South-eastern Asia"]},
+    "southern_asia": {"name": "South Asia", "adjective": "South Asian",
+                      "aliases": ["south asia", "southern asia", "south asian", "asia meridional",
+                                  "asie du sud", "südasien"],
+                      "subregions": ["Southern Asia"]},
+    "western_asia": {"name": "the Middle East", "adjective": "Middle Eastern",
+                     "aliases": ["west asia", "western asia", "middle east", "middle eastern",
+                                 "oriente medio", "oriente médio", "moyen orient", "naher osten"],
+                     "subregions": ["Western Asia"]},
+    "eastern_europe": {"name": "Eastern Europe", "adjective": "Eastern European",
+                       "aliases": ["eastern europe", "east europe", "eastern european",
+                                   "europa del este", "europe de l'est", "osteuropa"],
+                       "subregions": ["Eastern Europe"]},
+    "northern_europe": {"name": "Northern Europe", "adjective": "Northern European",
+                        "aliases": ["northern europe", "north europe", "northern european",
+                                    "europa del norte", "europe du nord", "nordeuropa"],
+                        "subregions": ["Northern Europe"]},
+    "southern_europe": {"name": "Southern Europe", "adjective": "Southern European",
+                        "aliases": ["southern europe", "south europe", "southern european",
+                                    "europa del sur", "europe du sud", "südeuropa"],
+                        "subregions": ["Southern Europe"]},
+    "western_europe": {"name": "Western Europe", "adjective": "Western European",
+                       "aliases": ["western europe", "west europe", "western european",
+                                   "europa occidental", "europe occidentale", "westeuropa"],
+                       "subregions": ["Western Europe"]},
+}
+
+ORGANIZATION_TYPES: Dict[str, Dict] = {
+    "ngo": {"label": "NGOs",
+            "aliases": ["ngo", "ngos", "nonprofit", "nonprofits", "non profit", "non profits",
+                        "civil society", "community organization", "community organizations"]},
+    "government": {"label": "governments",
+                   "aliases": ["government", "governments", "ministry", "ministries",
+                               "municipality", "municipalities", "public sector"]},
+    "private_sector": {"label": "private sector organizations",
+                       "aliases": ["private sector", "business", "businesses", "company",
+                                   "companies", "enterprise", "enterprises"]},
+    "research": {"label": "research institutions",
+                 "aliases": ["university", "universities", "research institution",
+                             "research institutions", "researchers"]},
+}
+
+TOPICS: Dict[str, List[str]] = {
+    "flood": ["flood", "floods", "flooding"],
+    "drought": ["drought", "droughts"],
+    "sea_level": ["sea level", "sea levels", "sea level rise", "coastal"],
+    "heat": ["heat", "heatwave", "heatwaves", "heat wave", "heat waves", "extreme heat"],
+    "temperature": ["temperature", "temperatures", "warming", "global warming"],
+    "precipitation": ["precipitation", "rainfall", "rain", "monsoon", "monsoons"],
+    "emissions": ["emissions", "co2", "carbon", "greenhouse gas", "greenhouse gases", "ghg"],
+    "air_quality": ["air quality", "air pollution", "pollution", "pm2 5", "pm25"],
+    "adaptation": ["adaptation", "adapt", "resilience"],
+    "renewable_energy": ["renewable", "renewables", "renewable energy", "solar", "wind power"],
+    "agriculture": ["agriculture", "farming", "crops", "food security"],
+}
+
+# ISO alpha-2 codes that are also common capitalized words or abbreviations
+# (IN, IT, NO, US state codes, TV, PM) and are not treated as countries
+AMBIGUOUS_ALPHA2 = frozenset({
+    "AL", "AM", "AR", "AS", "AT", "AU", "BE", "BY", "CA", "CO", "CV", "DE", "DO", "FM", "GA", "GO",
+    "HE", "ID", "IL", "IN", "IS", "IT", "LA", "MA", "MD", "ME", "ML", "MN", "MS", "MT", "MY", "NE",
+    "NO", "OR", "PA", "PE", "PM", "SA", "SE", "SO", "TN", "TO", "TV", "UP", "WE",
+})
+
+# Demonyms take no plural with these endings (Japanese, Irish, Dutch, Swiss)
+_UNCOUNTABLE_DEMONYM_ENDINGS = ("ese", "sh", "tch", "ss", "ois")
+
+
+@dataclass
+class ResolvedEntities:
+    """Entities found in a question, in order of first mention"""
+    countries: List[str] = field(default_factory=list)
+    regions: List[str] = field(default_factory=list)
+    organization_types: List[str] = field(default_factory=list)
+    topics: List[str] = field(default_factory=list)
+    # Misspelt question words and the names they were read as
+    corrections: Dict[str, str] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.countries or self.regions or self.organization_types or self.topics)
+
+
+class KnowledgeIndex:
+    """Immutable set of indexes built from one snapshot of the dataset files"""
+
+    def __init__(self, data: Dict[str, Dict], fuzzy: bool = True):
+        self.data = data
+
+        # Country reference and region membership
+        self.countries: Dict[str, Dict] = {}
+        self.region_members: Dict[str, set] = {region_id: set() for region_id in REGIONS}
+        self.country_regions: Dict[str, List[str]] = {}
+        for name, iso2, iso3, region, subregion in COUNTRIES:
+            self.countries[iso3] = {
+                "name": name, "iso2": iso2, "iso3": iso3,
+                "region": region, "subregion": subregion,
+                "small_island_state": iso3 in SMALL_ISLAND_STATES
+            }
+            memberships = [
+                region_id for region_id, spec in REGIONS.items()
+                if region in spec.get("regions", ())
+                or subregion in spec.get("subregions", ())
+                or (spec.get("small_island_states") and iso3 in SMALL_ISLAND_STATES)
+            ]
+            self.country_regions[iso3] = memberships
+            for region_id in memberships:
+                self.region_members[region_id].add(iso3)
+
+        # Gazetteer: every folded alias maps to (kind, id); the first
+        # registration wins, so country names shadow region and topic aliases
+        self.gazetteer = Gazetteer(fuzzy=fuzzy)
+        for iso3, country in self.countries.items():
+            self.gazetteer.add(country["name"], "country", iso3)
+            self.gazetteer.add_code(iso3, "country", iso3)
+            for alias in COUNTRY_ALIASES.get(iso3, []):
+                # Upper-case aliases (US, UK, DRC) are codes, matched case-sensitively
+                if alias.isupper():
+                    self.gazetteer.add_code(alias, "country", iso3)
+                else:
+                    self.gazetteer.add(alias, "country", iso3)
+            if country["iso2"] not in AMBIGUOUS_ALPHA2:
+                self.gazetteer.add_code(country["iso2"], "country", iso3)
+        for iso3, names in COUNTRY_TRANSLATIONS.items():
+            for name in names:
+                self.gazetteer.add(name, "country", iso3)
+        for iso3, demonyms in COUNTRY_DEMONYMS.items():
+            for demonym in demonyms:
+                self.gazetteer.add(demonym, "country", iso3)
+                if not demonym.lower().endswith(_UNCOUNTABLE_DEMONYM_ENDINGS):
+                    self.gazetteer.add(demonym + "s", "country", iso3)
+        for region_id, spec in REGIONS.items():
+            for alias in spec["aliases"]:
+                self.gazetteer.add(alias, "region", region_id)
+        for org_type, spec in ORGANIZATION_TYPES.items():
+            for alias in spec["aliases"]:
+                self.gazetteer.add(alias, "organization", org_type)
+        for topic, aliases in TOPICS.items():
+            for alias in aliases:
+                self.gazetteer.add(alias, "topic", topic)
+
+        # Dataset rows keyed by country
+        nd_gain = data.get("nd_gain", {})
+        self.nd_gain = self._by_country(nd_gain.get("countries", []))
+        self.flood_risks = self._by_country(nd_gain.get("flood_risks", []))
+        self.emissions = self._by_country(data.get("climate_trace", {}).get("emissions", []))
+        self.ndc_progress = self._by_country(data.get("climate_watch", {}).get("ndc_progress", []))
+
+        # Policy recommendations keyed by region
+        self.policies: Dict[str, Dict] = {}
+        for policy in data.get("climate_watch", {}).get("policy_recommendations", []):
+            self.policies.setdefault(policy["region"], policy)
+
+        # Funding opportunities with parsed amounts and deadlines and region
+        # and organization type postings
+        self.funding: List[Dict] = list(data.get("un_sdg13", {}).get("funding_opportunities", []))
+        self.funding_index = FundingIndex(self.funding)
+
+        # Topic index over every tagged record
+        self.by_topic: Dict[str, List[Dict]] = {}
+        for record in (list(self.flood_risks.values()) + list(self.policies.values()) + self.funding):
+            for topic in record.get("topics", []):
+                self.by_topic.setdefault(topic, []).append(record)
+
+    def _by_country(self, rows: Iterable[Dict]) -> Dict[str, Dict]:
+        """Key dataset rows by ISO alpha-3, falling back to the lower-cased name"""
+        keyed = {}
+        for row in rows:
+            name = row.get("country", "")
+            keyed[self.country_code(name) or name.lower()] = row
+        return keyed
+
+    def country_code(self, name: str) -> Optional[str]:
+        """ISO alpha-3 code for a country name, alias or code"""
+        entry = self.gazetteer.lookup(name) or self.gazetteer.code(name)
+        if entry and entry[0] == "country":
+            return entry[1]
+        return None
+
+    def resolve(self, question: str) -> ResolvedEntities:
+        """Find every country, region, organization type and topic in a question"""
+        entities = ResolvedEntities()
+        found = {
+            "country": entities.countries,
+            "region": entities.regions,
+            "organization": entities.organization_types,
+            "topic": entities.topics
+        }
+        mentions, entities.corrections = self.gazetteer.scan(question)
+        for kind, entity_id in mentions:
+            found[kind].append(entity_id)
+        return entities
+
+    def regions_for(self, entities: ResolvedEntities) -> List[str]:
+        """Regions mentioned directly, then the regions of mentioned countries"""
+        regions = list(entities.regions)
+        for iso3 in entities.countries:
+            for region_id in self.country_regions.get(iso3, []):
+                if region_id not in regions:
+                    regions.append(region_id)
+        return regions
+
+    def policy_for(self, entities: ResolvedEntities) -> Optional[Dict]:
+        """First policy recommendation matching the question's regions.
+
+        A region without recommendations of its own borrows those of a
+        region covering most of its members, so "Pacific island nations"
+        gets the small island developing states guidance.
+        """
+        regions = self.regions_for(entities)
+        for region_id in regions:
+            if region_id in self.policies:
+                return self.policies[region_id]
+        for region_id in regions:
+            members = self.region_members.get(region_id)
+            if not members:
+                continue
+            for policy_region, policy in self.policies.items():
+                overlap = members & self.region_members.get(policy_region, set())
+                if len(overlap) * 2 >= len(members):
+                    return policy
+        return None
+
+    def funding_for(self, regions: List[str], organization_types: List[str], **limits) -> List[Dict]:
+        """Open funding opportunities for any of the regions and organization types given"""
+        return [self.funding[position] for position in self.funding_positions(regions, organization_types, **limits)]
+
+    def funding_positions(self, regions: List[str], organization_types: List[str],
+                          min_amount: Optional[float] = None, max_amount: Optional[float] = None,
+                          closes_by: Optional[date] = None, today: Optional[date] = None) -> List[int]:
+        """Positions in ``funding`` of the opportunities funding_for() returns, soonest deadline first.
+
+        Opportunities whose deadline is before ``today`` are left out; a
+        question with neither regions, organization types nor limits
+        matches none.
+        """
+        if not (regions or organization_types or min_amount is not None or max_amount is not None
+                or closes_by is not None):
+            return []
+        return self.funding_index.query(regions, organization_types, min_amount=min_amount,
+                                        max_amount=max_amount, closes_by=closes_by, today=today)
+
+
+def intern_strings(value):
+    """A JSON-like value with its dict keys and short strings interned, so repeats share one object"""
+    if isinstance(value, str):
+        return sys.intern(value) if len(value) <= MAX_INTERNED_LENGTH else value
+    if isinstance(value, dict):
+        return {sys.intern(key) if isinstance(key, str) else key: intern_strings(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [intern_strings(item) for item in value]
+    return value
+
+
+class ClimateKnowledgeStore:
+    """Knowledge index that reloads itself when the dataset files change"""
+
+    def __init__(self, data_dir: str, check_interval: float = 5.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.data_dir = data_dir
+        self.check_interval = check_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._fingerprint = source_fingerprint([data_dir])
+        self._index = KnowledgeIndex(self.load_data())
+        self._next_check = clock() + check_interval
+
+    @property
+    def index(self) -> KnowledgeIndex:
+        """Current index, rebuilt if a dataset file changed since the last check.
+
+        Indexes are immutable once built; a reload swaps in a new one, so
+        readers holding the previous index are unaffected.
+        """
+        now = self._clock()
+        if now >= self._next_check:
+            with self._lock:
+                if now >= self._next_check:
+                    self._next_check = now + self.check_interval
+                    fingerprint = source_fingerprint([self.data_dir])
+                    if fingerprint != self._fingerprint:
+                        self._index = KnowledgeIndex(self.load_data())
+                        self._fingerprint = fingerprint
+                        logger.info("Climate knowledge store reloaded from dataset files")
+        return self._index
+
+    def load_data(self) -> Dict[str, Dict]:
+        """Built-in sample data overlaid with any data/*_sample.json files"""
+        data = {dataset_id: dict(collections) for dataset_id, collections in SAMPLE_DATA.items()}
+        for path in sorted(glob.glob(os.path.join(self.data_dir, "*_sample.json"))):
+            dataset_id = os.path.basename(path)[:-len("_sample.json")]
+            try:
+                with open(path) as f:
+                    collections = intern_strings(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable dataset file {path}: {str(e)}")
+                continue
+            data.setdefault(dataset_id, {}).update(collections)
+        return data
@@ -0,0 +1,444 @@
+"""
+IBM watsonx.ai client for ClimateGuardian
+One pooled keep-alive HTTP session per process, IAM bearer tokens cached and
+refreshed ahead of expiry, bounded concurrency, timeouts and retries with
+jittered exponential backoff. Latency of every call is recorded so
+percentiles can be reported.
+
+agenerate() uses an httpx.AsyncClient so an event loop can hold many
+generations in flight without a thread each; httpx is imported on first use.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+API_VERSION = "2023-05-29"
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# httpcore's pool does O(connections^2) bookkeeping per request, so async
+# connections are spread over several small pools instead of one large one
+ASYNC_POOL_CONNECTIONS = 16
+
+
+class LLMError(Exception):
+    """Raised when the LLM backend cannot produce a response"""
+
+
+class LLMResult:
+    """Generated text plus per-call timing"""
+
+    __slots__ = ("text", "latency_ms", "attempts", "token_count")
+
+    def __init__(self, text: str, latency_ms: float, attempts: int, token_count: Optional[int] = None):
+        self.text = text
+        self.latency_ms = latency_ms
+        self.attempts = attempts
+        self.token_count = token_count
+
+
+def build_prompt(question: str, reference_answer: str, passages: Optional[List[str]] = None) -> str:
+    """Prompt asking the model to answer from the grounded reference answer"""
+    related = "".join(f"- {passage}\n" for passage in passages or [])
+    return (
+        "You are ClimateGuardian, an assistant for climate risk analysis and policy "
+        "recommendations. Answer the question using only the reference information. "
+        "Keep figures, deadlines and source names exactly as given.\n\n"
+        + (f"Related records:\n{related}\n" if related else "")
+        + f"Reference information:\n{reference_answer}\n\n"
+        f"Question: {question}\n\n"
+        "Answer:"
+    )
+
+
+class IAMTokenProvider:
+    """Caches an IBM Cloud IAM bearer token and refreshes it before it expires"""
+
+    def __init__(self, api_key: str, session: requests.Session, iam_url: str,
+                 refresh_margin: float = 300, timeout: float = 10,
+                 clock: Callable[[], float] = time.time):
+        self.api_key = api_key
+        self.session = session
+        self.iam_url = iam_url
+        self.refresh_margin = refresh_margin
+        self.timeout = timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._token: Optional[str] = None
+        self._refresh_at = 0.0
+        self.refreshes = 0
+
+    def token(self) -> str:
+        """Return a valid bearer token, fetching a new one when due"""
+        if self._token and self._clock() < self._refresh_at:
+            return self._token
+        with self._lock:
+            # Another thread may have refreshed while we waited
+            if self._token and self._clock() < self._refresh_at:
+                return self._token
+            self._fetch()
+            return self._token
+
+    def peek(self) -> Optional[str]:
+        """The cached token if it is still valid, without fetching"""
+        token = self._token
+        return token if token and self._clock() < self._refresh_at else None
+
+    def invalidate(self):
+        """Force the next call to fetch a fresh token"""
+        with self._lock:
+            self._refresh_at = 0.0
+
+    def _fetch(self):
+        try:
+            response = self.session.post(
+                self.iam_url,
+                data={
+                    "grant_type": "urn:ibm:params:oauth:grant-type:apikey",
+                    "apikey": self.api_key
+                },
+                headers={"Accept": "application/json"},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            payload = response.json()
+        except (requests.RequestException, ValueError) as e:
+            raise LLMError(f"IAM token request failed: {str(e)}") from e
+
+        if not isinstance(payload, dict) or not payload.get("access_token"):
+            raise LLMError("IAM token response has no access_token")
+        now = self._clock()
+        try:
+            expires_in = float(payload.get("expires_in") or max(payload.get("expiration", now) - now, 0))
+        except (TypeError, ValueError) as e:
+            raise LLMError(f"IAM token response has an unreadable expiry: {str(e)}") from e
+        self._token = payload["access_token"]
+        # Refresh ahead of expiry; short-lived tokens refresh at half-life
+        self._refresh_at = now + expires_in - min(self.refresh_margin, expires_in / 2)
+        self.refreshes += 1
+
+
+class WatsonxClient:
+    """Pooled, retrying watsonx.ai text generation client"""
+
+    def __init__(self, api_key: str, project_id: str, url: str, model_id: str,
+                 iam_url: str = "https://iam.cloud.ibm.com/identity/token",
+                 pool_size: int = 10, max_concurrency: int = 8,
+                 connect_timeout: float = 3.05, read_timeout: float = 30,
+                 max_retries: int = 3, backoff_base: float = 0.25, backoff_cap: float = 4.0,
+                 latency_window: int = 1000, default_parameters: Optional[Dict] = None,
+                 async_max_concurrency: int = 100):
+        self.project_id = project_id
+        self.url = url.rstrip("/")
+        self.model_id = model_id
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.default_parameters = default_parameters or {
+            "decoding_method": "greedy",
+            "max_new_tokens": 400
+        }
+
+        # Keep-alive connections shared by every thread in the process
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, pool_block=False)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.tokens = IAMTokenProvider(api_key, self.session, iam_url, timeout=connect_timeout + 10)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self.async_max_concurrency = async_max_concurrency
+        # (event loop, httpx.AsyncClient pools, asyncio.Semaphore), created on first async call
+        self._async_state: Optional[Tuple] = None
+        self._async_calls = 0
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+        self._stats_lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+
+    def generate(self, prompt: str, parameters: Optional[Dict] = None) -> LLMResult:
+        """Generate a completion for ``prompt``"""
+        start = time.perf_counter()
+        try:
+            with self._slots:
+                response, attempts = self._post("/ml/v1/text/generation", prompt, parameters)
+            result = response.json()["results"][0]
+        except (ValueError, KeyError, IndexError) as e:
+            self._record(start, failed=True)
+            raise LLMError(f"Malformed generation response: {str(e)}") from e
+        except LLMError:
+            self._record(start, failed=True)
+            raise
+        latency_ms = self._record(start)
+        return LLMResult(result.get("generated_text", ""), latency_ms, attempts,
+                         result.get("generated_token_count"))
+
+    def generate_stream(self, prompt: str, parameters: Optional[Dict] = None) -> Iterator[str]:
+        """Yield generated text chunks as the backend produces them.
+
+        Retries only happen before the first chunk; a stream broken midway
+        raises LLMError.
+        """
+        start = time.perf_counter()
+        with self._slots:
+            try:
+                response, _ = self._post("/ml/v1/text/generation_stream", prompt, parameters, stream=True)
+            except LLMError:
+                self._record(start, failed=True)
+                raise
+            try:
+                with response:
+                    for line in response.iter_lines(decode_unicode=True):
+                        if not line or not line.startswith("data:"):
+                            continue
+                        payload = json.loads(line[5:].strip())
+                        for result in payload.get("results", []):
+                            text = result.get("generated_text")
+                            if text:
+                                yield text
+            except (requests.RequestException, ValueError) as e:
+                self._record(start, failed=True)
+                raise LLMError(f"Generation stream interrupted: {str(e)}") from e
+        self._record(start)
+
+    async def agenerate(self, prompt: str, parameters: Optional[Dict] = None) -> LLMResult:
+        """Awaitable generate() that waits on the backend without holding a thread"""
+        start = time.perf_counter()
+        client, slots = await self._async_client()
+        try:
+            async with slots:
+                response, attempts = await self._apost(client, "/ml/v1/text/generation", prompt, parameters)
+            result = response.json()["results"][0]
+        except (ValueError, KeyError, IndexError) as e:
+            self._record(start, failed=True)
+            raise LLMError(f"Malformed generation response: {str(e)}") from e
+        except LLMError:
+            self._record(start, failed=True)
+            raise
+        latency_ms = self._record(start)
+        return LLMResult(result.get("generated_text", ""), latency_ms, attempts,
+                         result.get("generated_token_count"))
+
+    def ping(self, timeout: float = 5.0) -> Dict:
+        """Check the backend is reachable by fetching a token and the model list; never raises"""
+        start = time.perf_counter()
+        try:
+            response = self.session.get(
+                f"{self.url}/ml/v1/foundation_model_specs?version={API_VERSION}&limit=1",
+                headers={"Authorization": f"Bearer {self.tokens.token()}"},
+                timeout=(self.timeout[0], timeout)
+            )
+            response.close()
+            error = None if response.status_code < 400 else f"HTTP {response.status_code}"
+        except (requests.RequestException, LLMError) as e:
+            error = str(e)
+        status = {"reachable": error is None,
+                  "latency_ms": round((time.perf_counter() - start) * 1000, 2)}
+        if error:
+            status["error"] = error
+        return status
+
+    def latency_percentiles(self) -> Dict:
+        """p50/p95/p99 latency in milliseconds over the recent call window"""
+        with self._stats_lock:
+            samples = sorted(self._latencies)
+        if not samples:
+            return {"count": 0, "p50": None, "p95": None, "p99": None}
+
+        def percentile(fraction: float) -> float:
+            return round(samples[min(len(samples) - 1, int(fraction * len(samples)))], 2)
+
+        return {
+            "count": len(samples),
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99)
+        }
+
+    def stats(self) -> Dict:
+        """Call counters and latency percentiles"""
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "retries": self.retries,
+            "token_refreshes": self.tokens.refreshes,
+            "latency_ms": self.latency_percentiles()
+        }
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+
+    async def aclose(self):
+        """Close the async connection pool of the running event loop"""
+        state, self._async_state = self._async_state, None
+        if state is not None and state[0] is asyncio.get_running_loop():
+            for client in state[1]:
+                await client.aclose()
+
+    async def _async_client(self):
+        """An httpx client, picked round-robin, and the concurrency slots of the running event loop"""
+        loop = asyncio.get_running_loop()
+        state = self._async_state
+        if state is None or state[0] is not loop:
+            stale = state
+            try:
+                import httpx
+            except ImportError as e:
+                raise LLMError("Async generation requires the httpx package") from e
+            pools = -(-self.async_max_concurrency // ASYNC_POOL_CONNECTIONS)
+            size = -(-self.async_max_concurrency // pools)
+            clients = [httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout[1], connect=self.timeout[0]),
+                limits=httpx.Limits(max_connections=size, max_keepalive_connections=size)
+            ) for _ in range(pools)]
+            state = self._async_state = (loop, clients, asyncio.Semaphore(self.async_max_concurrency))
+            if stale is not None:
+                await self._aclose_stale(*stale[:2])
+        self._async_calls += 1
+        return state[1][self._async_calls % len(state[1])], state[2]
+
+    @staticmethod
+    async def _aclose_stale(loop, clients):
+        """Close the clients of an event loop this client has moved away from"""
+        for client in clients:
+            if loop.is_running():
+                # Their connections belong to that loop, so close them there
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+                continue
+            try:
+                await client.aclose()
+            except RuntimeError as e:
+                # The loop is closed, and its connections with it
+                logger.debug(f"Discarding async client of a closed event loop: {str(e)}")
+
+    def _request_body(self, prompt: str, parameters: Optional[Dict]) -> Dict:
+        return {
+            "input": prompt,
+            "model_id": self.model_id,
+            "project_id": self.project_id,
+            "parameters": {**self.default_parameters, **(parameters or {})}
+        }
+
+    async def _apost(self, client, path: str, prompt: str, parameters: Optional[Dict]):
+        """Async _post(): same retry, backoff and token refresh rules"""
+        import httpx
+
+        body = self._request_body(prompt, parameters)
+        url = f"{self.url}{path}?version={API_VERSION}"
+        refreshed_token = False
+        attempt = 0
+        while True:
+            attempt += 1
+            retry_after = None
+            # Token refreshes are rare and synchronous; keep them off the event loop
+            token = self.tokens.peek() or await asyncio.to_thread(self.tokens.token)
+            try:
+                response = await client.post(url, json=body, headers={
+                    "Authorization": f"Bearer {token}",
+                    "Accept": "application/json"
+                })
+                if response.status_code == 401 and not refreshed_token:
+                    self.tokens.invalidate()
+                    refreshed_token = True
+                    attempt -= 1
+                    continue
+                if response.status_code < 400:
+                    return response, attempt
+                error = LLMError(f"watsonx.ai returned HTTP {response.status_code}")
+                retryable = response.status_code in RETRY_STATUSES
+                retry_after = response.headers.get("Retry-After")
+            except httpx.TransportError as e:
+                error = LLMError(f"watsonx.ai request failed: {str(e) or type(e).__name__}")
+                retryable = True
+            except (httpx.HTTPError, httpx.InvalidURL) as e:
+                # Undecodable bodies, redirect loops and invalid URLs will not succeed on a retry
+                error = LLMError(f"watsonx.ai request failed: {str(e) or type(e).__name__}")
+                retryable = False
+
+            if not retryable or attempt > self.max_retries:
+                raise error
+
+            with self._stats_lock:
+                self.retries += 1
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+
+    def _post(self, path: str, prompt: str, parameters: Optional[Dict],
+              stream: bool = False) -> Tuple[requests.Response, int]:
+        """POST a generation request, retrying transient failures with jittered backoff"""
+        body = self._request_body(prompt, parameters)
+        url = f"{self.url}{path}?version={API_VERSION}"
+        refreshed_token = False
+        attempt = 0
+        while True:
+            attempt += 1
+            retry_after = None
+            try:
+                response = self.session.post(
+                    url,
+                    json=body,
+                    headers={
+                        "Authorization": f"Bearer {self.tokens.token()}",
+                        "Accept": "text/event-stream" if stream else "application/json"
+                    },
+                    timeout=self.timeout,
+                    stream=stream
+                )
+                if response.status_code == 401 and not refreshed_token:
+                    # Token revoked or expired early: refresh once without backoff
+                    response.close()
+                    self.tokens.invalidate()
+                    refreshed_token = True
+                    attempt -= 1
+                    continue
+                if response.status_code < 400:
+                    return response, attempt
+                error = LLMError(f"watsonx.ai returned HTTP {response.status_code}")
+                retryable = response.status_code in RETRY_STATUSES
+                retry_after = response.headers.get("Retry-After")
+                response.close()
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                error = LLMError(f"watsonx.ai request failed: {str(e)}")
+                retryable = True
+            except requests.RequestException as e:
+                # Redirect loops, invalid URLs and the like will not succeed on a retry
+                error = LLMError(f"watsonx.ai request failed: {str(e) or type(e).__name__}")
+                retryable = False
+
+            if not retryable or attempt > self.max_retries:
+                raise error
+
+            with self._stats_lock:
+                self.retries += 1
+            time.sleep(self._backoff(attempt, retry_after))
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when sent"""
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1)))
+        if retry_after:
+            try:
+                delay = max(delay, min(float(retry_after), self.backoff_cap))
+            except ValueError:
+                pass
+        return delay
+
+    def _record(self, start: float, failed: bool = False) -> float:
+        latency_ms = (time.perf_counter() - start) * 1000
+        with self._stats_lock:
+            self.calls += 1
+            if failed:
+                self.failures += 1
+            else:
+                self._latencies.append(latency_ms)
+        return latency_ms
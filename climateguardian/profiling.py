@@ -0,0 +1,121 @@
+"""
+Opt-in sampling profiler for query processing
+When enabled, one in every N profiled calls runs under cProfile and its
+stats are merged into a per-process .pstats file, so a slow path can be
+profiled in production without a restart or profiling every request.
+
+Sampling is switched at runtime through a control file holding N:
+
+    echo 100 > data/profiles/sample_every    # profile 1 in 100 queries
+    rm data/profiles/sample_every            # back to off
+
+and the aggregated stats are read with ``python -m pstats data/profiles/query-<pid>.pstats``.
+"""
+
+import cProfile
+import logging
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+CONTROL_FILE = "sample_every"
+
+
+class SamplingProfiler:
+    """Profiles 1 in N calls with cProfile and accumulates the stats on disk"""
+
+    def __init__(self, output_dir: str, name: str = "query", every: int = 0,
+                 control_file: Optional[str] = None, check_interval: float = 5.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.output_dir = output_dir
+        self.name = name
+        self.every = every
+        self.control_file = control_file if control_file is not None else os.path.join(output_dir, CONTROL_FILE)
+        self.check_interval = check_interval
+        self._clock = clock
+        self._control_stamp = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._stats: Optional[pstats.Stats] = None
+        self.samples = 0
+
+    @property
+    def stats_path(self) -> str:
+        return os.path.join(self.output_dir, f"{self.name}-{os.getpid()}.pstats")
+
+    @contextmanager
+    def sample(self) -> Iterator[bool]:
+        """Profile the enclosed block if it is the Nth call; yields whether it is profiled"""
+        self._check_control()
+        profile = None
+        if self.every > 0:
+            with self._lock:
+                self._calls += 1
+                selected = self._calls % self.every == 0
+            if selected:
+                profile = cProfile.Profile()
+                try:
+                    profile.enable()
+                except ValueError:
+                    # Another profiler is already active on this thread
+                    profile = None
+        try:
+            yield profile is not None
+        finally:
+            if profile is not None:
+                profile.disable()
+                self._accumulate(profile)
+
+    def reset(self):
+        """Discard accumulated stats"""
+        with self._lock:
+            self._stats = None
+            self.samples = 0
+
+    def _accumulate(self, profile: cProfile.Profile):
+        try:
+            with self._lock:
+                if self._stats is None:
+                    self._stats = pstats.Stats(profile)
+                else:
+                    self._stats.add(profile)
+                self.samples += 1
+                os.makedirs(self.output_dir, exist_ok=True)
+                tmp_path = f"{self.stats_path}.tmp"
+                self._stats.dump_stats(tmp_path)
+                os.replace(tmp_path, self.stats_path)
+        except (OSError, TypeError) as e:
+            logger.warning(f"Could not write profile stats: {str(e)}")
+
+    def _check_control(self):
+        """Pick up a changed sampling rate from the control file"""
+        now = self._clock()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.check_interval
+        try:
+            stamp = os.stat(self.control_file).st_mtime_ns
+        except OSError:
+            if self._control_stamp is not None:
+                self._control_stamp = None
+                self.every = 0
+                logger.info("Query profiling disabled")
+            return
+        if stamp == self._control_stamp:
+            return
+        self._control_stamp = stamp
+        try:
+            with open(self.control_file) as f:
+                every = int(f.read().strip() or 0)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable profiling control file: {str(e)}")
+            return
+        self.every = max(every, 0)
+        logger.info(f"Query profiling {'sampling 1 in ' + str(self.every) if self.every else 'disabled'}"
+                    f" -> {self.stats_path}")
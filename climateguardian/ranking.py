@@ -0,0 +1,132 @@
+"""
+Comparative climate risk ranking for ClimateGuardian
+Questions such as "rank South Asian countries by flood risk" or "compare
+Bangladesh and the Netherlands" need a score for many countries at once.
+A RiskTable holds one array per indicator across every country with ND-GAIN
+scores and computes their composite risk scores in a few array operations,
+so a ranking is a mask and a partial sort of one score vector.
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from climateguardian.knowledge import KnowledgeIndex
+
+# Flood risk levels from the hazard assessments, on the 0-1 risk scale
+HAZARD_LEVELS: Dict[str, float] = {"LOW": 0.25, "MEDIUM": 0.5, "HIGH": 0.75, "VERY HIGH": 1.0}
+
+# Composite weights; a country missing an indicator has the others rescaled to sum to one
+WEIGHTS: Dict[str, float] = {"vulnerability": 0.5, "readiness_gap": 0.3, "flood_hazard": 0.2}
+
+INDICATOR_LABELS: Dict[str, str] = {
+    "vulnerability": "ND-GAIN vulnerability",
+    "readiness_gap": "lack of ND-GAIN readiness",
+    "flood_hazard": "flood hazard",
+}
+
+
+def composite_scores(indicators: Dict[str, np.ndarray], weights: Dict[str, float] = WEIGHTS) -> np.ndarray:
+    """Weighted mean of the indicators present for each country; NaN where none are"""
+    values = np.vstack([indicators[name] for name in weights])
+    weight_column = np.array(list(weights.values()))[:, None]
+    present = ~np.isnan(values)
+    weighted = np.where(present, values * weight_column, 0.0).sum(axis=0)
+    total = np.where(present, weight_column, 0.0).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return weighted / total
+
+
+class RiskTable:
+    """Risk indicators and composite scores for every country with ND-GAIN scores"""
+
+    def __init__(self, knowledge: KnowledgeIndex, weights: Dict[str, float] = WEIGHTS):
+        codes = [iso3 for iso3 in knowledge.countries if iso3 in knowledge.nd_gain]
+        self.codes = np.array(codes, dtype=str)
+        self.positions = {iso3: position for position, iso3 in enumerate(codes)}
+
+        def column(values: Iterable[Optional[float]]) -> np.ndarray:
+            return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+        rows = [knowledge.nd_gain[iso3] for iso3 in codes]
+        self.vulnerability = column(row.get("vulnerability_score") for row in rows)
+        self.readiness = column(row.get("readiness_score") for row in rows)
+        self.flood_levels = [knowledge.flood_risks.get(iso3, {}).get("risk_level") for iso3 in codes]
+        self.indicators = {
+            "vulnerability": self.vulnerability,
+            "readiness_gap": 1.0 - self.readiness,
+            "flood_hazard": column(HAZARD_LEVELS.get(str(level).upper()) if level else None
+                                   for level in self.flood_levels),
+        }
+        self.scores = composite_scores(self.indicators, weights)
+        self.region_masks = {
+            region_id: np.isin(self.codes, list(members))
+            for region_id, members in knowledge.region_members.items() if members
+        }
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def rank(self, regions: Sequence[str] = (), countries: Sequence[str] = (),
+             top_k: Optional[int] = None, ascending: bool = False) -> np.ndarray:
+        """Positions of the highest-risk countries (lowest with ``ascending``), best first.
+
+        ``countries`` restricts the ranking to those countries, otherwise
+        ``regions`` restricts it to their members; neither ranks them all.
+        """
+        mask = ~np.isnan(self.scores)
+        if countries:
+            selected = np.zeros(len(self), dtype=bool)
+            selected[[self.positions[iso3] for iso3 in countries if iso3 in self.positions]] = True
+            mask &= selected
+        elif regions:
+            mask &= np.logical_or.reduce([self.region_masks.get(region_id, np.zeros(len(self), bool))
+                                          for region_id in regions])
+        candidates = np.flatnonzero(mask)
+        keys = self.scores[candidates] if ascending else -self.scores[candidates]
+        if top_k is not None and 0 < top_k < len(candidates):
+            keep = np.argpartition(keys, top_k - 1)[:top_k]
+            candidates, keys = candidates[keep], keys[keep]
+        return candidates[np.argsort(keys, kind="stable")]
+
+    def row(self, position: int) -> Dict:
+        """Score and indicators of the country at ``position``; None for indicators it lacks"""
+        vulnerability, readiness = self.vulnerability[position], self.readiness[position]
+        return {
+            "iso3": str(self.codes[position]),
+            "score": float(self.scores[position]),
+            "vulnerability": None if np.isnan(vulnerability) else float(vulnerability),
+            "readiness": None if np.isnan(readiness) else float(readiness),
+            "flood_risk": self.flood_levels[position]
+        }
+
+
+class RiskRanker:
+    """RiskTable for the current knowledge index, rebuilt when the index is reloaded"""
+
+    def __init__(self, weights: Dict[str, float] = WEIGHTS):
+        self.weights = weights
+        self._lock = threading.Lock()
+        self._built: Optional[Tuple[KnowledgeIndex, RiskTable]] = None
+        parts = [f"{INDICATOR_LABELS.get(name, name)} ({weight:.0%})" for name, weight in weights.items()]
+        self._methodology = ", ".join(parts[:-1]) + " and " + parts[-1] if len(parts) > 1 else parts[0]
+
+    def table(self, knowledge: KnowledgeIndex) -> RiskTable:
+        built = self._built
+        if built is not None and built[0] is knowledge:
+            return built[1]
+        with self._lock:
+            if self._built is None or self._built[0] is not knowledge:
+                self._built = (knowledge, RiskTable(knowledge, self.weights))
+            return self._built[1]
+
+    def methodology(self) -> str:
+        """The composite's indicators and weights, for answers"""
+        return self._methodology
+
+    def rank(self, knowledge: KnowledgeIndex, regions: Sequence[str] = (), countries: Sequence[str] = (),
+             top_k: Optional[int] = None, ascending: bool = False) -> List[Dict]:
+        """Ranked rows for the countries or regions given, highest risk first"""
+        table = self.table(knowledge)
+        return [table.row(position) for position in table.rank(regions, countries, top_k, ascending)]
@@ -0,0 +1,135 @@
+"""
+Dataset registry shared by the API and scripts/initialize_datasets.py
+``DATASETS`` describes each open dataset once. ``DatasetCatalog`` serializes
+the public catalog a single time and reuses the bytes and their ETag until
+one of the data/{dataset}_metadata.json files written by the init script
+changes, at which point the live sync status is merged in again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from climateguardian.cache import source_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Dataset id -> description. ``api_endpoint`` is None where no public API is used yet.
+DATASETS: Dict[str, Dict] = {
+    "nd_gain": {
+        "name": "ND-GAIN",
+        "description": "Climate vulnerability and readiness index",
+        "url": "https://gain.nd.edu/our-work/country-index/",
+        "api_endpoint": None,  # Would be actual API in production
+        "license": "CC BY 4.0",
+        "update_frequency": "Annual"
+    },
+    "noaa_climate": {
+        "name": "NOAA Climate Data",
+        "description": "Historical weather and climate records",
+        "url": "https://www.ncei.noaa.gov/products",
+        "api_endpoint": None,  # Would be actual API in production
+        "license": "Public Domain",
+        "update_frequency": "Daily/Monthly"
+    },
+    "openaq": {
+        "name": "OpenAQ",
+        "description": "Global air quality measurements",
+        "url": "https://openaq.org/",
+        "api_endpoint": "https://api.openaq.org/v2/",
+        "license": "CC BY 4.0",
+        "update_frequency": "Real-time"
+    },
+    "climate_trace": {
+        "name": "Climate TRACE",
+        "description": "Greenhouse gas emissions data",
+        "url": "https://climatetrace.org/",
+        "api_endpoint": None,  # Would be actual API in production
+        "license": "CC BY 4.0",
+        "update_frequency": "Annual"
+    },
+    "climate_watch": {
+        "name": "Climate Watch",
+        "description": "Climate policy and NDC tracking",
+        "url": "https://www.climatewatchdata.org/",
+        "api_endpoint": None,  # Would be actual API in production
+        "license": "CC BY 4.0",
+        "update_frequency": "Quarterly"
+    },
+    "un_sdg13": {
+        "name": "UN SDG 13 Indicators",
+        "description": "Climate action progress metrics",
+        "url": "https://unstats.un.org/sdgs/indicators/database/",
+        "api_endpoint": None,  # Would be actual API in production
+        "license": "CC BY 3.0",
+        "update_frequency": "Annual"
+    }
+}
+
+# Catalog fields served by /api/datasets, and live fields taken from the metadata files
+PUBLIC_FIELDS = ["name", "description", "license", "update_frequency", "url"]
+LIVE_FIELDS = ["last_updated", "status", "api_status"]
+# Connectivity details safe to publish (error messages and upstream ETags stay internal)
+API_STATUS_FIELDS = ["accessible", "status_code", "response_time", "tested_at"]
+
+
+def metadata_path(data_dir: str, dataset_id: str) -> str:
+    return os.path.join(data_dir, f"{dataset_id}_metadata.json")
+
+
+class DatasetCatalog:
+    """Serialized /api/datasets payload, rebuilt only when the metadata files change"""
+
+    def __init__(self, data_dir: str, check_interval: float = 5.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.data_dir = data_dir
+        self.check_interval = check_interval
+        self._clock = clock
+        self._paths = [metadata_path(data_dir, dataset_id) for dataset_id in DATASETS]
+        self._lock = threading.Lock()
+        self._fingerprint = source_fingerprint(self._paths)
+        self._body, self._etag = self._build()
+        self._next_check = clock() + check_interval
+
+    def snapshot(self) -> Tuple[bytes, str]:
+        """Current (JSON body, strong ETag), rebuilt if a metadata file changed since the last check"""
+        now = self._clock()
+        if now >= self._next_check:
+            with self._lock:
+                if now >= self._next_check:
+                    self._next_check = now + self.check_interval
+                    fingerprint = source_fingerprint(self._paths)
+                    if fingerprint != self._fingerprint:
+                        self._fingerprint = fingerprint
+                        self._body, self._etag = self._build()
+                        logger.info("Dataset catalog rebuilt from metadata files")
+        return self._body, self._etag
+
+    def entries(self) -> List[Dict]:
+        """Catalog entries with the live status from each dataset's metadata file"""
+        entries = []
+        for dataset_id, info in DATASETS.items():
+            entry = {"id": dataset_id, **{name: info[name] for name in PUBLIC_FIELDS}}
+            try:
+                with open(metadata_path(self.data_dir, dataset_id)) as f:
+                    metadata = json.load(f)
+            except FileNotFoundError:
+                metadata = {}
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable metadata for {dataset_id}: {str(e)}")
+                metadata = {}
+            entry.update({name: metadata[name] for name in LIVE_FIELDS if name in metadata})
+            if isinstance(entry.get("api_status"), dict):
+                entry["api_status"] = {name: entry["api_status"][name] for name in API_STATUS_FIELDS
+                                       if name in entry["api_status"]}
+            entries.append(entry)
+        return entries
+
+    def _build(self) -> Tuple[bytes, str]:
+        body = json.dumps({"status": "success", "data": self.entries()},
+                          separators=(",", ":")).encode("utf-8")
+        return body, hashlib.sha256(body).hexdigest()[:32]
@@ -0,0 +1,215 @@
+"""
+Sample climate data for demonstration purposes
+Written to data/{dataset}_sample.json by scripts/initialize_datasets.py and
+used by the knowledge store when those files have not been generated yet.
+In production these would be fetched from the upstream dataset APIs.
+"""
+
+SAMPLE_DATA = {
+    "nd_gain": {
+        "countries": [
+            {"country": "Bangladesh", "vulnerability_score": 0.72, "readiness_score": 0.31},
+            {"country": "Netherlands", "vulnerability_score": 0.28, "readiness_score": 0.89},
+            {"country": "Maldives", "vulnerability_score": 0.85, "readiness_score": 0.42}
+        ],
+        "flood_risks": [
+            {
+                "country": "Bangladesh",
+                "risk_level": "HIGH",
+                "confidence": 89,
+                "factors": [
+                    "Increased monsoon intensity (+23% by 2030)",
+                    "Sea level rise of 15-20cm expected",
+                    "40% of population in flood-prone areas"
+                ],
+                "sources": ["ND-GAIN Country Index 2023", "NOAA Climate Projections"],
+                "topics": ["flood", "sea_level", "precipitation"]
+            },
+            {
+                "country": "Netherlands",
+                "risk_level": "MEDIUM",
+                "confidence": 76,
+                "factors": [
+                    "Advanced flood protection systems",
+                    "Sea level rise of 10-15cm expected",
+                    "25% of land below sea level"
+                ],
+                "sources": ["European Climate Assessment", "Dutch Delta Works Data"],
+                "topics": ["flood", "sea_level"]
+            }
+        ]
+    },
+    "noaa_climate": {
+        "temperature_trends": [
+            {"region": "Global", "year": 2023, "anomaly": 1.2},
+            {"region": "Arctic", "year": 2023, "anomaly": 2.8},
+            {"region": "Tropical", "year": 2023, "anomaly": 0.9}
+        ],
+        "global_temperature_anomalies": [
+            {"region": "Global", "year": 2000, "anomaly": 0.39},
+            {"region": "Global", "year": 2001, "anomaly": 0.54},
+            {"region": "Global", "year": 2002, "anomaly": 0.6},
+            {"region": "Global", "year": 2003, "anomaly": 0.61},
+            {"region": "Global", "year": 2004, "anomaly": 0.57},
+            {"region": "Global", "year": 2005, "anomaly": 0.66},
+            {"region": "Global", "year": 2006, "anomaly": 0.62},
+            {"region": "Global", "year": 2007, "anomaly": 0.61},
+            {"region": "Global", "year": 2008, "anomaly": 0.54},
+            {"region": "Global", "year": 2009, "anomaly": 0.64},
+            {"region": "Global", "year": 2010, "anomaly": 0.71},
+            {"region": "Global", "year": 2011, "anomaly": 0.58},
+            {"region": "Global", "year": 2012, "anomaly": 0.62},
+            {"region": "Global", "year": 2013, "anomaly": 0.67},
+            {"region": "Global", "year": 2014, "anomaly": 0.74},
+            {"region": "Global", "year": 2015, "anomaly": 0.93},
+            {"region": "Global", "year": 2016, "anomaly": 0.99},
+            {"region": "Global", "year": 2017, "anomaly": 0.91},
+            {"region": "Global", "year": 2018, "anomaly": 0.83},
+            {"region": "Global", "year": 2019, "anomaly": 0.95},
+            {"region": "Global", "year": 2020, "anomaly": 0.98},
+            {"region": "Global", "year": 2021, "anomaly": 0.84},
+            {"region": "Global", "year": 2022, "anomaly": 0.86},
+            {"region": "Global", "year": 2023, "anomaly": 1.18}
+        ]
+    },
+    "openaq": {
+        "air_quality": [
+            {"city": "Delhi", "pm25": 89.5, "timestamp": "2024-01-01T00:00:00Z"},
+            {"city": "Beijing", "pm25": 67.2, "timestamp": "2024-01-01T00:00:00Z"},
+            {"city": "Los Angeles", "pm25": 23.1, "timestamp": "2024-01-01T00:00:00Z"}
+        ]
+    },
+    "climate_trace": {
+        "emissions": [
+            {"country": "China", "co2_emissions_mt": 10175, "year": 2022},
+            {"country": "United States", "co2_emissions_mt": 5007, "year": 2022},
+            {"country": "India", "co2_emissions_mt": 2654, "year": 2022}
+        ],
+        "emissions_history": [
+            {"country": "China", "co2_emissions_mt": 9899, "year": 2020},
+            {"country": "China", "co2_emissions_mt": 10318, "year": 2021},
+            {"country": "China", "co2_emissions_mt": 10175, "year": 2022},
+            {"country": "United States", "co2_emissions_mt": 4715, "year": 2020},
+            {"country": "United States", "co2_emissions_mt": 5032, "year": 2021},
+            {"country": "United States", "co2_emissions_mt": 5007, "year": 2022},
+            {"country": "India", "co2_emissions_mt": 2412, "year": 2020},
+            {"country": "India", "co2_emissions_mt": 2601, "year": 2021},
+            {"country": "India", "co2_emissions_mt": 2654, "year": 2022}
+        ]
+    },
+    "climate_watch": {
+        "ndc_progress": [
+            {"country": "Costa Rica", "target": "Carbon neutral by 2050", "progress": 0.65},
+            {"country": "Denmark", "target": "70% reduction by 2030", "progress": 0.78},
+            {"country": "Bhutan", "target": "Carbon negative", "progress": 1.0}
+        ],
+        "policy_recommendations": [
+            {
+                "region": "small_island_nations",
+                "priorities": [
+                    {
+                        "policy": "Coastal protection infrastructure",
+                        "funding": "$2.3B funding available",
+                        "impact": "High"
+                    },
+                    {
+                        "policy": "Renewable energy transition",
+                        "funding": "74% potential reduction in emissions",
+                        "impact": "Very High"
+                    },
+                    {
+                        "policy": "Climate-smart agriculture adaptation",
+                        "funding": "$500M available",
+                        "impact": "Medium"
+                    }
+                ],
+                "funding_opportunities": [
+                    {
+                        "name": "Green Climate Fund",
+                        "deadline": "June 2027",
+                        "amount": "$50M"
+                    },
+                    {
+                        "name": "Adaptation Fund",
+                        "deadline": "August 2027",
+                        "amount": "$25M"
+                    }
+                ],
+                "sources": ["UN SDG13 Database", "Climate Watch Policy Tracker"],
+                "topics": ["adaptation", "sea_level", "renewable_energy", "agriculture"]
+            }
+        ]
+    },
+    "un_sdg13": {
+        "climate_indicators": [
+            {"indicator": "Climate finance mobilized", "value": 83.3, "unit": "billion USD", "year": 2022},
+            {"indicator": "Countries with NDCs", "value": 195, "unit": "count", "year": 2023},
+            {"indicator": "Renewable energy capacity", "value": 3372, "unit": "GW", "year": 2022}
+        ],
+        "funding_opportunities": [
+            {
+                "name": "Adaptation Fund",
+                "amount": "$50M",
+                "deadline": "August 2027",
+                "eligibility": "Must demonstrate community impact and have local partnerships",
+                "regions": ["africa"],
+                "organization_types": ["ngo"],
+                "topics": ["adaptation"]
+            },
+            {
+                "name": "Climate Investment Funds",
+                "amount": "$25M",
+                "deadline": "September 2027",
+                "focus": "Community-based adaptation",
+                "regions": ["africa"],
+                "organization_types": ["ngo"],
+                "topics": ["adaptation"]
+            },
+            {
+                "name": "Global Environment Facility",
+                "amount": "$15M",
+                "deadline": "October 2027",
+                "focus": "Ecosystem-based solutions",
+                "regions": ["africa"],
+                "organization_types": ["ngo"],
+                "topics": ["adaptation"]
+            },
+            {
+                "name": "Pacific Resilience Facility",
+                "amount": "$12M",
+                "deadline": "15 December 2026",
+                "focus": "Small-scale resilience infrastructure",
+                "regions": ["pacific"],
+                "organization_types": ["government"],
+                "topics": ["adaptation", "sea_level"]
+            },
+            {
+                "name": "Green Climate Fund Readiness Programme",
+                "amount": "$3M",
+                "deadline": "31 March 2027",
+                "focus": "National adaptation planning and access to climate finance",
+                "regions": ["pacific", "small_island_nations", "latin_america"],
+                "organization_types": ["government"],
+                "topics": ["adaptation"]
+            },
+            {
+                "name": "Community Resilience Partnership Program",
+                "amount": "$30M",
+                "deadline": "January 2027",
+                "focus": "Locally led adaptation with women and vulnerable groups",
+                "regions": ["asia", "pacific"],
+                "organization_types": ["government", "ngo"],
+                "topics": ["adaptation"]
+            },
+            {
+                "name": "Least Developed Countries Fund",
+                "amount": "$20M",
+                "deadline": "Rolling",
+                "focus": "Urgent adaptation needs identified in national adaptation plans",
+                "regions": ["asia", "small_island_nations"],
+                "organization_types": ["government"],
+                "topics": ["adaptation"]
+            }
+        ]
+    }
+}
@@ -0,0 +1,105 @@
+"""
+Request coalescing for ClimateGuardian
+When many users ask the same question at once, each cache miss would start
+its own generation and LLM call. A SingleFlight lets the first caller for a
+key run the computation while identical concurrent callers wait for and
+share its result (or its exception) instead of starting their own.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    """One in-flight computation and the outcome its waiters receive"""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls by key, for threads and for coroutines.
+
+    ``do`` and ``ado`` return ``(result, shared)``, where ``shared`` is True
+    for callers that joined a computation another caller started. Keys are
+    forgotten as soon as their computation finishes, so later calls start
+    afresh; a result worth reusing beyond that belongs in a cache.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        # Coroutine callers share a task on their event loop: (loop, key) -> task
+        self._tasks: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls) + len(self._tasks)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run ``fn`` unless an identical call is in flight, then wait for its outcome"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    async def ado(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Await ``factory()`` unless an identical call is in flight on this loop, then await that.
+
+        The computation runs as its own task, so a caller that is cancelled
+        (a client disconnecting) does not cancel it for the others.
+        """
+        loop = asyncio.get_running_loop()
+        task_key = (loop, key)
+        with self._lock:
+            task = self._tasks.get(task_key)
+            if task is None:
+                task = loop.create_task(factory())
+                self._tasks[task_key] = task
+                task.add_done_callback(lambda done: self._forget(task_key, done))
+                self.leaders += 1
+                shared = False
+            else:
+                self.coalesced += 1
+                shared = True
+        return await asyncio.shield(task), shared
+
+    def stats(self) -> Dict:
+        """Computations started, callers that joined one, and how many are running"""
+        return {"leaders": self.leaders, "coalesced": self.coalesced, "in_flight": self.in_flight}
+
+    def _forget(self, task_key, task: asyncio.Future):
+        with self._lock:
+            self._tasks.pop(task_key, None)
+        # Mark the error retrieved; every waiter may have been cancelled
+        if not task.cancelled():
+            task.exception()
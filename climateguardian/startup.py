@@ -0,0 +1,187 @@
+"""
+Startup timing and lazy loading for ClimateGuardian
+A worker that has been spun down pays for every import, dataset load and
+index build before it answers its first request. STARTUP_MODE chooses when
+the heavy components are built:
+
+    eager  - in ClimateGuardian(), before the worker accepts requests
+    lazy   - on first use, by the first request that needs each one
+    warm   - lazy, plus a background thread that builds them right away
+
+A StartupReport records how long each phase and component took and when the
+worker finished importing, was constructed and served its first request.
+``python -m climateguardian.startup`` profiles module import times in a
+fresh interpreter and checks them against a budget.
+"""
+
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Generic, Iterator, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+STARTUP_MODES = ("eager", "lazy", "warm")
+
+T = TypeVar("T")
+
+
+def process_age() -> Optional[float]:
+    """Seconds since this process started, read from /proc; None where that is unavailable"""
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the parenthesised command name; starttime is field 22
+            fields = f.read().rsplit(")", 1)[1].split()
+        return time.clock_gettime(time.CLOCK_BOOTTIME) - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class StartupReport:
+    """Startup milestones (seconds since the process started), phase durations and component loads.
+
+    Milestones are measured from process start where /proc is available,
+    so they include interpreter startup and imports; elsewhere from when
+    the report was created.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self.started = clock() - (process_age() or 0.0)
+        self._lock = threading.Lock()
+        self.milestones: Dict[str, float] = {}
+        self.phases: Dict[str, float] = {}
+        self.components: Dict[str, Dict] = {}
+
+    def mark(self, milestone: str) -> bool:
+        """Record when ``milestone`` was first reached; True only the first time"""
+        if milestone in self.milestones:
+            return False
+        with self._lock:
+            if milestone in self.milestones:
+                return False
+            self.milestones[milestone] = self._clock() - self.started
+            return True
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a startup phase"""
+        start = self._clock()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.phases[name] = self._clock() - start
+
+    def component_loaded(self, name: str, seconds: float):
+        """Record a component build and the thread that paid for it"""
+        with self._lock:
+            self.components[name] = {"seconds": round(seconds, 6), "thread": threading.current_thread().name}
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            return {
+                "milestones_seconds": {name: round(value, 6) for name, value in self.milestones.items()},
+                "phases_seconds": {name: round(value, 6) for name, value in self.phases.items()},
+                "components": dict(self.components)
+            }
+
+
+class LazyComponent(Generic[T]):
+    """A component built by ``factory`` on first ``get()``, once, however many threads ask"""
+
+    __slots__ = ("name", "_factory", "_report", "_lock", "_value", "_loaded")
+
+    def __init__(self, name: str, factory: Callable[[], T], report: Optional[StartupReport] = None):
+        self.name = name
+        self._factory = factory
+        self._report = report
+        self._lock = threading.Lock()
+        self._value: Optional[T] = None
+        self._loaded = False
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def get(self) -> T:
+        if self._loaded:
+            return self._value
+        with self._lock:
+            if not self._loaded:
+                start = time.perf_counter()
+                self._value = self._factory()
+                self._loaded = True
+                if self._report is not None:
+                    self._report.component_loaded(self.name, time.perf_counter() - start)
+        return self._value
+
+    def set(self, value: T):
+        """Replace the component, e.g. with a test double"""
+        with self._lock:
+            self._value = value
+            self._loaded = True
+
+
+def warm_up(steps: Dict[str, Callable[[], object]], report: Optional[StartupReport] = None) -> threading.Thread:
+    """Run named ``steps`` in order on a daemon thread; a failing step is logged and the rest still run"""
+    report = report or StartupReport()
+
+    def run():
+        for name, step in steps.items():
+            try:
+                with report.phase(f"warm_up.{name}"):
+                    step()
+            except Exception as e:
+                logger.warning(f"Warm-up step {name} failed: {str(e)}")
+        report.mark("warmed")
+        logger.info(f"Warm-up finished {report.milestones['warmed']:.3f}s after process start")
+
+    thread = threading.Thread(target=run, name="startup-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def import_times(module: str = "app", python: str = sys.executable, cwd: Optional[str] = None,
+                 env: Optional[Dict[str, str]] = None) -> Dict[str, Dict[str, float]]:
+    """Self and cumulative import seconds of every module loaded by ``import module`` in a fresh interpreter"""
+    result = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"], cwd=cwd,
+                            env={**os.environ, **(env or {})}, capture_output=True, text=True, timeout=120)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed: {result.stderr.strip().splitlines()[-1:]}")
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = {"self": int(self_us) / 1e6, "cumulative": int(cumulative_us) / 1e6}
+    return times
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Profile module import times against a budget")
+    parser.add_argument("module", nargs="?", default="app")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list")
+    parser.add_argument("--budget", type=float, default=None, help="Fail above this many seconds")
+    args = parser.parse_args()
+
+    times = import_times(args.module)
+    total = times[args.module]["cumulative"]
+    slowest = sorted(times.items(), key=lambda item: item[1]["cumulative"], reverse=True)
+    print(f"{'module':<48} {'self ms':>9} {'cumulative ms':>14}")
+    for name, spent in slowest[:args.top]:
+        print(f"{name:<48} {spent['self'] * 1000:>9.1f} {spent['cumulative'] * 1000:>14.1f}")
+    if args.budget is not None and total > args.budget:
+        print(f"import {args.module} took {total:.3f}s, over the {args.budget:.3f}s budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,479 @@
+"""
+Shared storage backends for conversation history and the response cache
+The in-process stores (history.ConversationHistoryStore, cache.ResponseCache)
+are private to one worker process, so with several gunicorn workers a user's
+history depends on which worker answers and every worker warms its own
+cache. The SQLite stores here keep both in one WAL-mode database file that
+every worker on the host opens:
+
+    STORAGE_BACKEND=sqlite STORAGE_PATH=data/shared/climateguardian.db
+
+Writes are queued in memory and committed by a background thread in
+batches, one transaction per ``flush_interval`` or ``batch_size`` writes,
+so a query pays for an append to a list rather than a commit. A worker sees
+its own queued writes immediately and other workers' writes once their
+batch is committed.
+"""
+
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from climateguardian.cache import CacheKey, SourceWatcher, normalize_question
+from climateguardian.history import Entry, as_dict
+
+logger = logging.getLogger(__name__)
+
+# Hits refresh a cache entry's LRU position at most this often, in seconds
+TOUCH_INTERVAL = 1.0
+
+Hook = Callable[[sqlite3.Connection, Set], None]
+
+
+class SQLiteBackend:
+    """WAL-mode SQLite database with per-thread connections and a batching writer thread"""
+
+    def __init__(self, path: str, flush_interval: float = 0.05, batch_size: int = 256,
+                 busy_timeout: float = 5.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.busy_timeout = busy_timeout
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._local = threading.local()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        # Queued writes: (owner, sql, params, key)
+        self._pending: List[Tuple[str, str, tuple, object]] = []
+        # Queued writes per (owner, key), so readers flush only when they would miss one
+        self._pending_keys: Counter = Counter()
+        self._in_transaction: Dict[str, Hook] = {}
+        self._after_commit: Dict[str, Hook] = {}
+        self._after_drop: Dict[str, Hook] = {}
+        self._writer: Optional[threading.Thread] = None
+        self._writer_pid: Optional[int] = None
+        self._closed = False
+
+        self.flushes = 0
+        self.writes = 0
+        self.failed_writes = 0
+        atexit.register(self.close)
+
+    def connection(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use (and again after a fork)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # WAL with synchronous=NORMAL only syncs at checkpoints; commits stay cheap
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def register(self, owner: str, in_transaction: Optional[Hook] = None,
+                 after_commit: Optional[Hook] = None, after_drop: Optional[Hook] = None):
+        """Hooks run for each batch holding writes from ``owner``, with the keys those writes named.
+
+        ``in_transaction`` runs inside the batch transaction after the writes
+        (for trimming and eviction); ``after_commit`` runs once it committed,
+        and ``after_drop`` instead if it failed and its writes were dropped.
+        """
+        if in_transaction is not None:
+            self._in_transaction[owner] = in_transaction
+        if after_commit is not None:
+            self._after_commit[owner] = after_commit
+        if after_drop is not None:
+            self._after_drop[owner] = after_drop
+
+    def write(self, owner: str, sql: str, params: tuple = (), key=None):
+        """Queue a write for the next batch"""
+        with self._cond:
+            self._pending.append((owner, sql, params, key))
+            self._pending_keys[owner, key] += 1
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify()
+        self._ensure_writer()
+
+    def pending(self, owner: str, key) -> bool:
+        """Whether a write from ``owner`` naming ``key`` is queued and not yet committed"""
+        return self._pending_keys[owner, key] > 0
+
+    def flush(self) -> int:
+        """Commit every queued write now; returns how many were committed"""
+        with self._flush_lock:
+            with self._cond:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+
+            keys: Dict[str, Set] = defaultdict(set)
+            for owner, _, _, key in batch:
+                keys[owner].add(key)
+            conn = self.connection()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for _, sql, params, _ in batch:
+                    conn.execute(sql, params)
+                for owner, owner_keys in keys.items():
+                    hook = self._in_transaction.get(owner)
+                    if hook is not None:
+                        hook(conn, owner_keys)
+                conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                self.failed_writes += len(batch)
+                logger.error(f"Dropped {len(batch)} queued storage writes: {str(e)}")
+                for owner, owner_keys in keys.items():
+                    hook = self._after_drop.get(owner)
+                    if hook is not None:
+                        hook(conn, owner_keys)
+                return 0
+            finally:
+                with self._cond:
+                    for owner, _, _, key in batch:
+                        pending_key = (owner, key)
+                        self._pending_keys[pending_key] -= 1
+                        if not self._pending_keys[pending_key]:
+                            del self._pending_keys[pending_key]
+
+            self.flushes += 1
+            self.writes += len(batch)
+            for owner, owner_keys in keys.items():
+                hook = self._after_commit.get(owner)
+                if hook is not None:
+                    hook(conn, owner_keys)
+            return len(batch)
+
+    def close(self):
+        """Stop the writer thread after committing what is queued"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        writer = self._writer
+        if writer is not None and writer.is_alive() and writer is not threading.current_thread():
+            writer.join(timeout=10)
+        self.flush()
+
+    def _ensure_writer(self):
+        if self._writer_pid == os.getpid() or self._closed:
+            return
+        with self._cond:
+            if self._writer_pid == os.getpid():
+                return
+            self._writer = threading.Thread(target=self._run, name="storage-writer", daemon=True)
+            self._writer_pid = os.getpid()
+            self._writer.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if self._closed:
+                    return
+                # Give concurrent requests a window to join this batch
+                self._cond.wait_for(lambda: len(self._pending) >= self.batch_size or self._closed,
+                                    timeout=self.flush_interval)
+            self.flush()
+
+
+class SQLiteHistoryStore:
+    """ConversationHistoryStore kept in a shared SQLite database.
+
+    Each session keeps its newest ``max_entries_per_session`` entries; idle
+    sessions expire after ``session_ttl`` seconds and the least recently
+    used ones are dropped beyond ``max_sessions``. Trimming runs in every
+    batch transaction of the writer; expiry and eviction, which count every
+    session, in every ``maintenance_interval``-th one, so the session count
+    can overshoot ``max_sessions`` by the sessions started in between.
+    Expired sessions read as empty either way.
+    """
+
+    OWNER = "history"
+
+    def __init__(self, backend: SQLiteBackend, max_entries_per_session: int = 50, max_sessions: int = 10000,
+                 session_ttl: float = 86400, clock: Callable[[], float] = time.time,
+                 maintenance_interval: int = 16):
+        if max_entries_per_session < 1 or max_sessions < 1:
+            raise ValueError("History capacity must be at least one entry and one session")
+        if maintenance_interval < 1:
+            raise ValueError("History maintenance must run at least every batch")
+        self.backend = backend
+        self.max_entries_per_session = max_entries_per_session
+        self.max_sessions = max_sessions
+        self.session_ttl = session_ttl
+        self.maintenance_interval = maintenance_interval
+        self._clock = clock
+        self._batches = 0
+        self.evicted_sessions = 0
+        backend.connection().executescript("""
+            CREATE TABLE IF NOT EXISTS history_sessions (
+                session_id TEXT PRIMARY KEY,
+                last_seen REAL NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS history_sessions_last_seen ON history_sessions (last_seen);
+            CREATE TABLE IF NOT EXISTS history_entries (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                entry TEXT NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS history_entries_session ON history_entries (session_id, seq);
+        """)
+        backend.register(self.OWNER, in_transaction=self._maintain)
+
+    def append(self, session_id: str, entry: Entry):
+        """Queue an entry; the session's oldest entries are trimmed when the batch commits"""
+        payload = json.dumps(as_dict(entry), default=str)
+        self.backend.write(self.OWNER, "INSERT INTO history_entries (session_id, entry, size) VALUES (?, ?, ?)",
+                           (session_id, payload, len(payload)), session_id)
+        self._touch(session_id, session_id)
+
+    def recent(self, session_id: str, limit: int = 10) -> List[Dict]:
+        """Return up to ``limit`` most recent entries for a session, oldest first"""
+        self._flush_pending(session_id)
+        if limit <= 0 or not self._live(session_id):
+            return []
+        rows = self.backend.connection().execute(
+            "SELECT entry FROM history_entries WHERE session_id = ? ORDER BY seq DESC LIMIT ?",
+            (session_id, limit)).fetchall()
+        # Refreshing last_seen need not make this session's next read flush
+        self._touch(session_id, None)
+        return [json.loads(entry) for entry, in reversed(rows)]
+
+    def count(self, session_id: str) -> int:
+        """Number of entries currently held for a session"""
+        self._flush_pending(session_id)
+        if not self._live(session_id):
+            return 0
+        return self.backend.connection().execute(
+            "SELECT COUNT(*) FROM history_entries WHERE session_id = ?", (session_id,)).fetchone()[0]
+
+    def clear(self, session_id: str):
+        """Forget a session's history"""
+        self.backend.write(self.OWNER, "DELETE FROM history_entries WHERE session_id = ?", (session_id,))
+        self.backend.write(self.OWNER, "DELETE FROM history_sessions WHERE session_id = ?", (session_id,))
+        self.backend.flush()
+
+    def memory_budget(self) -> Dict:
+        """Report current usage against the configured capacity; sizes are serialized JSON bytes"""
+        self.backend.flush()
+        conn = self.backend.connection()
+        cutoff = self._cutoff()
+        sessions = conn.execute("SELECT COUNT(*) FROM history_sessions WHERE last_seen > ?",
+                                (cutoff,)).fetchone()[0]
+        entries, estimated_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM history_entries WHERE session_id IN "
+            "(SELECT session_id FROM history_sessions WHERE last_seen > ?)", (cutoff,)).fetchone()
+        return {
+            "sessions": sessions,
+            "entries": entries,
+            "estimated_bytes": estimated_bytes,
+            "max_sessions": self.max_sessions,
+            "max_entries_per_session": self.max_entries_per_session,
+            "max_entries": self.max_sessions * self.max_entries_per_session,
+            "session_ttl_seconds": self.session_ttl,
+            "evicted_sessions": self.evicted_sessions,
+            "backend": "sqlite"
+        }
+
+    def __len__(self) -> int:
+        return self.backend.connection().execute("SELECT COUNT(*) FROM history_entries").fetchone()[0]
+
+    def _flush_pending(self, session_id: str):
+        """Commit queued writes first if any are for this session, so a worker reads its own appends"""
+        if self.backend.pending(self.OWNER, session_id):
+            self.backend.flush()
+
+    def _touch(self, session_id: str, key):
+        """Queue a last_seen refresh; ``key`` None keeps it out of trimming and pending checks"""
+        self.backend.write(self.OWNER,
+                           "INSERT INTO history_sessions (session_id, last_seen) VALUES (?, ?) "
+                           "ON CONFLICT (session_id) DO UPDATE SET last_seen = MAX(last_seen, excluded.last_seen)",
+                           (session_id, self._clock()), key)
+
+    def _live(self, session_id: str) -> bool:
+        row = self.backend.connection().execute(
+            "SELECT last_seen FROM history_sessions WHERE session_id = ?", (session_id,)).fetchone()
+        return row is not None and row[0] > self._cutoff()
+
+    def _cutoff(self) -> float:
+        return self._clock() - self.session_ttl if self.session_ttl is not None else float("-inf")
+
+    def _maintain(self, conn: sqlite3.Connection, session_ids: Set):
+        """Trim the sessions written in this batch, then every few batches expire and cap sessions"""
+        for session_id in session_ids:
+            if session_id is None:
+                continue
+            conn.execute("DELETE FROM history_entries WHERE session_id = ? AND seq <= "
+                         "(SELECT seq FROM history_entries WHERE session_id = ? ORDER BY seq DESC LIMIT 1 OFFSET ?)",
+                         (session_id, session_id, self.max_entries_per_session))
+        self._batches += 1
+        if self._batches % self.maintenance_interval:
+            return
+
+        expired = [session_id for session_id, in conn.execute(
+            "SELECT session_id FROM history_sessions WHERE last_seen <= ?", (self._cutoff(),))]
+        count = conn.execute("SELECT COUNT(*) FROM history_sessions").fetchone()[0] - len(expired)
+        if count > self.max_sessions:
+            expired += [session_id for session_id, in conn.execute(
+                "SELECT session_id FROM history_sessions WHERE last_seen > ? ORDER BY last_seen LIMIT ?",
+                (self._cutoff(), count - self.max_sessions))]
+        for session_id in expired:
+            conn.execute("DELETE FROM history_entries WHERE session_id = ?", (session_id,))
+            conn.execute("DELETE FROM history_sessions WHERE session_id = ?", (session_id,))
+        self.evicted_sessions += len(expired)
+
+
+class SQLiteResponseCache:
+    """ResponseCache kept in a shared SQLite database.
+
+    Puts are visible to this worker at once and to the others after the
+    next batch commit. LRU order is kept in a last_used column refreshed at
+    most every TOUCH_INTERVAL seconds per entry; hit and miss counters are
+    per worker.
+    """
+
+    OWNER = "response_cache"
+
+    def __init__(self, backend: SQLiteBackend, max_size: int = 1024, ttl: Optional[float] = 3600,
+                 watch_paths: Iterable[str] = (), check_interval: float = 5.0,
+                 clock: Callable[[], float] = time.time):
+        self.backend = backend
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._sources = SourceWatcher(watch_paths, check_interval, clock)
+        self._lock = threading.Lock()
+        # Puts not yet committed: key -> (generation, expires_at, response)
+        self._pending: Dict[CacheKey, Tuple[int, float, Dict]] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        backend.connection().executescript("""
+            CREATE TABLE IF NOT EXISTS response_cache (
+                question TEXT NOT NULL,
+                intent TEXT NOT NULL,
+                response TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (question, intent)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS response_cache_last_used ON response_cache (last_used);
+        """)
+        backend.register(self.OWNER, in_transaction=self._enforce_size, after_commit=self._settled,
+                         after_drop=self._settled)
+
+    @staticmethod
+    def make_key(question: str, intent: str) -> CacheKey:
+        """Build the cache key for a question and its intent"""
+        return normalize_question(question), intent
+
+    def get(self, key: CacheKey) -> Optional[Dict]:
+        """Return the cached response or None on a miss"""
+        self._check_sources()
+        now = self._clock()
+        with self._lock:
+            pending = self._pending.get(key)
+        if pending is not None and pending[1] > now:
+            self._count(hits=1)
+            return pending[2]
+
+        row = self.backend.connection().execute(
+            "SELECT response, expires_at, last_used FROM response_cache WHERE question = ? AND intent = ?",
+            key).fetchone()
+        if row is None:
+            self._count(misses=1)
+            return None
+        response, expires_at, last_used = row
+        if expires_at <= now:
+            self.backend.write(self.OWNER, "DELETE FROM response_cache WHERE question = ? AND intent = ? "
+                               "AND expires_at <= ?", (*key, now))
+            self._count(misses=1, evictions=1)
+            return None
+        if now - last_used >= TOUCH_INTERVAL:
+            self.backend.write(self.OWNER, "UPDATE response_cache SET last_used = ? WHERE question = ? AND intent = ?",
+                               (now, *key))
+        self._count(hits=1)
+        return json.loads(response)
+
+    def put(self, key: CacheKey, response: Dict):
+        """Store a response; the least recently used entries are evicted when the batch commits"""
+        if self.max_size <= 0:
+            return
+        now = self._clock()
+        expires_at = now + self.ttl if self.ttl is not None else float("inf")
+        payload = json.dumps(response, default=str)
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            self._pending[key] = (generation, expires_at, response)
+        self.backend.write(self.OWNER, "INSERT OR REPLACE INTO response_cache "
+                           "(question, intent, response, expires_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                           (*key, payload, expires_at, now), (key, generation))
+
+    def clear(self) -> int:
+        """Drop every cached response, in every worker; returns how many were dropped"""
+        self.backend.flush()
+        with self._lock:
+            self._pending.clear()
+        return self.backend.connection().execute("DELETE FROM response_cache").rowcount
+
+    def stats(self) -> Dict:
+        """Cache counters (this worker's) and occupancy (shared)"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "backend": "sqlite"
+        }
+
+    def __len__(self) -> int:
+        return self.backend.connection().execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+
+    def _count(self, hits: int = 0, misses: int = 0, evictions: int = 0):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+            self.evictions += evictions
+
+    def _check_sources(self):
+        """Invalidate everything if a watched file changed since the last check"""
+        if self._sources.changed() and self.clear():
+            self.invalidations += 1
+
+    def _enforce_size(self, conn: sqlite3.Connection, keys: Set):
+        excess = conn.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0] - self.max_size
+        if excess > 0:
+            conn.execute("DELETE FROM response_cache WHERE (question, intent) IN "
+                         "(SELECT question, intent FROM response_cache ORDER BY last_used LIMIT ?)", (excess,))
+            self._count(evictions=excess)
+
+    def _settled(self, conn: sqlite3.Connection, keys: Set):
+        """Forget pending puts once their batch committed or was dropped, unless re-put since"""
+        with self._lock:
+            for item in keys:
+                if item is None:
+                    continue
+                key, generation = item
+                pending = self._pending.get(key)
+                if pending is not None and pending[0] == generation:
+                    del self._pending[key]
@@ -0,0 +1,29 @@
+"""
+Server-Sent Events helpers for streaming ClimateGuardian answers
+"""
+
+import json
+import re
+from typing import Dict, Iterator
+
+_WORD = re.compile(r"\S+\s*|\s+")
+
+
+def sse_event(event: str, data: Dict) -> str:
+    """Format one Server-Sent Event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def chunk_text(text: str, size: int = 48) -> Iterator[str]:
+    """Split text into chunks of roughly ``size`` characters on word boundaries.
+
+    Chunks concatenate back to the original text exactly, whitespace included.
+    """
+    chunk = ""
+    for word in _WORD.findall(text):
+        chunk += word
+        if len(chunk) >= size:
+            yield chunk
+            chunk = ""
+    if chunk:
+        yield chunk
@@ -0,0 +1,225 @@
+"""
+Local stand-in for the IBM IAM and watsonx.ai text generation endpoints
+Used by the tests and benchmarks so the LLM client can be exercised without
+credentials or network access. Run standalone with:
+
+    python -m climateguardian.stub_llm --port 8099 --latency 0.2
+
+then point WATSONX_URL and IBM_IAM_URL at it.
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+from climateguardian.streaming import chunk_text
+
+_REFERENCE = re.compile(r"Reference information:\n(.*?)\n\nQuestion:", re.DOTALL)
+
+
+def echo_reference(prompt: str) -> str:
+    """Default stub completion: the reference answer embedded in the prompt"""
+    match = _REFERENCE.search(prompt)
+    return match.group(1) if match else "Stub completion."
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.stub._count("connections")
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        stub = self.server.stub
+        if urlsplit(self.path).path != "/ml/v1/foundation_model_specs":
+            self._send_json(404, {"errors": [{"message": "not found"}]})
+            return
+        stub._count("model_spec_requests")
+        self._send_json(200, {"total_count": 1, "resources": [{"model_id": "ibm/granite-13b-chat-v2"}]})
+
+    def do_POST(self):
+        stub = self.server.stub
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        path = urlsplit(self.path).path
+
+        if path == "/identity/token":
+            stub._count("token_requests")
+            token = f"stub-token-{stub.counters['token_requests']}"
+            stub.valid_tokens.add(token)
+            self._send_json(200, {
+                "access_token": token,
+                "token_type": "Bearer",
+                "expires_in": stub.token_ttl,
+                "expiration": int(time.time() + stub.token_ttl)
+            })
+            return
+
+        if path not in ("/ml/v1/text/generation", "/ml/v1/text/generation_stream"):
+            self._send_json(404, {"errors": [{"message": "not found"}]})
+            return
+
+        authorization = self.headers.get("Authorization", "")
+        if authorization.replace("Bearer ", "", 1) not in stub.valid_tokens:
+            self._send_json(401, {"errors": [{"message": "invalid token"}]})
+            return
+
+        stub._count("generation_requests")
+        if stub._take_failure():
+            self._send_json(stub.fail_status, {"errors": [{"message": "stub failure"}]})
+            return
+
+        prompt = json.loads(body or b"{}").get("input", "")
+        text = stub.responder(prompt)
+        with stub._tracking_in_flight():
+            if path.endswith("_stream"):
+                self._send_stream(text, stub.latency)
+            else:
+                time.sleep(stub.latency)
+                self._send_json(200, {
+                    "model_id": "stub",
+                    "results": [{
+                        "generated_text": text,
+                        "generated_token_count": len(text.split()),
+                        "stop_reason": "eos_token"
+                    }]
+                })
+
+    def _send_json(self, status: int, payload: Dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_stream(self, text: str, latency: float):
+        chunks = list(chunk_text(text, size=16)) or [""]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i, chunk in enumerate(chunks):
+            time.sleep(latency / len(chunks))
+            event = json.dumps({"results": [{"generated_text": chunk, "generated_token_count": i + 1}]})
+            frame = f"id: {i + 1}\nevent: message\ndata: {event}\n\n".encode("utf-8")
+            self.wfile.write(f"{len(frame):x}\r\n".encode("ascii") + frame + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    # socketserver's default backlog of 5 drops connections under benchmark concurrency
+    request_queue_size = 256
+
+
+class StubWatsonxServer:
+    """Threaded HTTP server emulating IAM token issue and watsonx.ai generation"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 token_ttl: int = 3600, failures: int = 0, fail_status: int = 503,
+                 responder: Callable[[str], str] = echo_reference):
+        self.latency = latency
+        self.token_ttl = token_ttl
+        self.fail_status = fail_status
+        self.responder = responder
+        self.valid_tokens = set()
+        self.counters = {"connections": 0, "token_requests": 0, "generation_requests": 0,
+                         "model_spec_requests": 0}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._failures = failures
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        self.httpd = _StubHTTPServer((host, port), _StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.stub = self
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def iam_url(self) -> str:
+        return f"{self.url}/identity/token"
+
+    def fail_next(self, count: int, status: int = 503):
+        """Make the next ``count`` generation requests fail with ``status``"""
+        with self._lock:
+            self._failures = count
+            self.fail_status = status
+
+    def revoke_tokens(self):
+        """Invalidate every issued token so clients get HTTP 401"""
+        self.valid_tokens.clear()
+
+    def start(self) -> "StubWatsonxServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "StubWatsonxServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _take_failure(self) -> bool:
+        with self._lock:
+            if self._failures > 0:
+                self._failures -= 1
+                return True
+            return False
+
+    @contextmanager
+    def _tracking_in_flight(self):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stub of the watsonx.ai API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per generation")
+    parser.add_argument("--token-ttl", type=int, default=3600, help="IAM token lifetime in seconds")
+    args = parser.parse_args()
+
+    server = StubWatsonxServer(args.host, args.port, latency=args.latency, token_ttl=args.token_ttl)
+    print(f"Stub watsonx.ai listening on {server.url} (IAM: {server.iam_url})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
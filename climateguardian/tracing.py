@@ -0,0 +1,83 @@
+"""
+Lightweight per-request tracing
+A ``Trace`` records how long each named stage of a request took. The trace
+for the current request lives in a context variable, so code deep inside
+query processing can open a ``span`` without the trace being passed down;
+outside an active trace spans cost a single lookup. Traces render as a
+``Server-Timing`` header for debugging from the browser or curl.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+_current: ContextVar[Optional["Trace"]] = ContextVar("climateguardian_trace", default=None)
+
+
+class Trace:
+    """Stage timings for one request, in completion order"""
+
+    __slots__ = ("started", "spans", "failed_stage")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: List[Tuple[str, float]] = []
+        self.failed_stage: Optional[str] = None
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as stage ``name``; the innermost failing stage is remembered"""
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            if self.failed_stage is None:
+                self.failed_stage = name
+            raise
+        finally:
+            self.spans.append((name, time.perf_counter() - start))
+
+    def elapsed(self) -> float:
+        """Seconds since the trace started"""
+        return time.perf_counter() - self.started
+
+    def timings_ms(self) -> Dict[str, float]:
+        """Milliseconds per stage, summed when a stage ran more than once"""
+        timings: Dict[str, float] = {}
+        for name, seconds in self.spans:
+            timings[name] = timings.get(name, 0.0) + seconds * 1000
+        return {name: round(ms, 3) for name, ms in timings.items()}
+
+    def server_timing(self, include_total: bool = True) -> str:
+        """``Server-Timing`` header value, e.g. ``intent;dur=0.041, generate;dur=2.3``"""
+        parts = [f"{name};dur={ms}" for name, ms in self.timings_ms().items()]
+        if include_total:
+            parts.append(f"total;dur={round(self.elapsed() * 1000, 3)}")
+        return ", ".join(parts)
+
+
+def current_trace() -> Optional[Trace]:
+    """The trace active in this context, if any"""
+    return _current.get()
+
+
+@contextmanager
+def activate(trace: Trace) -> Iterator[Trace]:
+    """Make ``trace`` current for the enclosed block"""
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a stage of the current trace; a no-op when no trace is active"""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    with trace.span(name):
+        yield
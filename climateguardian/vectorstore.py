@@ -0,0 +1,465 @@
+"""
+Persistent vector index for retrieval-augmented generation
+Embeddings live in a memory-mapped float32 matrix on disk, alongside a JSON
+manifest of document ids, content hashes and metadata. Search uses an
+inverted-file (IVF) index: vectors are clustered with spherical k-means and
+each query only scans the lists of its nearest centroids. Small indexes are
+searched exhaustively. Documents can be added, replaced and deleted
+incrementally; deletions are tombstones until the index is compacted.
+
+The default embedder hashes words and word bigrams into a fixed number of
+dimensions, so the index works fully offline. Any callable mapping a list
+of texts to an (n, dim) float32 array can be used instead.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+Embedder = Callable[[Sequence[str]], np.ndarray]
+
+MANIFEST_FILE = "index.json"
+VECTORS_FILE = "vectors.f32"
+CENTROIDS_FILE = "centroids.npy"
+
+# Below this many vectors an exhaustive scan is as fast as probing lists
+MIN_TRAIN_ROWS = 1024
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset("a an and are as at be by can do does for from how in is it of on or that the "
+                       "this to what when where which who why with".split())
+
+
+def _stem(token: str) -> str:
+    """Fold simple plurals ("risks", "NGOs") onto the singular"""
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+class HashingEmbedder:
+    """Offline embedder: signed feature hashing of words and word bigrams"""
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = [_stem(token) for token in _TOKEN.findall(text.casefold()) if token not in _STOPWORDS]
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            if not features:
+                continue
+            hashes = np.fromiter((zlib.crc32(feature.encode("utf-8")) for feature in features),
+                                 dtype=np.uint64, count=len(features))
+            signs = np.where(hashes & 1, 1.0, -1.0).astype(np.float32)
+            np.add.at(vectors[row], (hashes >> 1) % self.dim, signs)
+        # Sublinear term frequency, then unit length for cosine similarity
+        vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+        return normalize(vectors)
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length (zero rows stay zero)"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.where(norms == 0, 1, norms)).astype(np.float32, copy=False)
+
+
+def content_hash(text: str, metadata: Optional[Dict] = None) -> str:
+    encoded = json.dumps([text, metadata or {}], sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def spherical_kmeans(vectors: np.ndarray, n_lists: int, iterations: int = 10,
+                     seed: int = 0, batch: int = 65536) -> np.ndarray:
+    """Unit-length centroids maximizing cosine similarity to their members"""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = assign(vectors, centroids, batch)
+        order = np.argsort(assignments, kind="stable")
+        counts = np.bincount(assignments, minlength=n_lists)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        nonempty = counts > 0
+        sums = np.add.reduceat(vectors[order], starts[nonempty], axis=0)
+        # Empty clusters keep their previous centroid
+        centroids[nonempty] = normalize(sums)
+    return centroids
+
+
+def assign(vectors: np.ndarray, centroids: np.ndarray, batch: int = 65536) -> np.ndarray:
+    """Index of the most similar centroid for each vector, in bounded-memory batches"""
+    out = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), batch):
+        out[start:start + batch] = np.argmax(vectors[start:start + batch] @ centroids.T, axis=1)
+    return out
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k highest scores, best first"""
+    if len(scores) <= k:
+        return np.argsort(-scores, kind="stable")
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+class VectorStore:
+    """Memory-mapped embedding matrix with an IVF index and incremental updates"""
+
+    def __init__(self, path: str, embedder: Optional[Embedder] = None, dim: Optional[int] = None,
+                 n_probe: int = 8, readonly: bool = False):
+        self.path = path
+        self.embedder = embedder or HashingEmbedder(dim or 512)
+        self.n_probe = n_probe
+        self.readonly = readonly
+        self._lock = threading.RLock()
+
+        manifest = self._read_manifest()
+        self.dim = manifest.get("dim") or dim or getattr(self.embedder, "dim", None)
+        if not self.dim:
+            raise ValueError("Vector dimension is unknown; pass dim or an embedder with a dim attribute")
+        self.ids: List[str] = manifest.get("ids", [])
+        self.hashes: List[str] = manifest.get("hashes", [])
+        self.metadata: List[Dict] = manifest.get("metadata", [])
+        self.rows = len(self.ids)
+        self.trained_rows = manifest.get("trained_rows", 0)
+        self._live = np.ones(self.rows, dtype=bool)
+        self._live[manifest.get("deleted", [])] = False
+        self._row_of = {doc_id: row for row, doc_id in enumerate(self.ids) if self._live[row]}
+
+        self._vectors = self._map(max(self.rows, 1))
+        centroids_file = os.path.join(path, CENTROIDS_FILE)
+        self.centroids = np.load(centroids_file) if self.trained_rows and os.path.exists(centroids_file) else None
+        self._assignments: Optional[np.ndarray] = None
+        self._lists: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    # Storage
+
+    def _read_manifest(self) -> Dict:
+        try:
+            with open(os.path.join(self.path, MANIFEST_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _map(self, capacity: int) -> np.ndarray:
+        """Map the vector file with room for ``capacity`` rows"""
+        vectors_file = os.path.join(self.path, VECTORS_FILE)
+        if self.readonly:
+            if not self.rows:
+                return np.zeros((0, self.dim), dtype=np.float32)
+            return np.memmap(vectors_file, dtype=np.float32, mode="r", shape=(self.rows, self.dim))
+        os.makedirs(self.path, exist_ok=True)
+        size = capacity * self.dim * 4
+        with open(vectors_file, "ab") as f:
+            if f.tell() < size:
+                f.truncate(size)
+        current = os.path.getsize(vectors_file) // (self.dim * 4)
+        return np.memmap(vectors_file, dtype=np.float32, mode="r+", shape=(current, self.dim))
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Stored vectors, deleted rows included"""
+        return self._vectors[:self.rows]
+
+    def save(self):
+        """Flush vectors and write the manifest and centroids"""
+        with self._lock:
+            self._vectors.flush()
+            if self.centroids is not None:
+                np.save(os.path.join(self.path, CENTROIDS_FILE), self.centroids)
+            manifest = {
+                "dim": self.dim,
+                "ids": self.ids,
+                "hashes": self.hashes,
+                "metadata": self.metadata,
+                "deleted": np.flatnonzero(~self._live).tolist(),
+                "trained_rows": self.trained_rows if self.centroids is not None else 0,
+                "updated_at": time.time()
+            }
+            tmp_path = os.path.join(self.path, f"{MANIFEST_FILE}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(manifest, f)
+            os.replace(tmp_path, os.path.join(self.path, MANIFEST_FILE))
+
+    # Updates
+
+    def add(self, ids: Sequence[str], texts: Sequence[str], metadata: Optional[Sequence[Dict]] = None):
+        """Embed and add documents, replacing any existing documents with the same id"""
+        metadata = list(metadata) if metadata is not None else [{} for _ in ids]
+        hashes = [content_hash(text, meta) for text, meta in zip(texts, metadata)]
+        metadata = [dict(meta, text=text) for text, meta in zip(texts, metadata)]
+        self.add_vectors(ids, self.embedder(list(texts)), metadata, hashes)
+
+    def add_vectors(self, ids: Sequence[str], vectors: np.ndarray,
+                    metadata: Optional[Sequence[Dict]] = None, hashes: Optional[Sequence[str]] = None):
+        """Add precomputed vectors (normalized on the way in)"""
+        if self.readonly:
+            raise RuntimeError("Vector store is read-only")
+        vectors = normalize(np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dim))
+        with self._lock:
+            self.delete([doc_id for doc_id in ids if doc_id in self._row_of])
+            needed = self.rows + len(ids)
+            if needed > len(self._vectors):
+                self._vectors.flush()
+                self._vectors = self._map(max(needed, 2 * len(self._vectors)))
+            self._vectors[self.rows:needed] = vectors
+            for offset, doc_id in enumerate(ids):
+                self._row_of[doc_id] = self.rows + offset
+            self.ids.extend(ids)
+            self.hashes.extend(hashes or [""] * len(ids))
+            self.metadata.extend(metadata or [{} for _ in ids])
+            self._live = np.concatenate((self._live, np.ones(len(ids), dtype=bool)))
+            self.rows = needed
+            self._lists = None
+            if self.centroids is not None and self._assignments is not None:
+                self._assignments = np.concatenate((self._assignments, assign(vectors, self.centroids)))
+
+    def delete(self, ids: Iterable[str]) -> int:
+        """Tombstone documents by id; returns how many were removed"""
+        removed = 0
+        with self._lock:
+            for doc_id in ids:
+                row = self._row_of.pop(doc_id, None)
+                if row is not None:
+                    self._live[row] = False
+                    removed += 1
+        return removed
+
+    def sync(self, documents: Iterable[Dict]) -> Dict[str, int]:
+        """Make the index match ``documents`` ({"id", "text", "metadata"}), embedding only changes"""
+        with self._lock:
+            current = {doc_id: self.hashes[row] for doc_id, row in self._row_of.items()}
+            changed, seen = [], set()
+            for document in documents:
+                seen.add(document["id"])
+                digest = content_hash(document["text"], document.get("metadata"))
+                if current.get(document["id"]) != digest:
+                    changed.append(document)
+            stale = [doc_id for doc_id in current if doc_id not in seen]
+            self.delete(stale)
+            if changed:
+                self.add([d["id"] for d in changed], [d["text"] for d in changed],
+                         [d.get("metadata", {}) for d in changed])
+            updated = sum(1 for d in changed if d["id"] in current)
+
+            deleted_rows = self.rows - len(self._row_of)
+            if deleted_rows > max(MIN_TRAIN_ROWS, len(self._row_of)):
+                self.compact()
+            if len(self._row_of) >= MIN_TRAIN_ROWS and len(self._row_of) > 2 * self.trained_rows:
+                self.train()
+            self.save()
+            return {"added": len(changed) - updated, "updated": updated,
+                    "deleted": len(stale), "unchanged": len(seen) - len(changed)}
+
+    def compact(self):
+        """Drop tombstoned rows and rewrite the vector file"""
+        with self._lock:
+            keep = np.flatnonzero(self._live)
+            vectors = np.array(self.vectors[keep])
+            self.ids = [self.ids[row] for row in keep]
+            self.hashes = [self.hashes[row] for row in keep]
+            self.metadata = [self.metadata[row] for row in keep]
+            self.rows = len(keep)
+            self._live = np.ones(self.rows, dtype=bool)
+            self._row_of = {doc_id: row for row, doc_id in enumerate(self.ids)}
+            # Write a new file and swap it in: readers keep mapping the old inode
+            vectors_file = os.path.join(self.path, VECTORS_FILE)
+            vectors.tofile(f"{vectors_file}.tmp")
+            os.replace(f"{vectors_file}.tmp", vectors_file)
+            self._vectors = self._map(max(self.rows, 1))
+            self._assignments = None
+            self._lists = None
+
+    def train(self, n_lists: Optional[int] = None, iterations: int = 10):
+        """Cluster live vectors into IVF lists (about sqrt(n) lists by default)"""
+        with self._lock:
+            live = np.flatnonzero(self._live)
+            if len(live) < 2:
+                return
+            n_lists = min(n_lists or int(np.sqrt(len(live))), len(live))
+            self.centroids = spherical_kmeans(np.asarray(self.vectors[live]), n_lists, iterations)
+            self.trained_rows = len(live)
+            self._assignments = None
+            self._lists = None
+
+    # Search
+
+    def _inverted_lists(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(rows ordered by list, list start offsets) built lazily from assignments"""
+        with self._lock:
+            if self._lists is None:
+                if self._assignments is None or len(self._assignments) != self.rows:
+                    self._assignments = assign(self.vectors, self.centroids)
+                order = np.argsort(self._assignments, kind="stable").astype(np.int64)
+                counts = np.bincount(self._assignments, minlength=len(self.centroids))
+                self._lists = (order, np.concatenate(([0], np.cumsum(counts))))
+            return self._lists
+
+    def search(self, queries: np.ndarray, k: int = 5,
+               n_probe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Approximate top-k by cosine similarity for a batch of query vectors.
+
+        Returns (scores, rows), each shaped (len(queries), k); missing results
+        are padded with -inf and -1.
+        """
+        queries = normalize(np.atleast_2d(np.asarray(queries, dtype=np.float32)))
+        if self.centroids is None or self.rows < MIN_TRAIN_ROWS:
+            return self.search_exact(queries, k)
+
+        order, offsets = self._inverted_lists()
+        n_probe = min(n_probe or self.n_probe, len(self.centroids))
+        probes = np.argpartition(-(queries @ self.centroids.T), n_probe - 1, axis=1)[:, :n_probe]
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        rows = np.full((len(queries), k), -1, dtype=np.int64)
+        vectors = self.vectors
+        for i, query in enumerate(queries):
+            candidates = np.concatenate([order[offsets[list_id]:offsets[list_id + 1]] for list_id in probes[i]])
+            candidates = candidates[self._live[candidates]]
+            if not len(candidates):
+                continue
+            candidate_scores = vectors[candidates] @ query
+            top = _top_k(candidate_scores, k)
+            scores[i, :len(top)] = candidate_scores[top]
+            rows[i, :len(top)] = candidates[top]
+        return scores, rows
+
+    def search_exact(self, queries: np.ndarray, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """Brute-force top-k over every live vector"""
+        queries = normalize(np.atleast_2d(np.asarray(queries, dtype=np.float32)))
+        live = np.flatnonzero(self._live)
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        rows = np.full((len(queries), k), -1, dtype=np.int64)
+        if not len(live):
+            return scores, rows
+        all_scores = queries @ np.asarray(self.vectors[live]).T if len(live) < self.rows else queries @ self.vectors.T
+        for i, row_scores in enumerate(all_scores):
+            top = _top_k(row_scores, k)
+            scores[i, :len(top)] = row_scores[top]
+            rows[i, :len(top)] = live[top]
+        return scores, rows
+
+    def query(self, texts: Sequence[str], k: int = 5, min_score: float = 0.0) -> List[List[Dict]]:
+        """Top-k documents for each text, as dicts with id, score and metadata"""
+        if not self._row_of:
+            return [[] for _ in texts]
+        scores, rows = self.search(self.embedder(list(texts)), k)
+        return [
+            [{"id": self.ids[row], "score": float(score), **self.metadata[row]}
+             for score, row in zip(row_scores, row_ids) if row >= 0 and score > min_score]
+            for row_scores, row_ids in zip(scores, rows)
+        ]
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+
+class VectorStoreReader:
+    """Read-only store under ``path``, reopened when the index on disk changes"""
+
+    def __init__(self, path: str, embedder: Optional[Embedder] = None):
+        self.path = path
+        self.embedder = embedder
+        self._stamp = None
+        self._store: Optional[VectorStore] = None
+        self._lock = threading.Lock()
+
+    @property
+    def store(self) -> Optional[VectorStore]:
+        """The current store, or None if no index has been built"""
+        try:
+            stamp = os.stat(os.path.join(self.path, MANIFEST_FILE)).st_mtime_ns
+        except OSError:
+            return None
+        if stamp == self._stamp:
+            return self._store
+        with self._lock:
+            if stamp != self._stamp:
+                try:
+                    self._store = VectorStore(self.path, self.embedder, readonly=True)
+                    self._stamp = stamp
+                except (OSError, ValueError):
+                    # Caught mid-rewrite; keep serving the previous index
+                    pass
+            return self._store
+
+
+def evaluate(store: VectorStore, queries: np.ndarray, k: int = 10,
+             n_probe: Optional[int] = None) -> Dict:
+    """Recall@k of the IVF search against brute force, with per-query latency percentiles"""
+    ann_ms, exact_ms, hits = [], [], 0
+    for query in np.atleast_2d(queries):
+        start = time.perf_counter()
+        _, approximate = store.search(query, k, n_probe)
+        ann_ms.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        _, exact = store.search_exact(query, k)
+        exact_ms.append((time.perf_counter() - start) * 1000)
+        truth = set(exact[0][exact[0] >= 0].tolist())
+        hits += len(truth & set(approximate[0].tolist()))
+    expected = len(queries) * min(k, len(store))
+    return {
+        "queries": len(queries),
+        "k": k,
+        "recall": round(hits / expected, 4) if expected else 1.0,
+        "ann_p50_ms": round(float(np.percentile(ann_ms, 50)), 3),
+        "ann_p99_ms": round(float(np.percentile(ann_ms, 99)), 3),
+        "exact_p50_ms": round(float(np.percentile(exact_ms, 50)), 3),
+        "exact_p99_ms": round(float(np.percentile(exact_ms, 99)), 3)
+    }
+
+
+def dataset_documents(data: Dict[str, Dict]) -> List[Dict]:
+    """Retrieval documents for the dataset records and policy texts"""
+    documents = []
+
+    def add(doc_id: str, text: str, dataset: str, kind: str):
+        documents.append({"id": doc_id, "text": text, "metadata": {"dataset": dataset, "kind": kind}})
+
+    nd_gain = data.get("nd_gain", {})
+    for row in nd_gain.get("flood_risks", []):
+        add(f"nd_gain:flood_risks:{row['country']}",
+            f"{row['country']} flood risk {row['risk_level']} ({row['confidence']}% confidence): "
+            + "; ".join(row["factors"]) + f". Sources: {', '.join(row['sources'])}.",
+            "nd_gain", "flood_risk")
+    for row in nd_gain.get("countries", []):
+        add(f"nd_gain:countries:{row['country']}",
+            f"{row['country']} ND-GAIN vulnerability score {row['vulnerability_score']}, "
+            f"readiness score {row['readiness_score']}.", "nd_gain", "vulnerability")
+
+    climate_watch = data.get("climate_watch", {})
+    for policy in climate_watch.get("policy_recommendations", []):
+        region = policy["region"].replace("_", " ")
+        priorities = "; ".join(f"{p['policy']} ({p['funding']}, impact {p['impact']})"
+                               for p in policy["priorities"])
+        add(f"climate_watch:policy:{policy['region']}",
+            f"Priority climate policies for {region}: {priorities}.", "climate_watch", "policy")
+    for row in climate_watch.get("ndc_progress", []):
+        add(f"climate_watch:ndc:{row['country']}",
+            f"{row['country']} NDC target: {row['target']}; progress {row['progress']:.0%}.",
+            "climate_watch", "ndc")
+
+    for row in data.get("un_sdg13", {}).get("funding_opportunities", []):
+        detail = row.get("focus") or row.get("eligibility", "")
+        add(f"un_sdg13:funding:{row['name']}",
+            f"{row['name']} climate funding {row['amount']}, deadline {row['deadline']}. {detail}. "
+            f"Regions: {', '.join(row.get('regions', []))}; "
+            f"organizations: {', '.join(row.get('organization_types', []))}.",
+            "un_sdg13", "funding")
+
+    for row in data.get("climate_trace", {}).get("emissions", []):
+        add(f"climate_trace:emissions:{row['country']}",
+            f"{row['country']} CO2 emissions {row['co2_emissions_mt']} Mt in {row['year']}.",
+            "climate_trace", "emissions")
+    for row in data.get("openaq", {}).get("air_quality", []):
+        add(f"openaq:air_quality:{row['city']}",
+            f"{row['city']} air quality PM2.5 {row['pm25']} µg/m³ at {row['timestamp']}.",
+            "openaq", "air_quality")
+    return documents
@@ -7,102 +7,124 @@ This script initializes and validates climate datasets for the application.
 import os
 import sys
 import json
+import time
+import hashlib
+import argparse
 import requests
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from climateguardian.columnar import DEFAULT_CHUNK_ROWS, ingest_file, ingest_lines, text_lines
+from climateguardian.knowledge import ClimateKnowledgeStore
+from climateguardian.registry import DATASETS, metadata_path
+from climateguardian.sample_data import SAMPLE_DATA
+from climateguardian.vectorstore import VectorStore, dataset_documents
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# How long a dataset is considered fresh after a sync, by update frequency.
+# Within this window incremental runs skip the upstream connectivity check.
+UPDATE_WINDOWS = {
+    "Real-time": timedelta(0),
+    "Daily/Monthly": timedelta(days=1),
+    "Quarterly": timedelta(days=90),
+    "Annual": timedelta(days=365)
+}
+
+STATE_FILE = "sync_state.json"
+
+def content_hash(data) -> str:
+    """Stable SHA-256 of a JSON-serializable value"""
+    encoded = json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+def write_json(path: str, data):
+    """Write JSON atomically so readers never see a partial file"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
 class DatasetInitializer:
     """Initialize and validate climate datasets"""
     
-    def __init__(self):
-        self.datasets = {
-            "nd_gain": {
-                "name": "ND-GAIN",
-                "description": "Climate vulnerability and readiness index",
-                "url": "https://gain.nd.edu/our-work/country-index/",
-                "api_endpoint": None,  # Would be actual API in production
-                "license": "CC BY 4.0",
-                "update_frequency": "Annual"
-            },
-            "noaa_climate": {
-                "name": "NOAA Climate Data",
-                "description": "Historical weather and climate records",
-                "url": "https://www.ncei.noaa.gov/products",
-                "api_endpoint": None,  # Would be actual API in production
-                "license": "Public Domain",
-                "update_frequency": "Daily/Monthly"
-            },
-            "openaq": {
-                "name": "OpenAQ",
-                "description": "Global air quality measurements",
-                "url": "https://openaq.org/",
-                "api_endpoint": "https://api.openaq.org/v2/",
-                "license": "CC BY 4.0",
-                "update_frequency": "Real-time"
-            },
-            "climate_trace": {
-                "name": "Climate TRACE",
-                "description": "Greenhouse gas emissions data",
-                "url": "https://climatetrace.org/",
-                "api_endpoint": None,  # Would be actual API in production
-                "license": "CC BY 4.0",
-                "update_frequency": "Annual"
-            },
-            "climate_watch": {
-                "name": "Climate Watch",
-                "description": "Climate policy and NDC tracking",
-                "url": "https://www.climatewatchdata.org/",
-                "api_endpoint": None,  # Would be actual API in production
-                "license": "CC BY 4.0",
-                "update_frequency": "Quarterly"
-            },
-            "un_sdg13": {
-                "name": "UN SDG 13 Indicators",
-                "description": "Climate action progress metrics",
-                "url": "https://unstats.un.org/sdgs/indicators/database/",
-                "api_endpoint": None,  # Would be actual API in production
-                "license": "CC BY 3.0",
-                "update_frequency": "Annual"
-            }
-        }
+    def __init__(self, data_dir: Optional[str] = None, max_workers: int = 4,
+                 incremental: bool = False, timeout: float = 10):
+        # Own copies, so changes here never reach the shared registry
+        self.datasets = {dataset_id: dict(info) for dataset_id, info in DATASETS.items()}
         
-        self.data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
+        self.data_dir = data_dir or os.path.join(os.path.dirname(__file__), '..', 'data')
         os.makedirs(self.data_dir, exist_ok=True)
+        
+        self.max_workers = max_workers
+        self.incremental = incremental
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.state = self.load_state()
+        self.timings: Dict[str, Dict] = {}
     
     def initialize_all_datasets(self) -> Dict[str, bool]:
-        """Initialize all datasets and return status"""
-        results = {}
+        """Initialize all datasets concurrently and return status"""
+        logger.info(f"Starting dataset initialization ({self.max_workers} workers, "
+                    f"{'incremental' if self.incremental else 'full'} sync)...")
         
-        logger.info("Starting dataset initialization...")
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {
+                dataset_id: pool.submit(self._initialize_timed, dataset_id, dataset_info)
+                for dataset_id, dataset_info in self.datasets.items()
+            }
+            results = {dataset_id: future.result() for dataset_id, future in futures.items()}
+        self.total_duration = time.perf_counter() - started
         
-        for dataset_id, dataset_info in self.datasets.items():
-            try:
-                logger.info(f"Initializing {dataset_info['name']}...")
-                success = self.initialize_dataset(dataset_id, dataset_info)
-                results[dataset_id] = success
-                
-                if success:
-                    logger.info(f"✅ {dataset_info['name']} initialized successfully")
-                else:
-                    logger.warning(f"⚠️ {dataset_info['name']} initialization failed")
-                    
-            except Exception as e:
-                logger.error(f"❌ Error initializing {dataset_info['name']}: {str(e)}")
-                results[dataset_id] = False
+        self.save_state()
+        self.vector_index_status = self.refresh_vector_index()
         
         # Generate summary report
         self.generate_summary_report(results)
         
         return results
     
+    def _initialize_timed(self, dataset_id: str, dataset_info: Dict) -> bool:
+        """Initialize one dataset, recording its duration and outcome"""
+        started = time.perf_counter()
+        try:
+            logger.info(f"Initializing {dataset_info['name']}...")
+            success = self.initialize_dataset(dataset_id, dataset_info)
+            
+            if success:
+                logger.info(f"✅ {dataset_info['name']} initialized successfully")
+            else:
+                logger.warning(f"⚠️ {dataset_info['name']} initialization failed")
+                
+        except Exception as e:
+            logger.error(f"❌ Error initializing {dataset_info['name']}: {str(e)}")
+            success = False
+        
+        timing = self.timings.setdefault(dataset_id, {"action": "failed"})
+        timing["duration_seconds"] = round(time.perf_counter() - started, 3)
+        return success
+    
     def initialize_dataset(self, dataset_id: str, dataset_info: Dict) -> bool:
-        """Initialize a specific dataset"""
+        """Initialize a specific dataset, skipping unchanged ones in incremental mode"""
         try:
+            state = dict(self.state.get(dataset_id, {}))
+            api_status = None
+            sample = SAMPLE_DATA.get(dataset_id)
+            sample_hash = content_hash(sample) if sample is not None else None
+            
+            if self.incremental:
+                reason, api_status = self.unchanged_reason(dataset_id, dataset_info, state, sample_hash)
+                if reason:
+                    self.timings[dataset_id] = {"action": "skipped", "reason": reason}
+                    return True
+            
             # Create dataset metadata
             metadata = {
                 "id": dataset_id,
@@ -116,32 +138,68 @@ class DatasetInitializer:
                 "api_available": dataset_info["api_endpoint"] is not None
             }
             
-            # Test API connectivity if available
+            # Test API connectivity if available, reusing the conditional request's response
             if dataset_info["api_endpoint"]:
-                api_status = self.test_api_connectivity(dataset_info["api_endpoint"])
+                if api_status is None:
+                    api_status = self.test_api_connectivity(dataset_info["api_endpoint"], state.get("etag"))
                 metadata["api_status"] = api_status
+                if api_status.get("etag"):
+                    state["etag"] = api_status["etag"]
             
             # Save metadata
-            metadata_file = os.path.join(self.data_dir, f"{dataset_id}_metadata.json")
-            with open(metadata_file, 'w') as f:
-                json.dump(metadata, f, indent=2)
+            write_json(metadata_path(self.data_dir, dataset_id), metadata)
             
             # Create sample data file (in production, this would fetch real data)
             self.create_sample_data(dataset_id, dataset_info)
             
+            state.update({"content_hash": sample_hash, "synced_at": metadata["last_updated"]})
+            self.state[dataset_id] = state
+            self.timings[dataset_id] = {"action": "synced"}
             return True
             
         except Exception as e:
             logger.error(f"Error initializing {dataset_id}: {str(e)}")
             return False
     
-    def test_api_connectivity(self, api_endpoint: str) -> Dict:
-        """Test API connectivity and return status"""
+    def unchanged_reason(self, dataset_id: str, dataset_info: Dict, state: Dict,
+                         sample_hash: Optional[str]) -> Tuple[Optional[str], Optional[Dict]]:
+        """Why the previous sync of a dataset is still current, or None if it must be synced.
+
+        Also returns the API status from the conditional request, when one
+        was sent, so a sync that follows does not request the endpoint again.
+        """
+        files = [metadata_path(self.data_dir, dataset_id)]
+        if sample_hash is not None:
+            files.append(os.path.join(self.data_dir, f"{dataset_id}_sample.json"))
+        if not state.get("synced_at") or not all(os.path.exists(path) for path in files):
+            return None, None
+        if state.get("content_hash") != sample_hash:
+            return None, None
+        
+        if not dataset_info["api_endpoint"]:
+            return "content hash unchanged", None
+        
+        window = UPDATE_WINDOWS.get(dataset_info["update_frequency"], timedelta(0))
+        if datetime.now() - datetime.fromisoformat(state["synced_at"]) < window:
+            return f"within {dataset_info['update_frequency'].lower()} update window", None
+        
+        if state.get("etag"):
+            api_status = self.test_api_connectivity(dataset_info["api_endpoint"], state["etag"])
+            if api_status.get("not_modified"):
+                return "ETag unchanged", api_status
+            return None, api_status
+        return None, None
+    
+    def test_api_connectivity(self, api_endpoint: str, etag: Optional[str] = None) -> Dict:
+        """Test API connectivity and return status, sending a conditional request when an ETag is known"""
         try:
-            response = requests.get(api_endpoint, timeout=10)
+            headers = {"If-None-Match": etag} if etag else {}
+            response = self.session.get(api_endpoint, headers=headers, timeout=(3.05, self.timeout))
             return {
-                "accessible": response.status_code == 200,
+                "accessible": response.status_code in (200, 304),
                 "status_code": response.status_code,
+                "not_modified": response.status_code == 304,
+                "etag": response.headers.get("ETag"),
                 "response_time": response.elapsed.total_seconds(),
                 "tested_at": datetime.now().isoformat()
             }
@@ -154,61 +212,66 @@ class DatasetInitializer:
     
     def create_sample_data(self, dataset_id: str, dataset_info: Dict):
         """Create sample data for demonstration purposes"""
-        sample_data = {
-            "nd_gain": {
-                "countries": [
-                    {"country": "Bangladesh", "vulnerability_score": 0.72, "readiness_score": 0.31},
-                    {"country": "Netherlands", "vulnerability_score": 0.28, "readiness_score": 0.89},
-                    {"country": "Maldives", "vulnerability_score": 0.85, "readiness_score": 0.42}
-                ]
-            },
-            "noaa_climate": {
-                "temperature_trends": [
-                    {"region": "Global", "year": 2023, "anomaly": 1.2},
-                    {"region": "Arctic", "year": 2023, "anomaly": 2.8},
-                    {"region": "Tropical", "year": 2023, "anomaly": 0.9}
-                ]
-            },
-            "openaq": {
-                "air_quality": [
-                    {"city": "Delhi", "pm25": 89.5, "timestamp": "2024-01-01T00:00:00Z"},
-                    {"city": "Beijing", "pm25": 67.2, "timestamp": "2024-01-01T00:00:00Z"},
-                    {"city": "Los Angeles", "pm25": 23.1, "timestamp": "2024-01-01T00:00:00Z"}
-                ]
-            },
-            "climate_trace": {
-                "emissions": [
-                    {"country": "China", "co2_emissions_mt": 10175, "year": 2022},
-                    {"country": "United States", "co2_emissions_mt": 5007, "year": 2022},
-                    {"country": "India", "co2_emissions_mt": 2654, "year": 2022}
-                ]
-            },
-            "climate_watch": {
-                "ndc_progress": [
-                    {"country": "Costa Rica", "target": "Carbon neutral by 2050", "progress": 0.65},
-                    {"country": "Denmark", "target": "70% reduction by 2030", "progress": 0.78},
-                    {"country": "Bhutan", "target": "Carbon negative", "progress": 1.0}
-                ]
-            },
-            "un_sdg13": {
-                "climate_indicators": [
-                    {"indicator": "Climate finance mobilized", "value": 83.3, "unit": "billion USD", "year": 2022},
-                    {"indicator": "Countries with NDCs", "value": 195, "unit": "count", "year": 2023},
-                    {"indicator": "Renewable energy capacity", "value": 3372, "unit": "GW", "year": 2022}
-                ]
-            }
-        }
-        
-        if dataset_id in sample_data:
+        if dataset_id in SAMPLE_DATA:
             data_file = os.path.join(self.data_dir, f"{dataset_id}_sample.json")
-            with open(data_file, 'w') as f:
-                json.dump(sample_data[dataset_id], f, indent=2)
+            write_json(data_file, SAMPLE_DATA[dataset_id])
+    
+    def refresh_vector_index(self) -> Dict:
+        """Bring the retrieval index in data/vectors in line with the current dataset files"""
+        try:
+            started = time.perf_counter()
+            data = ClimateKnowledgeStore(self.data_dir).load_data()
+            store = VectorStore(os.path.join(self.data_dir, "vectors"))
+            status = store.sync(dataset_documents(data))
+            status.update({"documents": len(store),
+                           "duration_seconds": round(time.perf_counter() - started, 3)})
+            logger.info(f"🔎 Vector index: {status['documents']} documents "
+                        f"({status['added']} added, {status['updated']} updated, {status['deleted']} deleted)")
+            return status
+        except Exception as e:
+            logger.error(f"❌ Error refreshing vector index: {str(e)}")
+            return {"error": str(e)}
+    
+    def ingest_dataset(self, dataset_id: str, table: str, source: str, fmt: Optional[str] = None,
+                       chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Dict:
+        """Stream a large CSV/NDJSON file or URL into data/columnar/<dataset>/<table>"""
+        path = os.path.join(self.data_dir, "columnar", dataset_id, table)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fmt = fmt or os.path.splitext(source.split("?")[0])[1].lstrip(".").lower()
+        
+        started = time.perf_counter()
+        logger.info(f"Ingesting {source} into {dataset_id}/{table}...")
+        if source.startswith(("http://", "https://")):
+            with self.session.get(source, stream=True, timeout=(3.05, self.timeout)) as response:
+                response.raise_for_status()
+                schema = ingest_lines(text_lines(response.iter_content(chunk_size=1 << 20)),
+                                      path, fmt, chunk_rows=chunk_rows)
+        else:
+            schema = ingest_file(source, path, fmt, chunk_rows=chunk_rows)
+        
+        duration = time.perf_counter() - started
+        logger.info(f"✅ {dataset_id}/{table}: {schema['rows']} rows, "
+                    f"{len(schema['columns'])} columns in {duration:.2f}s")
+        return {"rows": schema["rows"], "columns": schema["columns"], "duration_seconds": round(duration, 3)}
+    
+    def load_state(self) -> Dict:
+        """Load per-dataset sync state (content hash, ETag, last sync) from the last run"""
+        try:
+            with open(os.path.join(self.data_dir, STATE_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def save_state(self):
+        """Persist per-dataset sync state for the next incremental run"""
+        write_json(os.path.join(self.data_dir, STATE_FILE), self.state)
     
     def generate_summary_report(self, results: Dict[str, bool]):
         """Generate initialization summary report"""
         total_datasets = len(results)
         successful = sum(results.values())
         failed = total_datasets - successful
+        skipped = sum(1 for timing in self.timings.values() if timing["action"] == "skipped")
         
         report = {
             "initialization_summary": {
@@ -216,22 +279,30 @@ class DatasetInitializer:
                 "total_datasets": total_datasets,
                 "successful": successful,
                 "failed": failed,
-                "success_rate": f"{(successful/total_datasets)*100:.1f}%"
+                "skipped": skipped,
+                "success_rate": f"{(successful/total_datasets)*100:.1f}%",
+                "mode": "incremental" if self.incremental else "full",
+                "workers": self.max_workers,
+                "duration_seconds": round(getattr(self, "total_duration", 0.0), 3)
             },
             "dataset_status": results,
+            "dataset_timings": {dataset_id: self.timings.get(dataset_id, {}) for dataset_id in results},
+            "vector_index": getattr(self, "vector_index_status", None),
             "next_steps": [
                 "Configure IBM watsonx.ai credentials",
-                "Set up vector database for RAG",
                 "Implement real-time data fetching",
                 "Deploy to production environment"
             ]
         }
         
         report_file = os.path.join(self.data_dir, "initialization_report.json")
-        with open(report_file, 'w') as f:
-            json.dump(report, f, indent=2)
+        write_json(report_file, report)
         
-        logger.info(f"📊 Initialization complete: {successful}/{total_datasets} datasets successful")
+        for dataset_id, timing in report["dataset_timings"].items():
+            logger.info(f"⏱️ {dataset_id}: {timing.get('action')} in {timing.get('duration_seconds', 0):.3f}s"
+                        + (f" ({timing['reason']})" if timing.get('reason') else ""))
+        logger.info(f"📊 Initialization complete: {successful}/{total_datasets} datasets successful"
+                    f" ({skipped} unchanged)")
         logger.info(f"📄 Report saved to: {report_file}")
     
     def validate_environment(self) -> bool:
@@ -253,12 +324,34 @@ class DatasetInitializer:
         logger.info("✅ Environment validation passed")
         return True
 
-def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Initialize ClimateGuardian datasets")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="Number of datasets to initialize concurrently (default: 4)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Skip datasets unchanged since the last run")
+    parser.add_argument("--timeout", type=float, default=10,
+                        help="Read timeout in seconds for upstream API checks (default: 10)")
+    parser.add_argument("--data-dir", default=None, help="Output directory (default: ./data)")
+    parser.add_argument("--ingest", nargs=3, action="append", default=[],
+                        metavar=("DATASET", "TABLE", "SOURCE"),
+                        help="Stream a CSV/NDJSON file or URL into the columnar store (repeatable)")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f"Rows parsed per ingest chunk (default: {DEFAULT_CHUNK_ROWS})")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
     """Main initialization function"""
+    args = parse_args(argv)
     print("🌍 ClimateGuardian Dataset Initialization")
     print("=" * 50)
     
-    initializer = DatasetInitializer()
+    initializer = DatasetInitializer(
+        data_dir=args.data_dir,
+        max_workers=max(1, args.workers),
+        incremental=args.incremental,
+        timeout=args.timeout
+    )
     
     # Validate environment
     env_valid = initializer.validate_environment()
@@ -266,6 +359,14 @@ def main():
     # Initialize datasets
     results = initializer.initialize_all_datasets()
     
+    # Stream large upstream extracts into the columnar store
+    for dataset_id, table, source in args.ingest:
+        try:
+            initializer.ingest_dataset(dataset_id, table, source, chunk_rows=args.chunk_rows)
+        except Exception as e:
+            logger.error(f"❌ Error ingesting {source} into {dataset_id}/{table}: {str(e)}")
+            results[f"{dataset_id}/{table}"] = False
+    
     # Print summary
     successful = sum(results.values())
     total = len(results)
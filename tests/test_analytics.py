@@ -0,0 +1,138 @@
+"""
+Test suite for the time-series analytics engine
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from climateguardian.analytics import (ClimateAnalytics, annual_aggregate, anomalies, calendar_years,
+                                       linear_trend, rolling_mean, summarize, year_over_year)
+from climateguardian.columnar import ColumnarCatalog, ColumnarWriter
+from climateguardian.knowledge import KnowledgeIndex
+from climateguardian.sample_data import SAMPLE_DATA
+
+
+class AnalyticsFunctionsTestCase(unittest.TestCase):
+    """Test cases for the vectorized series operations"""
+
+    def test_calendar_years(self):
+        """Test the day lookup matches numpy's calendar conversion, before and after 1970"""
+        times = np.array(["1899-12-31T23:59:59", "1969-12-31T12:00:00", "1970-01-01T00:00:00",
+                          "2000-02-29T08:00:00", "2024-12-31T23:59:59"], dtype="datetime64[s]")
+        expected = times.astype("datetime64[Y]").astype(np.int64) + 1970
+        self.assertEqual(list(calendar_years(times)), list(expected))
+        self.assertEqual(len(calendar_years(times[:0])), 0)
+
+    def test_annual_aggregate(self):
+        """Test per-year means and sums skip missing years"""
+        years = np.array([2001, 2001, 2003, 2003, 2003])
+        values = np.array([1.0, 3.0, 2.0, 4.0, 6.0])
+        out_years, means, counts = annual_aggregate(years, values)
+        self.assertEqual(list(out_years), [2001, 2003])
+        self.assertEqual(list(means), [2.0, 4.0])
+        self.assertEqual(list(counts), [2, 3])
+        self.assertEqual(list(annual_aggregate(years, values, "sum")[1]), [4.0, 12.0])
+
+    def test_linear_trend(self):
+        """Test slope and fit quality match the closed-form solution"""
+        x = np.arange(2000, 2010)
+        slope, intercept, r_squared = linear_trend(x, 0.5 * x - 3)
+        self.assertAlmostEqual(slope, 0.5)
+        self.assertAlmostEqual(intercept, -3)
+        self.assertAlmostEqual(r_squared, 1.0)
+        self.assertAlmostEqual(linear_trend(x, np.sin(x) + x)[0], np.polyfit(x, np.sin(x) + x, 1)[0])
+
+    def test_anomalies_rolling_and_yoy(self):
+        """Test baseline anomalies, rolling means and year-over-year change"""
+        years = np.array([2000, 2001, 2002, 2003])
+        values = np.array([1.0, 3.0, 4.0, 8.0])
+        departures, baseline_mean = anomalies(years, values, (2000, 2001))
+        self.assertEqual(baseline_mean, 2.0)
+        self.assertEqual(list(departures), [-1.0, 1.0, 2.0, 6.0])
+        self.assertEqual(list(rolling_mean(values, 2)), [2.0, 3.5, 6.0])
+        change, percent = year_over_year(values)
+        self.assertEqual(list(change), [2.0, 1.0, 4.0])
+        np.testing.assert_allclose(percent, [200.0, 100 / 3, 100.0])
+
+    def test_summarize_needs_two_years(self):
+        """Test a single-year series has no trend summary"""
+        self.assertIsNone(summarize(np.array([2023, 2023]), np.array([1.0, 2.0])))
+
+
+class ClimateAnalyticsTestCase(unittest.TestCase):
+    """Test cases for answering analysis questions"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.analytics = ClimateAnalytics(ColumnarCatalog(self.root))
+        self.knowledge = KnowledgeIndex(SAMPLE_DATA)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_sample_temperature_series(self):
+        """Test the sample NOAA anomaly series is analyzed"""
+        response = self.analytics.answer("What is the global temperature trend?", self.knowledge)
+        self.assertEqual(response["sources"], ["NOAA Climate Data"])
+        self.assertIn("Temperature anomaly analysis for Global, 2000-2023", response["answer"])
+        self.assertIn("per decade", response["answer"])
+
+    def test_sample_temperature_series_is_global(self):
+        """Test a country question answered from the global sample series says the series is global"""
+        response = self.analytics.answer("temperature trend data for Kenya", self.knowledge)
+        self.assertIn("Temperature anomaly analysis for Global (country-level data for Kenya is not available)",
+                      response["answer"])
+
+    def test_year_over_year_from_zero_skipped(self):
+        """Test no year-over-year line is given when the previous year's value is zero"""
+        summary = summarize(np.array([2020, 2021, 2022]), np.array([1.0, 0.0, 2.0]))
+        answer = ClimateAnalytics.render("emissions", "CO2 emissions", "Chad", "sample records", summary)
+        self.assertNotIn("Year-over-year", answer)
+        self.assertNotIn("nan", answer)
+        self.assertIn("rolling mean", answer)
+
+    def test_sample_emissions_for_country(self):
+        """Test emissions are narrowed to the country in the question"""
+        response = self.analytics.answer("CO2 emissions trend data for India", self.knowledge)
+        self.assertIn("CO2 emissions analysis for India, 2020-2022", response["answer"])
+        self.assertIn("+53 Mt (+2.0%) from 2021 to 2022", response["answer"])
+
+    def test_unknown_metric(self):
+        """Test questions without an analyzable metric return None"""
+        self.assertIsNone(self.analytics.answer("trend data please", self.knowledge))
+        self.assertIsNone(self.analytics.answer("precipitation trend in Kenya", self.knowledge))
+
+    def test_ingested_table_preferred(self):
+        """Test an ingested daily table is used and filtered by country"""
+        days = np.arange("2010-01-01", "2020-01-01", dtype="datetime64[D]")
+        countries = np.where(np.arange(len(days)) % 2, "Kenya", "Chile")
+        tavg = 20 + 0.03 * (days.astype(np.int64) / 365.25) + np.where(countries == "Kenya", 5.0, 0.0)
+        writer = ColumnarWriter(os.path.join(self.root, "noaa_climate", "daily"))
+        writer.write_chunk({"date": days.astype("datetime64[s]"), "country": countries, "tavg": tavg})
+        writer.close()
+
+        response = self.analytics.answer("temperature trend data for Kenya", self.knowledge)
+        self.assertIn("Temperature analysis for Kenya, 2010-2019", response["answer"])
+        self.assertIn(f"{int((countries == 'Kenya').sum()):,} ingested records", response["answer"])
+        self.assertIn("+0.30 °C per decade", response["answer"])
+
+    def test_ingested_table_without_location_column_is_labelled(self):
+        """Test a place question answered from a table without a location column says it covers all locations"""
+        days = np.arange("2010-01-01", "2020-01-01", dtype="datetime64[D]")
+        writer = ColumnarWriter(os.path.join(self.root, "noaa_climate", "daily"))
+        writer.write_chunk({"date": days.astype("datetime64[s]"), "tavg": np.full(len(days), 20.0)})
+        writer.close()
+
+        response = self.analytics.answer("temperature trend data for Kenya", self.knowledge)
+        self.assertIn("Temperature analysis for all locations (country-level data for Kenya is not available)",
+                      response["answer"])
+        response = self.analytics.answer("What is the global temperature trend?", self.knowledge)
+        self.assertIn("Temperature analysis for all locations, 2010-2019", response["answer"])
+
+
+if __name__ == '__main__':
+    unittest.main()
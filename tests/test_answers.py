@@ -0,0 +1,109 @@
+"""
+Test suite for answer templates and pre-rendered answers
+"""
+
+import copy
+import unittest
+from datetime import date
+
+from climateguardian.answers import (FUNDING_OPPORTUNITY, GENERAL, POLICY_FUNDING_NONE, RISK_FACTOR, AnswerBook,
+                                     AnswerBooks, Template)
+from climateguardian.knowledge import KnowledgeIndex
+from climateguardian.sample_data import SAMPLE_DATA
+
+
+class TemplateTestCase(unittest.TestCase):
+    """Test cases for Template"""
+
+    def test_fields_and_render(self):
+        """Test fields are listed once in order and filled with their format specs"""
+        template = Template("{country}: {score:.2f} ({country})")
+        self.assertEqual(template.fields, ("country", "score"))
+        self.assertIsNone(template.text)
+        self.assertEqual(template.render(country="Chad", score=0.9), "Chad: 0.90 (Chad)")
+        self.assertEqual(Template("{name!r:>8}|{{literal}}").render(name="TCD"), "   'TCD'|{literal}")
+
+    def test_static_templates_are_their_text(self):
+        """Test a template without fields renders to the same string every time"""
+        self.assertEqual(Template("{{not a field}}").text, "{not a field}")
+        self.assertIs(GENERAL.render(), GENERAL.text)
+
+    def test_lines(self):
+        """Test one line is rendered per row, ignoring unused keys"""
+        self.assertEqual(RISK_FACTOR.lines([{"factor": "a"}, {"factor": "b", "extra": 1}]), "• a\n• b")
+        self.assertEqual(RISK_FACTOR.lines([]), "")
+
+    def test_rejects_expression_fields(self):
+        """Test fields must be plain names so every template renders from keyword values"""
+        with self.assertRaises(ValueError):
+            Template("{row[score]}")
+
+
+class AnswerBookTestCase(unittest.TestCase):
+    """Test cases for answers pre-rendered from a knowledge index"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.index = KnowledgeIndex(SAMPLE_DATA)
+        cls.book = AnswerBook(cls.index)
+
+    def test_risk_prefers_hazard_profiles(self):
+        """Test a hazard profile for any country named wins over ND-GAIN scores for an earlier one"""
+        response = self.book.risk(["MDV", "BGD"])
+        self.assertIn("Bangladesh faces HIGH flood risk (confidence: 89%)", response["answer"])
+        self.assertIn("• Sea level rise of 15-20cm expected", response["answer"])
+        self.assertIs(self.book.risk(["BGD"]), response)
+
+        response = self.book.risk(["MDV"])
+        self.assertIn("Maldives has a climate vulnerability", response["answer"])
+        self.assertEqual(response["sources"], ["ND-GAIN Country Index"])
+        self.assertIsNone(self.book.risk(["KEN"]))
+
+    def test_policies_and_funding(self):
+        """Test policy answers are rendered per region and funding answers from per-opportunity lines"""
+        self.assertIn("Funding Opportunities:", self.book.policies["small_island_nations"]["answer"])
+
+        positions = self.index.funding_positions(["africa"], ["ngo"], today=date(2026, 10, 17))
+        answer = self.book.funding("African NGOs", positions)
+        self.assertTrue(answer.startswith("Current climate funding opportunities for African NGOs:"))
+        first = self.index.funding[positions[0]]
+        expected = FUNDING_OPPORTUNITY.render(name=first["name"], amount=first["amount"],
+                                              deadline=first["deadline"], focus=first["eligibility"])
+        self.assertIn(expected, answer)
+        self.assertIs(self.book.funding("African NGOs", positions), answer)
+
+        answer = self.book.funding("African NGOs", positions[:1], "over $40M")
+        self.assertTrue(answer.startswith("Current climate funding opportunities for African NGOs (over $40M):"))
+
+    def test_policy_lists_open_funding_only(self):
+        """Test policy answers drop funding opportunities whose deadline has passed"""
+        full = self.book.policies["small_island_nations"]
+        self.assertIs(self.book.policy("small_island_nations", date(2026, 10, 17)), full)
+        self.assertIs(self.book.policy("small_island_nations", date(2027, 6, 30)), full)
+
+        response = self.book.policy("small_island_nations", date(2027, 7, 1))
+        self.assertNotIn("Green Climate Fund", response["answer"])
+        self.assertIn("• Adaptation Fund: $25M (deadline: August 2027)", response["answer"])
+        self.assertEqual(response["sources"], full["sources"])
+        self.assertIs(self.book.policy("small_island_nations", date(2027, 7, 2)), response)
+
+        response = self.book.policy("small_island_nations", date(2027, 9, 1))
+        self.assertNotIn("Adaptation Fund", response["answer"])
+        self.assertIn(POLICY_FUNDING_NONE.text, response["answer"])
+
+    def test_incomplete_scores_skipped(self):
+        """Test countries missing an ND-GAIN score get no scores answer rather than failing the book"""
+        data = copy.deepcopy(SAMPLE_DATA)
+        data["nd_gain"]["countries"].append({"country": "Chad", "vulnerability_score": 0.9})
+        self.assertIsNone(AnswerBook(KnowledgeIndex(data)).risk(["TCD"]))
+
+    def test_books_rebuilt_for_new_index(self):
+        """Test the book is reused until the knowledge index is replaced"""
+        books = AnswerBooks()
+        book = books.book(self.index)
+        self.assertIs(books.book(self.index), book)
+        self.assertIsNot(books.book(KnowledgeIndex(SAMPLE_DATA)), book)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,9 +2,24 @@
 Test suite for ClimateGuardian application
 """
 
+import copy
 import unittest
 import json
-from app import app, guardian
+import threading
+from datetime import date
+from unittest import mock
+from app import app, guardian, Config
+from climateguardian.intent import ComparisonRequest
+from climateguardian.knowledge import KnowledgeIndex
+from climateguardian.sample_data import SAMPLE_DATA
+
+def parse_sse(body):
+    """Parse a Server-Sent Events body into (event, data) pairs"""
+    events = []
+    for frame in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
 
 class ClimateGuardianTestCase(unittest.TestCase):
     """Test cases for ClimateGuardian application"""
@@ -23,6 +38,55 @@ class ClimateGuardianTestCase(unittest.TestCase):
         self.assertEqual(data['status'], 'healthy')
         self.assertEqual(data['service'], 'ClimateGuardian')
     
+    def test_liveness_and_readiness(self):
+        """Test the liveness probe and the readiness checks without an LLM configured"""
+        response = self.app.get('/api/health/live')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['status'], 'alive')
+        
+        response = self.app.get('/api/health/ready')
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data['status'], 'ready')
+        self.assertTrue(data['checks']['datasets']['ok'])
+        self.assertFalse(data['checks']['llm']['configured'])
+    
+    def test_metrics_endpoint(self):
+        """Test /metrics exports request counts, per-intent latency, cache and history metrics"""
+        question = {"question": "What are the flood risks for Bangladesh?"}
+        self.app.post('/api/query', data=json.dumps(question), content_type='application/json')
+        response = self.app.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain; version=0.0.4'))
+        
+        body = response.get_data(as_text=True)
+        self.assertIn('climateguardian_http_requests_total{endpoint="/api/query",method="POST",status="200"}', body)
+        self.assertIn('climateguardian_query_duration_seconds_count{intent="risk_assessment"}', body)
+        self.assertIn('climateguardian_response_cache_hit_ratio', body)
+        self.assertIn('climateguardian_history_entries', body)
+    
+    def test_debug_timing_header(self):
+        """Test per-stage timing is attached only when the debug header is sent"""
+        question = json.dumps({"question": "Climate funding opportunities for NGOs in Africa"})
+        response = self.app.post('/api/query', data=question, content_type='application/json')
+        self.assertNotIn('Server-Timing', response.headers)
+        
+        response = self.app.post('/api/query', data=question, content_type='application/json',
+                                 headers={'X-Debug-Timing': '1'})
+        stages = [part.split(';')[0] for part in response.headers['Server-Timing'].split(', ')]
+        self.assertEqual(stages[:2], ['intent', 'cache'])
+        self.assertEqual(stages[-2:], ['serialize', 'total'])
+    
+    def test_query_failure_logged_with_stage(self):
+        """Test a failing stage is logged with its traceback and counted by stage"""
+        with mock.patch.object(guardian, '_draft_response', side_effect=RuntimeError("boom")), \
+                self.assertLogs('app', level='ERROR') as logs:
+            result = guardian.query("Unique question about glacier melt rates?")
+        self.assertEqual(result['intent'], 'error')
+        self.assertIn('stage draft', logs.output[0])
+        self.assertIn('Traceback', logs.output[0])
+        self.assertGreaterEqual(guardian.query_errors.value(stage='draft'), 1)
+    
     def test_datasets_endpoint(self):
         """Test datasets information endpoint"""
         response = self.app.get('/api/datasets')
@@ -33,6 +97,21 @@ class ClimateGuardianTestCase(unittest.TestCase):
         self.assertIsInstance(data['data'], list)
         self.assertGreater(len(data['data']), 0)
     
+    def test_datasets_conditional_get(self):
+        """Test the datasets catalog carries a strong ETag and answers 304 when unchanged"""
+        response = self.app.get('/api/datasets')
+        etag = response.headers['ETag']
+        self.assertFalse(etag.startswith('W/'))
+        self.assertIn('max-age', response.headers['Cache-Control'])
+        
+        response = self.app.get('/api/datasets', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+        self.assertEqual(response.headers['ETag'], etag)
+        
+        response = self.app.get('/api/datasets', headers={'If-None-Match': '"stale"'})
+        self.assertEqual(response.status_code, 200)
+    
     def test_query_endpoint_valid(self):
         """Test query endpoint with valid input"""
         query_data = {
@@ -76,6 +155,66 @@ class ClimateGuardianTestCase(unittest.TestCase):
         
         self.assertEqual(response.status_code, 400)
     
+    def test_query_stream_endpoint(self):
+        """Test streaming query endpoint emits meta, chunks and a final done event"""
+        question = "What are the flood risks for Bangladesh?"
+        response = self.app.post('/api/query/stream',
+                               data=json.dumps({"question": question}),
+                               content_type='application/json')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.mimetype == 'text/event-stream')
+        
+        events = parse_sse(response.get_data(as_text=True))
+        names = [event for event, _ in events]
+        self.assertEqual(names[0], 'meta')
+        self.assertEqual(names[-1], 'done')
+        self.assertGreater(names.count('chunk'), 1)
+        
+        answer = "".join(data['text'] for event, data in events if event == 'chunk')
+        expected = guardian.query(question)
+        self.assertEqual(answer, expected['answer'])
+        self.assertEqual(events[0][1]['intent'], expected['intent'])
+        self.assertEqual(events[-1][1]['sources'], expected['sources'])
+        self.assertEqual(events[-1][1]['confidence'], expected['confidence'])
+    
+    def test_query_stream_endpoint_empty(self):
+        """Test streaming query endpoint with empty question"""
+        response = self.app.post('/api/query/stream',
+                               data=json.dumps({"question": " "}),
+                               content_type='application/json')
+        
+        self.assertEqual(response.status_code, 400)
+    
+    def test_query_batch_endpoint(self):
+        """Test batch endpoint returns ordered results with per-item errors"""
+        questions = [
+            "What are the flood risks for Bangladesh?",
+            "",
+            "What funding is available for NGOs in Kenya?"
+        ]
+        response = self.app.post('/api/query/batch',
+                               data=json.dumps({"questions": questions}),
+                               content_type='application/json')
+        
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)['data']
+        self.assertEqual(len(data), 3)
+        self.assertEqual(data[0]['status'], 'success')
+        self.assertEqual(data[0]['data']['intent'], 'risk_assessment')
+        self.assertEqual(data[0]['data']['answer'], guardian.query(questions[0])['answer'])
+        self.assertEqual(data[1], {"status": "error", "error": "Question is required"})
+        self.assertEqual(data[2]['data']['intent'], 'funding_intelligence')
+    
+    def test_query_batch_endpoint_invalid(self):
+        """Test batch endpoint rejects missing, empty and oversized batches"""
+        for payload in ({}, {"questions": []}, {"questions": "not a list"},
+                        {"questions": ["q"] * (Config.BATCH_MAX_QUESTIONS + 1)}):
+            response = self.app.post('/api/query/batch',
+                                   data=json.dumps(payload),
+                                   content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+    
     def test_index_page(self):
         """Test main index page"""
         response = self.app.get('/')
@@ -99,6 +238,20 @@ class ClimateGuardianTestCase(unittest.TestCase):
         data = json.loads(response.data)
         self.assertEqual(data['status'], 'success')
         self.assertIsInstance(data['data'], list)
+        self.assertEqual(data['data'][-1]['question'], "Test question")
+    
+    def test_history_endpoint_isolated_per_session(self):
+        """Test conversation history is not shared between sessions"""
+        self.app.post('/api/query',
+                     data=json.dumps({"question": "Private question"}),
+                     content_type='application/json')
+        
+        other_client = app.test_client()
+        response = other_client.get('/api/history')
+        self.assertEqual(response.status_code, 200)
+        
+        data = json.loads(response.data)
+        self.assertEqual(data['data'], [])
 
 class ClimateGuardianLogicTestCase(unittest.TestCase):
     """Test cases for ClimateGuardian logic"""
@@ -154,15 +307,125 @@ class ClimateGuardianLogicTestCase(unittest.TestCase):
         self.assertGreater(response['confidence'], 0)
         self.assertLessEqual(response['confidence'], 100)
     
+    def test_query_resolves_misspelt_and_translated_places(self):
+        """Test risk answers for misspelt names and demonyms match the canonical question"""
+        expected = self.guardian.query("What are the flood risks for Bangladesh?")["answer"]
+        for question in ["What are the flood risks for Bangaldesh?", "Flood risk for Bangladeshi farmers?"]:
+            self.assertEqual(self.guardian.query(question)["answer"], expected, question)
+
+    def test_query_ranks_regions_and_compares_countries(self):
+        """Test comparative questions are answered with a ranking of composite scores"""
+        response = self.guardian.query("rank South Asian countries by flood risk")
+        self.assertIn("Climate risk ranking for South Asia", response["answer"])
+        self.assertLess(response["answer"].index("Maldives"), response["answer"].index("Bangladesh"))
+        self.assertIn("ND-GAIN Country Index", response["sources"])
+
+        response = self.guardian.query("Compare Bangladesh, the Netherlands and Kenya")
+        self.assertLess(response["answer"].index("1. Bangladesh"), response["answer"].index("2. Netherlands"))
+        self.assertIn("No ND-GAIN scores are available yet for Kenya", response["answer"])
+
+        single = self.guardian.query("What are the flood risks for Bangladesh?")
+        self.assertNotIn("Climate risk ranking", single["answer"])
+
+    def test_ranking_marks_missing_indicators(self):
+        """Test a country ranked without a readiness score shows it as n/a rather than nan"""
+        data = copy.deepcopy(SAMPLE_DATA)
+        data["nd_gain"]["countries"].append({"country": "Chad", "vulnerability_score": 0.9})
+        knowledge = KnowledgeIndex(data)
+        response = self.guardian._handle_risk_comparison(
+            knowledge, knowledge.resolve("Compare Chad and Bangladesh"), ComparisonRequest())
+        self.assertIn("1. Chad: 0.90 (vulnerability 0.90, readiness n/a)", response["answer"])
+        self.assertNotIn("nan", response["answer"])
+
+    def test_query_filters_funding_by_amount_and_deadline(self):
+        """Test funding answers list only open opportunities within the amount and deadline asked for"""
+        with mock.patch("climateguardian.funding.current_date", return_value=date(2026, 10, 17)):
+            response = self.guardian.query("open grants over $10M closing in the next 90 days for Pacific governments")
+            self.assertEqual(response["intent"], "funding_intelligence")
+            self.assertIn("for Pacific governments (over $10M, closing by 15 January 2027):", response["answer"])
+            self.assertIn("Pacific Resilience Facility", response["answer"])
+            self.assertNotIn("Community Resilience Partnership Program", response["answer"])
+            self.assertNotIn("Green Climate Fund Readiness Programme", response["answer"])
+
+            response = self.guardian.query("grants over $500M for Pacific governments")
+            self.assertIn("No open climate funding opportunities for Pacific governments (over $500M)",
+                          response["answer"])
+
     def test_conversation_history(self):
         """Test conversation history tracking"""
-        initial_count = len(self.guardian.conversation_history)
+        context = {"session_id": "test-conversation-history"}
+        initial_count = self.guardian.history.count(context["session_id"])
         
-        self.guardian.query("Test question 1")
-        self.guardian.query("Test question 2")
+        self.guardian.query("Test question 1", context)
+        self.guardian.query("Test question 2", context)
         
-        final_count = len(self.guardian.conversation_history)
+        final_count = self.guardian.history.count(context["session_id"])
         self.assertEqual(final_count, initial_count + 2)
+    
+    def test_concurrent_queries(self):
+        """Stress the shared guardian from many threads: no errors, no lost history entries"""
+        threads_count, per_thread = 16, 40
+        questions = ["What are the flood risks for Bangladesh?", "Climate funding opportunities for NGOs in Africa",
+                     "What climate policy should Kenya adopt?", "Show CO2 emissions trend data for India"]
+        barrier = threading.Barrier(threads_count)
+        failures = []
+        
+        def worker(index):
+            context = {"session_id": f"stress-{index}"}
+            barrier.wait()
+            for i in range(per_thread):
+                # Half the questions repeat across threads (cache hits), half are unique
+                question = questions[i % len(questions)] if i % 2 else f"{questions[i % len(questions)]} #{index}-{i}"
+                result = self.guardian.query(question, context)
+                if result["intent"] == "error":
+                    failures.append(result)
+                self.guardian.history.recent(context["session_id"], 10)
+        
+        lookups_before = self.guardian.response_cache.hits + self.guardian.response_cache.misses
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(threads_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(failures, [])
+        lookups = self.guardian.response_cache.hits + self.guardian.response_cache.misses - lookups_before
+        self.assertEqual(lookups, threads_count * per_thread)
+        for i in range(threads_count):
+            self.assertEqual(self.guardian.history.count(f"stress-{i}"), min(per_thread, Config.HISTORY_MAX_ENTRIES))
+            self.guardian.history.clear(f"stress-{i}")
+    
+    def test_query_batch_dedupes_questions(self):
+        """Test equivalent questions in a batch are generated once"""
+        self.guardian.response_cache.clear()
+        questions = ["Flood risks for Bangladesh?", "flood risks for  bangladesh",
+                     "Climate policy for small island nations?", "Flood risks for Bangladesh?"]
+        
+        with mock.patch.object(self.guardian, '_generate_response',
+                               wraps=self.guardian._generate_response) as generate:
+            results = self.guardian.query_batch(questions, {"session_id": "test-batch"})
+        
+        self.assertEqual(generate.call_count, 2)
+        self.assertEqual([r['status'] for r in results], ['success'] * 4)
+        self.assertEqual(results[0]['data']['answer'], results[1]['data']['answer'])
+        self.assertEqual(results[2]['data']['intent'], 'policy_recommendation')
+        self.assertEqual(len({r['data']['id'] for r in results}), 4)
+        self.assertEqual(self.guardian.history.count("test-batch"), 4)
+    
+    def test_query_batch_reports_item_errors(self):
+        """Test a failing question does not fail the rest of the batch"""
+        original = self.guardian._generate_response
+        
+        def generate(question, intent, context=None):
+            if "boom" in question:
+                raise RuntimeError("boom")
+            return original(question, intent, context)
+        
+        with mock.patch.object(self.guardian, '_generate_response', side_effect=generate):
+            results = self.guardian.query_batch(["boom climate", "Flood risks for Bangladesh?"])
+        
+        self.assertEqual(results[0], {"status": "error", "error": "Failed to process question"})
+        self.assertEqual(results[1]['status'], 'success')
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
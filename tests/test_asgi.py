@@ -0,0 +1,168 @@
+"""
+Tests for the ASGI entry point
+"""
+
+import asyncio
+import unittest
+from unittest import mock
+
+import httpx
+
+import app as application
+from asgi import AsgiApp, wsgi_environ
+from climateguardian.metrics import MetricsRegistry
+from climateguardian.stub_llm import StubWatsonxServer
+from tests.test_app import parse_sse
+from tests.test_llm import make_client
+
+
+def run_requests(asgi_app, *requests):
+    """Send requests concurrently through the ASGI app; returns the responses in order"""
+    async def run():
+        transport = httpx.ASGITransport(app=asgi_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            return await asyncio.gather(*(client.request(method, url, **kwargs) for method, url, kwargs in requests))
+    return asyncio.run(run())
+
+
+class AsgiAppTestCase(unittest.TestCase):
+    """Routes served through the ASGI app without an LLM configured"""
+
+    def setUp(self):
+        self.metrics = MetricsRegistry()
+        self.asgi = AsgiApp(application.app, application.guardian, metrics=self.metrics)
+
+    def tearDown(self):
+        self.asgi.executor.shutdown()
+
+    def test_query_served_async(self):
+        """Test POST /api/query answers through aquery with the session cookie set"""
+        with mock.patch.object(application.guardian, 'query', side_effect=AssertionError("sync path used")):
+            response, = run_requests(self.asgi, ("POST", "/api/query", {
+                "json": {"question": "What are the flood risks for Bangladesh?"},
+                "headers": {"X-Debug-Timing": "1"}
+            }))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['status'], 'success')
+        self.assertIn("Bangladesh", data['data']['answer'])
+        self.assertIn("session", response.headers.get("set-cookie", ""))
+        self.assertIn("serialize;dur=", response.headers["server-timing"])
+
+    def test_query_validation(self):
+        """Test the async view rejects an empty question like the sync one"""
+        response, = run_requests(self.asgi, ("POST", "/api/query", {"json": {"question": "  "}}))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], 'Question is required')
+
+    def test_wsgi_routes_bridged(self):
+        """Test other routes, including conditional GETs and SSE, go through the WSGI bridge"""
+        datasets, health, stream = run_requests(
+            self.asgi,
+            ("GET", "/api/datasets", {}),
+            ("GET", "/api/health", {}),
+            ("POST", "/api/query/stream", {"json": {"question": "Climate funding opportunities for NGOs"}})
+        )
+        self.assertEqual(datasets.status_code, 200)
+        self.assertEqual(len(datasets.json()['data']), 6)
+        self.assertEqual(health.json()['status'], 'healthy')
+        events = parse_sse(stream.text)
+        self.assertEqual(events[0][0], "meta")
+        self.assertEqual(events[-1][0], "done")
+
+        cached, = run_requests(self.asgi, ("GET", "/api/datasets", {
+            "headers": {"If-None-Match": datasets.headers["etag"]}
+        }))
+        self.assertEqual(cached.status_code, 304)
+
+    def test_body_limit(self):
+        """Test oversized request bodies are refused before reaching Flask"""
+        self.asgi.max_body_bytes = 100
+        response, = run_requests(self.asgi, ("POST", "/api/query", {"json": {"question": "x" * 200}}))
+        self.assertEqual(response.status_code, 413)
+
+    def test_wsgi_environ(self):
+        """Test the environ built from an ASGI scope"""
+        environ = wsgi_environ({
+            "type": "http", "method": "GET", "path": "/api/history", "query_string": b"a=1",
+            "headers": [(b"content-type", b"application/json"), (b"x-forwarded-for", b"10.0.0.1"),
+                        (b"x-forwarded-for", b"10.0.0.2")],
+            "server": ("example.org", 8080), "client": ("127.0.0.1", 5000), "scheme": "https"
+        }, b"{}")
+        self.assertEqual(environ["PATH_INFO"], "/api/history")
+        self.assertEqual(environ["QUERY_STRING"], "a=1")
+        self.assertEqual(environ["CONTENT_TYPE"], "application/json")
+        self.assertEqual(environ["CONTENT_LENGTH"], "2")
+        self.assertEqual(environ["HTTP_X_FORWARDED_FOR"], "10.0.0.1,10.0.0.2")
+        self.assertEqual(environ["wsgi.url_scheme"], "https")
+        self.assertEqual(environ["wsgi.input"].read(), b"{}")
+
+
+class AsgiConcurrencyTestCase(unittest.TestCase):
+    """Queries waiting on a slow LLM backend"""
+
+    def setUp(self):
+        self.server = StubWatsonxServer(latency=0.2).start()
+        self.guardian = application.ClimateGuardian(llm=make_client(self.server, max_concurrency=2))
+        self.patch = mock.patch.object(application, 'guardian', self.guardian)
+        self.patch.start()
+        self.metrics = MetricsRegistry()
+
+    def tearDown(self):
+        self.patch.stop()
+        self.guardian.llm.close()
+        self.server.stop()
+
+    def make_app(self, **kwargs) -> AsgiApp:
+        asgi = AsgiApp(application.app, self.guardian, metrics=self.metrics, **kwargs)
+        self.addCleanup(asgi.executor.shutdown)
+        return asgi
+
+    def queries(self, count: int):
+        return [("POST", "/api/query", {"json": {"question": f"How is climate change affecting region {i}?"}})
+                for i in range(count)]
+
+    def test_llm_calls_overlap_on_one_thread_pool(self):
+        """Test many queries wait on the LLM at once, beyond the sync client's concurrency"""
+        responses = run_requests(self.make_app(), *self.queries(40))
+        self.assertTrue(all(response.status_code == 200 for response in responses))
+        self.assertEqual(self.server.counters["generation_requests"], 40)
+        self.assertGreater(self.server.max_in_flight, 20)
+
+    def test_backpressure(self):
+        """Test requests past the in-flight limit get 503 with Retry-After while health stays up"""
+        asgi = self.make_app(max_in_flight=5)
+        responses = run_requests(asgi, *self.queries(8), ("GET", "/api/health/live", {}))
+        statuses = [response.status_code for response in responses[:-1]]
+        self.assertEqual(statuses.count(200), 5)
+        self.assertEqual(statuses.count(503), 3)
+        rejected = next(response for response in responses if response.status_code == 503)
+        self.assertEqual(rejected.headers["retry-after"], "1")
+        self.assertEqual(responses[-1].status_code, 200)
+        self.assertEqual(asgi.rejected.value(), 3)
+        self.assertEqual(asgi.in_flight, 0)
+        self.assertIn("climateguardian_asgi_rejected_total 3", self.metrics.render())
+
+    def test_lifespan_shutdown_closes_async_client(self):
+        """Test the lifespan shutdown event closes the LLM client's async pool"""
+        asgi = self.make_app()
+        messages = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+        sent = []
+
+        async def receive():
+            return next(messages)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        async def run():
+            await self.guardian.llm.agenerate("prompt")
+            await asgi({"type": "lifespan"}, receive, send)
+
+        asyncio.run(run())
+        self.assertEqual(sent, ["lifespan.startup.complete", "lifespan.shutdown.complete"])
+        self.assertIsNone(self.guardian.llm._async_state)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+"""
+Test suite for the response cache
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+from climateguardian.cache import ResponseCache, normalize_question
+
+
+class FakeClock:
+    """Manually advanced clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+    """Test cases for ResponseCache"""
+
+    def setUp(self):
+        """Set up a small cache watching a temporary data directory"""
+        self.clock = FakeClock()
+        self.data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.data_dir)
+        self.cache = ResponseCache(max_size=2, ttl=60, watch_paths=[self.data_dir],
+                                   check_interval=0, clock=self.clock)
+
+    def test_normalize_question(self):
+        """Test case, whitespace and punctuation folding"""
+        self.assertEqual(normalize_question("  Flood risk,   BANGLADESH?! "), "flood risk bangladesh")
+        self.assertEqual(normalize_question("funding for African NGOs"),
+                         normalize_question("Funding for african NGOs."))
+
+    def test_hit_and_miss(self):
+        """Test equivalent questions hit the same entry"""
+        key = self.cache.make_key("Flood risk Bangladesh?", "risk_assessment")
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, {"answer": "cached"})
+
+        same = self.cache.make_key("flood   risk, bangladesh", "risk_assessment")
+        self.assertEqual(self.cache.get(same), {"answer": "cached"})
+        self.assertIsNone(self.cache.get(self.cache.make_key("flood risk bangladesh", "data_analysis")))
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 2)
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted at capacity"""
+        self.cache.put(("a", "i"), {"answer": "a"})
+        self.cache.put(("b", "i"), {"answer": "b"})
+        self.cache.get(("a", "i"))
+        self.cache.put(("c", "i"), {"answer": "c"})
+
+        self.assertIsNone(self.cache.get(("b", "i")))
+        self.assertIsNotNone(self.cache.get(("a", "i")))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_ttl_expiry(self):
+        """Test entries expire after the TTL"""
+        self.cache.put(("a", "i"), {"answer": "a"})
+        self.clock.now = 61
+        self.assertIsNone(self.cache.get(("a", "i")))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_invalidated_when_dataset_changes(self):
+        """Test writing a dataset file clears the cache"""
+        self.cache.put(("a", "i"), {"answer": "a"})
+        with open(os.path.join(self.data_dir, "nd_gain_sample.json"), "w") as f:
+            f.write("{}")
+
+        self.assertIsNone(self.cache.get(("a", "i")))
+        self.assertEqual(self.cache.stats()["invalidations"], 1)
+
+    def test_concurrent_access(self):
+        """Test counters stay exact and size bounded when threads share the cache"""
+        cache = ResponseCache(max_size=256, ttl=None)
+        self.assertGreater(cache.stats()["shards"], 1)
+        threads_count, per_thread = 16, 2000
+        barrier = threading.Barrier(threads_count)
+        # Switch threads far more often than usual to surface races
+        self.addCleanup(sys.setswitchinterval, sys.getswitchinterval())
+        sys.setswitchinterval(1e-5)
+
+        def worker(index):
+            barrier.wait()
+            for i in range(per_thread):
+                key = cache.make_key(f"question {(index * 7 + i) % 512}", "general_climate")
+                if cache.get(key) is None:
+                    cache.put(key, {"answer": key[0]})
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(threads_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.stats()
+        self.assertEqual(stats["hits"] + stats["misses"], threads_count * per_thread)
+        self.assertLessEqual(stats["size"], 256)
+        for key, (_, response) in ((key, entry) for shard in cache._shards for key, entry in shard.entries.items()):
+            self.assertEqual(response["answer"], key[0])
+
+
+class GuardianCacheTestCase(unittest.TestCase):
+    """Test the cache in front of ClimateGuardian._generate_response"""
+
+    def test_repeated_question_served_from_cache(self):
+        """Test a repeated question is answered from the cache"""
+        from app import guardian
+
+        first = guardian.query("What is the flood risk for Bangladesh?")
+        hits = guardian.response_cache.hits
+        second = guardian.query("what is the flood risk for bangladesh")
+
+        self.assertEqual(guardian.response_cache.hits, hits + 1)
+        self.assertEqual(first["answer"], second["answer"])
+        self.assertNotEqual(first["id"], second["id"])
+
+
+if __name__ == '__main__':
+    unittest.main()
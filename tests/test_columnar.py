@@ -0,0 +1,137 @@
+"""
+Test suite for the columnar dataset store
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from climateguardian.columnar import (ColumnarCatalog, ColumnarTable, ingest_file, ingest_lines,
+                                      text_lines)
+
+
+class ColumnarStoreTestCase(unittest.TestCase):
+    """Test cases for chunked ingest and memory-mapped reads"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def write_source(self, name, text):
+        path = os.path.join(self.tmp, name)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def test_csv_ingest_across_chunks(self):
+        """Test CSV chunks append to typed columns with a schema sidecar"""
+        rows = [f"{'USW' if i % 2 else 'GHC'},2024-01-{i + 1:02d},{i}.5,{i}" for i in range(25)]
+        source = self.write_source("noaa.csv", "station,date,tmax,count\n" + "\n".join(rows) + "\n")
+        table_path = os.path.join(self.tmp, "noaa", "daily")
+
+        schema = ingest_file(source, table_path, chunk_rows=4)
+        self.assertEqual(schema["rows"], 25)
+        self.assertEqual({name: column["type"] for name, column in schema["columns"].items()},
+                         {"station": "string", "date": "datetime", "tmax": "float64", "count": "int64"})
+
+        table = ColumnarTable(table_path)
+        self.assertIsInstance(table.column("tmax"), np.memmap)
+        self.assertAlmostEqual(float(table.column("tmax").sum()), sum(i + 0.5 for i in range(25)))
+        self.assertEqual(table.column("date")[-1], np.datetime64("2024-01-25T00:00:00"))
+        self.assertEqual(list(table.dictionary("station")), ["GHC", "USW"])
+        self.assertEqual(int((table.column("station") == table.code("station", "USW")).sum()), 12)
+
+    def test_column_selective_read(self):
+        """Test only requested columns are mapped"""
+        source = self.write_source("a.csv", "city,pm25\nDelhi,89.5\nBeijing,\n")
+        ingest_file(source, os.path.join(self.tmp, "t"))
+        table = ColumnarTable(os.path.join(self.tmp, "t"))
+        data = table.read(["city"])
+        self.assertEqual(list(data), ["city"])
+        self.assertEqual(list(data["city"]), ["Delhi", "Beijing"])
+        self.assertEqual(list(table._columns), ["city"])
+        self.assertTrue(np.isnan(table.column("pm25")[1]))
+
+    def test_ndjson_ingest_flattens_nested_fields(self):
+        """Test nested NDJSON objects become dotted columns"""
+        records = [
+            {"location": "Delhi", "value": 89.5, "date": {"utc": "2024-01-01T00:00:00Z"}},
+            {"location": "Beijing", "value": 67.2, "date": {"utc": "2024-01-01T01:00:00Z"}}
+        ]
+        lines = [json.dumps(record) + "\n" for record in records]
+        schema = ingest_lines(lines, os.path.join(self.tmp, "aq"), "ndjson")
+        self.assertEqual(schema["columns"]["date.utc"]["type"], "datetime")
+        table = ColumnarTable(os.path.join(self.tmp, "aq"))
+        self.assertEqual(list(table.read(["location"])["location"]), ["Delhi", "Beijing"])
+
+    def test_type_mismatch_leaves_previous_table(self):
+        """Test a failed ingest aborts without replacing the existing table"""
+        path = os.path.join(self.tmp, "t")
+        ingest_lines(["year\n", "2022\n"], path, "csv")
+        with self.assertRaises(ValueError):
+            ingest_lines(["year\n", "2022\n", "2023.5\n"], path, "csv", chunk_rows=1)
+        self.assertEqual(list(ColumnarTable(path).column("year")), [2022])
+        self.assertEqual(os.listdir(self.tmp), ["t"])
+
+    def test_integer_column_with_blanks(self):
+        """Test integer columns with empty cells are stored as floats with NaN for the blanks"""
+        path = os.path.join(self.tmp, "t")
+        schema = ingest_lines(["station,year,temp\n", "A,2000,12\n", "B,2001,\n", "C,,13\n"], path, "csv")
+        self.assertEqual(schema["columns"]["year"]["type"], "float64")
+        self.assertEqual(schema["columns"]["temp"]["type"], "float64")
+        year = ColumnarTable(path).column("year")
+        self.assertEqual(list(year[:2]), [2000.0, 2001.0])
+        self.assertTrue(np.isnan(year[2]))
+
+        # Blanks first met in a later chunk widen the column already written
+        ingest_lines(["year\n", "2000\n", "2001\n", "\n", "2003\n"], path, "csv", chunk_rows=2)
+        year = ColumnarTable(path).column("year")
+        self.assertEqual(ColumnarTable(path).schema["columns"]["year"]["type"], "float64")
+        self.assertEqual(list(year[:2]), [2000.0, 2001.0])
+        self.assertEqual(year[-1], 2003.0)
+
+    def test_ndjson_fields_in_later_chunks(self):
+        """Test a field first seen in a later chunk becomes a column, null for the earlier rows"""
+        records = [{"location": "Delhi"}, {"location": "Beijing"},
+                   {"location": "Lima", "value": 41, "city": "Lima", "date": "2024-01-01T00:00:00Z"}]
+        path = os.path.join(self.tmp, "aq")
+        schema = ingest_lines([json.dumps(record) + "\n" for record in records], path, "ndjson", chunk_rows=2)
+        self.assertEqual(schema["rows"], 3)
+        self.assertEqual({name: column["type"] for name, column in schema["columns"].items()},
+                         {"location": "string", "value": "float64", "city": "string", "date": "datetime"})
+        table = ColumnarTable(path)
+        self.assertTrue(np.isnan(table.column("value")[0]))
+        self.assertEqual(table.column("value")[2], 41.0)
+        self.assertEqual(list(table.read(["city"])["city"]), ["", "", "Lima"])
+        self.assertTrue(np.isnat(table.column("date")[1]))
+
+    def test_explicit_schema(self):
+        """Test a declared schema overrides inference"""
+        path = os.path.join(self.tmp, "t")
+        ingest_lines(["year\n", "2022\n", "2023.5\n"], path, "csv", schema={"year": "float64"}, chunk_rows=1)
+        self.assertEqual(list(ColumnarTable(path).column("year")), [2022.0, 2023.5])
+
+    def test_catalog_reopens_after_reingest(self):
+        """Test the catalog picks up a re-ingested table"""
+        catalog = ColumnarCatalog(self.tmp)
+        self.assertIsNone(catalog.table("noaa", "daily"))
+        ingest_lines(["x\n", "1\n"], catalog.table_path("noaa", "daily"), "csv")
+        first = catalog.table("noaa", "daily")
+        self.assertIs(catalog.table("noaa", "daily"), first)
+        os.utime(os.path.join(catalog.table_path("noaa", "daily"), "schema.json"), ns=(1, 1))
+        self.assertIsNot(catalog.table("noaa", "daily"), first)
+        self.assertEqual(catalog.tables(), {"noaa": ["daily"]})
+
+    def test_text_lines_across_byte_chunks(self):
+        """Test byte chunks split mid-line decode into whole lines"""
+        self.assertEqual(list(text_lines([b"a,b\n1,", b"2\n3,4"])), ["a,b\n", "1,2\n", "3,4"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+Test suite for funding amount and deadline parsing and the funding index
+"""
+
+import itertools
+import unittest
+from datetime import date
+
+from climateguardian.funding import (FundingIndex, FundingRequest, format_amount, funding_request, parse_amount,
+                                     parse_deadline)
+
+TODAY = date(2026, 10, 17)
+
+
+class FundingParsingTestCase(unittest.TestCase):
+    """Test cases for amounts, deadlines and limits read from text"""
+
+    def test_parse_amount(self):
+        """Test amounts are read in US dollars, taking the top of a range"""
+        self.assertEqual(parse_amount("$50M"), 50e6)
+        self.assertEqual(parse_amount("US$ 2.5 million"), 2.5e6)
+        self.assertEqual(parse_amount("USD 500,000"), 500e3)
+        self.assertEqual(parse_amount("$1M-$5M"), 5e6)
+        self.assertEqual(parse_amount("$2.3bn"), 2.3e9)
+        self.assertIsNone(parse_amount("Varies"))
+        self.assertIsNone(parse_amount("10 million"))
+        self.assertEqual(parse_amount("10 million", require_currency=False), 10e6)
+
+    def test_format_amount(self):
+        """Test amounts are written as the datasets write them"""
+        self.assertEqual(format_amount(500e3), "$500K")
+        self.assertEqual(format_amount(12e6), "$12M")
+        self.assertEqual(format_amount(2.3e9), "$2.3B")
+        self.assertEqual(format_amount(750), "$750")
+
+    def test_parse_deadline(self):
+        """Test deadlines are read as the last day applications are accepted"""
+        self.assertEqual(parse_deadline("15 January 2027"), date(2027, 1, 15))
+        self.assertEqual(parse_deadline("January 15, 2027"), date(2027, 1, 15))
+        self.assertEqual(parse_deadline("2027-03-31"), date(2027, 3, 31))
+        self.assertEqual(parse_deadline("February 2028"), date(2028, 2, 29))
+        self.assertEqual(parse_deadline("Sept. 2027"), date(2027, 9, 30))
+        self.assertEqual(parse_deadline("Q3 2027"), date(2027, 9, 30))
+        self.assertIsNone(parse_deadline("Rolling"))
+        self.assertIsNone(parse_deadline("31 February 2027"))
+
+    def test_funding_request(self):
+        """Test amount ranges and deadline windows are read from questions"""
+        request = funding_request("open grants over $10M closing in the next 90 days for Pacific governments", TODAY)
+        self.assertEqual(request, FundingRequest(min_amount=10e6, closes_by=date(2027, 1, 15)))
+        self.assertEqual(request.describe(), "over $10M, closing by 15 January 2027")
+
+        request = funding_request("funding between 5 million and USD 20M within 3 months", TODAY)
+        self.assertEqual(request, FundingRequest(min_amount=5e6, max_amount=20e6, closes_by=date(2027, 1, 17)))
+        self.assertEqual(funding_request("grants under $2M in the next two weeks", TODAY),
+                         FundingRequest(max_amount=2e6, closes_by=date(2026, 10, 31)))
+
+    def test_funding_request_dates(self):
+        """Test "before" a month or quarter excludes it and "by" includes it"""
+        self.assertEqual(funding_request("grants closing before March 2027", TODAY).closes_by, date(2027, 2, 28))
+        self.assertEqual(funding_request("grants closing by March 2027", TODAY).closes_by, date(2027, 3, 31))
+        self.assertEqual(funding_request("grants due before 15 March 2027", TODAY).closes_by, date(2027, 3, 14))
+        self.assertEqual(funding_request("grants due by Q1 2027", TODAY).closes_by, date(2027, 3, 31))
+
+    def test_funding_request_without_limits(self):
+        """Test questions without amounts or dates ask for no limits"""
+        request = funding_request("Climate funding opportunities for NGOs in Africa", TODAY)
+        self.assertFalse(request)
+        self.assertEqual(request.describe(), "")
+        self.assertFalse(funding_request("grants for over 30 community groups", TODAY))
+
+
+class FundingIndexTestCase(unittest.TestCase):
+    """Test cases for range queries over the funding index"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.opportunities = [
+            {"name": "A", "amount": "$50M", "deadline": "August 2027", "regions": ["africa"],
+             "organization_types": ["ngo"]},
+            {"name": "B", "amount": "$5M", "deadline": "1 November 2026", "regions": ["africa", "asia"],
+             "organization_types": ["government"]},
+            {"name": "C", "amount": "$12M", "deadline": "Rolling", "regions": ["asia"],
+             "organization_types": ["ngo", "government"]},
+            {"name": "D", "amount": "Varies", "deadline": "June 2026", "regions": ["asia"],
+             "organization_types": ["ngo"]},
+            {"name": "E", "amount": "$20M", "deadline": "December 2026", "regions": ["asia"],
+             "organization_types": ["ngo"]},
+        ]
+        cls.index = FundingIndex(cls.opportunities)
+
+    def names(self, positions):
+        return [self.opportunities[position]["name"] for position in positions]
+
+    def test_open_leaves_out_closed(self):
+        """Test opportunities are listed soonest deadline first, closed ones left out and rolling ones last"""
+        self.assertEqual(len(self.index), 5)
+        self.assertEqual(self.names(self.index.open(TODAY)), ["B", "E", "A", "C"])
+        self.assertEqual(self.names(self.index.open(date(2026, 1, 1))), ["D", "B", "E", "A", "C"])
+        self.assertEqual(self.names(self.index.open(TODAY, closes_by=date(2026, 12, 31))), ["B", "E"])
+        self.assertEqual(self.names(self.index.open(date(2026, 11, 1), closes_by=date(2026, 11, 1))), ["B"])
+
+    def test_query_ranges(self):
+        """Test amount ranges and deadline windows intersect with region and organization type postings"""
+        self.assertEqual(self.names(self.index.query(regions=["asia"], today=TODAY)), ["B", "E", "C"])
+        self.assertEqual(self.names(self.index.query(regions=["asia"], organization_types=["ngo"], today=TODAY)),
+                         ["E", "C"])
+        self.assertEqual(self.names(self.index.query(min_amount=10e6, max_amount=20e6, today=TODAY)), ["E", "C"])
+        self.assertEqual(self.names(self.index.query(min_amount=10e6, closes_by=date(2027, 1, 15), today=TODAY)),
+                         ["E"])
+        self.assertEqual(self.names(self.index.query(regions=["asia"], organization_types=["ngo"], min_amount=10e6,
+                                                     closes_by=date(2027, 1, 15), today=TODAY)), ["E"])
+        self.assertEqual(self.index.query(regions=["europe"], today=TODAY), [])
+
+    def test_query_matches_linear_filter(self):
+        """Test the index returns what filtering every opportunity would"""
+        for regions, min_amount, max_amount in itertools.product(([], ["asia"], ["africa", "asia"]),
+                                                                 (None, 5e6, 6e6), (None, 12e6, 30e6)):
+            for closes_by in (None, date(2026, 11, 30), date(2027, 12, 31)):
+                expected = []
+                for position, (amount, deadline) in enumerate(zip(self.index.amounts, self.index.deadlines)):
+                    if regions and not set(regions) & set(self.opportunities[position]["regions"]):
+                        continue
+                    if deadline is not None and deadline < TODAY:
+                        continue
+                    if closes_by is not None and (deadline is None or deadline > closes_by):
+                        continue
+                    if (min_amount is not None or max_amount is not None) and amount is None:
+                        continue
+                    if (min_amount is not None and amount < min_amount
+                            or max_amount is not None and amount > max_amount):
+                        continue
+                    expected.append(position)
+                result = self.index.query(regions, min_amount=min_amount, max_amount=max_amount, closes_by=closes_by,
+                                          today=TODAY)
+                self.assertEqual(sorted(result), expected, (regions, min_amount, max_amount, closes_by))
+
+
+if __name__ == '__main__':
+    unittest.main()
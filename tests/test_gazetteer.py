@@ -0,0 +1,90 @@
+"""
+Test suite for the gazetteer's exact and typo-tolerant name resolution
+"""
+
+import unittest
+
+from climateguardian.gazetteer import Gazetteer, deletions, edit_distance, fold
+
+
+class GazetteerTestCase(unittest.TestCase):
+    """Test cases for Gazetteer"""
+
+    def setUp(self):
+        self.gazetteer = Gazetteer()
+        for alias, kind, entity_id in [
+            ("Kenya", "country", "KEN"), ("Papua New Guinea", "country", "PNG"),
+            ("Guinea", "country", "GIN"), ("Guinée", "country", "GIN"), ("Perú", "country", "PER"),
+            ("Benin", "country", "BEN"), ("Caribbean", "region", "caribbean"),
+            ("flooding", "topic", "flood"),
+        ]:
+            self.gazetteer.add(alias, kind, entity_id)
+        self.gazetteer.add_code("KEN", "country", "KEN")
+
+    def test_fold(self):
+        """Test case, punctuation and accents are removed"""
+        self.assertEqual(fold("  Perú, Côte d'Ivoire!"), "peru cote d ivoire")
+        self.assertEqual(fold("Südafrika"), "sudafrika")
+
+    def test_edit_distance(self):
+        """Test substitutions, insertions, deletions and swaps count one edit each"""
+        self.assertEqual(edit_distance("kenya", "keyna", 2), 1)
+        self.assertEqual(edit_distance("kenya", "kenia", 2), 1)
+        self.assertEqual(edit_distance("bangladesh", "bangldesh", 2), 1)
+        self.assertEqual(edit_distance("kenya", "canada", 1), 2)
+        self.assertIn("kena", deletions("kenya", 1))
+
+    def test_first_registration_wins(self):
+        """Test an alias keeps the entity it was first registered for"""
+        self.assertFalse(self.gazetteer.add("kenya", "region", "east_africa"))
+        self.assertEqual(self.gazetteer.lookup("KENYA"), ("country", "KEN"))
+
+    def test_scan_exact(self):
+        """Test accented, multi-word and coded names resolve in order of mention"""
+        found, corrections = self.gazetteer.scan("Compare Peru, Papua New Guinea and KEN")
+        self.assertEqual(found, [("country", "PER"), ("country", "PNG"), ("country", "KEN")])
+        self.assertEqual(corrections, {})
+
+    def test_scan_corrects_misspelt_names(self):
+        """Test a misspelt name resolves and the correction is reported"""
+        found, corrections = self.gazetteer.scan("Flooding in the Carribean and Keyna")
+        self.assertEqual(found, [("topic", "flood"), ("region", "caribbean"), ("country", "KEN")])
+        self.assertEqual(corrections, {"carribean": "caribbean", "keyna": "kenya"})
+
+    def test_correction_memo_cleared_concurrently(self):
+        """Test a correction lookup survives another thread clearing the memo mid-lookup"""
+        class ClearedAfterCheck(dict):
+            def __contains__(self, key):
+                found = super().__contains__(key)
+                self.clear()
+                return found
+
+        self.assertIsNone(self.gazetteer.correct("zzzzzz"))
+        self.gazetteer._corrections = ClearedAfterCheck(self.gazetteer._corrections)
+        self.assertIsNone(self.gazetteer.correct("zzzzzz"))
+        self.assertEqual(self.gazetteer.correct("keyna"), "kenya")
+
+    def test_ties_go_to_first_registration(self):
+        """Test a typo equally close to two words is read as the one registered first"""
+        found, _ = self.gazetteer.scan("Floods in Papua New Guinae")
+        self.assertEqual(found, [("country", "PNG")])
+
+    def test_short_lowercase_words_not_corrected(self):
+        """Test ordinary words a typo away from a short name are left alone"""
+        self.assertEqual(self.gazetteer.scan("Begin adapting before the flood")[0], [])
+        self.assertEqual(self.gazetteer.scan("how do i begin? keyna")[0], [])
+        self.assertEqual(self.gazetteer.scan("Where do we Begin")[0], [("country", "BEN")])
+
+    def test_topics_not_fuzzy(self):
+        """Test only place names are candidates for correction"""
+        self.assertEqual(self.gazetteer.scan("Floodding in Kenya")[0], [("country", "KEN")])
+
+    def test_fuzzy_disabled(self):
+        """Test an exact-only gazetteer ignores misspellings"""
+        gazetteer = Gazetteer(fuzzy=False)
+        gazetteer.add("Kenya", "country", "KEN")
+        self.assertEqual(gazetteer.scan("Drought in Keyna"), ([], {}))
+
+
+if __name__ == '__main__':
+    unittest.main()
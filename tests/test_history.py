@@ -0,0 +1,141 @@
+"""
+Test suite for the bounded conversation history store
+"""
+
+import sys
+import threading
+import unittest
+
+from climateguardian.history import ConversationHistoryStore, HistoryEntry, estimate_size
+
+
+class FakeClock:
+    """Manually advanced clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ConversationHistoryStoreTestCase(unittest.TestCase):
+    """Test cases for ConversationHistoryStore"""
+
+    def setUp(self):
+        """Set up a small store with a controllable clock"""
+        self.clock = FakeClock()
+        self.store = ConversationHistoryStore(max_entries_per_session=3, max_sessions=2,
+                                              session_ttl=60, clock=self.clock)
+
+    def test_ring_buffer_keeps_latest_entries(self):
+        """Test each session keeps only its most recent entries"""
+        for i in range(5):
+            self.store.append("a", {"question": f"q{i}"})
+
+        self.assertEqual([entry["question"] for entry in self.store.recent("a")], ["q2", "q3", "q4"])
+        self.assertEqual([entry["question"] for entry in self.store.recent("a", 2)], ["q3", "q4"])
+        self.assertEqual(len(self.store), 3)
+
+    def test_sessions_are_isolated(self):
+        """Test sessions never see each other's entries"""
+        self.store.append("a", {"question": "from a"})
+        self.store.append("b", {"question": "from b"})
+
+        self.assertEqual(self.store.recent("a"), [{"question": "from a"}])
+        self.assertEqual(self.store.recent("b"), [{"question": "from b"}])
+        self.assertEqual(self.store.recent("unknown"), [])
+
+    def test_least_recently_used_session_evicted(self):
+        """Test the idle session is evicted when capacity is exceeded"""
+        self.store.append("a", {"question": "1"})
+        self.store.append("b", {"question": "2"})
+        self.store.recent("a")
+        self.store.append("c", {"question": "3"})
+
+        self.assertEqual(self.store.count("b"), 0)
+        self.assertEqual(self.store.count("a"), 1)
+        self.assertEqual(self.store.count("c"), 1)
+        self.assertEqual(self.store.evicted_sessions, 1)
+
+    def test_idle_sessions_expire(self):
+        """Test sessions idle longer than the TTL are dropped"""
+        self.store.append("a", {"question": "old"})
+        self.clock.now = 30
+        self.store.append("b", {"question": "newer"})
+        self.clock.now = 61
+
+        self.assertEqual(self.store.recent("a"), [])
+        self.assertEqual(self.store.count("b"), 1)
+
+    def test_memory_budget(self):
+        """Test the memory report tracks entries and bytes"""
+        empty = self.store.memory_budget()
+        self.assertEqual(empty["entries"], 0)
+        self.assertEqual(empty["estimated_bytes"], 0)
+        self.assertEqual(empty["max_entries"], 6)
+
+        for i in range(10):
+            self.store.append(f"s{i % 3}", {"question": "x" * 100})
+        report = self.store.memory_budget()
+        self.assertEqual(report["sessions"], 2)
+        self.assertLessEqual(report["entries"], report["max_entries"])
+        self.assertGreater(report["estimated_bytes"], 0)
+
+        self.store.clear("s0")
+        self.store.clear("s1")
+        self.store.clear("s2")
+        self.assertEqual(self.store.memory_budget()["estimated_bytes"], 0)
+
+    def test_history_entries_share_responses(self):
+        """Test recorded entries read back as dicts holding the shared response, which is counted in full"""
+        response = {"answer": "x" * 10000, "sources": [], "confidence": 90}
+        intent = "".join(["risk_", "assessment"])
+        entry = HistoryEntry("id-1", "2026-01-01T00:00:00", "Flood risk?", intent, response)
+        self.assertIs(entry.intent, sys.intern("risk_assessment"))
+        self.assertFalse(hasattr(entry, "__dict__"))
+        self.assertGreater(estimate_size(entry), estimate_size(response))
+        self.assertLess(estimate_size(entry), estimate_size(response) + 1000)
+
+        self.store.append("a", entry)
+        [recorded] = self.store.recent("a")
+        self.assertEqual(recorded, {"id": "id-1", "timestamp": "2026-01-01T00:00:00", "question": "Flood risk?",
+                                    "intent": "risk_assessment", "response": response})
+        self.assertIs(recorded["response"], response)
+
+    def test_concurrent_appends(self):
+        """Test threads appending to many sessions lose no entries and keep counters exact"""
+        store = ConversationHistoryStore(max_entries_per_session=1000, max_sessions=4096)
+        self.assertGreater(store.memory_budget()["shards"], 1)
+        sessions, threads_count, per_thread = 64, 16, 500
+        barrier = threading.Barrier(threads_count)
+        # Switch threads far more often than usual to surface races
+        self.addCleanup(sys.setswitchinterval, sys.getswitchinterval())
+        sys.setswitchinterval(1e-5)
+
+        def worker(index):
+            barrier.wait()
+            for i in range(per_thread):
+                session_id = f"s{(index * per_thread + i) % sessions}"
+                store.append(session_id, {"question": f"{index}-{i}"})
+                store.recent(session_id, 5)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(threads_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        total = threads_count * per_thread
+        self.assertEqual(len(store), total)
+        self.assertEqual(sum(store.count(f"s{i}") for i in range(sessions)), total)
+        report = store.memory_budget()
+        self.assertEqual(report["sessions"], sessions)
+        self.assertEqual(report["entries"], total)
+        for i in range(sessions):
+            store.clear(f"s{i}")
+        self.assertEqual(store.memory_budget()["estimated_bytes"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Test suite for the dataset initialization script
+"""
+
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+SCRIPT = os.path.join(os.path.dirname(__file__), '..', 'scripts', 'initialize_datasets.py')
+spec = importlib.util.spec_from_file_location("initialize_datasets", SCRIPT)
+initialize_datasets = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(initialize_datasets)
+
+
+class DatasetInitializerTestCase(unittest.TestCase):
+    """Test cases for parallel and incremental dataset initialization"""
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.connectivity = mock.patch.object(
+            initialize_datasets.DatasetInitializer, 'test_api_connectivity',
+            return_value={"accessible": True, "status_code": 200, "not_modified": False, "etag": '"v1"'}
+        )
+        self.api_check = self.connectivity.start()
+
+    def tearDown(self):
+        self.connectivity.stop()
+        shutil.rmtree(self.data_dir)
+
+    def run_initializer(self, **kwargs):
+        initializer = initialize_datasets.DatasetInitializer(data_dir=self.data_dir, **kwargs)
+        results = initializer.initialize_all_datasets()
+        with open(os.path.join(self.data_dir, "initialization_report.json")) as f:
+            return results, json.load(f)
+
+    def test_full_sync_reports_timings(self):
+        """Test every dataset is written and timed"""
+        results, report = self.run_initializer(max_workers=3)
+        self.assertTrue(all(results.values()))
+        self.assertEqual(report["initialization_summary"]["workers"], 3)
+        for dataset_id, timing in report["dataset_timings"].items():
+            self.assertEqual(timing["action"], "synced")
+            self.assertGreaterEqual(timing["duration_seconds"], 0)
+            self.assertTrue(os.path.exists(os.path.join(self.data_dir, f"{dataset_id}_metadata.json")))
+
+    def test_incremental_skips_unchanged(self):
+        """Test a second incremental run skips datasets and leaves files alone"""
+        self.run_initializer()
+        metadata_file = os.path.join(self.data_dir, "nd_gain_metadata.json")
+        mtime = os.stat(metadata_file).st_mtime_ns
+
+        results, report = self.run_initializer(incremental=True)
+        self.assertTrue(all(results.values()))
+        self.assertEqual(os.stat(metadata_file).st_mtime_ns, mtime)
+        self.assertEqual(report["dataset_timings"]["nd_gain"]["reason"], "content hash unchanged")
+        self.assertEqual(report["initialization_summary"]["skipped"], 5)
+        # Real-time datasets are re-checked; the ETag shows whether they changed
+        self.assertEqual(report["dataset_timings"]["openaq"]["action"], "synced")
+
+    def test_incremental_skips_on_matching_etag(self):
+        """Test a 304 for the stored ETag skips the dataset"""
+        self.run_initializer()
+        self.api_check.return_value = {"accessible": True, "status_code": 304, "not_modified": True}
+        _, report = self.run_initializer(incremental=True)
+        self.assertEqual(report["dataset_timings"]["openaq"]["reason"], "ETag unchanged")
+        self.assertEqual(self.api_check.call_args[0][1], '"v1"')
+
+    def test_incremental_reuses_conditional_response(self):
+        """Test a changed ETag resyncs the dataset from the conditional request, without a second request"""
+        self.run_initializer()
+        self.api_check.reset_mock()
+        self.api_check.return_value = {"accessible": True, "status_code": 200, "not_modified": False, "etag": '"v2"'}
+        _, report = self.run_initializer(incremental=True)
+        self.assertEqual(report["dataset_timings"]["openaq"]["action"], "synced")
+        endpoint = initialize_datasets.DATASETS["openaq"]["api_endpoint"]
+        calls = [call for call in self.api_check.call_args_list if call[0][0] == endpoint]
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0][0][1], '"v1"')
+
+    def test_incremental_resyncs_changed_content(self):
+        """Test datasets whose content hash or files changed are rewritten"""
+        self.run_initializer()
+        os.remove(os.path.join(self.data_dir, "noaa_climate_sample.json"))
+        with mock.patch.dict(initialize_datasets.SAMPLE_DATA, {"nd_gain": {"countries": []}}):
+            _, report = self.run_initializer(incremental=True)
+        self.assertEqual(report["dataset_timings"]["nd_gain"]["action"], "synced")
+        self.assertEqual(report["dataset_timings"]["noaa_climate"]["action"], "synced")
+        self.assertEqual(report["dataset_timings"]["un_sdg13"]["action"], "skipped")
+
+    def test_update_window(self):
+        """Test datasets with an endpoint are skipped within their update window"""
+        info = dict(initialize_datasets.DATASETS["openaq"], update_frequency="Quarterly")
+        with mock.patch.dict(initialize_datasets.DATASETS, {"openaq": info}):
+            initialize_datasets.DatasetInitializer(data_dir=self.data_dir).initialize_all_datasets()
+            self.api_check.reset_mock()
+
+            initializer = initialize_datasets.DatasetInitializer(data_dir=self.data_dir, incremental=True)
+            initializer.initialize_all_datasets()
+        self.assertEqual(initializer.timings["openaq"]["reason"], "within quarterly update window")
+        self.api_check.assert_not_called()
+
+    def test_registry_not_shared(self):
+        """Test changing an initializer's dataset settings leaves the shared registry alone"""
+        initializer = initialize_datasets.DatasetInitializer(data_dir=self.data_dir)
+        initializer.datasets["openaq"]["update_frequency"] = "Quarterly"
+        self.assertEqual(initialize_datasets.DATASETS["openaq"]["update_frequency"], "Real-time")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Test suite for intent classification
+"""
+
+import random
+import unittest
+
+from climateguardian.intent import INTENT_KEYWORDS, IntentClassifier, comparison_request, intent_classifier
+
+
+def legacy_analyze_intent(question):
+    """Reference implementation: the original chained any() scans"""
+    question_lower = question.lower()
+    for intent, keywords in INTENT_KEYWORDS.items():
+        if any(word in question_lower for word in keywords):
+            return intent
+    return "general_climate"
+
+
+class IntentClassifierTestCase(unittest.TestCase):
+    """Test cases for IntentClassifier"""
+
+    def test_matches_legacy_precedence(self):
+        """Test classification agrees with the chained any() scans"""
+        rng = random.Random(13)
+        keywords = [word for words in INTENT_KEYWORDS.values() for word in words]
+        vocabulary = keywords + ["climate", "Bangladesh", "coastal", "heat", "water", "the", "in", "?"]
+
+        for _ in range(2000):
+            question = " ".join(rng.choice(vocabulary) + rng.choice(["", "s", "ING"])
+                                for _ in range(rng.randint(1, 12)))
+            self.assertEqual(intent_classifier.classify(question), legacy_analyze_intent(question),
+                             question)
+
+    def test_overlapping_keywords(self):
+        """Test keywords sharing characters are all found"""
+        # "should" and "disaster" overlap on the "d"; risk must still win
+        self.assertEqual(intent_classifier.classify("shouldisaster"), "risk_assessment")
+        self.assertEqual(intent_classifier.classify("grantrend"), "funding_intelligence")
+
+    def test_prefix_keywords(self):
+        """Test a keyword that prefixes another is found alongside it"""
+        classifier = IntentClassifier({"risk_assessment": ["risk"], "data_analysis": ["risks"]})
+        self.assertEqual(classifier.classify("Which risks matter most?"), "risk_assessment")
+        self.assertEqual(classifier.hit_counts("Which risks matter most?"),
+                         {"risk_assessment": 1, "data_analysis": 1})
+
+    def test_hit_counts(self):
+        """Test per-intent hit counts"""
+        counts = intent_classifier.hit_counts("Flood risk data: should floods trend with funding?")
+        self.assertEqual(counts, {
+            "risk_assessment": 3,
+            "policy_recommendation": 1,
+            "funding_intelligence": 1,
+            "data_analysis": 2
+        })
+
+    def test_default_intent(self):
+        """Test questions without keywords fall back to the default intent"""
+        self.assertEqual(intent_classifier.classify("Tell me about the weather"), "general_climate")
+        self.assertEqual(intent_classifier.classify(""), "general_climate")
+
+    def test_multi_word_keywords(self):
+        """Test keywords containing spaces are matched across tokens"""
+        classifier = IntentClassifier({"sea_level": ["sea level"], "heat": ["heatwave"]})
+        self.assertEqual(classifier.classify("Sea   level rise"), "general_climate")
+        self.assertEqual(classifier.classify("sea level and heatwave"), "sea_level")
+
+    def test_comparison_request(self):
+        """Test ranking words, top-k and ascending order are recognised"""
+        self.assertIsNone(comparison_request("What are the flood risks for Bangladesh?"))
+        self.assertIsNotNone(comparison_request("Compare Bangladesh and the Netherlands"))
+        self.assertIsNotNone(comparison_request("rank South Asian countries by flood risk"))
+        request = comparison_request("Which 3 countries are least vulnerable?")
+        self.assertEqual((request.top_k, request.ascending), (3, True))
+        self.assertEqual(comparison_request("top 5 countries by climate risk").top_k, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
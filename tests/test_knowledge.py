@@ -0,0 +1,160 @@
+"""
+Test suite for the indexed climate knowledge store
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+
+from climateguardian.knowledge import ClimateKnowledgeStore, KnowledgeIndex
+from climateguardian.sample_data import SAMPLE_DATA
+
+TODAY = date(2026, 10, 17)
+
+
+class KnowledgeIndexTestCase(unittest.TestCase):
+    """Test cases for entity resolution and lookups"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Build one index from the bundled sample data"""
+        cls.index = KnowledgeIndex(SAMPLE_DATA)
+
+    def test_resolve_countries(self):
+        """Test country names and aliases resolve to ISO alpha-3 codes"""
+        entities = self.index.resolve("Compare Bangladesh, Viet Nam and the UK with Côte d'Ivoire")
+        self.assertEqual(entities.countries, ["BGD", "VNM", "CIV", "GBR"])
+        self.assertEqual(self.index.resolve("Ivory Coast floods").countries, ["CIV"])
+
+    def test_resolve_prefers_longest_phrase(self):
+        """Test multi-word names win over the shorter names they contain"""
+        self.assertEqual(self.index.resolve("Papua New Guinea").countries, ["PNG"])
+        entities = self.index.resolve("grants in South Africa")
+        self.assertEqual(entities.countries, ["ZAF"])
+        self.assertEqual(entities.regions, [])
+
+    def test_resolve_iso_codes(self):
+        """Test capitalised ISO codes resolve but lower-case words do not"""
+        self.assertEqual(self.index.resolve("flood risk in BGD").countries, ["BGD"])
+        self.assertEqual(self.index.resolve("tell us about the US").countries, ["USA"])
+        self.assertEqual(self.index.resolve("tell us about floods").countries, [])
+        self.assertEqual(self.index.resolve("FLOOD RISK IN BANGLADESH").countries, ["BGD"])
+
+    def test_resolve_regions_organizations_topics(self):
+        """Test region aliases, organization types and topics"""
+        entities = self.index.resolve("Drought funding for African NGOs and South Asian governments")
+        self.assertEqual(entities.regions, ["africa", "southern_asia"])
+        self.assertEqual(entities.organization_types, ["ngo", "government"])
+        self.assertEqual(entities.topics, ["drought"])
+
+    def test_resolve_translations_and_demonyms(self):
+        """Test names in other languages, demonyms and ISO alpha-2 codes resolve"""
+        self.assertEqual(self.index.resolve("Riesgo de inundación en Bangladés").countries, ["BGD"])
+        self.assertEqual(self.index.resolve("Dürre in Südafrika und Äthiopien").countries, ["ZAF", "ETH"])
+        self.assertEqual(self.index.resolve("Sécheresse en Afrique de l'Ouest").regions, ["western_africa"])
+        self.assertEqual(self.index.resolve("Kenyan and Bangladeshi farmers").countries, ["KEN", "BGD"])
+        self.assertEqual(self.index.resolve("flood risk in BD").countries, ["BGD"])
+        self.assertEqual(self.index.resolve("What IN means in IT").countries, [])
+
+    def test_resolve_misspellings(self):
+        """Test misspelt country and region names resolve"""
+        entities = self.index.resolve("Flood risk for Bangaldesh and the Phillipines")
+        self.assertEqual(entities.countries, ["BGD", "PHL"])
+        self.assertEqual(entities.corrections, {"bangaldesh": "bangladesh", "phillipines": "philippines"})
+        self.assertEqual(self.index.resolve("Drought in Keyna").countries, ["KEN"])
+        self.assertEqual(self.index.resolve("How do I begin adapting?").countries, [])
+
+    def test_region_membership(self):
+        """Test region indexes cover every member country"""
+        self.assertIn("BGD", self.index.region_members["southern_asia"])
+        self.assertIn("FJI", self.index.region_members["small_island_nations"])
+        self.assertIn("africa", self.index.country_regions["KEN"])
+        self.assertEqual(len(self.index.region_members["africa"]), 54)
+
+    def test_policy_for_region_and_member_country(self):
+        """Test policies resolve from a region, a member country or an overlapping region"""
+        for question in ["small island nations", "policy for Fiji", "Pacific island countries"]:
+            policy = self.index.policy_for(self.index.resolve(question))
+            self.assertIsNotNone(policy, question)
+            self.assertEqual(policy["region"], "small_island_nations")
+        self.assertIsNone(self.index.policy_for(self.index.resolve("policy for Germany")))
+
+    def test_funding_for(self):
+        """Test funding lookups intersect region and organization type"""
+        self.assertEqual(len(self.index.funding_for(["africa"], ["ngo"], today=TODAY)), 3)
+        self.assertEqual(len(self.index.funding_for(["africa"], [], today=TODAY)), 3)
+        self.assertEqual(self.index.funding_for(["africa"], ["government"], today=TODAY), [])
+        self.assertEqual(self.index.funding_for([], [], today=TODAY), [])
+
+    def test_funding_for_limits(self):
+        """Test funding lookups leave out closed opportunities and apply amount and deadline limits"""
+        funding = self.index.funding_for(["pacific"], ["government"], today=TODAY)
+        self.assertEqual([opportunity["name"] for opportunity in funding],
+                         ["Pacific Resilience Facility", "Community Resilience Partnership Program",
+                          "Green Climate Fund Readiness Programme"])
+        self.assertEqual(len(self.index.funding_for(["africa"], ["ngo"], today=date(2027, 10, 1))), 1)
+        self.assertEqual([opportunity["name"] for opportunity in
+                          self.index.funding_for([], ["government"], min_amount=15e6, today=TODAY)],
+                         ["Community Resilience Partnership Program", "Least Developed Countries Fund"])
+        self.assertEqual(len(self.index.funding_for([], [], closes_by=date(2026, 12, 31), today=TODAY)), 1)
+
+    def test_topic_index(self):
+        """Test records are indexed by topic"""
+        countries = {record.get("country") for record in self.index.by_topic["flood"]}
+        self.assertEqual(countries, {"Bangladesh", "Netherlands"})
+
+
+class ClimateKnowledgeStoreTestCase(unittest.TestCase):
+    """Test cases for loading and reloading dataset files"""
+
+    def setUp(self):
+        """Set up an empty data directory"""
+        self.data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.data_dir)
+
+    def write_sample(self, dataset_id, data):
+        with open(os.path.join(self.data_dir, f"{dataset_id}_sample.json"), "w") as f:
+            json.dump(data, f)
+
+    def test_falls_back_to_sample_data(self):
+        """Test the store works before any dataset file is written"""
+        store = ClimateKnowledgeStore(self.data_dir)
+        self.assertIn("BGD", store.index.flood_risks)
+
+    def test_dataset_files_overlay_sample_data(self):
+        """Test collections from files replace the bundled ones"""
+        self.write_sample("nd_gain", {"countries": [
+            {"country": "Kenya", "vulnerability_score": 0.5, "readiness_score": 0.3}
+        ]})
+        store = ClimateKnowledgeStore(self.data_dir)
+        self.assertEqual(list(store.index.nd_gain), ["KEN"])
+        self.assertIn("BGD", store.index.flood_risks)
+
+    def test_dataset_strings_interned(self):
+        """Test repeated short values in dataset files share one string object"""
+        self.write_sample("nd_gain", {"flood_risks": [
+            {"country": name, "risk_level": "HIGH", "confidence": 80, "factors": ["x" * 100],
+             "sources": ["ND-GAIN Country Index 2023"]}
+            for name in ("Kenya", "Chad")
+        ]})
+        rows = ClimateKnowledgeStore(self.data_dir).index.flood_risks
+        self.assertIs(rows["KEN"]["risk_level"], rows["TCD"]["risk_level"])
+        self.assertIs(rows["KEN"]["sources"][0], rows["TCD"]["sources"][0])
+        self.assertIsNot(rows["KEN"]["factors"][0], rows["TCD"]["factors"][0])
+
+    def test_reloads_when_files_change(self):
+        """Test the index is rebuilt after a dataset file changes"""
+        store = ClimateKnowledgeStore(self.data_dir, check_interval=0)
+        self.assertNotIn("KEN", store.index.nd_gain)
+
+        self.write_sample("nd_gain", {"countries": [
+            {"country": "Kenya", "vulnerability_score": 0.5, "readiness_score": 0.3}
+        ]})
+        self.assertIn("KEN", store.index.nd_gain)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,353 @@
+"""
+Test suite for the watsonx.ai client against the local stub server
+"""
+
+import asyncio
+import threading
+import unittest
+from unittest import mock
+
+import httpx
+import requests
+
+from climateguardian.llm import LLMError, WatsonxClient, build_prompt
+from climateguardian.stub_llm import StubWatsonxServer
+
+
+def make_client(server: StubWatsonxServer, **kwargs) -> WatsonxClient:
+    options = {"backoff_base": 0.01, "backoff_cap": 0.05, "read_timeout": 5}
+    options.update(kwargs)
+    return WatsonxClient(
+        api_key="test-key",
+        project_id="test-project",
+        url=server.url,
+        model_id="ibm/granite-13b-chat-v2",
+        iam_url=server.iam_url,
+        **options
+    )
+
+
+class WatsonxClientTestCase(unittest.TestCase):
+    """Test cases for WatsonxClient"""
+
+    def setUp(self):
+        self.server = StubWatsonxServer().start()
+        self.client = make_client(self.server)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def test_generate(self):
+        """Test a completion is returned with per-call timing"""
+        result = self.client.generate(build_prompt("Flood risk?", "High flood risk."))
+        self.assertEqual(result.text, "High flood risk.")
+        self.assertEqual(result.attempts, 1)
+        self.assertGreater(result.latency_ms, 0)
+
+    def test_connection_and_token_reuse(self):
+        """Test calls share one keep-alive connection and one IAM token"""
+        for _ in range(5):
+            self.client.generate("prompt")
+        self.assertEqual(self.server.counters["token_requests"], 1)
+        self.assertEqual(self.server.counters["generation_requests"], 5)
+        self.assertEqual(self.server.counters["connections"], 1)
+
+    def test_token_refreshed_ahead_of_expiry(self):
+        """Test short-lived tokens are refreshed before they expire"""
+        now = [1000.0]
+        self.client.tokens._clock = lambda: now[0]
+        self.server.token_ttl = 60
+        self.client.generate("prompt")
+        now[0] += 29
+        self.client.generate("prompt")
+        self.assertEqual(self.server.counters["token_requests"], 1)
+        now[0] += 2
+        self.client.generate("prompt")
+        self.assertEqual(self.server.counters["token_requests"], 2)
+
+    def test_revoked_token_is_replaced(self):
+        """Test a 401 triggers one token refresh and the call succeeds"""
+        self.client.generate("prompt")
+        self.server.revoke_tokens()
+        result = self.client.generate("prompt")
+        self.assertEqual(result.attempts, 1)
+        self.assertEqual(self.server.counters["token_requests"], 2)
+
+    def test_retries_transient_failures(self):
+        """Test 429/5xx responses are retried with backoff"""
+        self.server.fail_next(2, status=429)
+        result = self.client.generate("prompt")
+        self.assertEqual(result.attempts, 3)
+        self.assertEqual(self.client.retries, 2)
+
+    def test_gives_up_after_max_retries(self):
+        """Test persistent failures raise LLMError"""
+        self.server.fail_next(10)
+        with self.assertRaises(LLMError):
+            self.client.generate("prompt")
+        self.assertEqual(self.server.counters["generation_requests"], 4)
+        self.assertEqual(self.client.failures, 1)
+
+    def test_client_errors_not_retried(self):
+        """Test non-transient errors fail immediately"""
+        self.server.fail_next(1, status=400)
+        with self.assertRaises(LLMError):
+            self.client.generate("prompt")
+        self.assertEqual(self.server.counters["generation_requests"], 1)
+
+    def test_unreachable_backend(self):
+        """Test connection errors surface as LLMError"""
+        self.server.stop()
+        with self.assertRaises(LLMError):
+            self.client.generate("prompt")
+        self.server = StubWatsonxServer().start()
+
+    def test_other_request_errors_surface_as_llm_error(self):
+        """Test request failures other than connection errors and timeouts raise LLMError, without retries"""
+        self.client.generate("prompt")
+        with mock.patch.object(self.client.session, "post", side_effect=requests.TooManyRedirects("loop")) as post:
+            with self.assertRaises(LLMError):
+                self.client.generate("prompt")
+        self.assertEqual(post.call_count, 1)
+
+    def test_token_response_without_access_token(self):
+        """Test an IAM response missing its token raises LLMError and the ping reports it"""
+        response = mock.Mock(status_code=200)
+        response.json.return_value = {"expires_in": 3600}
+        with mock.patch.object(self.client.tokens.session, "post", return_value=response):
+            with self.assertRaises(LLMError):
+                self.client.generate("prompt")
+            status = self.client.ping()
+        self.assertFalse(status["reachable"])
+        self.assertIn("access_token", status["error"])
+
+    def test_concurrency_bounded(self):
+        """Test no more than max_concurrency requests are in flight"""
+        self.server.latency = 0.05
+        client = make_client(self.server, max_concurrency=2)
+        threads = [threading.Thread(target=client.generate, args=("prompt",)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        client.close()
+        self.assertEqual(self.server.counters["generation_requests"], 8)
+        self.assertLessEqual(self.server.max_in_flight, 2)
+
+    def test_ping(self):
+        """Test the readiness ping reaches the backend without a generation call"""
+        status = self.client.ping()
+        self.assertTrue(status["reachable"])
+        self.assertEqual(self.server.counters["model_spec_requests"], 1)
+        self.assertEqual(self.server.counters["generation_requests"], 0)
+        self.assertEqual(self.client.calls, 0)
+
+    def test_ping_unreachable(self):
+        """Test the ping reports an unreachable backend instead of raising"""
+        self.server.stop()
+        status = self.client.ping(timeout=1)
+        self.assertFalse(status["reachable"])
+        self.assertIn("error", status)
+
+    def test_generate_stream(self):
+        """Test streamed chunks rebuild the full completion"""
+        reference = "Bangladesh faces HIGH flood risk due to monsoon intensity and sea level rise."
+        chunks = list(self.client.generate_stream(build_prompt("Flood risk?", reference)))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), reference)
+
+    def test_agenerate(self):
+        """Test the awaitable variant"""
+        result = asyncio.run(self.client.agenerate(build_prompt("q", "async answer")))
+        self.assertEqual(result.text, "async answer")
+
+    def test_agenerate_other_request_errors_surface_as_llm_error(self):
+        """Test async request failures other than transport errors raise LLMError, without retries"""
+        async def run(error):
+            client, _ = await self.client._async_client()
+            with mock.patch.object(type(client), "post", side_effect=error) as post:
+                with self.assertRaises(LLMError):
+                    await self.client.agenerate("prompt")
+            return post.call_count
+
+        for error in (httpx.TooManyRedirects("loop"), httpx.DecodingError("bad gzip"), httpx.InvalidURL("bad")):
+            self.assertEqual(asyncio.run(run(error)), 1, type(error).__name__)
+
+    def test_async_clients_closed_when_loop_changes(self):
+        """Test moving to a new event loop closes the clients made for the previous one"""
+        asyncio.run(self.client.agenerate("prompt"))
+        _, first, _ = self.client._async_state
+
+        async def run():
+            try:
+                return await self.client.agenerate("prompt")
+            finally:
+                await self.client.aclose()
+
+        asyncio.run(run())
+        self.assertTrue(all(client.is_closed for client in first))
+
+    def test_agenerate_retries_and_refreshes_token(self):
+        """Test the async path shares the retry and 401 token refresh rules"""
+        client = make_client(self.server, backoff_base=0.001)
+        client.generate("prompt")
+        self.server.revoke_tokens()
+        self.server.fail_next(2)
+
+        async def run():
+            try:
+                return await client.agenerate("prompt")
+            finally:
+                await client.aclose()
+
+        result = asyncio.run(run())
+        client.close()
+        self.assertEqual(result.attempts, 3)
+        self.assertEqual(self.server.counters["token_requests"], 2)
+
+    def test_agenerate_concurrency(self):
+        """Test concurrent async generations overlap up to async_max_concurrency"""
+        self.server.latency = 0.1
+        client = make_client(self.server, max_concurrency=2, async_max_concurrency=20)
+
+        async def run():
+            try:
+                return await asyncio.gather(*(client.agenerate("prompt") for _ in range(20)))
+            finally:
+                await client.aclose()
+
+        results = asyncio.run(run())
+        client.close()
+        self.assertEqual(len(results), 20)
+        self.assertGreater(self.server.max_in_flight, 2)
+        self.assertLessEqual(self.server.max_in_flight, 20)
+
+    def test_latency_percentiles(self):
+        """Test percentiles are reported over recorded calls"""
+        self.assertEqual(self.client.latency_percentiles()["count"], 0)
+        for _ in range(10):
+            self.client.generate("prompt")
+        latency = self.client.stats()["latency_ms"]
+        self.assertEqual(latency["count"], 10)
+        self.assertLessEqual(latency["p50"], latency["p95"])
+        self.assertLessEqual(latency["p95"], latency["p99"])
+
+
+class GuardianLLMTestCase(unittest.TestCase):
+    """Test ClimateGuardian answers through the LLM client"""
+
+    def setUp(self):
+        from app import ClimateGuardian
+        self.server = StubWatsonxServer().start()
+        self.guardian = ClimateGuardian(llm=make_client(self.server))
+        self.question = "What are the flood risks for Bangladesh?"
+
+    def tearDown(self):
+        self.guardian.llm.close()
+        self.server.stop()
+
+    def test_query_uses_llm(self):
+        """Test queries go through the model with the grounded answer as reference"""
+        self.server.responder = lambda prompt: "Model answer about Bangladesh."
+        result = self.guardian.query(self.question)
+        self.assertEqual(result["answer"], "Model answer about Bangladesh.")
+        self.assertIn("ND-GAIN Country Index 2023", result["sources"])
+
+    def test_aquery_uses_llm(self):
+        """Test the async query path generates through the model and caches the answer"""
+        self.server.responder = lambda prompt: "Async model answer."
+
+        async def run():
+            try:
+                return [await self.guardian.aquery(self.question) for _ in range(2)]
+            finally:
+                await self.guardian.llm.aclose()
+
+        first, second = asyncio.run(run())
+        self.assertEqual(first["answer"], "Async model answer.")
+        self.assertEqual(second["answer"], "Async model answer.")
+        self.assertEqual(self.server.counters["generation_requests"], 1)
+
+    def test_identical_concurrent_queries_share_one_generation(self):
+        """Test concurrent identical questions make one model call, each answer keeping its own id"""
+        self.server.latency = 0.3
+        self.server.responder = lambda prompt: "Shared model answer."
+        results = [None] * 8
+        barrier = threading.Barrier(len(results))
+
+        def ask(i):
+            barrier.wait()
+            results[i] = self.guardian.query(self.question if i % 2 else self.question.upper())
+
+        threads = [threading.Thread(target=ask, args=(i,)) for i in range(len(results))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual({result["answer"] for result in results}, {"Shared model answer."})
+        self.assertEqual(len({result["id"] for result in results}), len(results))
+        self.assertEqual(self.server.counters["generation_requests"], 1)
+        self.assertEqual(self.guardian.inflight.leaders, 1)
+        self.assertEqual(self.guardian.inflight.coalesced + self.guardian.response_cache.hits, len(results) - 1)
+        self.assertIn("query_coalesced_total", self.guardian.metrics.render())
+
+    def test_identical_concurrent_aqueries_share_one_generation(self):
+        """Test the async query path coalesces identical in-flight questions"""
+        self.server.latency = 0.2
+
+        async def run():
+            try:
+                return await asyncio.gather(*(self.guardian.aquery(self.question) for _ in range(6)))
+            finally:
+                await self.guardian.llm.aclose()
+
+        results = asyncio.run(run())
+        self.assertEqual(len({result["answer"] for result in results}), 1)
+        self.assertEqual(len({result["id"] for result in results}), 6)
+        self.assertEqual(self.server.counters["generation_requests"], 1)
+        self.assertEqual(self.guardian.inflight.coalesced, 5)
+
+    def test_query_falls_back_when_llm_fails(self):
+        """Test the grounded answer is served when the model is unavailable"""
+        self.server.fail_next(10)
+        result = self.guardian.query(self.question)
+        self.assertIn("Bangladesh faces HIGH flood risk", result["answer"])
+
+    def test_stream_query_uses_llm_stream(self):
+        """Test streamed chunks come from the model stream"""
+        events = list(self.guardian.stream_query(self.question))
+        chunks = [payload["text"] for event, payload in events if event == "chunk"]
+        self.assertEqual(events[-1][0], "done")
+        self.assertGreater(len(chunks), 1)
+        self.assertIn("Bangladesh faces HIGH flood risk", "".join(chunks))
+        self.assertEqual(self.server.counters["generation_requests"], 1)
+
+    def test_readiness_checks_llm(self):
+        """Test readiness pings the LLM backend and caches the report"""
+        report = self.guardian.readiness()
+        self.assertTrue(report["ready"])
+        self.assertTrue(report["checks"]["llm"]["reachable"])
+        self.guardian.readiness()
+        self.assertEqual(self.server.counters["model_spec_requests"], 1)
+
+    def test_readiness_fails_when_llm_unreachable(self):
+        """Test a worker whose LLM backend is down reports not ready"""
+        self.server.stop()
+        report = self.guardian.readiness()
+        self.assertFalse(report["ready"])
+        self.assertFalse(report["checks"]["llm"]["ok"])
+        self.assertTrue(report["checks"]["datasets"]["ok"])
+
+    def test_stream_query_falls_back_when_llm_fails(self):
+        """Test the grounded answer is streamed when the model stream cannot start"""
+        self.server.fail_next(10)
+        events = list(self.guardian.stream_query(self.question))
+        chunks = [payload["text"] for event, payload in events if event == "chunk"]
+        self.assertEqual(events[-1][0], "done")
+        self.assertIn("Bangladesh faces HIGH flood risk", "".join(chunks))
+
+
+if __name__ == '__main__':
+    unittest.main()
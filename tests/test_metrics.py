@@ -0,0 +1,80 @@
+"""
+Test suite for the Prometheus metrics registry
+"""
+
+import threading
+import unittest
+
+from climateguardian.metrics import MetricsRegistry
+
+
+class MetricsRegistryTestCase(unittest.TestCase):
+    """Test cases for counters, histograms and callback metrics"""
+
+    def setUp(self):
+        self.registry = MetricsRegistry(prefix="test")
+
+    def test_counter(self):
+        """Test counters accumulate per label set and render sorted"""
+        counter = self.registry.counter("requests_total", "Requests", ["status"])
+        counter.inc(status=200)
+        counter.inc(2, status=200)
+        counter.inc(status=500)
+        self.assertEqual(counter.value(status=200), 3)
+        self.assertEqual(self.registry.render(), (
+            "# HELP test_requests_total Requests\n"
+            "# TYPE test_requests_total counter\n"
+            'test_requests_total{status="200"} 3\n'
+            'test_requests_total{status="500"} 1\n'
+        ))
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test bucket counts include smaller buckets and boundary values land in their bucket"""
+        histogram = self.registry.histogram("latency_seconds", "Latency", ["intent"], buckets=[0.1, 1.0])
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, intent="policy")
+        lines = self.registry.render().splitlines()
+        self.assertIn('test_latency_seconds_bucket{intent="policy",le="0.1"} 2', lines)
+        self.assertIn('test_latency_seconds_bucket{intent="policy",le="1"} 3', lines)
+        self.assertIn('test_latency_seconds_bucket{intent="policy",le="+Inf"} 4', lines)
+        self.assertIn('test_latency_seconds_sum{intent="policy"} 3.65', lines)
+        self.assertIn('test_latency_seconds_count{intent="policy"} 4', lines)
+        self.assertEqual(histogram.count(intent="policy"), 4)
+
+    def test_callback_and_escaping(self):
+        """Test callback values are read at render time and label values are escaped"""
+        state = {"size": 1}
+        self.registry.callback("size", "Size", lambda: state["size"])
+        self.registry.callback("by_path", "By path", lambda: {('a"b\\c',): 2.5}, labels=["path"])
+        state["size"] = 7
+        lines = self.registry.render().splitlines()
+        self.assertIn("test_size 7", lines)
+        self.assertIn('test_by_path{path="a\\"b\\\\c"} 2.5', lines)
+
+    def test_duplicate_names_rejected(self):
+        """Test a metric name can only be registered once"""
+        self.registry.counter("events_total", "Events")
+        with self.assertRaises(ValueError):
+            self.registry.counter("events_total", "Events")
+
+    def test_concurrent_updates(self):
+        """Test no increments are lost across threads"""
+        counter = self.registry.counter("hits_total", "Hits")
+        histogram = self.registry.histogram("work_seconds", "Work")
+
+        def work():
+            for _ in range(1000):
+                counter.inc()
+                histogram.observe(0.01)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(counter.value(), 8000)
+        self.assertEqual(histogram.count(), 8000)
+
+
+if __name__ == '__main__':
+    unittest.main()
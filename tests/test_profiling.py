@@ -0,0 +1,78 @@
+"""
+Test suite for the sampling profiler
+"""
+
+import os
+import pstats
+import shutil
+import tempfile
+import unittest
+
+from climateguardian.profiling import SamplingProfiler
+
+
+def busy_work():
+    return sum(i * i for i in range(2000))
+
+
+class SamplingProfilerTestCase(unittest.TestCase):
+    """Test cases for SamplingProfiler"""
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def run_calls(self, profiler: SamplingProfiler, count: int) -> int:
+        profiled = 0
+        for _ in range(count):
+            with profiler.sample() as sampled:
+                busy_work()
+            profiled += sampled
+        return profiled
+
+    def test_disabled_by_default(self):
+        """Test nothing is profiled or written without a sampling rate"""
+        profiler = SamplingProfiler(self.output_dir)
+        self.assertEqual(self.run_calls(profiler, 10), 0)
+        self.assertFalse(os.path.exists(profiler.stats_path))
+
+    def test_samples_one_in_n_and_aggregates(self):
+        """Test every Nth call is profiled and stats accumulate in one file"""
+        profiler = SamplingProfiler(self.output_dir, every=4)
+        self.assertEqual(self.run_calls(profiler, 12), 3)
+        self.assertEqual(profiler.samples, 3)
+
+        stats = pstats.Stats(profiler.stats_path)
+        calls = {func[2]: entry[1] for func, entry in stats.stats.items()}
+        self.assertEqual(calls["busy_work"], 3)
+
+    def test_control_file_toggles_at_runtime(self):
+        """Test writing and removing the control file switches sampling without a restart"""
+        now = [0.0]
+        profiler = SamplingProfiler(self.output_dir, check_interval=5, clock=lambda: now[0])
+        self.assertEqual(self.run_calls(profiler, 4), 0)
+
+        with open(profiler.control_file, "w") as f:
+            f.write("2\n")
+        now[0] = 6
+        self.assertEqual(self.run_calls(profiler, 4), 2)
+
+        os.remove(profiler.control_file)
+        now[0] = 12
+        self.assertEqual(self.run_calls(profiler, 4), 0)
+        self.assertEqual(profiler.every, 0)
+
+    def test_exceptions_still_recorded(self):
+        """Test a profiled call that raises still stops the profiler and saves stats"""
+        profiler = SamplingProfiler(self.output_dir, every=1)
+        with self.assertRaises(ValueError):
+            with profiler.sample():
+                raise ValueError("boom")
+        self.assertEqual(profiler.samples, 1)
+        self.assertTrue(os.path.exists(profiler.stats_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Test suite for comparative risk ranking
+"""
+
+import copy
+import math
+import unittest
+
+import numpy as np
+
+from climateguardian.knowledge import KnowledgeIndex
+from climateguardian.ranking import RiskRanker, RiskTable, composite_scores
+from climateguardian.sample_data import SAMPLE_DATA
+
+
+def ranked_codes(table, positions):
+    return [str(table.codes[position]) for position in positions]
+
+
+class RiskTableTestCase(unittest.TestCase):
+    """Test cases for RiskTable and composite scores"""
+
+    @classmethod
+    def setUpClass(cls):
+        data = copy.deepcopy(SAMPLE_DATA)
+        data["nd_gain"]["countries"] += [
+            {"country": "Kenya", "vulnerability_score": 0.6, "readiness_score": 0.3},
+            {"country": "Nepal", "vulnerability_score": 0.55, "readiness_score": 0.35},
+            {"country": "Chad", "vulnerability_score": 0.9}
+        ]
+        cls.knowledge = KnowledgeIndex(data)
+        cls.table = RiskTable(cls.knowledge)
+
+    def test_composite_rescales_missing_indicators(self):
+        """Test a missing indicator's weight is shared among the indicators present"""
+        scores = composite_scores({"a": np.array([0.5, 1.0, np.nan]), "b": np.array([1.0, np.nan, np.nan])},
+                                  {"a": 0.5, "b": 0.5})
+        self.assertAlmostEqual(scores[0], 0.75)
+        self.assertAlmostEqual(scores[1], 1.0)
+        self.assertTrue(math.isnan(scores[2]))
+
+    def test_scores(self):
+        """Test flood hazard raises a score and countries without readiness are still scored"""
+        bangladesh = self.table.row(self.table.positions["BGD"])
+        self.assertAlmostEqual(bangladesh["score"], 0.5 * 0.72 + 0.3 * 0.69 + 0.2 * 0.75)
+        self.assertEqual(bangladesh["flood_risk"], "HIGH")
+        self.assertAlmostEqual(self.table.row(self.table.positions["TCD"])["score"], 0.9)
+
+    def test_rank_all_and_top_k(self):
+        """Test every scored country is ranked, highest risk first, and top-k keeps the head"""
+        everything = ranked_codes(self.table, self.table.rank())
+        self.assertEqual(everything, ["TCD", "MDV", "BGD", "KEN", "NPL", "NLD"])
+        self.assertEqual(ranked_codes(self.table, self.table.rank(top_k=2)), everything[:2])
+        self.assertEqual(ranked_codes(self.table, self.table.rank(top_k=2, ascending=True)), ["NLD", "NPL"])
+
+    def test_rank_region_and_countries(self):
+        """Test region filters rank members only and named countries override regions"""
+        self.assertEqual(ranked_codes(self.table, self.table.rank(regions=["southern_asia"])),
+                         ["MDV", "BGD", "NPL"])
+        self.assertEqual(ranked_codes(self.table, self.table.rank(regions=["africa", "europe"])),
+                         ["TCD", "KEN", "NLD"])
+        self.assertEqual(ranked_codes(self.table, self.table.rank(regions=["africa"], countries=["NLD", "BGD"])),
+                         ["BGD", "NLD"])
+        self.assertEqual(len(self.table.rank(regions=["caribbean"])), 0)
+
+    def test_row_missing_indicator_is_none(self):
+        """Test a country scored without one of its indicators reports that indicator as None, not NaN"""
+        row = self.table.row(self.table.positions["TCD"])
+        self.assertAlmostEqual(row["score"], 0.9)
+        self.assertEqual(row["vulnerability"], 0.9)
+        self.assertIsNone(row["readiness"])
+        self.assertIsNone(row["flood_risk"])
+
+    def test_ranker_rebuilds_for_new_index(self):
+        """Test the ranker reuses its table until the knowledge index is replaced"""
+        ranker = RiskRanker()
+        table = ranker.table(self.knowledge)
+        self.assertIs(ranker.table(self.knowledge), table)
+        self.assertIsNot(ranker.table(KnowledgeIndex(SAMPLE_DATA)), table)
+        self.assertIn("ND-GAIN vulnerability (50%)", ranker.methodology())
+
+
+if __name__ == '__main__':
+    unittest.main()
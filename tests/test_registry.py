@@ -0,0 +1,79 @@
+"""
+Test suite for the shared dataset registry and catalog
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+
+from climateguardian.registry import DATASETS, DatasetCatalog, metadata_path
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class DatasetCatalogTestCase(unittest.TestCase):
+    """Test cases for DatasetCatalog"""
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def write_metadata(self, dataset_id: str, **fields):
+        with open(metadata_path(self.data_dir, dataset_id), "w") as f:
+            json.dump({"id": dataset_id, **fields}, f)
+
+    def test_static_catalog(self):
+        """Test every registered dataset is listed without metadata files"""
+        body, etag = DatasetCatalog(self.data_dir).snapshot()
+        data = json.loads(body)
+        self.assertEqual([entry["id"] for entry in data["data"]], list(DATASETS))
+        self.assertEqual(data["data"][0]["name"], "ND-GAIN")
+        self.assertNotIn("last_updated", data["data"][0])
+        self.assertNotIn("api_endpoint", data["data"][0])
+        self.assertEqual(len(etag), 32)
+
+    def test_live_status_merged(self):
+        """Test last_updated and public api_status fields come from the metadata files"""
+        self.write_metadata("openaq", last_updated="2026-01-01T00:00:00", status="initialized",
+                            api_status={"accessible": False, "error": "DNS failure", "tested_at": "t"})
+        entry = DatasetCatalog(self.data_dir).entries()[2]
+        self.assertEqual(entry["last_updated"], "2026-01-01T00:00:00")
+        self.assertEqual(entry["api_status"], {"accessible": False, "tested_at": "t"})
+
+    def test_rebuilt_only_when_metadata_changes(self):
+        """Test the serialized body is reused until a metadata file changes"""
+        catalog = DatasetCatalog(self.data_dir, check_interval=5, clock=self.clock)
+        body, etag = catalog.snapshot()
+
+        self.write_metadata("nd_gain", last_updated="2026-02-01T00:00:00")
+        self.assertIs(catalog.snapshot()[0], body)
+
+        self.clock.now = 6
+        new_body, new_etag = catalog.snapshot()
+        self.assertNotEqual(new_etag, etag)
+        self.assertIn(b"2026-02-01T00:00:00", new_body)
+
+        self.clock.now = 12
+        self.assertIs(catalog.snapshot()[0], new_body)
+
+    def test_unreadable_metadata_ignored(self):
+        """Test a corrupt metadata file does not break the catalog"""
+        with open(metadata_path(self.data_dir, "nd_gain"), "w") as f:
+            f.write("{not json")
+        entry = DatasetCatalog(self.data_dir).entries()[0]
+        self.assertEqual(entry["name"], "ND-GAIN")
+        self.assertNotIn("status", entry)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Test suite for request coalescing
+"""
+
+import asyncio
+import threading
+import unittest
+
+from climateguardian.singleflight import SingleFlight
+
+
+class SingleFlightTestCase(unittest.TestCase):
+    """Test cases for SingleFlight"""
+
+    def setUp(self):
+        self.flight = SingleFlight()
+
+    def run_concurrently(self, count, key_for, fn):
+        """Call do() from ``count`` threads at once while ``fn`` blocks until all have called"""
+        results, errors = [None] * count, []
+        started = threading.Barrier(count + 1)
+
+        def worker(i):
+            started.wait()
+            try:
+                results[i] = self.flight.do(key_for(i), fn)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        started.wait()
+        for thread in threads:
+            thread.join()
+        return results, errors
+
+    def test_concurrent_identical_calls_share_one_computation(self):
+        """Test callers of one key wait for the first caller's result"""
+        calls = []
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return {"answer": "shared"}
+
+        timer = threading.Timer(0.2, release.set)
+        timer.start()
+        results, errors = self.run_concurrently(8, lambda i: ("q", "intent"), compute)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result[0] is results[0][0] for result in results))
+        self.assertEqual(sorted(shared for _, shared in results), [False] + [True] * 7)
+        self.assertEqual(self.flight.stats(), {"leaders": 1, "coalesced": 7, "in_flight": 0})
+
+    def test_distinct_keys_run_separately(self):
+        """Test calls with different keys do not wait on each other"""
+        results, errors = self.run_concurrently(4, lambda i: (f"q{i}", "intent"), lambda: "done")
+        self.assertEqual(errors, [])
+        self.assertEqual([shared for _, shared in results], [False] * 4)
+        self.assertEqual(self.flight.leaders, 4)
+
+    def test_error_reaches_every_waiter(self):
+        """Test an exception from the computation is raised to all callers sharing it"""
+        release = threading.Event()
+
+        def fail():
+            release.wait(5)
+            raise RuntimeError("generation failed")
+
+        timer = threading.Timer(0.2, release.set)
+        timer.start()
+        results, errors = self.run_concurrently(5, lambda i: "q", fail)
+
+        self.assertEqual(len(errors), 5)
+        self.assertTrue(all(isinstance(error, RuntimeError) for error in errors))
+        self.assertEqual(self.flight.in_flight, 0)
+
+    def test_finished_key_runs_again(self):
+        """Test a key is forgotten once its computation finishes"""
+        self.assertEqual(self.flight.do("q", lambda: 1), (1, False))
+        self.assertEqual(self.flight.do("q", lambda: 2), (2, False))
+        self.assertEqual(self.flight.coalesced, 0)
+
+    def test_async_callers_share_one_task(self):
+        """Test coroutines awaiting one key share a single computation"""
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "shared"
+
+        async def run():
+            return await asyncio.gather(*(self.flight.ado("q", compute) for _ in range(10)))
+
+        results = asyncio.run(run())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([result for result, _ in results], ["shared"] * 10)
+        self.assertEqual(self.flight.stats(), {"leaders": 1, "coalesced": 9, "in_flight": 0})
+
+    def test_cancelled_async_caller_does_not_cancel_others(self):
+        """Test the shared task keeps running when the caller that started it is cancelled"""
+        async def compute():
+            await asyncio.sleep(0.05)
+            return "shared"
+
+        async def run():
+            first = asyncio.ensure_future(self.flight.ado("q", compute))
+            await asyncio.sleep(0)
+            second = asyncio.ensure_future(self.flight.ado("q", compute))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        self.assertEqual(asyncio.run(run()), ("shared", True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+"""
+Test suite for startup modes, lazy components and the startup-time budget
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import unittest
+
+from climateguardian.startup import LazyComponent, StartupReport, import_times, warm_up
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds; generous for shared CI machines, tighten locally with the environment variables
+IMPORT_BUDGET = float(os.environ.get('STARTUP_IMPORT_BUDGET', 3.0))
+FIRST_REQUEST_BUDGET = float(os.environ.get('STARTUP_FIRST_REQUEST_BUDGET', 5.0))
+
+FIRST_REQUEST_SCRIPT = """
+import json, sys
+import app
+client = app.app.test_client()
+client.post('/api/query', json={'question': 'What are the flood risks for Bangladesh?'})
+print(json.dumps({"report": app.guardian.startup.as_dict(), "numpy": "numpy" in sys.modules}))
+"""
+
+
+class LazyComponentTestCase(unittest.TestCase):
+    """Test cases for LazyComponent and the startup report"""
+
+    def test_built_once_across_threads(self):
+        """Test concurrent first uses build the component once and record the build"""
+        report = StartupReport()
+        builds = []
+
+        def build():
+            builds.append(1)
+            time.sleep(0.05)
+            return object()
+
+        component = LazyComponent("index", build, report)
+        self.assertFalse(component.loaded)
+        values = []
+        threads = [threading.Thread(target=lambda: values.append(component.get())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(builds), 1)
+        self.assertTrue(all(value is values[0] for value in values))
+        self.assertTrue(component.loaded)
+        self.assertGreaterEqual(report.components["index"]["seconds"], 0.04)
+
+    def test_milestones_recorded_once(self):
+        """Test a milestone keeps the first time it was reached"""
+        report = StartupReport()
+        self.assertTrue(report.mark("first_request"))
+        first = report.milestones["first_request"]
+        self.assertFalse(report.mark("first_request"))
+        self.assertEqual(report.milestones["first_request"], first)
+        self.assertGreater(first, 0)
+
+    def test_warm_up_continues_after_failure(self):
+        """Test a failing warm-up step does not stop the remaining ones"""
+        report = StartupReport()
+        ran = []
+
+        def fail():
+            raise OSError("index missing")
+
+        warm_up({"broken": fail, "index": lambda: ran.append("index")}, report).join(5)
+        self.assertEqual(ran, ["index"])
+        self.assertIn("warmed", report.milestones)
+        self.assertIn("warm_up.index", report.as_dict()["phases_seconds"])
+
+
+class GuardianStartupTestCase(unittest.TestCase):
+    """Test ClimateGuardian startup modes"""
+
+    def test_lazy_mode_loads_on_first_use(self):
+        """Test a lazy guardian builds only the components a query needs"""
+        from app import ClimateGuardian
+        guardian = ClimateGuardian(startup_mode="lazy")
+        self.assertEqual(guardian.startup.components, {})
+
+        result = guardian.query("What are the flood risks for Bangladesh?")
+        self.assertIn("Bangladesh", result["answer"])
+        self.assertIn("knowledge", guardian.startup.components)
+        self.assertNotIn("analytics", guardian.startup.components)
+
+    def test_warm_mode_loads_in_background(self):
+        """Test the warm-up thread builds every component off the request path"""
+        from app import ClimateGuardian
+        guardian = ClimateGuardian(startup_mode="warm")
+        guardian.warm_up_thread.join(10)
+
+        components = guardian.startup.components
+        self.assertEqual(set(components), {"knowledge", "datasets", "tables", "analytics", "retriever",
+                                           "ranking"})
+        self.assertTrue(all(load["thread"] == "startup-warm-up" for load in components.values()))
+        self.assertIn("warmed", guardian.startup.milestones)
+
+    def test_async_query_loads_components_off_event_loop(self):
+        """Test aquery waits for a component still loading on a worker thread, not on the event loop"""
+        from app import ClimateGuardian, Config
+        from climateguardian.knowledge import ClimateKnowledgeStore
+        guardian = ClimateGuardian(startup_mode="lazy")
+        release = threading.Event()
+        released = []
+
+        def slow_knowledge():
+            released.append(release.wait(2))
+            return ClimateKnowledgeStore(Config.DATA_DIR)
+
+        guardian._knowledge = LazyComponent("knowledge", slow_knowledge, guardian.startup)
+
+        async def run():
+            query = asyncio.ensure_future(guardian.aquery("What are the flood risks for Bangladesh?"))
+            # Let the query start loading; a blocked event loop would not get back here until it gave up
+            await asyncio.sleep(0.2)
+            release.set()
+            return await query
+
+        result = asyncio.run(run())
+        self.assertEqual(released, [True])
+        self.assertIn("Bangladesh", result["answer"])
+
+    def test_unknown_mode_rejected(self):
+        """Test a misspelt STARTUP_MODE fails loudly"""
+        from app import ClimateGuardian
+        with self.assertRaises(ValueError):
+            ClimateGuardian(startup_mode="fast")
+
+
+class StartupBudgetTestCase(unittest.TestCase):
+    """Cold-start timings of a fresh interpreter against the budget"""
+
+    def test_import_within_budget(self):
+        """Test importing the app in lazy mode stays within budget and defers numpy"""
+        times = import_times("app", cwd=REPO_ROOT, env={"STARTUP_MODE": "lazy"})
+        self.assertLess(times["app"]["cumulative"], IMPORT_BUDGET)
+        self.assertNotIn("numpy", times)
+        self.assertNotIn("climateguardian.analytics", times)
+
+    def test_first_request_within_budget(self):
+        """Test the first query is served within budget of process start"""
+        result = subprocess.run([sys.executable, "-c", FIRST_REQUEST_SCRIPT], cwd=REPO_ROOT,
+                                env={**os.environ, "STARTUP_MODE": "lazy"},
+                                capture_output=True, text=True, timeout=120)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        output = json.loads(result.stdout.strip().splitlines()[-1])
+        milestones = output["report"]["milestones_seconds"]
+        self.assertLess(milestones["first_request"], FIRST_REQUEST_BUDGET)
+        self.assertLessEqual(milestones["guardian_ready"], milestones["first_request"])
+        self.assertFalse(output["numpy"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,247 @@
+"""
+Test suite for the shared SQLite storage backends
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from climateguardian.history import HistoryEntry
+from climateguardian.storage import SQLiteBackend, SQLiteHistoryStore, SQLiteResponseCache
+
+
+class FakeClock:
+    """Manually advanced clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class StorageTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.data_dir)
+        self.path = os.path.join(self.data_dir, "shared", "state.db")
+        self.clock = FakeClock()
+
+    def backend(self, **kwargs) -> SQLiteBackend:
+        """A backend on the shared file, as a separate worker process would open it"""
+        backend = SQLiteBackend(self.path, **kwargs)
+        self.addCleanup(backend.close)
+        return backend
+
+
+class SQLiteHistoryStoreTestCase(StorageTestCase):
+    """Test cases for SQLiteHistoryStore"""
+
+    def store(self, backend=None, **kwargs) -> SQLiteHistoryStore:
+        options = {"max_entries_per_session": 3, "max_sessions": 2, "session_ttl": 60, "clock": self.clock,
+                   "maintenance_interval": 1}
+        options.update(kwargs)
+        return SQLiteHistoryStore(backend or self.backend(), **options)
+
+    def test_ring_buffer_keeps_latest_entries(self):
+        """Test each session keeps only its most recent entries"""
+        store = self.store()
+        for i in range(5):
+            store.append("a", {"question": f"q{i}"})
+
+        self.assertEqual([entry["question"] for entry in store.recent("a")], ["q2", "q3", "q4"])
+        self.assertEqual([entry["question"] for entry in store.recent("a", 2)], ["q3", "q4"])
+        self.assertEqual(len(store), 3)
+
+    def test_history_entries_stored_as_dicts(self):
+        """Test HistoryEntry records are stored and read back in the history API's shape"""
+        store = self.store()
+        response = {"answer": "a", "sources": ["s"], "confidence": 90}
+        store.append("a", HistoryEntry("id-1", "t", "q", "general_climate", response))
+        self.assertEqual(store.recent("a"), [{"id": "id-1", "timestamp": "t", "question": "q",
+                                              "intent": "general_climate", "response": response}])
+
+    def test_least_recently_used_session_evicted(self):
+        """Test the idle session is evicted when capacity is exceeded"""
+        store = self.store()
+        store.append("a", {"question": "1"})
+        self.clock.now += 1
+        store.append("b", {"question": "2"})
+        self.clock.now += 1
+        store.recent("a")
+        self.clock.now += 1
+        store.append("c", {"question": "3"})
+        store.backend.flush()
+
+        self.assertEqual(store.count("b"), 0)
+        self.assertEqual(store.count("a"), 1)
+        self.assertEqual(store.count("c"), 1)
+        self.assertEqual(store.evicted_sessions, 1)
+
+    def test_sessions_capped_every_maintenance_interval(self):
+        """Test the session cap is enforced in every maintenance_interval-th batch"""
+        store = self.store(maintenance_interval=2)
+        for session_id in "abc":
+            self.clock.now += 1
+            store.append(session_id, {"question": session_id})
+            store.backend.flush()
+        self.assertEqual(store.evicted_sessions, 0)
+        self.assertEqual(store.count("a"), 1)
+
+        self.clock.now += 1
+        store.append("d", {"question": "d"})
+        store.backend.flush()
+        self.assertEqual(store.evicted_sessions, 2)
+        self.assertEqual([store.count(session_id) for session_id in "abcd"], [0, 0, 1, 1])
+
+    def test_idle_sessions_expire(self):
+        """Test sessions idle longer than the TTL are dropped"""
+        store = self.store()
+        store.append("a", {"question": "old"})
+        self.clock.now += 30
+        store.append("b", {"question": "newer"})
+        self.clock.now += 31
+
+        self.assertEqual(store.recent("a"), [])
+        self.assertEqual(store.count("b"), 1)
+        self.assertEqual(store.memory_budget()["sessions"], 1)
+
+    def test_shared_between_workers(self):
+        """Test history written through one worker's backend is read through another's"""
+        first, second = self.store(), self.store()
+        first.append("user-1", {"question": "from worker 1", "response": {"sources": ["ND-GAIN"]}})
+        first.backend.flush()
+
+        self.assertEqual(second.recent("user-1"),
+                         [{"question": "from worker 1", "response": {"sources": ["ND-GAIN"]}}])
+        second.clear("user-1")
+        self.assertEqual(first.count("user-1"), 0)
+
+    def test_writes_are_batched(self):
+        """Test appends are queued and committed together, and visible to their own worker at once"""
+        backend = self.backend(flush_interval=60, batch_size=1000)
+        store = self.store(backend, max_entries_per_session=100, max_sessions=100)
+        for i in range(50):
+            store.append(f"s{i % 5}", {"question": str(i)})
+        self.assertEqual(backend.flushes, 0)
+
+        self.assertEqual(store.count("s0"), 10)
+        self.assertEqual(backend.flushes, 1)
+        self.assertEqual(backend.writes, 100)
+
+    def test_reads_flush_only_for_their_session(self):
+        """Test reading a session without queued appends leaves the batch queued"""
+        backend = self.backend(flush_interval=60, batch_size=1000)
+        store = self.store(backend)
+        store.append("a", {"question": "q"})
+        self.assertEqual(store.recent("b"), [])
+        self.assertEqual(backend.flushes, 0)
+        self.assertEqual(len(store.recent("a")), 1)
+        self.assertEqual(store.recent("a")[0]["question"], "q")
+        self.assertEqual(backend.flushes, 1)
+
+    def test_writer_thread_flushes(self):
+        """Test the background writer commits queued appends without a read"""
+        backend = self.backend(flush_interval=0.01)
+        store = self.store(backend)
+        store.append("a", {"question": "q"})
+        reader = self.backend()
+        for _ in range(200):
+            if reader.connection().execute("SELECT COUNT(*) FROM history_entries").fetchone()[0]:
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(len(store), 1)
+
+    def test_concurrent_appends(self):
+        """Test threads appending through one backend lose no entries"""
+        store = self.store(max_entries_per_session=1000, max_sessions=100)
+        threads = [threading.Thread(target=lambda i=i: [store.append(f"s{i % 4}", {"n": n}) for n in range(100)])
+                   for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sum(store.count(f"s{i}") for i in range(4)), 800)
+        self.assertEqual(store.memory_budget()["entries"], 800)
+
+
+class SQLiteResponseCacheTestCase(StorageTestCase):
+    """Test cases for SQLiteResponseCache"""
+
+    def cache(self, backend=None, **kwargs) -> SQLiteResponseCache:
+        options = {"max_size": 2, "ttl": 60, "watch_paths": [self.data_dir], "check_interval": 0,
+                   "clock": self.clock}
+        options.update(kwargs)
+        return SQLiteResponseCache(backend or self.backend(), **options)
+
+    def test_hit_and_miss(self):
+        """Test a stored response is returned, from this worker's queue and after commit"""
+        cache = self.cache(self.backend(flush_interval=60))
+        key = cache.make_key("Flood risks for Bangladesh?", "risk_assessment")
+        self.assertIsNone(cache.get(key))
+        cache.put(key, {"answer": "a", "sources": [], "confidence": 90})
+        self.assertEqual(cache.get(key)["answer"], "a")
+        cache.backend.flush()
+        self.assertEqual(cache.get(cache.make_key("flood risks for bangladesh", "risk_assessment"))["answer"], "a")
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+    def test_failed_flush_forgets_pending_puts(self):
+        """Test puts dropped with a failed batch are not held in memory forever"""
+        cache = self.cache(self.backend(flush_interval=60))
+        cache.put(("a", "i"), {"answer": "a"})
+        self.assertEqual(len(cache._pending), 1)
+        cache.backend.connection().execute("DROP TABLE response_cache")
+
+        self.assertEqual(cache.backend.flush(), 0)
+        self.assertEqual(cache.backend.failed_writes, 1)
+        self.assertEqual(cache._pending, {})
+
+    def test_shared_between_workers(self):
+        """Test a response generated by one worker is a hit for another"""
+        first, second = self.cache(), self.cache()
+        key = first.make_key("q", "general_climate")
+        first.put(key, {"answer": "shared"})
+        first.backend.flush()
+        self.assertEqual(second.get(key), {"answer": "shared"})
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted when full"""
+        cache = self.cache()
+        cache.put(("a", "i"), {"answer": "a"})
+        self.clock.now += 2
+        cache.put(("b", "i"), {"answer": "b"})
+        cache.backend.flush()
+        self.clock.now += 2
+        cache.get(("a", "i"))
+        cache.put(("c", "i"), {"answer": "c"})
+        cache.backend.flush()
+
+        self.assertIsNotNone(cache.get(("a", "i")))
+        self.assertIsNone(cache.get(("b", "i")))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_ttl_expiry(self):
+        """Test entries expire after the TTL"""
+        cache = self.cache()
+        cache.put(("a", "i"), {"answer": "a"})
+        cache.backend.flush()
+        self.clock.now += 61
+        self.assertIsNone(cache.get(("a", "i")))
+
+    def test_invalidated_when_dataset_changes(self):
+        """Test the shared cache is emptied when a watched dataset file changes"""
+        cache = self.cache()
+        cache.put(("a", "i"), {"answer": "a"})
+        with open(os.path.join(self.data_dir, "nd_gain_sample.json"), "w") as f:
+            f.write("{}")
+        self.assertIsNone(cache.get(("a", "i")))
+        self.assertEqual(cache.stats()["invalidations"], 1)
+        self.assertEqual(cache.stats()["size"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
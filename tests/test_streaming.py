@@ -0,0 +1,36 @@
+"""
+Test suite for Server-Sent Events helpers
+"""
+
+import json
+import unittest
+
+from climateguardian.streaming import chunk_text, sse_event
+
+
+class StreamingHelpersTestCase(unittest.TestCase):
+    """Test cases for chunk_text and sse_event"""
+
+    def test_chunks_rebuild_original_text(self):
+        """Test chunks concatenate back to the exact answer"""
+        text = "Line one with  double spaces\n\n• bullet\n  indented line   "
+        chunks = list(chunk_text(text, size=10))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), text)
+
+    def test_chunk_size(self):
+        """Test chunks break on word boundaries near the requested size"""
+        chunks = list(chunk_text("alpha beta gamma delta epsilon", size=8))
+        self.assertEqual(chunks, ["alpha beta ", "gamma delta ", "epsilon"])
+        self.assertEqual(list(chunk_text("")), [])
+
+    def test_sse_event_format(self):
+        """Test events carry a name and a single-line JSON payload"""
+        frame = sse_event("chunk", {"text": "a\nb"})
+        self.assertTrue(frame.startswith("event: chunk\ndata: "))
+        self.assertTrue(frame.endswith("\n\n"))
+        self.assertEqual(json.loads(frame.split("data: ", 1)[1]), {"text": "a\nb"})
+
+
+if __name__ == '__main__':
+    unittest.main()
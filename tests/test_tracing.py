@@ -0,0 +1,52 @@
+"""
+Test suite for per-request tracing
+"""
+
+import unittest
+
+from climateguardian import tracing
+from climateguardian.tracing import Trace
+
+
+class TraceTestCase(unittest.TestCase):
+    """Test cases for Trace and the context-local span helper"""
+
+    def test_spans_recorded_in_completion_order(self):
+        """Test nested module-level spans land in the active trace"""
+        with tracing.activate(Trace()) as trace:
+            with trace.span("generate"):
+                with tracing.span("draft"):
+                    pass
+            with tracing.span("history"):
+                pass
+        self.assertEqual([name for name, _ in trace.spans], ["draft", "generate", "history"])
+        self.assertIsNone(tracing.current_trace())
+
+    def test_span_without_trace_is_noop(self):
+        """Test spans outside an active trace do nothing"""
+        with tracing.span("draft"):
+            value = 1
+        self.assertEqual(value, 1)
+
+    def test_failed_stage_is_innermost(self):
+        """Test the innermost failing stage is remembered and the error propagates"""
+        trace = Trace()
+        with self.assertRaises(KeyError):
+            with trace.span("generate"):
+                with trace.span("draft"):
+                    raise KeyError("missing")
+        self.assertEqual(trace.failed_stage, "draft")
+        self.assertEqual(len(trace.spans), 2)
+
+    def test_server_timing(self):
+        """Test repeated stages are summed and the header lists every stage plus the total"""
+        trace = Trace()
+        trace.spans = [("cache", 0.001), ("llm", 0.25), ("cache", 0.002)]
+        self.assertEqual(trace.timings_ms(), {"cache": 3.0, "llm": 250.0})
+        header = trace.server_timing()
+        self.assertTrue(header.startswith("cache;dur=3.0, llm;dur=250.0, total;dur="))
+        self.assertEqual(trace.server_timing(include_total=False), "cache;dur=3.0, llm;dur=250.0")
+
+
+if __name__ == '__main__':
+    unittest.main()
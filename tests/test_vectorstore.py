@@ -0,0 +1,155 @@
+"""
+Test suite for the persistent vector index
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from climateguardian.llm import build_prompt
+from climateguardian.sample_data import SAMPLE_DATA
+from climateguardian.vectorstore import (MIN_TRAIN_ROWS, HashingEmbedder, VectorStore, VectorStoreReader,
+                                         dataset_documents, evaluate)
+
+
+def clustered_vectors(rows: int, dim: int, clusters: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    return (centers[rng.integers(0, clusters, rows)] + 0.3 * rng.normal(size=(rows, dim))).astype(np.float32)
+
+
+class HashingEmbedderTestCase(unittest.TestCase):
+    """Test cases for the offline embedder"""
+
+    def test_unit_length_and_similarity(self):
+        """Test embeddings are normalized and related texts score higher"""
+        vectors = HashingEmbedder(128)(["flood risk in Bangladesh", "Bangladesh flood risk factors",
+                                        "air quality in Delhi", ""])
+        self.assertEqual(vectors.shape, (4, 128))
+        np.testing.assert_allclose(np.linalg.norm(vectors[:3], axis=1), 1.0, rtol=1e-5)
+        self.assertEqual(np.abs(vectors[3]).sum(), 0)
+        self.assertGreater(vectors[0] @ vectors[1], vectors[0] @ vectors[2])
+
+
+class VectorStoreTestCase(unittest.TestCase):
+    """Test cases for VectorStore"""
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_add_query_and_persist(self):
+        """Test documents are found by text and survive a reopen"""
+        store = VectorStore(self.path)
+        store.add(["a", "b"], ["Bangladesh flood risk is high", "Delhi air quality is poor"],
+                  [{"kind": "flood"}, {"kind": "air"}])
+        store.save()
+
+        reopened = VectorStore(self.path, readonly=True)
+        hits = reopened.query(["flood risk Bangladesh"], k=1)[0]
+        self.assertEqual(hits[0]["id"], "a")
+        self.assertEqual(hits[0]["kind"], "flood")
+        self.assertEqual(hits[0]["text"], "Bangladesh flood risk is high")
+        self.assertEqual(len(reopened), 2)
+        with self.assertRaises(RuntimeError):
+            reopened.add(["c"], ["text"])
+
+    def test_replace_and_delete(self):
+        """Test re-adding an id replaces it and deleted ids are never returned"""
+        store = VectorStore(self.path)
+        store.add(["a", "b"], ["flood risk", "drought risk"])
+        store.add(["a"], ["heatwave risk"])
+        self.assertEqual(store.delete(["b", "missing"]), 1)
+        self.assertEqual(len(store), 1)
+        hits = store.query(["drought risk", "heatwave risk"], k=5)
+        self.assertEqual({hit["id"] for hit in hits[0] + hits[1]}, {"a"})
+        self.assertEqual(hits[1][0]["text"], "heatwave risk")
+
+    def test_sync_embeds_only_changes(self):
+        """Test sync reports added, updated, deleted and unchanged documents"""
+        store = VectorStore(self.path)
+        documents = [{"id": str(i), "text": f"document number {i}"} for i in range(5)]
+        self.assertEqual(store.sync(documents), {"added": 5, "updated": 0, "deleted": 0, "unchanged": 0})
+
+        documents = documents[1:]
+        documents[0] = {"id": "1", "text": "rewritten document"}
+        documents.append({"id": "9", "text": "new document"})
+        self.assertEqual(store.sync(documents), {"added": 1, "updated": 1, "deleted": 1, "unchanged": 3})
+        self.assertEqual(VectorStore(self.path).sync(documents),
+                         {"added": 0, "updated": 0, "deleted": 0, "unchanged": 5})
+
+    def test_ivf_recall_against_exact(self):
+        """Test the trained IVF index finds nearly all exact neighbours"""
+        vectors = clustered_vectors(4 * MIN_TRAIN_ROWS, 32, clusters=40)
+        store = VectorStore(self.path, dim=32, n_probe=8)
+        store.add_vectors([str(i) for i in range(len(vectors))], vectors)
+        store.train()
+        self.assertIsNotNone(store.centroids)
+
+        queries = clustered_vectors(50, 32, clusters=40, seed=1)
+        report = evaluate(store, queries, k=10)
+        self.assertGreaterEqual(report["recall"], 0.9)
+
+        store.delete([str(i) for i in range(0, len(vectors), 2)])
+        _, rows = store.search(queries, k=10)
+        self.assertTrue(np.all(rows[rows >= 0] % 2 == 1))
+
+    def test_compact(self):
+        """Test compaction drops tombstones and keeps ids searchable"""
+        store = VectorStore(self.path, dim=8)
+        vectors = np.eye(8, dtype=np.float32)
+        store.add_vectors([str(i) for i in range(8)], vectors)
+        store.delete(["0", "1", "2"])
+        store.compact()
+        store.save()
+
+        reopened = VectorStore(self.path)
+        self.assertEqual(reopened.rows, 5)
+        self.assertEqual(os.path.getsize(os.path.join(self.path, "vectors.f32")), 5 * 8 * 4)
+        _, rows = reopened.search(vectors[5], k=1)
+        self.assertEqual(reopened.ids[rows[0][0]], "5")
+
+
+class VectorStoreReaderTestCase(unittest.TestCase):
+    """Test cases for the reloading reader and dataset documents"""
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_reloads_on_change(self):
+        """Test the reader picks up a rebuilt index"""
+        reader = VectorStoreReader(self.path)
+        self.assertIsNone(reader.store)
+
+        writer = VectorStore(self.path)
+        writer.sync([{"id": "a", "text": "first"}])
+        first = reader.store
+        self.assertEqual(len(first), 1)
+        self.assertIs(reader.store, first)
+
+        writer.sync([{"id": "a", "text": "first"}, {"id": "b", "text": "second"}])
+        os.utime(os.path.join(self.path, "index.json"), ns=(0, 0))
+        self.assertEqual(len(reader.store), 2)
+
+    def test_sample_documents_retrieved(self):
+        """Test sample records are indexed and retrieved into the prompt"""
+        store = VectorStore(self.path)
+        store.sync(dataset_documents(SAMPLE_DATA))
+        hits = store.query(["Which funding is available for NGOs in Africa?"], k=3)[0]
+        self.assertTrue(all(hit["id"].startswith("un_sdg13:funding:") for hit in hits))
+
+        prompt = build_prompt("Funding for NGOs?", "Reference text", [hit["text"] for hit in hits])
+        self.assertIn("Related records:\n- ", prompt)
+        self.assertLess(prompt.index("Related records:"), prompt.index("Reference information:\nReference text"))
+
+
+if __name__ == '__main__':
+    unittest.main()